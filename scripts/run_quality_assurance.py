@@ -5,27 +5,94 @@
 """
 
 import sys
+import codecs
 import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
-from validators import (
-    DocumentExistenceChecker,
-    DocumentContentChecker,
-    CodeExampleValidator,
-    MarkdownFormatChecker,
-    DocumentStructureChecker,
-    TerminologyChecker,
-    LinkValidator,
-)
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
+from validators import DocumentCorpus, DocumentValidator, registry
+from validators.cache import DEFAULT_CACHE_DIR, ValidationCache
+from validators.corpus import SOURCE_LOCALE
+from validators.diagnostics import ERROR, Diagnostic
+from validators.parallel import ParallelCheckExecutor
+from validators.pathindex import PathIndex, shared_index
+from validators.reports import REPORT_WRITERS
+from validators.schedule import CheckHistory, ErrorBudget, ScheduledCheck, schedule
+from validators.shard import Shard, load_partial_report, merge_partial_reports
+from validators.timing import CheckTimings, slowest_files, slowest_rules
 
 
 class QualityAssuranceRunner:
     """质量保证运行器 - 执行所有验证并生成报告"""
     
-    def __init__(self, root_dir: str = '.'):
+    # 检查项: (名称, 注册表中的检查器名称, 描述)，按报告中的顺序排列；
+    # 执行时按预计耗时从低到高调度（见 validators/schedule.py）
+    CHECKS = [
+        ("文档存在性", "existence", "检查所有必需文档是否存在"),
+        ("内容完整性", "content", "检查文档是否包含必需章节"),
+        ("代码示例", "code", "验证代码示例的语法正确性"),
+        ("Markdown 格式", "format", "检查 Markdown 格式规范"),
+        ("结构一致性", "structure", "检查同类文档的结构一致性"),
+        ("术语一致性", "terminology", "检查术语使用的一致性"),
+        ("链接有效性", "links", "验证所有链接的有效性"),
+        ("近似重复", "duplicates", "检测文档、README 和 notebook 中近似重复的段落"),
+        ("版本一致性", "parity", "检查各教程版本的 notebook 是否一致"),
+        ("提示与评分", "graders", "检查练习提示与评分函数是否一致"),
+    ]
+    
+    # Markdown 报告中每项检查列出的错误和警告的最大条数
+    REPORT_LIMIT = 20
+    
+    # 从临时文件复制到 JSON 报告时每次读取的字节数
+    SPOOL_BLOCK = 1 << 20
+    
+    def __init__(self, root_dir: str = '.', jobs: int = 1, cache_dir: Optional[str] = None,
+                 report_formats: Sequence[str] = (), top: int = 10,
+                 locales: Optional[Sequence[str]] = None, max_errors: Optional[int] = None,
+                 shard: Optional[Shard] = None, path_index: Optional[PathIndex] = None):
         self.root_dir = Path(root_dir)
+        self.report_dir = self.root_dir / "scripts" / "tests"
+        # 并行进程数；大于 1 时检查器及其文件分区在进程池中执行
+        self.jobs = jobs
+        self._executor = None
+        # 分片运行时只运行属于本分片的文档和检查，报告文件名带分片后缀（见 validators/shard.py）
+        self.shard = shard
+        # 所有检查共享同一个语料库，每个文档只读取一次；
+        # 分片运行时使用所有分片共用的预先计算的路径索引
+        self.corpus = DocumentCorpus(root_dir, path_index)
+        # 要检查的语言；默认为 docs/ 下发现的所有语言目录（始终包括源语言）
+        if locales:
+            self.locales = list(dict.fromkeys(locales))
+        else:
+            discovered = self.corpus.locales()
+            self.locales = discovered if SOURCE_LOCALE in discovered else [SOURCE_LOCALE] + discovered
+        # 增量验证缓存目录；为 None 时不使用缓存
+        self.cache_dir = cache_dir
+        self.cache = ValidationCache(cache_dir) if cache_dir is not None else None
+        # 流式报告：每项检查完成后立即写出（见 validators/reports.py）
+        self._writers = [
+            REPORT_WRITERS[fmt](self._report_path(REPORT_WRITERS[fmt].FILENAME))
+            for fmt in report_formats
+        ]
+        # 报告中列出的最慢文件和规则的个数
+        self.top = top
+        # 检查结果中保留的最慢文件个数；分片的部分报告保留全部文件，合并后的统计才准确
+        self._result_top = top if shard is None else None
+        # 每项检查的耗时统计（见 validators/timing.py）
+        self.timings: Dict[str, CheckTimings] = {}
+        # 各项检查的历史耗时（保存在缓存目录中），用于先运行最便宜的检查
+        self.history = CheckHistory(self.cache)
+        # 错误预算：累计错误数达到上限后取消其余检查，上限为 None 时运行全部检查
+        self.budget = ErrorBudget(max_errors)
+        # 本次运行的执行顺序，以及因错误预算用尽而没有运行的检查名称
+        self.plan: List[ScheduledCheck] = []
+        self.cancelled: List[str] = []
         self.results = {}
+        # 选择了流式报告时，每项检查的诊断写出后即从 results 中丢弃（只保留计数和前 REPORT_LIMIT 条），
+        # JSON 报告中该检查的部分先写入临时文件：检查名称 -> (偏移, 字节数)
+        self._spool = None
+        self._spooled: Dict[str, Tuple[int, int]] = {}
         self.start_time = None
         self.end_time = None
     
@@ -38,109 +105,248 @@ class QualityAssuranceRunner:
         print("=" * 80)
         print(f"开始时间: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"项目根目录: {self.root_dir.absolute()}")
+        print(f"文档语言: {', '.join(self.locales)}")
+        if self.shard is not None:
+            print(f"分片: {self.shard}")
         print("=" * 80)
         print()
         
         all_success = True
+        self.plan = self._schedule()
+        self.cancelled = []
         
-        # 1. 文档存在性检查
-        all_success &= self._run_check(
-            "文档存在性",
-            DocumentExistenceChecker,
-            "检查所有必需文档是否存在"
-        )
-        
-        # 2. 文档内容完整性检查
-        all_success &= self._run_check(
-            "内容完整性",
-            DocumentContentChecker,
-            "检查文档是否包含必需章节"
-        )
-        
-        # 3. 代码示例验证
-        all_success &= self._run_check(
-            "代码示例",
-            CodeExampleValidator,
-            "验证代码示例的语法正确性"
-        )
-        
-        # 4. Markdown 格式检查
-        all_success &= self._run_check(
-            "Markdown 格式",
-            MarkdownFormatChecker,
-            "检查 Markdown 格式规范"
-        )
+        for writer in self._writers:
+            writer.start(self._metadata())
+        if self._writers:
+            self._spool = tempfile.TemporaryFile()
+            self._spooled = {}
         
-        # 5. 文档结构一致性检查
-        all_success &= self._run_check(
-            "结构一致性",
-            DocumentStructureChecker,
-            "检查同类文档的结构一致性"
-        )
+        if self.jobs > 1:
+            # 按执行顺序把所有语言的所有检查提交到进程池（各语言同时检查，便宜的检查先开始），
+            # 再按同样的顺序收集并打印结果
+            self._executor = ParallelCheckExecutor(
+                str(self.root_dir), self.jobs, self.corpus, self.cache_dir, timings=True
+            )
+            for check in self.plan:
+                checker_class = check.spec.load()
+                self._executor.submit(checker_class, check.locale, self._shard_paths(checker_class, check.locale))
         
-        # 6. 术语一致性检查
-        all_success &= self._run_check(
-            "术语一致性",
-            TerminologyChecker,
-            "检查术语使用的一致性"
-        )
-        
-        # 7. 链接验证
-        all_success &= self._run_check(
-            "链接有效性",
-            LinkValidator,
-            "验证所有链接的有效性"
-        )
-        
-        self.end_time = datetime.now()
+        try:
+            for index, check in enumerate(self.plan):
+                name, description = check.data
+                all_success &= self._run_check(name, check.spec.load(), description, check.locale)
+                # 分片只运行检查的一部分，耗时不代表完整检查的耗时，不计入历史
+                if self.shard is None:
+                    self.history.record(check.spec.name, check.locale, self.results[name]['timings']['wall_seconds'])
+                self.budget.spend(self.results[name]['error_count'])
+                if self.budget.exhausted and index + 1 < len(self.plan):
+                    self._cancel(self.plan[index + 1:])
+                    all_success = False
+                    break
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self.end_time = datetime.now()
+            self._finish_streaming_reports()
+            self.history.save()
         
-        # 生成报告
+        # 生成报告（错误预算用尽时只包含已完成的检查）
+        self._sort_results()
         self._generate_summary_report(all_success)
-        self._generate_detailed_report()
+        try:
+            self._generate_detailed_report()
+        finally:
+            if self._spool is not None:
+                self._spool.close()
+                self._spool = None
         
         return all_success
     
-    def _run_check(self, name: str, checker_class, description: str) -> bool:
-        """运行单个检查"""
+    @classmethod
+    def merge(cls, report_paths: Sequence[str], root_dir: str = '.', top: int = 10) -> 'QualityAssuranceRunner':
+        """读取并合并所有分片的部分报告，返回可以生成完整摘要和报告的运行器
+        
+        分片报告不完整或不属于同一次划分时抛出 ValueError。
+        """
+        merged = merge_partial_reports([load_partial_report(path) for path in report_paths])
+        metadata = merged['metadata']
+        runner = cls(root_dir, top=top, locales=metadata['locales'], max_errors=metadata.get('max_errors'))
+        runner.start_time = metadata['started_at']
+        runner.end_time = metadata['finished_at']
+        runner.timings = merged['timings']
+        runner.cancelled = merged['cancelled']
+        runner.results = {
+            name: {
+                **result,
+                'error_count': len(result['errors']),
+                'warning_count': len(result['warnings']),
+                'timings': runner.timings[name].to_dict(top),
+            }
+            for name, result in merged['results'].items()
+        }
+        runner._sort_results()
+        return runner
+    
+    def _sort_results(self):
+        """报告中的检查按检查项的固定顺序排列，与执行顺序（和分片）无关"""
+        order = [self.result_name(name, locale) for locale in self.locales for name, _, _ in self.CHECKS]
+        self.results = {name: self.results[name] for name in order if name in self.results}
+    
+    def _schedule(self) -> List[ScheduledCheck]:
+        """所有语言的所有检查项，按预计耗时从低到高排列
+        
+        分片运行时，不属于本分片的汇总类检查不在执行计划中（逐文档检查在每个分片上都运行）。
+        """
+        checks = []
+        for locale in self.locales:
+            for name, checker_name, description in self.CHECKS:
+                spec = registry.get(checker_name)
+                if self.shard is not None and not spec.load().PER_DOCUMENT \
+                        and not self.shard.owns(checker_name, locale):
+                    continue
+                checks.append(ScheduledCheck(spec, locale, (self.result_name(name, locale), description)))
+        return schedule(checks, self.history)
+    
+    def _shard_paths(self, checker_class, locale: str) -> Optional[List[Path]]:
+        """分片运行时逐文档检查器要检查的文档（属于本分片的部分），其他情况为 None"""
+        if self.shard is None or not checker_class.PER_DOCUMENT:
+            return None
+        paths = checker_class(str(self.root_dir), self.corpus.for_locale(locale)).document_paths()
+        return self.shard.select(paths, self.corpus.path_index)
+    
+    def _report_path(self, filename: str) -> Path:
+        """报告文件的路径；分片运行时在扩展名之前加上分片后缀"""
+        path = self.report_dir / filename
+        if self.shard is None:
+            return path
+        return path.with_name(f"{path.stem}.{self.shard.suffix}{path.suffix}")
+    
+    def _metadata(self) -> Dict[str, Any]:
+        """写入报告开头的运行信息（合并分片报告时需要语言、分片和错误数上限）"""
+        return {
+            'started_at': self.start_time.isoformat(),
+            'root_dir': str(self.root_dir.absolute()),
+            'locales': self.locales,
+            'shard': str(self.shard) if self.shard is not None else None,
+            'max_errors': self.budget.max_errors,
+        }
+    
+    def _cancel(self, remaining: List[ScheduledCheck]):
+        """错误预算用尽：放弃其余检查，并行运行时终止进程池中尚未完成的任务"""
+        self.cancelled = [check.data[0] for check in remaining]
+        print(f"\n⚠️  错误数已达到上限 {self.budget.max_errors}，取消其余 {len(remaining)} 项检查")
+        if self._executor is not None:
+            self._executor.cancel()
+    
+    @staticmethod
+    def result_name(name: str, locale: str) -> str:
+        """检查结果的名称：源语言沿用检查项名称，其他语言加上语言标记（如 "链接有效性 [en]"）"""
+        return name if locale == SOURCE_LOCALE else f"{name} [{locale}]"
+    
+    def _run_check(self, name: str, checker_class, description: str,
+                   locale: str = SOURCE_LOCALE) -> bool:
+        """在某种语言的文档上运行单个检查"""
         print(f"\n{'─' * 80}")
-        print(f"检查 {len(self.results) + 1}/7: {name}")
+        print(f"检查 {len(self.results) + 1}/{len(self.plan)}: {name}")
         print(f"描述: {description}")
         print(f"{'─' * 80}")
         
+        corpus = self.corpus.for_locale(locale)
+        timings = self.timings[name] = CheckTimings()
         try:
-            checker = checker_class(str(self.root_dir))
-            success = checker.check()
+            if self._executor is not None:
+                # 并行模式：取回子进程收集的结果，在主进程中按原样打印报告
+                checker = DocumentValidator(str(self.root_dir), corpus)
+                result = self._executor.collect(checker_class, locale)
+                checker.errors = result['errors']
+                checker.warnings = result['warnings']
+                checker.info = result['info']
+                checker.stats = result['stats']
+                if result['timings'] is not None:
+                    timings = self.timings[name] = result['timings']
+                success = checker.print_report(checker_class.REPORT_TITLE)
+            else:
+                checker = checker_class(str(self.root_dir), corpus, self.cache)
+                checker.timings = timings
+                paths = self._shard_paths(checker_class, locale)
+                if paths is None:
+                    success = checker.check()
+                else:
+                    with timings.measure():
+                        checker.run_documents(paths)
+                    success = checker.print_report(checker_class.REPORT_TITLE)
             
-            # 收集结果
-            self.results[name] = {
+            # 收集结果（诊断按文档路径和位置排序，与并行、缓存和分片合并后的报告顺序一致）
+            self._record_result(name, {
                 'success': success,
-                'errors': getattr(checker, 'errors', []),
-                'warnings': getattr(checker, 'warnings', []),
+                'locale': locale,
+                'errors': sorted(getattr(checker, 'errors', []), key=Diagnostic.sort_key),
+                'warnings': sorted(getattr(checker, 'warnings', []), key=Diagnostic.sort_key),
                 'info': getattr(checker, 'info', []),
                 'stats': getattr(checker, 'stats', {}),
-            }
+                'timings': timings.to_dict(self._result_top),
+            })
             
             # 打印结果摘要
             if success:
                 print(f"\n✓ {name}检查通过")
             else:
                 print(f"\n✗ {name}检查失败")
-                print(f"  错误数: {len(self.results[name]['errors'])}")
-                print(f"  警告数: {len(self.results[name]['warnings'])}")
+                print(f"  错误数: {self.results[name]['error_count']}")
+                print(f"  警告数: {self.results[name]['warning_count']}")
+            print(f"  耗时: {timings.wall:.2f} 秒（CPU {timings.cpu:.2f} 秒）")
             
             return success
             
         except Exception as e:
             print(f"\n✗ {name}检查执行失败: {e}")
-            self.results[name] = {
+            self._record_result(name, {
                 'success': False,
-                'errors': [f"检查器执行失败: {str(e)}"],
+                'locale': locale,
+                'errors': [Diagnostic('checker-failed', ERROR, args=(str(e),))],
                 'warnings': [],
                 'info': [],
                 'stats': {},
-            }
+                'timings': timings.to_dict(self._result_top),
+            })
             return False
     
+    def _record_result(self, name: str, result: Dict[str, Any]):
+        """记录一项检查的结果并写入各个流式报告
+        
+        选择了流式报告时，诊断写出后只保留计数和 Markdown 报告列出的前 REPORT_LIMIT 条，
+        JSON 报告中该检查的部分写入临时文件，内存占用不随诊断总数增长。
+        """
+        result['error_count'] = len(result['errors'])
+        result['warning_count'] = len(result['warnings'])
+        self.results[name] = result
+        for writer in self._writers:
+            writer.write_check(name, result['success'], result['errors'], result['warnings'], result['stats'],
+                               {'locale': result['locale'], 'timings': result['timings']})
+        if self._spool is None:
+            return
+        offset = self._spool.tell()
+        for chunk in self._json_result(result):
+            self._spool.write(chunk.encode('utf-8'))
+        self._spooled[name] = (offset, self._spool.tell() - offset)
+        result['errors'] = result['errors'][:self.REPORT_LIMIT]
+        result['warnings'] = result['warnings'][:self.REPORT_LIMIT]
+    
+    def _finish_streaming_reports(self):
+        """写入流式报告的结尾并关闭文件（检查中途失败时也会执行）"""
+        summary = {
+            'finished_at': self.end_time.isoformat(),
+            'duration_seconds': (self.end_time - self.start_time).total_seconds(),
+            'total_checks': len(self.results),
+            'passed_checks': sum(1 for r in self.results.values() if r['success']),
+            'total_errors': sum(r['error_count'] for r in self.results.values()),
+            'total_warnings': sum(r['warning_count'] for r in self.results.values()),
+            'cancelled_checks': self.cancelled,
+        }
+        for writer in self._writers:
+            writer.finish(summary)
+    
     def _generate_summary_report(self, all_success: bool):
         """生成摘要报告"""
         print(f"\n\n{'=' * 80}")
@@ -152,8 +358,8 @@ class QualityAssuranceRunner:
         passed_checks = sum(1 for r in self.results.values() if r['success'])
         failed_checks = total_checks - passed_checks
         
-        total_errors = sum(len(r['errors']) for r in self.results.values())
-        total_warnings = sum(len(r['warnings']) for r in self.results.values())
+        total_errors = sum(r['error_count'] for r in self.results.values())
+        total_warnings = sum(r['warning_count'] for r in self.results.values())
         
         print(f"\n检查统计:")
         print(f"  总检查数: {total_checks}")
@@ -165,6 +371,11 @@ class QualityAssuranceRunner:
         print(f"  错误: {total_errors}")
         print(f"  警告: {total_warnings}")
         
+        if self.cancelled:
+            print(f"\n错误数达到上限 {self.budget.max_errors}，已取消 {len(self.cancelled)} 项检查:")
+            for name in self.cancelled:
+                print(f"  - {name}")
+        
         # 执行时间
         duration = self.end_time - self.start_time
         print(f"\n执行时间: {duration.total_seconds():.2f} 秒")
@@ -177,10 +388,10 @@ class QualityAssuranceRunner:
         
         for i, (name, result) in enumerate(self.results.items(), 1):
             status = "✓ 通过" if result['success'] else "✗ 失败"
-            error_count = len(result['errors'])
-            warning_count = len(result['warnings'])
+            error_count = result['error_count']
+            warning_count = result['warning_count']
             
-            print(f"{i}. {name:20s} {status:10s} ", end="")
+            print(f"{i}. {name:20s} {status:10s} {result['timings']['wall_seconds']:7.2f}s ", end="")
             if error_count > 0:
                 print(f"错误: {error_count:3d} ", end="")
             if warning_count > 0:
@@ -201,16 +412,18 @@ class QualityAssuranceRunner:
         report_dir.mkdir(parents=True, exist_ok=True)
         
         # Markdown 报告
-        md_report_path = report_dir / "QUALITY_ASSURANCE_REPORT.md"
+        md_report_path = self._report_path("QUALITY_ASSURANCE_REPORT.md")
         self._write_markdown_report(md_report_path)
         
-        # JSON 报告
-        json_report_path = report_dir / "quality_assurance_report.json"
+        # JSON 报告（分片运行时为部分报告，用 merge 子命令合并）
+        json_report_path = self._report_path("quality_assurance_report.json")
         self._write_json_report(json_report_path)
         
         print(f"详细报告已生成:")
         print(f"  Markdown: {md_report_path}")
         print(f"  JSON: {json_report_path}")
+        for writer in self._writers:
+            print(f"  {writer.path.suffix[1:].upper()}: {writer.path}")
     
     def _write_markdown_report(self, path: Path):
         """写入 Markdown 格式的详细报告"""
@@ -225,8 +438,8 @@ class QualityAssuranceRunner:
             total_checks = len(self.results)
             passed_checks = sum(1 for r in self.results.values() if r['success'])
             failed_checks = total_checks - passed_checks
-            total_errors = sum(len(r['errors']) for r in self.results.values())
-            total_warnings = sum(len(r['warnings']) for r in self.results.values())
+            total_errors = sum(r['error_count'] for r in self.results.values())
+            total_warnings = sum(r['warning_count'] for r in self.results.values())
             
             f.write(f"- **总检查数**: {total_checks}\n")
             f.write(f"- **通过**: {passed_checks} ✓\n")
@@ -235,9 +448,24 @@ class QualityAssuranceRunner:
             f.write(f"- **总错误数**: {total_errors}\n")
             f.write(f"- **总警告数**: {total_warnings}\n")
             
+            f.write(f"- **文档语言**: {', '.join(self.locales)}\n")
+            if self.shard is not None:
+                f.write(f"- **分片**: {self.shard}（部分报告）\n")
+            if self.cancelled:
+                f.write(f"- **已取消**: {len(self.cancelled)} 项（错误数达到上限 {self.budget.max_errors}）: "
+                        f"{', '.join(self.cancelled)}\n")
+            
             duration = self.end_time - self.start_time
             f.write(f"- **执行时间**: {duration.total_seconds():.2f} 秒\n\n")
             
+            if len(self.locales) > 1:
+                f.write("| 语言 | 检查数 | 通过 | 错误 | 警告 |\n")
+                f.write("|------|--------|------|------|------|\n")
+                for locale, summary in self._locale_summaries().items():
+                    f.write(f"| {locale} | {summary['total_checks']} | {summary['passed_checks']} | "
+                            f"{summary['total_errors']} | {summary['total_warnings']} |\n")
+                f.write("\n")
+            
             # 各项检查详情
             f.write("## 检查详情\n\n")
             
@@ -255,21 +483,21 @@ class QualityAssuranceRunner:
                     f.write("\n")
                 
                 # 错误
-                if result['errors']:
-                    f.write(f"**错误** ({len(result['errors'])}):\n\n")
-                    for error in result['errors'][:20]:  # 最多显示20个
+                if result['error_count']:
+                    f.write(f"**错误** ({result['error_count']}):\n\n")
+                    for error in result['errors'][:self.REPORT_LIMIT]:
                         f.write(f"- {error}\n")
-                    if len(result['errors']) > 20:
-                        f.write(f"- ... 还有 {len(result['errors']) - 20} 个错误\n")
+                    if result['error_count'] > self.REPORT_LIMIT:
+                        f.write(f"- ... 还有 {result['error_count'] - self.REPORT_LIMIT} 个错误\n")
                     f.write("\n")
                 
                 # 警告
-                if result['warnings']:
-                    f.write(f"**警告** ({len(result['warnings'])}):\n\n")
-                    for warning in result['warnings'][:20]:  # 最多显示20个
+                if result['warning_count']:
+                    f.write(f"**警告** ({result['warning_count']}):\n\n")
+                    for warning in result['warnings'][:self.REPORT_LIMIT]:
                         f.write(f"- {warning}\n")
-                    if len(result['warnings']) > 20:
-                        f.write(f"- ... 还有 {len(result['warnings']) - 20} 个警告\n")
+                    if result['warning_count'] > self.REPORT_LIMIT:
+                        f.write(f"- ... 还有 {result['warning_count'] - self.REPORT_LIMIT} 个警告\n")
                     f.write("\n")
                 
                 # 信息
@@ -283,6 +511,8 @@ class QualityAssuranceRunner:
                 
                 f.write("---\n\n")
             
+            self._write_performance_section(f)
+            
             # 建议
             f.write("## 改进建议\n\n")
             
@@ -291,8 +521,8 @@ class QualityAssuranceRunner:
                 f.write("请优先修复以下类型的错误:\n\n")
                 
                 for name, result in self.results.items():
-                    if result['errors']:
-                        f.write(f"- **{name}**: {len(result['errors'])} 个错误\n")
+                    if result['error_count']:
+                        f.write(f"- **{name}**: {result['error_count']} 个错误\n")
                 f.write("\n")
             
             if total_warnings > 0:
@@ -300,8 +530,8 @@ class QualityAssuranceRunner:
                 f.write("以下警告建议在时间允许时进行改进:\n\n")
                 
                 for name, result in self.results.items():
-                    if result['warnings']:
-                        f.write(f"- **{name}**: {len(result['warnings'])} 个警告\n")
+                    if result['warning_count']:
+                        f.write(f"- **{name}**: {result['warning_count']} 个警告\n")
                 f.write("\n")
             
             if total_errors == 0 and total_warnings == 0:
@@ -320,33 +550,174 @@ class QualityAssuranceRunner:
                 f.write("2. 可以进行人工审查\n")
                 f.write("3. 准备发布文档\n")
     
+    def _write_performance_section(self, f):
+        """写入各项检查的耗时、最慢的文件和最慢的规则"""
+        f.write("## 性能分析\n\n")
+        f.write("| 检查 | 墙钟时间（秒） | CPU 时间（秒） | 文件数 | 扫描字节数 | MB/秒 |\n")
+        f.write("|------|---------------|---------------|--------|-----------|-------|\n")
+        for name, result in self.results.items():
+            timings = result['timings']
+            throughput = timings['mb_per_second'] if timings['mb_per_second'] is not None else '-'
+            f.write(f"| {name} | {timings['wall_seconds']:.3f} | {timings['cpu_seconds']:.3f} | "
+                    f"{timings['files']} | {timings['bytes_scanned']} | {throughput} |\n")
+        f.write("\n")
+        
+        files = slowest_files(self.timings, self.top)
+        if files:
+            f.write(f"### 最慢的文件（前 {self.top} 个）\n\n")
+            f.write("| 文件 | 耗时（秒） | 各项检查耗时（秒） |\n")
+            f.write("|------|-----------|-------------------|\n")
+            for entry in files:
+                checks = ', '.join(f"{name} {seconds:.3f}" for name, seconds in entry['checks'].items())
+                f.write(f"| `{entry['path']}` | {entry['seconds']:.3f} | {checks} |\n")
+            f.write("\n")
+        
+        rules = slowest_rules(self.timings, self.top)
+        if rules:
+            f.write(f"### 最慢的规则（前 {self.top} 个）\n\n")
+            f.write("| 规则 | 检查 | 耗时（秒） |\n")
+            f.write("|------|------|-----------|\n")
+            for entry in rules:
+                f.write(f"| `{entry['rule']}` | {entry['check']} | {entry['seconds']:.3f} |\n")
+            f.write("\n")
+        f.write("---\n\n")
+    
+    def _locale_summaries(self) -> Dict[str, Dict[str, int]]:
+        """各语言的检查数、通过数、错误数和警告数"""
+        summaries = {}
+        for locale in self.locales:
+            results = [r for r in self.results.values() if r['locale'] == locale]
+            summaries[locale] = {
+                'total_checks': len(results),
+                'passed_checks': sum(1 for r in results if r['success']),
+                'total_errors': sum(r['error_count'] for r in results),
+                'total_warnings': sum(r['warning_count'] for r in results),
+            }
+        return summaries
+    
     def _write_json_report(self, path: Path):
-        """写入 JSON 格式的详细报告"""
+        """写入 JSON 格式的详细报告（不缩进）
+        
+        各项检查的结果逐个写出：已写入临时文件的部分直接复制，不在内存中构造整个报告。
+        """
         report_data = {
             'metadata': {
+                **self._metadata(),
                 'generated_at': self.end_time.isoformat(),
-                'root_dir': str(self.root_dir.absolute()),
                 'duration_seconds': (self.end_time - self.start_time).total_seconds(),
             },
             'summary': {
                 'total_checks': len(self.results),
                 'passed_checks': sum(1 for r in self.results.values() if r['success']),
                 'failed_checks': sum(1 for r in self.results.values() if not r['success']),
-                'total_errors': sum(len(r['errors']) for r in self.results.values()),
-                'total_warnings': sum(len(r['warnings']) for r in self.results.values()),
+                'total_errors': sum(r['error_count'] for r in self.results.values()),
+                'total_warnings': sum(r['warning_count'] for r in self.results.values()),
+                # 错误预算用尽时没有运行的检查，不为空时报告只包含部分检查
+                'cancelled_checks': self.cancelled,
             },
-            'results': self.results,
+            # 各语言的汇总
+            'locales': self._locale_summaries(),
+        }
+        # 所有检查合计最慢的文件和耗时最多的规则
+        performance = {
+            'slowest_files': slowest_files(self.timings, self.top),
+            'slowest_rules': slowest_rules(self.timings, self.top),
         }
         
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+            f.write(json.dumps(report_data, ensure_ascii=False, separators=(',', ':'))[:-1])
+            # 错误和警告写为结构化记录（规则、位置、参数和格式化后的消息）
+            f.write(',"results":{')
+            for number, (name, result) in enumerate(self.results.items()):
+                f.write((',' if number else '') + json.dumps(name, ensure_ascii=False) + ':')
+                if name in self._spooled:
+                    offset, size = self._spooled[name]
+                    self._spool.seek(offset)
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                    while size > 0:
+                        block = self._spool.read(min(size, self.SPOOL_BLOCK))
+                        size -= len(block)
+                        f.write(decoder.decode(block, final=size <= 0))
+                else:
+                    f.writelines(self._json_result(result))
+            f.write('},"performance":' + json.dumps(performance, ensure_ascii=False, separators=(',', ':')) + '}')
+    
+    @staticmethod
+    def _json_result(result: Dict[str, Any]) -> Iterator[str]:
+        """JSON 报告中一项检查的结果，逐段生成（诊断逐条序列化，不构造整个列表）"""
+        separator = '{'
+        for key, value in result.items():
+            if key in ('error_count', 'warning_count'):
+                continue
+            yield f"{separator}{json.dumps(key)}:"
+            separator = ','
+            if key in ('errors', 'warnings'):
+                yield '['
+                for number, diagnostic in enumerate(value):
+                    yield (',' if number else '') + json.dumps(diagnostic.to_dict(), ensure_ascii=False,
+                                                               separators=(',', ':'))
+                yield ']'
+            else:
+                yield json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        yield '}'
+
+
+def merge_main(argv: Sequence[str]) -> int:
+    """merge 子命令：合并所有分片的部分报告，打印完整摘要并写入完整报告"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog='run_quality_assurance.py merge',
+        description='合并 --shard 运行写出的部分报告（JSON 或 NDJSON），生成与不分片运行相同的摘要和报告',
+    )
+    parser.add_argument('reports', nargs='+', metavar='REPORT', help='各分片的部分报告文件')
+    parser.add_argument('--root', default='.', help='项目根目录路径（默认: 当前目录）')
+    parser.add_argument('--top', type=int, default=10, metavar='N',
+                        help='报告中列出的最慢文件和规则的个数（默认: 10）')
+    args = parser.parse_args(argv)
+    
+    try:
+        runner = QualityAssuranceRunner.merge(args.reports, args.root, max(1, args.top))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ 无法合并分片报告: {e}", file=sys.stderr)
+        return 2
+    
+    all_success = not runner.cancelled and all(result['success'] for result in runner.results.values())
+    runner._generate_summary_report(all_success)
+    runner._generate_detailed_report()
+    return 0 if all_success else 1
+
+
+def index_main(argv: Sequence[str]) -> int:
+    """index 子命令：遍历仓库并写入所有分片共用的路径索引文件"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        prog='run_quality_assurance.py index',
+        description='预先计算路径索引（文件列表和文件大小），供各分片通过 --path-index 共用',
+    )
+    parser.add_argument('output', metavar='FILE', help='要写入的索引文件')
+    parser.add_argument('--root', default='.', help='项目根目录路径（默认: 当前目录）')
+    args = parser.parse_args(argv)
+    
+    index = PathIndex(args.root)
+    index.save(args.output)
+    print(f"路径索引已写入: {args.output}（{len(index.files)} 个文件，{len(index.dirs)} 个目录）")
+    return 0
 
 
 def main():
     """主函数"""
     import argparse
     
+    # 子命令：合并分片报告、预先计算路径索引
+    if len(sys.argv) > 1 and sys.argv[1] == 'merge':
+        sys.exit(merge_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'index':
+        sys.exit(index_main(sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(
+        usage='%(prog)s [选项]\n       %(prog)s merge [--root DIR] REPORT...\n       %(prog)s index [--root DIR] FILE',
         description='运行文档质量保证检查并生成报告',
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -357,11 +728,115 @@ def main():
         help='项目根目录路径（默认: 当前目录）'
     )
     
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        metavar='N',
+        help='并行进程数（默认: 1，即串行执行）'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='禁用增量验证缓存'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help=f'缓存目录（默认: <root>/{DEFAULT_CACHE_DIR}）'
+    )
+    
+    parser.add_argument(
+        '--report-format',
+        action='append',
+        choices=sorted(REPORT_WRITERS),
+        default=[],
+        help='额外生成的流式报告格式，可重复（写入 scripts/tests/，每项检查完成后立即写出）'
+    )
+    
+    parser.add_argument(
+        '--locale',
+        action='append',
+        default=[],
+        metavar='LOCALE',
+        help='要检查的文档语言（docs/<LOCALE>），可重复（默认: docs/ 下的所有语言目录）'
+    )
+    
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        metavar='N',
+        help='报告中列出的最慢文件和规则的个数（默认: 10）'
+    )
+    
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='任何检查报告错误后立即取消其余检查（等同于 --max-errors 1）'
+    )
+    
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=None,
+        metavar='N',
+        help='累计错误数达到 N 后取消其余检查，仍然生成已完成检查的报告'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        metavar='I/N',
+        help='只运行 N 个分片中的第 I 个（从 1 开始），写出带分片后缀的部分报告，用 merge 子命令合并'
+    )
+    
+    parser.add_argument(
+        '--path-index',
+        metavar='FILE',
+        help='所有分片共用的预先计算的路径索引（由 index 子命令生成；文件不存在时遍历仓库并写入）'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help='用 cProfile 分析主进程并把 pstats 数据写入 FILE（并行运行时不包含子进程）'
+    )
+    
     args = parser.parse_args()
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors 必须大于 0")
+    max_errors = 1 if args.fail_fast else args.max_errors
+    shard = None
+    if args.shard:
+        try:
+            shard = Shard.parse(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    path_index = shared_index(args.path_index, args.root) if args.path_index else None
+    
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or str(Path(args.root) / DEFAULT_CACHE_DIR)
     
     # 运行质量保证检查
-    runner = QualityAssuranceRunner(args.root)
-    success = runner.run_all_checks()
+    runner = QualityAssuranceRunner(
+        args.root, jobs=max(1, args.jobs), cache_dir=cache_dir,
+        report_formats=list(dict.fromkeys(args.report_format)),
+        top=max(1, args.top), locales=args.locale, max_errors=max_errors,
+        shard=shard, path_index=path_index,
+    )
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        success = profiler.runcall(runner.run_all_checks)
+        profiler.dump_stats(args.profile)
+        print(f"性能分析数据已写入: {args.profile}（按累计耗时排列的前 {args.top} 个函数如下）")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(args.top)
+    else:
+        success = runner.run_all_checks()
     
     # 返回适当的退出码
     sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+属性测试：锚点链接验证
+验证 GitHub 风格的标题锚点生成，以及页内和跨文档锚点链接的检查
+"""
+
+from hypothesis import given, strategies as st, settings
+from pathlib import Path
+from validators import DocumentCorpus, LinkValidator, ValidationCache
+from validators.markdown import anchors, slugify, tokenize
+
+
+def make_docs(tmp_path: Path, index_text: str) -> Path:
+    """创建 index.md 和带有重复标题的 other.md"""
+    docs_dir = tmp_path / "docs" / "zh"
+    docs_dir.mkdir(parents=True, exist_ok=True)
+    (docs_dir / "index.md").write_text(index_text, encoding='utf-8')
+    (docs_dir / "other.md").write_text(
+        "# 其他文档\n\n## 安装步骤\n\n## 安装步骤\n\n## Python 3.9+ 支持\n",
+        encoding='utf-8',
+    )
+    return tmp_path
+
+
+def run_links(root: Path, cache=None) -> LinkValidator:
+    """使用全新语料库运行一次链接验证"""
+    checker = LinkValidator(str(root), DocumentCorpus(str(root)), cache)
+    checker.collect()
+    return checker
+
+
+class TestAnchors:
+    """
+    属性测试：锚点链接
+    
+    属性：锚点链接有效当且仅当目标文档中存在生成该锚点的标题。
+    """
+    
+    def test_github_slugs(self):
+        """标题锚点应与 GitHub 生成的一致（包括中文标题）"""
+        assert slugify("Python 代码规范") == "python-代码规范"
+        assert slugify("1. 安装：步骤（可选）") == "1-安装步骤可选"
+        assert slugify("**加粗** `代码` [链接](a.md)") == "加粗-代码-链接"
+        assert slugify("Q&A - FAQ") == "qa---faq"
+        assert slugify("snake_case") == "snake_case"
+    
+    def test_combining_marks_are_kept(self):
+        """组合附加符号（分解形式的重音、天城文元音符号等）保留在锚点中"""
+        assert slugify("Cafe\u0301 Menu") == "cafe\u0301-menu"
+        assert slugify("हिन्दी") == "हिन्दी"
+    
+    def test_closing_sequence_is_not_part_of_anchor(self):
+        """ATX 标题末尾的关闭序列 # 不属于标题文本，没有空格分隔的 # 属于文本"""
+        tokens = tokenize(["## 安装 ##", "## 使用 C#", "### 常见问题 #  ", "## ##"])
+        assert [token.text for token in tokens] == ["安装", "使用 C#", "常见问题", None]
+        assert anchors(tokens) == {"安装", "使用-c", "常见问题"}
+    
+    def test_setext_headings(self):
+        """段落下一行的 === 和 --- 生成一级和二级标题，分隔线和列表项后的 --- 不是标题"""
+        tokens = tokenize([
+            "快速开始", "========", "",
+            "安装", "步骤", "---", "",
+            "---", "",
+            "- 列表项", "---",
+            "```", "代码", "---", "```",
+        ])
+        assert [(token.line, token.level, token.text) for token in tokens if token.kind == 'heading'] == [
+            (1, 1, "快速开始"), (4, 2, "安装 步骤"),
+        ]
+        assert anchors(tokens) == {"快速开始", "安装-步骤"}
+    
+    def test_duplicate_headings_get_suffixes(self):
+        """重复标题依次追加 -1、-2 后缀，格式错误的标题不生成锚点"""
+        tokens = tokenize(["# 概述", "## 概述", "### 概述", "#没有空格"])
+        assert anchors(tokens) == {"概述", "概述-1", "概述-2"}
+    
+    @given(fragment=st.sampled_from([
+        "安装步骤", "安装步骤-1", "python-39-支持", "%E5%AE%89%E8%A3%85%E6%AD%A5%E9%AA%A4",
+        "安装步骤-2", "missing", "Python-39-支持",
+    ]))
+    @settings(max_examples=20, deadline=None)
+    def test_cross_document_anchor(self, tmp_path_factory, fragment):
+        """跨文档锚点链接在目标文档的锚点集合中查找"""
+        root = make_docs(tmp_path_factory.mktemp("repo"), f"# 索引\n\n[链接](other.md#{fragment})\n")
+        valid = fragment not in ("安装步骤-2", "missing")
+        
+        errors = run_links(root).errors
+        assert (errors == []) == valid
+        if not valid:
+            assert "包含失效的锚点链接" in str(errors[0])
+    
+    def test_same_page_anchor(self, tmp_path):
+        """页内锚点链接在当前文档的标题中查找"""
+        root = make_docs(tmp_path, "# 索引\n\n## 目录\n\n[有效](#目录) [失效](#不存在)\n")
+        
+        errors = run_links(root).errors
+        assert len(errors) == 1
+        assert "行 5, 列 11" in str(errors[0])
+        assert "#不存在" in str(errors[0])
+    
+    def test_target_heading_change_invalidates_cache(self, tmp_path):
+        """目标文档的标题变化后，引用其锚点的文档不应命中旧的缓存结果"""
+        root = make_docs(tmp_path, "# 索引\n\n[链接](other.md#安装步骤)\n")
+        cache = ValidationCache(str(tmp_path / "cache"))
+        assert run_links(root, cache).errors == []
+        
+        other = root / "docs" / "zh" / "other.md"
+        other.write_text("# 其他文档\n\n## 部署步骤\n", encoding='utf-8')
+        assert len(run_links(root, cache).errors) == 1
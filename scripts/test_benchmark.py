@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+测试：合成文档树与基准测试
+验证生成的文档树是确定性的、符合给定参数，并且基准测试能写出和比较基线
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from validators import DocumentCorpus, registry
+from validators.synthetic import CorpusSpec, document_paths, generate_corpus
+from benchmark_validators import compare
+
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def tree_contents(root: Path):
+    """文档树中所有文件：相对路径 -> 内容"""
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob('*')) if path.is_file()
+    }
+
+
+def run_checkers(root: Path):
+    """在文档树上运行所有默认检查器，返回 检查器名称 -> (错误, 警告)"""
+    corpus = DocumentCorpus(str(root))
+    results = {}
+    for spec in registry.defaults():
+        checker = spec.load()(str(root), corpus)
+        checker.collect()
+        results[spec.name] = (checker.errors, checker.warnings)
+    return results
+
+
+class TestSyntheticCorpus:
+    """
+    测试：合成文档树
+    
+    属性：相同参数生成逐字节相同的文档树；error_rate 为 0 时各检查器都不报告错误。
+    """
+    
+    def test_deterministic(self, tmp_path):
+        """相同参数和种子生成相同的文档树，种子不同时内容不同"""
+        spec = CorpusSpec(documents=40, error_rate=0.05)
+        stats = generate_corpus(tmp_path / "a", spec)
+        generate_corpus(tmp_path / "b", spec)
+        generate_corpus(tmp_path / "c", CorpusSpec(documents=40, error_rate=0.05, seed=1))
+        assert tree_contents(tmp_path / "a") == tree_contents(tmp_path / "b")
+        assert tree_contents(tmp_path / "a") != tree_contents(tmp_path / "c")
+        assert stats['documents'] == 40
+        assert stats['bytes'] == sum(
+            len(data) for path, data in tree_contents(tmp_path / "a").items() if path.startswith('docs/zh/')
+        )
+    
+    @settings(max_examples=15, deadline=None)
+    @given(
+        documents=st.integers(min_value=1, max_value=60),
+        heading_depth=st.integers(min_value=2, max_value=6),
+        link_density=st.floats(min_value=0, max_value=1),
+        cjk_ratio=st.floats(min_value=0, max_value=1),
+        glossary_size=st.integers(min_value=1, max_value=20),
+        seed=st.integers(min_value=0, max_value=1000),
+    )
+    def test_clean_corpus_has_no_errors(self, documents, heading_depth, link_density, cjk_ratio,
+                                        glossary_size, seed):
+        """任意参数下生成的文档数正确，所有链接和锚点有效，代码块语法正确，格式没有问题"""
+        root = Path(tempfile.mkdtemp())
+        try:
+            spec = CorpusSpec(
+                documents=documents, heading_depth=heading_depth, link_density=link_density,
+                cjk_ratio=cjk_ratio, glossary_size=glossary_size, seed=seed,
+            )
+            generate_corpus(root, spec)
+            assert len(DocumentCorpus(str(root)).doc_paths()) == documents
+            results = run_checkers(root)
+            for name in ('code', 'format', 'links', 'terminology', 'content'):
+                assert results[name][0] == [], name
+            assert results['format'][1] == []
+        finally:
+            shutil.rmtree(root)
+    
+    def test_error_rate_injects_errors(self, tmp_path):
+        """error_rate 大于 0 时出现失效链接、标题格式问题和语法错误"""
+        generate_corpus(tmp_path, CorpusSpec(documents=200, error_rate=0.2))
+        results = run_checkers(tmp_path)
+        rules = {d.rule for name in ('code', 'format', 'links') for d in results[name][0] + results[name][1]}
+        assert {'links/broken-internal', 'links/broken-anchor', 'format/heading-space',
+                'code/syntax-error'} <= rules
+    
+    def test_required_documents_first(self):
+        """文档数足够时包含存在性检查要求的所有 docs/zh 文档"""
+        paths = document_paths(CorpusSpec(documents=100))
+        required = [path for docs in registry.get('existence').load().REQUIRED_DOCS.values()
+                    for path in docs if path.startswith('docs/zh/')]
+        assert set(required) <= set(paths)
+        assert len(set(paths)) == 100
+
+
+class TestBenchmark:
+    """
+    测试：基准测试
+    
+    属性：每个测量目标都记录耗时和吞吐量；与基线比较时只报告超出容差的变化。
+    """
+    
+    def test_writes_baseline(self, tmp_path):
+        """在小规模文档树上测量一个检查器和完整质量保证运行"""
+        output = tmp_path / "baseline.json"
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / 'benchmark_validators.py'), '--sizes', '20',
+             '--checks', 'format', '--checks', 'qa', '--output', str(output)],
+            capture_output=True, text=True, timeout=120,
+        )
+        assert completed.returncode == 0, completed.stderr
+        report = json.loads(output.read_text(encoding='utf-8'))
+        [entry] = report['results']
+        assert entry['documents'] == 20 and entry['bytes'] > 0
+        assert set(entry['measurements']) == {'format', 'qa'}
+        for result in entry['measurements'].values():
+            assert result['seconds'] > 0
+            assert result['docs_per_second'] > 0 and result['mb_per_second'] > 0
+        assert report['metadata']['spec']['seed'] == 0
+    
+    def test_compare(self):
+        """吞吐量下降或内存增长超过容差时报告退化，其他规模和目标不参与比较"""
+        def entry(documents, docs_per_second, peak_rss_mb):
+            return {'documents': documents, 'measurements': {
+                'links': {'docs_per_second': docs_per_second, 'peak_rss_mb': peak_rss_mb},
+            }}
+        
+        baseline = {'results': [entry(100, 1000.0, 50.0), entry(1000, 1000.0, 50.0)]}
+        assert compare([entry(100, 850.0, 55.0)], baseline, 0.2) == []
+        regressions = compare([entry(100, 700.0, 55.0), entry(1000, 1000.0, 70.0), entry(5, 1.0, 1.0)],
+                              baseline, 0.2)
+        assert len(regressions) == 2
+        assert '吞吐量' in regressions[0] and '峰值内存' in regressions[1]
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+测试：增量验证缓存
+验证缓存命中时结果不变，文档内容或链接目标变化时缓存失效
+"""
+
+from pathlib import Path
+from validators import (
+    DocumentCorpus,
+    ValidationCache,
+    CodeExampleValidator,
+    DocumentStructureChecker,
+    LinkValidator,
+)
+
+
+# 获取项目根目录（从 scripts/ 目录向上一级）
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def run_links(root: Path, cache: ValidationCache) -> LinkValidator:
+    """使用全新语料库运行一次链接验证"""
+    checker = LinkValidator(str(root), DocumentCorpus(str(root)), cache)
+    checker.collect()
+    return checker
+
+
+class TestValidationCache:
+    """
+    测试：增量验证缓存
+    
+    属性：启用缓存后的检查结果应与不使用缓存时完全一致。
+    """
+    
+    def test_cached_results_match_uncached(self, tmp_path):
+        """第二次运行应全部命中缓存，且结果与未使用缓存时一致"""
+        for checker_class in [CodeExampleValidator, LinkValidator, DocumentStructureChecker]:
+            uncached = checker_class(str(ROOT_DIR))
+            uncached.collect()
+            
+            cache = ValidationCache(str(tmp_path / checker_class.__name__))
+            first = checker_class(str(ROOT_DIR), DocumentCorpus(str(ROOT_DIR)), cache)
+            first.collect()
+            assert cache.hits == 0
+            
+            second = checker_class(str(ROOT_DIR), DocumentCorpus(str(ROOT_DIR)), cache)
+            second.collect()
+            assert cache.hits > 0
+            
+            for checker in (first, second):
+                assert checker.errors == uncached.errors, checker_class.__name__
+                assert checker.warnings == uncached.warnings, checker_class.__name__
+    
+    def test_content_change_invalidates_entry(self, tmp_path):
+        """文档内容变化后应重新验证"""
+        docs_dir = tmp_path / "docs" / "zh"
+        docs_dir.mkdir(parents=True)
+        doc = docs_dir / "index.md"
+        doc.write_text("# 索引\n\n```python\nprint('ok')\n```\n", encoding='utf-8')
+        cache = ValidationCache(str(tmp_path / "cache"))
+        
+        checker = CodeExampleValidator(str(tmp_path), DocumentCorpus(str(tmp_path)), cache)
+        checker.collect()
+        assert not checker.errors
+        
+        doc.write_text("# 索引\n\n```python\nprint('broken'\n```\n", encoding='utf-8')
+        checker = CodeExampleValidator(str(tmp_path), DocumentCorpus(str(tmp_path)), cache)
+        checker.collect()
+        assert cache.hits == 0
+        assert len(checker.errors) == 1
+    
+    def test_link_target_appearing_or_disappearing_invalidates_entry(self, tmp_path):
+        """链接目标出现或消失时，引用它的文档的缓存条目应失效"""
+        docs_dir = tmp_path / "docs" / "zh"
+        docs_dir.mkdir(parents=True)
+        (docs_dir / "index.md").write_text("# 索引\n\n[其他](other.md)\n", encoding='utf-8')
+        target = docs_dir / "other.md"
+        cache = ValidationCache(str(tmp_path / "cache"))
+        
+        assert len(run_links(tmp_path, cache).errors) == 1
+        
+        target.write_text("# 其他\n", encoding='utf-8')
+        assert run_links(tmp_path, cache).errors == []
+        
+        # 目标再次出现前后未变化的文档应命中缓存
+        hits = cache.hits
+        assert run_links(tmp_path, cache).errors == []
+        assert cache.hits > hits
+        
+        target.unlink()
+        assert len(run_links(tmp_path, cache).errors) == 1
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+测试：基于 git 改动的增量验证范围
+验证改动文档及链接指向它们的文档都会被重新验证
+"""
+
+import subprocess
+from pathlib import Path
+from validators import DocumentCorpus, LinkValidator, MarkdownFormatChecker
+from validators.changes import ChangeSet
+
+
+def git(repo: Path, *args: str):
+    """在测试仓库中执行 git 命令"""
+    subprocess.run(
+        ['git', '-C', str(repo), '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def make_repo(tmp_path: Path) -> Path:
+    """创建包含三个互相链接文档的测试仓库"""
+    docs_dir = tmp_path / "docs" / "zh"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "a.md").write_text("# A\n\n[B](b.md)\n", encoding='utf-8')
+    (docs_dir / "b.md").write_text("# B\n\n内容\n", encoding='utf-8')
+    (docs_dir / "c.md").write_text("# C\n\n内容\n", encoding='utf-8')
+    (tmp_path / "README.md").write_text("# 项目\n\n[B](docs/zh/b.md)\n", encoding='utf-8')
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'add', '-A')
+    git(tmp_path, 'commit', '-q', '-m', 'init')
+    return tmp_path
+
+
+class TestChangeSet:
+    """
+    测试：增量验证范围
+    
+    属性：受影响的文档 = 改动的 Markdown 文档 ∪ 链接指向任一改动文件的文档。
+    """
+    
+    def test_modified_document_pulls_in_referrers(self, tmp_path):
+        """修改 b.md 后，a.md 和 README.md 因链接指向 b.md 也应被重新验证"""
+        repo = make_repo(tmp_path)
+        (repo / "docs" / "zh" / "b.md").write_text("# B\n\n新内容\n", encoding='utf-8')
+        
+        change_set = ChangeSet.since(str(repo), 'HEAD')
+        change_set.expand_with_referrers(DocumentCorpus(str(repo)))
+        
+        names = {path.name for path in change_set.affected}
+        assert names == {"a.md", "b.md", "README.md"}
+    
+    def test_deleted_target_revalidates_referrers(self, tmp_path):
+        """删除 b.md 后，引用它的文档应被重新验证并报告失效链接"""
+        repo = make_repo(tmp_path)
+        (repo / "docs" / "zh" / "b.md").unlink()
+        
+        corpus = DocumentCorpus(str(repo))
+        change_set = ChangeSet.since(str(repo), 'HEAD')
+        change_set.expand_with_referrers(corpus)
+        
+        checker = LinkValidator(str(repo), corpus)
+        paths = change_set.select(checker.document_paths())
+        assert {path.name for path in paths} == {"a.md", "README.md"}
+        
+        checker.run_documents(paths)
+        assert len(checker.errors) == 2
+    
+    def test_untracked_document_is_included(self, tmp_path):
+        """未跟踪的新文档也属于改动"""
+        repo = make_repo(tmp_path)
+        (repo / "docs" / "zh" / "d.md").write_text("#D\n", encoding='utf-8')
+        
+        change_set = ChangeSet.since(str(repo), 'HEAD')
+        checker = MarkdownFormatChecker(str(repo))
+        paths = change_set.select(checker.document_paths())
+        assert [path.name for path in paths] == ["d.md"]
+    
+    def test_unknown_revision_returns_none(self, tmp_path):
+        """修订版本不存在时返回 None，由调用方退回完整验证"""
+        repo = make_repo(tmp_path)
+        assert ChangeSet.since(str(repo), 'no-such-rev') is None
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+测试：共享文档语料库
+验证每个文档在一次验证运行中只被读取一次，且检查结果与单独运行一致
+"""
+
+from pathlib import Path
+from validators import (
+    DocumentCorpus,
+    DocumentContentChecker,
+    CodeExampleValidator,
+    MarkdownFormatChecker,
+    DocumentStructureChecker,
+    TerminologyChecker,
+    LinkValidator,
+)
+
+
+# 获取项目根目录（从 scripts/ 目录向上一级）
+ROOT_DIR = Path(__file__).parent.parent
+
+CHECKER_CLASSES = [
+    DocumentContentChecker,
+    CodeExampleValidator,
+    MarkdownFormatChecker,
+    DocumentStructureChecker,
+    TerminologyChecker,
+    LinkValidator,
+]
+
+
+class TestDocumentCorpus:
+    """
+    测试：文档语料库
+    
+    属性：同一个语料库被所有检查器共享时，每个文件只被读取和解码一次。
+    """
+    
+    def test_each_document_is_read_once(self, monkeypatch):
+        """所有检查器共享语料库时，每个文档只读取一次"""
+        read_counts = {}
+        original_read_text = Path.read_text
+        
+        def counting_read_text(path, *args, **kwargs):
+            read_counts[path] = read_counts.get(path, 0) + 1
+            return original_read_text(path, *args, **kwargs)
+        
+        monkeypatch.setattr(Path, 'read_text', counting_read_text)
+        
+        corpus = DocumentCorpus(str(ROOT_DIR))
+        for checker_class in CHECKER_CLASSES:
+            checker_class(str(ROOT_DIR), corpus).check()
+        
+        assert read_counts, "没有读取任何文档"
+        repeated = {str(p): n for p, n in read_counts.items() if n > 1}
+        assert not repeated, f"以下文档被重复读取: {repeated}"
+    
+    def test_shared_corpus_matches_standalone_results(self):
+        """共享语料库的检查结果应与各检查器独立运行时一致"""
+        corpus = DocumentCorpus(str(ROOT_DIR))
+        for checker_class in CHECKER_CLASSES:
+            shared = checker_class(str(ROOT_DIR), corpus)
+            shared.check()
+            standalone = checker_class(str(ROOT_DIR))
+            standalone.check()
+            
+            assert shared.errors == standalone.errors, checker_class.__name__
+            assert shared.warnings == standalone.warnings, checker_class.__name__
+    
+    def test_read_failure_is_reported(self, tmp_path):
+        """无法解码的文档应记录错误而不是中断检查"""
+        docs_dir = tmp_path / "docs" / "zh"
+        docs_dir.mkdir(parents=True)
+        (docs_dir / "good.md").write_text("# 标题\n\n内容\n", encoding='utf-8')
+        (docs_dir / "bad.md").write_bytes(b"# \xff\xfe\n")
+        
+        corpus = DocumentCorpus(str(tmp_path))
+        documents = {doc.path.name: doc for doc in corpus.documents()}
+        
+        assert documents["good.md"].lines == ["# 标题", "", "内容", ""]
+        assert documents["bad.md"].error is not None
+        
+        checker = MarkdownFormatChecker(str(tmp_path), corpus)
+        checker.check()
+        assert any("读取文档失败" in str(error) for error in checker.errors)
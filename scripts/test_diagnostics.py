@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+测试：结构化的检查结果
+验证 Diagnostic 的格式化、序列化、比较和多语言输出
+"""
+
+import json
+import pickle
+from pathlib import Path
+from hypothesis import given, strategies as st
+from validators import DocumentValidator, LinkValidator, MarkdownFormatChecker, ValidationCache
+from validators import diagnostics
+from validators.diagnostics import ERROR, WARNING, Diagnostic
+
+
+def make_docs(tmp_path: Path) -> Path:
+    """创建包含格式问题和失效链接的文档"""
+    docs_dir = tmp_path / "docs" / "zh"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "guide.md").write_text(
+        "# 指南\n\n##没有空格\n\n- \n\n[链接](missing.md)\n", encoding='utf-8'
+    )
+    return tmp_path
+
+
+class TestDiagnostic:
+    """
+    测试：Diagnostic
+    
+    属性：格式化结果与原来的消息文本一致，序列化和跨进程传递不改变诊断。
+    """
+    
+    def test_location_formats(self):
+        """有无行号、列号和文档时的消息文本"""
+        assert str(Diagnostic('content/missing-title', WARNING, 'docs/zh/a.md')) == \
+            "文档 docs/zh/a.md 缺少主标题"
+        assert str(Diagnostic('code/empty-block', WARNING, 'docs/zh/a.md', 7, args=(2,))) == \
+            "文档 docs/zh/a.md 行 7: 代码块 #2 为空"
+        assert str(Diagnostic('links/broken-anchor', ERROR, 'docs/zh/a.md', 3, 5, ('b.md#x', 'x'))) == \
+            "文档 docs/zh/a.md 行 3, 列 5: 包含失效的锚点链接: b.md#x (目标文档中没有标题锚点: #x)"
+        assert str(Diagnostic('existence/missing-dir', ERROR, args=('docs/zh',))) == "缺失目录: docs/zh"
+    
+    def test_other_locale(self):
+        """同一个诊断可以按其他语言输出"""
+        diagnostic = Diagnostic('code/empty-block', WARNING, 'docs/zh/a.md', 7, args=(2,))
+        assert diagnostic.format('en') == "docs/zh/a.md:7: code block #2 is empty"
+        assert all(set(templates) == set(diagnostics.MESSAGES['zh'])
+                   for templates in diagnostics.MESSAGES.values())
+    
+    @given(
+        rule=st.sampled_from(sorted(diagnostics.MESSAGES['zh'])),
+        severity=st.sampled_from([ERROR, WARNING]),
+        path=st.one_of(st.none(), st.text(min_size=1, max_size=20)),
+        line=st.one_of(st.none(), st.integers(1, 10 ** 6)),
+        col=st.one_of(st.none(), st.integers(1, 500)),
+        args=st.lists(st.one_of(st.text(max_size=10), st.integers()), max_size=3),
+    )
+    def test_serialization_roundtrip(self, rule, severity, path, line, col, args):
+        """JSON 和 pickle 往返后得到相等的诊断，路径表中同一路径只保存一份"""
+        diagnostic = Diagnostic(rule, severity, path, line, col, args)
+        
+        restored = Diagnostic.from_list(json.loads(json.dumps(diagnostic.to_list())))
+        assert restored == diagnostic and hash(restored) == hash(diagnostic)
+        assert restored.path_index == diagnostic.path_index
+        assert pickle.loads(pickle.dumps(diagnostic)) == diagnostic
+    
+    def test_sort_and_deduplicate(self):
+        """诊断可以直接排序和去重"""
+        items = [
+            Diagnostic('format/heading-space', WARNING, 'b.md', 3),
+            Diagnostic('format/heading-space', WARNING, 'a.md', 9),
+            Diagnostic('format/heading-space', WARNING, 'a.md', 2),
+            Diagnostic('format/heading-space', WARNING, 'a.md', 9),
+        ]
+        ordered = sorted(set(items), key=Diagnostic.sort_key)
+        assert [(d.path, d.line) for d in ordered] == [('a.md', 2), ('a.md', 9), ('b.md', 3)]
+
+
+class TestCheckerDiagnostics:
+    """
+    测试：检查器产生的诊断
+    
+    属性：检查器报告结构化的诊断，缓存的结果与重新检查的结果相等。
+    """
+    
+    def test_checkers_report_rules_and_locations(self, tmp_path):
+        """诊断记录规则 ID 和相对于项目根目录的位置"""
+        root = make_docs(tmp_path)
+        checker = MarkdownFormatChecker(str(root))
+        checker.collect()
+        
+        assert [(d.rule, d.path, d.line) for d in checker.warnings] == [
+            ('format/heading-space', 'docs/zh/guide.md', 3),
+            ('format/list-marker-space', 'docs/zh/guide.md', 5),
+        ]
+    
+    def test_cached_diagnostics_are_equal(self, tmp_path):
+        """从缓存读取的诊断与重新检查得到的诊断相等"""
+        root = make_docs(tmp_path)
+        cache = ValidationCache(str(tmp_path / "cache"))
+        first = LinkValidator(str(root), cache=cache)
+        first.collect()
+        second = LinkValidator(str(root), cache=cache)
+        second.collect()
+        
+        assert cache.hits == 1
+        assert second.errors == first.errors
+        assert second.errors[0].rule == 'links/broken-internal'
+    
+    def test_plain_message_compatibility(self, tmp_path):
+        """直接传入消息文本的检查器仍然可用"""
+        checker = DocumentValidator(str(tmp_path))
+        checker.add_error("自定义检查失败")
+        
+        assert checker.errors[0].rule == diagnostics.PLAIN_MESSAGE
+        assert str(checker.errors[0]) == "自定义检查失败"
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+测试：近似重复检查
+验证 MinHash 签名估计的相似度、LSH 候选对，以及检查器对文档、README 和 notebook 的报告
+"""
+
+import json
+import random
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from validators import DocumentCorpus, NearDuplicateChecker, ValidationCache
+from validators.minhash import LSHIndex, jaccard, lsh_parameters, shingles, signature, similarity, words
+
+
+VOCABULARY = [f"w{index}" for index in range(500)]
+
+
+def passage(seed: int, count: int = 120) -> list:
+    """确定性的随机词序列"""
+    rng = random.Random(seed)
+    return [rng.choice(VOCABULARY) for _ in range(count)]
+
+
+def paragraph(seed: int, count: int = 80) -> str:
+    return ' '.join(passage(seed, count))
+
+
+def run_checker(root: Path, cache: ValidationCache = None) -> NearDuplicateChecker:
+    checker = NearDuplicateChecker(str(root), DocumentCorpus(str(root)), cache)
+    checker.collect()
+    return checker
+
+
+class TestMinHash:
+    """
+    测试：MinHash 签名与 LSH
+    
+    属性：签名估计的相似度接近精确的 Jaccard 相似度；相同的文本签名相同；
+    LSH 的拐点不超过阈值，高度相似的文本成为候选对，无关的文本不成为候选对。
+    """
+    
+    @settings(max_examples=40, deadline=None)
+    @given(seed=st.integers(min_value=0, max_value=10000), changes=st.integers(min_value=0, max_value=60))
+    def test_estimate_close_to_jaccard(self, seed, changes):
+        """修改若干个词后，估计值与精确的 Jaccard 相似度相差不超过 0.15"""
+        original = passage(seed, 200)
+        edited = list(original)
+        rng = random.Random(seed + 1)
+        for _ in range(changes):
+            edited[rng.randrange(len(edited))] = rng.choice(VOCABULARY)
+        first, second = shingles(original), shingles(edited)
+        estimate = similarity(signature(first), signature(second))
+        assert abs(estimate - jaccard(first, second)) <= 0.15
+    
+    def test_identical_and_empty(self):
+        """相同的文本签名相同；没有词时签名为空"""
+        tokens = words("提示词工程 prompt engineering 让模型 follow instructions")
+        assert tokens[:3] == ['提', '示', '词'] and 'prompt' in tokens
+        assert signature(shingles(tokens)) == signature(shingles(list(tokens)))
+        assert len(signature(shingles([]))) == 0
+    
+    def test_lsh_candidates(self):
+        """拐点不超过阈值；近似重复的文本成为候选对，无关的文本不成为候选对"""
+        bands, rows = lsh_parameters(128, 0.8)
+        assert bands * rows == 128 and (1 / bands) ** (1 / rows) <= 0.8
+        
+        base = passage(1, 300)
+        near = base[:290] + passage(2, 10)
+        index = LSHIndex(128, 0.8)
+        for key, tokens in enumerate([base, near] + [passage(seed, 300) for seed in range(10, 40)]):
+            index.add(key, signature(shingles(tokens)))
+        candidates = index.candidates()
+        assert (0, 1) in candidates
+        assert len(candidates) <= 3
+
+
+class TestNearDuplicateChecker:
+    """
+    测试：近似重复检查器
+    
+    属性：修改过的副本报告为警告，完全相同的副本只计入统计；
+    整篇近似重复的文档不再逐章节报告；notebook 的 Markdown 单元格和 README 参与比较。
+    """
+    
+    def test_drifted_section(self, tmp_path):
+        """两篇文档中复制后修改过的章节被报告，位置为第一篇文档中的章节标题"""
+        docs = tmp_path / "docs" / "zh"
+        docs.mkdir(parents=True)
+        shared = paragraph(1, 300)
+        drifted = ' '.join(word if index != 150 else "changed" for index, word in enumerate(shared.split()))
+        (docs / "a.md").write_text(f"# A\n\n{paragraph(2)}\n\n## 安装\n\n{shared}\n", encoding='utf-8')
+        (docs / "b.md").write_text(f"# B\n\n{paragraph(3)}\n\n## 安装说明\n\n{drifted}\n", encoding='utf-8')
+        (docs / "c.md").write_text(f"# C\n\n{paragraph(4)}\n\n## 安装\n\n{shared}\n", encoding='utf-8')
+        
+        checker = run_checker(tmp_path)
+        found = {(warning.path, warning.line, warning.args[1]) for warning in checker.warnings}
+        assert found == {('docs/zh/a.md', 5, 'docs/zh/b.md:5'), ('docs/zh/b.md', 5, 'docs/zh/c.md:5')}
+        assert all(warning.rule == 'duplicates/near-duplicate-section' for warning in checker.warnings)
+        assert checker.stats['identical'] == 1
+    
+    def test_whole_documents_and_notebooks(self, tmp_path):
+        """notebook 与 README 整体近似重复时只报告文档；章节可以跨越多个单元格"""
+        text = paragraph(5) + ' ' + paragraph(6)
+        variant = tmp_path / "variant"
+        variant.mkdir()
+        cells = [
+            {'cell_type': 'markdown', 'source': ["# Lesson\n", "\n", paragraph(5)]},
+            {'cell_type': 'code', 'source': [paragraph(9)]},
+            {'cell_type': 'markdown', 'source': [paragraph(6) + " extra words here"]},
+        ]
+        (variant / "lesson.ipynb").write_text(json.dumps({'cells': cells}), encoding='utf-8')
+        (tmp_path / "README.md").write_text(f"# Lesson\n\n{text}\n", encoding='utf-8')
+        (tmp_path / "docs" / "zh").mkdir(parents=True)
+        
+        checker = run_checker(tmp_path)
+        assert [warning.rule for warning in checker.warnings] == ['duplicates/near-duplicate-document']
+        assert checker.warnings[0].path == 'README.md'
+        assert checker.warnings[0].args[0] == 'variant/lesson.ipynb'
+    
+    def test_unrelated_and_invalid(self, tmp_path):
+        """内容无关的文档不被报告；无法解析的 notebook 报告为错误"""
+        docs = tmp_path / "docs" / "zh"
+        docs.mkdir(parents=True)
+        for index in range(20):
+            (docs / f"doc{index}.md").write_text(f"# D\n\n## S\n\n{paragraph(100 + index)}\n", encoding='utf-8')
+        (tmp_path / "broken.ipynb").write_text("{", encoding='utf-8')
+        
+        checker = run_checker(tmp_path)
+        assert not checker.warnings
+        assert [error.rule for error in checker.errors] == ['invalid-notebook']
+        assert checker.stats['passages'] == 40
+        assert checker.stats['candidate_pairs'] == 0
+    
+    def test_cached_until_input_changes(self, tmp_path):
+        """再次运行时整体命中缓存（包括统计信息）；任一输入文件（如 README）变化后重新检查"""
+        docs = tmp_path / "docs" / "zh"
+        docs.mkdir(parents=True)
+        (docs / "a.md").write_text(f"# A\n\n{paragraph(7)}\n", encoding='utf-8')
+        (docs / "b.md").write_text(f"# B\n\n{paragraph(7)} changed\n", encoding='utf-8')
+        readme = tmp_path / "README.md"
+        readme.write_text(f"# R\n\n{paragraph(8)}\n", encoding='utf-8')
+        cache = ValidationCache(str(tmp_path / "cache"))
+        
+        first = run_checker(tmp_path, cache)
+        second = run_checker(tmp_path, cache)
+        assert cache.hits == 1
+        assert second.warnings == first.warnings and len(first.warnings) == 1
+        assert second.stats == first.stats
+        
+        readme.write_text(f"# R\n\n{paragraph(7)}\n", encoding='utf-8')
+        third = run_checker(tmp_path, cache)
+        assert cache.hits == 1
+        assert len(third.warnings) == 3
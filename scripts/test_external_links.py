@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+测试：外部链接可达性检查
+在本地 HTTP 服务器上离线验证重定向、404、慢响应、连接复用和结果缓存
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+from validators import DocumentCorpus, ExternalLinkChecker, ValidationCache
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """模拟外部站点：正常页面、重定向、404、慢响应和不支持 HEAD 的页面"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+    
+    def _handle(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            server.clients.add(self.client_address)
+        path = self.path.split("?")[0]
+        if path == "/ok":
+            self._send(200, b"ok")
+        elif path == "/redirect":
+            self._send(302, headers={"Location": "/ok"})
+        elif path == "/loop":
+            self._send(301, headers={"Location": "/loop"})
+        elif path == "/slow":
+            time.sleep(1.0)
+            self._send(200, b"slow")
+        elif path == "/no-head":
+            self._send(405 if self.command == "HEAD" else 200, b"get only")
+        else:
+            self._send(404, b"not found")
+    
+    do_HEAD = _handle
+    do_GET = _handle
+
+
+@pytest.fixture
+def server():
+    """在后台线程中启动本地 HTTP 服务器"""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.clients = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_docs(tmp_path: Path, base: str, paths) -> Path:
+    """创建一个链接到本地服务器各个路径的文档"""
+    docs_dir = tmp_path / "docs" / "zh"
+    docs_dir.mkdir(parents=True)
+    links = "\n".join(f"- [链接]({base}{path})" for path in paths)
+    (docs_dir / "index.md").write_text(f"# 索引\n\n{links}\n", encoding="utf-8")
+    return tmp_path
+
+
+def run_external(root: Path, cache=None, **kwargs) -> ExternalLinkChecker:
+    """运行一次外部链接检查"""
+    checker = ExternalLinkChecker(str(root), DocumentCorpus(str(root)), cache, **kwargs)
+    checker.collect()
+    return checker
+
+
+class TestExternalLinks:
+    """
+    测试：外部链接可达性
+    
+    属性：可访问（含重定向后可访问）的链接不报告问题，HTTP 错误报告为错误，
+    超时等暂时性问题报告为警告。
+    """
+    
+    def test_statuses(self, server, tmp_path):
+        """重定向被跟随，405 的 HEAD 用 GET 重试，404 和重定向循环为错误，超时为警告"""
+        base = f"http://127.0.0.1:{server.server_port}"
+        root = make_docs(tmp_path, base, ["/ok", "/redirect", "/no-head", "/missing", "/loop", "/slow"])
+        
+        checker = run_external(root, timeout=0.3)
+        
+        assert len(checker.errors) == 2
+        assert "行 6, 列 3" in str(checker.errors[0]) and "HTTP 404" in str(checker.errors[0])
+        assert "/loop" in str(checker.errors[1]) and "重定向次数" in str(checker.errors[1])
+        assert len(checker.warnings) == 1
+        assert "/slow" in str(checker.warnings[0]) and "超时" in str(checker.warnings[0])
+        assert ("GET", "/no-head") in server.requests
+    
+    def test_connections_are_reused_per_host(self, server, tmp_path):
+        """同一主机的请求复用连接，并发连接数不超过每个主机的上限"""
+        base = f"http://127.0.0.1:{server.server_port}"
+        root = make_docs(tmp_path, base, [f"/ok?page={i}" for i in range(20)])
+        
+        checker = run_external(root, per_host=2)
+        
+        assert checker.errors == [] and checker.warnings == []
+        assert len(server.requests) == 20
+        assert checker.stats["connections"] <= 2
+        assert len(server.clients) == checker.stats["connections"]
+    
+    def test_results_are_cached_until_ttl_expires(self, server, tmp_path):
+        """有效期内重复运行不再探测，暂时性失败不缓存"""
+        base = f"http://127.0.0.1:{server.server_port}"
+        root = make_docs(tmp_path, base, ["/ok", "/missing", "/slow"])
+        cache = ValidationCache(str(tmp_path / "cache"))
+        
+        first = run_external(root, cache, timeout=0.3)
+        requests = len(server.requests)
+        
+        second = run_external(root, cache, timeout=0.3)
+        assert second.errors == first.errors
+        assert second.stats["cached"] == 2 and second.stats["probed"] == 1
+        assert [path for _, path in server.requests[requests:]] == ["/slow"]
+        
+        expired = run_external(root, cache, timeout=0.3, ttl=0)
+        assert expired.stats["cached"] == 0 and expired.stats["probed"] == 3
+    
+    def test_notebook_markdown_cells_only(self, server, tmp_path):
+        """notebook 中只探测 Markdown 单元格的链接，位置为单元格内的行列，代码和输出中的 URL 不探测"""
+        base = f"http://127.0.0.1:{server.server_port}"
+        root = make_docs(tmp_path, base, ["/ok"])
+        notebook = {'cells': [
+            {'cell_type': 'code', 'metadata': {}, 'source': [f'url = "{base}/in-code"'],
+             'outputs': [{'output_type': 'stream', 'name': 'stdout', 'text': [f"[x]({base}/in-output)"]}]},
+            {'cell_type': 'markdown', 'metadata': {}, 'source': ["# 标题\n", "\n", f"见 [文档]({base}/missing)"]},
+        ], 'nbformat': 4}
+        (root / "tutorial.ipynb").write_text(json.dumps(notebook, indent=1), encoding="utf-8")
+        
+        checker = run_external(root)
+        
+        assert [(e.path, e.cell, e.line, e.col) for e in checker.errors] == [("tutorial.ipynb", 2, 3, 3)]
+        assert {path for _, path in server.requests} == {"/missing", "/ok"}
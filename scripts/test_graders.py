@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+测试：练习提示与评分函数一致性检查
+验证正则表达式字面量片段的提取，以及检查器对提示、评分函数和各教程版本之间差异的报告
+"""
+
+import json
+import re
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from validators import DocumentCorpus, GraderHintChecker, ValidationCache
+from validators.graders import hint_strings, regex_literals
+
+
+HINTS = '''exercise_1_1_hint = """The grading function in this exercise is looking for an answer that contains the exact Arabic numerals "1", "2", and "3".
+You can often get Claude to do what you want simply by asking."""
+
+exercise_1_2_hint = """The grading function in this exercise is looking for answers that contain "soo" or "giggles".
+There are many ways to solve this."""
+
+exercise_1_2_solution = """Ask for "giggles"."""
+'''
+
+GRADER_1_1 = """PROMPT = "[Replace this text]"
+response = get_completion(PROMPT)
+
+def grade_exercise(text):
+    pattern = re.compile(r'^(?=.*1)(?=.*2)(?=.*3).*$', re.DOTALL)
+    return bool(pattern.match(text))
+
+print("This exercise has been correctly solved:", grade_exercise(response))
+"""
+
+GRADER_1_2 = """def grade_exercise(text):
+    return bool(re.search(r"giggles", text) or re.search(r"soo", text))
+"""
+
+
+def write_notebook(path: Path, cells: list):
+    data = {'cells': [
+        {'cell_type': kind, 'metadata': {}, 'outputs': [], 'source': source.splitlines(True)}
+        for kind, source in cells
+    ], 'nbformat': 4}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=1), encoding='utf-8')
+
+
+def chapter(grader_1_2: str = GRADER_1_2, hint_import: str = "from hints import {0}; print({0})") -> list:
+    return [
+        ('markdown', "# Chapter 1\n\n### Exercise 1.1 - Counting"),
+        ('code', GRADER_1_1),
+        ('code', hint_import.format('exercise_1_1_hint')),
+        ('markdown', "### Exercise 1.2 - System Prompt"),
+        ('code', grader_1_2),
+        ('code', hint_import.format('exercise_1_2_hint')),
+    ]
+
+
+class TestExtraction:
+    """
+    测试：评分函数和提示中字符串的提取
+    
+    属性：不含元字符的文本（以及用 re.escape() 转义后的文本）本身就是唯一的字面量片段；
+    提示中只取描述评分函数的那一行中用引号括起的字符串。
+    """
+    
+    @settings(max_examples=200, deadline=None)
+    @given(text=st.text(alphabet=st.sampled_from('ab 1-<>/\'"'), min_size=1, max_size=20))
+    def test_plain_text(self, text):
+        assert regex_literals(text) == [text]
+        assert regex_literals(re.escape(text)) == [text]
+    
+    def test_regex_literals(self):
+        """分组前缀、量词、字符类和 \\d 等转义分隔片段"""
+        assert regex_literals(r'^(?=.*1)(?=.*2)(?=.*3).*$') == ['1', '2', '3']
+        assert regex_literals(r'A\) P') == ['A) P']
+        assert regex_literals(r'colou?r') == ['colo', 'r']
+        assert regex_literals(r'(?P<n>\d+)-fold[s]?|x{2,3}y') == ['-fold', 'y']
+        assert regex_literals(r'<answer>B</answer>') == ['<answer>B</answer>']
+    
+    def test_hint_strings(self):
+        assert hint_strings('The grading function looks for "cat" and "<haiku>".\nSay "hi".') == ['cat', '<haiku>']
+        assert hint_strings('Write some "examples" first.') is None
+
+
+class TestGraderHintChecker:
+    """
+    测试：练习提示与评分函数一致性检查器
+    
+    属性：提示与评分函数一致、各版本相同时没有问题；引用不存在的提示报告为错误；
+    提示中的字符串不在评分函数中、某个版本的评分函数与多数不同或缺失时报告为警告，位置为评分函数的定义。
+    """
+    
+    def make_project(self, root: Path, boto3_grader: str = GRADER_1_2) -> Path:
+        (root / "Anthropic 1P").mkdir(parents=True)
+        (root / "Anthropic 1P" / "hints.py").write_text(HINTS, encoding='utf-8')
+        (root / "AmazonBedrock" / "utils").mkdir(parents=True)
+        (root / "AmazonBedrock" / "utils" / "hints.py").write_text(HINTS, encoding='utf-8')
+        write_notebook(root / "Anthropic 1P" / "01_Basics.ipynb", chapter())
+        write_notebook(root / "AmazonBedrock" / "anthropic" / "01_Basics.ipynb",
+                       chapter(hint_import="print(hints.{0})"))
+        write_notebook(root / "AmazonBedrock" / "boto3" / "01_Basics.ipynb",
+                       chapter(boto3_grader, hint_import="print(hints.{0})"))
+        return root
+    
+    def run(self, root: Path, cache: ValidationCache = None) -> GraderHintChecker:
+        checker = GraderHintChecker(str(root), DocumentCorpus(str(root)), cache)
+        checker.collect()
+        return checker
+    
+    def test_consistent(self, tmp_path):
+        checker = self.run(self.make_project(tmp_path))
+        assert checker.errors == [] and checker.warnings == []
+        assert checker.stats['graders'] == 6 and checker.stats['exercises'] == 2
+    
+    def test_drifted_grader(self, tmp_path):
+        """boto3 版本的评分函数改为查找 giggle：与多数版本不同，且不再包含提示中的 giggles"""
+        grader = GRADER_1_2.replace('r"giggles"', 'r"giggle"')
+        checker = self.run(self.make_project(tmp_path, grader))
+        found = [(w.rule, w.path, w.cell, w.line, w.args) for w in checker.warnings]
+        boto3 = 'AmazonBedrock/boto3/01_Basics.ipynb'
+        assert found == [
+            ('graders/ungraded-string', boto3, 5, 1, ('1.2', 'giggles', 'AmazonBedrock/utils/hints.py:4')),
+            ('graders/drifted-grader', boto3, 5, 1, ('1.2', 'Anthropic 1P/01_Basics.ipynb', '"giggle", "giggles"')),
+        ]
+    
+    def test_missing_and_undefined(self, tmp_path):
+        """缺少评分函数的版本报告为缺失，引用不存在的提示报告为错误"""
+        root = self.make_project(tmp_path)
+        cells = chapter(hint_import="print(hints.{0})")
+        cells[4] = ('code', "response = get_completion(PROMPT)")
+        cells.append(('code', "print(hints.exercise_1_3_hint)"))
+        write_notebook(root / "AmazonBedrock" / "boto3" / "01_Basics.ipynb", cells)
+        
+        checker = self.run(root)
+        assert [(e.rule, e.cell, e.line, e.args) for e in checker.errors] == [
+            ('graders/undefined-hint', 7, 1, ('exercise_1_3_hint', 'AmazonBedrock/utils/hints.py')),
+        ]
+        assert [(w.rule, w.path, w.args[:2]) for w in checker.warnings] == [
+            ('graders/missing-grader', 'Anthropic 1P/01_Basics.ipynb', ('1.2', 'AmazonBedrock/boto3')),
+        ]
+    
+    def test_cached_until_hints_change(self, tmp_path):
+        """再次运行时整体命中缓存（包括统计信息）；hints 模块变化后重新检查"""
+        root = self.make_project(tmp_path)
+        cache = ValidationCache(str(tmp_path / "cache"))
+        first = self.run(root, cache)
+        second = self.run(root, cache)
+        assert cache.hits == 1
+        assert second.warnings == first.warnings == [] and second.stats == first.stats
+        
+        hints = root / "AmazonBedrock" / "utils" / "hints.py"
+        hints.write_text(HINTS.replace('"giggles"', '"chuckles"'), encoding='utf-8')
+        assert 'graders/ungraded-string' in {w.rule for w in self.run(root, cache).warnings}
+        assert cache.hits == 1
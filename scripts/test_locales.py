@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+测试：多语言文档目录
+验证 docs/ 下的语言目录被自动发现，每种语言分别检查，各语言共用路径索引和已加载的文档，
+并行检查多种语言的结果与串行一致
+"""
+
+import json
+import shutil
+from pathlib import Path
+from validators import (
+    DocumentContentChecker, DocumentCorpus, DocumentExistenceChecker, LinkValidator, TerminologyChecker,
+)
+from validators.synthetic import CorpusSpec, generate_corpus
+from run_quality_assurance import QualityAssuranceRunner
+
+
+def make_project(root: Path) -> Path:
+    """合成的中文文档树，外加由它复制而来的英文文档树和一个非语言目录"""
+    generate_corpus(root, CorpusSpec(documents=30, error_rate=0.05))
+    shutil.copytree(root / "docs" / "zh", root / "docs" / "en")
+    (root / "docs" / "images").mkdir()
+    return root
+
+
+def check(checker_class, corpus: DocumentCorpus):
+    """在语料库上运行检查器并返回检查器"""
+    checker = checker_class(str(corpus.root_dir), corpus)
+    checker.collect()
+    return checker
+
+
+class TestLocaleCorpus:
+    """
+    测试：语言目录的发现和共享索引
+    
+    属性：docs/ 下名称像语言代码的目录都被发现，源语言在前；
+    各语言的语料库共用路径索引，跨语言的链接目标只加载一次。
+    """
+    
+    def test_discovery(self, tmp_path):
+        """images 不是语言目录；每种语言只包含自己目录下的文档"""
+        root = make_project(tmp_path)
+        (root / "docs" / "ja").mkdir()
+        corpus = DocumentCorpus(str(root))
+        assert corpus.locales() == ['zh', 'en', 'ja']
+        
+        english = corpus.for_locale('en')
+        assert english.docs_dir == root / "docs" / "en"
+        assert english.path_index is corpus.path_index
+        assert len(english.doc_paths()) == len(corpus.doc_paths()) == 30
+        assert all(path.is_relative_to(english.docs_dir) for path in english.doc_paths())
+        assert corpus.for_locale('ja').doc_paths() == []
+    
+    def test_cross_locale_links(self, tmp_path):
+        """英文文档可以链接到中文文档的锚点，目标文档在两种语言间只加载一次"""
+        root = tmp_path
+        (root / "docs" / "zh").mkdir(parents=True)
+        (root / "docs" / "en").mkdir(parents=True)
+        (root / "docs" / "zh" / "a.md").write_text("# 甲\n\n## 安装步骤\n", encoding='utf-8')
+        (root / "docs" / "en" / "a.md").write_text(
+            "# A\n\n[原文](../zh/a.md#安装步骤) [missing](../zh/a.md#nope) [b](b.md)\n", encoding='utf-8'
+        )
+        (root / "README.md").write_text("# 项目\n\n[缺失](missing.md)\n", encoding='utf-8')
+        
+        corpus = DocumentCorpus(str(root))
+        english = corpus.for_locale('en')
+        checker = check(LinkValidator, english)
+        assert [error.rule for error in checker.errors] == ['links/broken-anchor', 'links/broken-internal']
+        # README 只随源语言检查
+        assert root / "README.md" not in checker.document_paths()
+        assert english.load(root / "docs" / "zh" / "a.md") is corpus.load(root / "docs" / "zh" / "a.md")
+
+
+class TestLocaleCheckers:
+    """
+    测试：各检查器对不同语言的处理
+    
+    属性：必需文档按语言目录检查，根目录文档只随源语言检查；
+    章节关键词按语言的译法检查；英文文档检查术语表中的英文术语。
+    """
+    
+    def test_existence(self, tmp_path):
+        """英文文档树缺少的文档按 docs/en 下的路径报告"""
+        root = make_project(tmp_path)
+        (root / "docs" / "en" / "advanced" / "faq.md").unlink()
+        (root / "README_EN.md").unlink()
+        corpus = DocumentCorpus(str(root))
+        
+        english = check(DocumentExistenceChecker, corpus.for_locale('en'))
+        assert [error.args for error in english.errors] == [('advanced', 'docs/en/advanced/faq.md')]
+        assert 'root' not in english.required_docs()
+        source = check(DocumentExistenceChecker, corpus)
+        assert [error.args for error in source.errors] == [('root', 'README_EN.md')]
+    
+    def test_content_translations(self, tmp_path):
+        """英文文档使用英文章节名；没有译法的语言只检查标题和长度"""
+        root = tmp_path
+        body = "Some text. " * 20
+        for locale, text in [('en', f"# Guide\n\n## Overview\n\n{body}\n"),
+                             ('ja', f"# インストール\n\n{body}\n")]:
+            path = root / "docs" / locale / "getting-started" / "installation.md"
+            path.parent.mkdir(parents=True)
+            path.write_text(text, encoding='utf-8')
+        corpus = DocumentCorpus(str(root))
+        
+        english = check(DocumentContentChecker, corpus.for_locale('en'))
+        assert sorted(warning.args[0] for warning in english.warnings) == ['Installation', 'Prerequisites']
+        assert check(DocumentContentChecker, corpus.for_locale('ja')).warnings == []
+    
+    def test_english_terms(self, tmp_path):
+        """英文文档中查找术语表的英文一列，其他语言不检查术语"""
+        root = make_project(tmp_path)
+        (root / "docs" / "ja").mkdir()
+        (root / "docs" / "ja" / "a.md").write_text("# A\n", encoding='utf-8')
+        for path in (root / "docs" / "en").rglob('*.md'):
+            path.write_text("# Doc\n\nUses Term 0 and Term 3.\n", encoding='utf-8')
+        corpus = DocumentCorpus(str(root))
+        
+        english = check(TerminologyChecker, corpus.for_locale('en'))
+        assert english.terms[:2] == ['Term 0', 'Term 1']
+        assert english.term_positions['Term 0'] and not english.term_positions['Term 1']
+        assert 'Term 3' not in {warning.args[0] for warning in english.warnings}
+        japanese = check(TerminologyChecker, corpus.for_locale('ja'))
+        assert japanese.terms == [] and japanese.warnings == []
+
+
+class TestLocaleRunner:
+    """
+    测试：质量保证运行器中的多种语言
+    
+    属性：每种语言的每项检查都有结果，非源语言的结果名称带有语言标记；
+    各语言在进程池中同时检查的结果与串行检查一致。
+    """
+    
+    def test_parallel_matches_serial(self, tmp_path):
+        """并行和串行运行两种语言的检查，结果和各语言的汇总相同"""
+        root = make_project(tmp_path)
+        reports = []
+        for jobs in (1, 3):
+            runner = QualityAssuranceRunner(str(root), jobs=jobs)
+            runner.run_all_checks()
+            assert runner.locales == ['zh', 'en']
+            report_path = root / "scripts" / "tests" / "quality_assurance_report.json"
+            reports.append(json.loads(report_path.read_text(encoding='utf-8')))
+        
+        serial, parallel = reports
+        names = [name for name, _, _ in QualityAssuranceRunner.CHECKS]
+        assert list(serial['results']) == names + [f"{name} [en]" for name in names]
+        assert serial['results']['链接有效性 [en]']['locale'] == 'en'
+        for name in serial['results']:
+            assert serial['results'][name]['errors'] == parallel['results'][name]['errors'], name
+            assert serial['results'][name]['warnings'] == parallel['results'][name]['warnings'], name
+        assert serial['locales'] == parallel['locales']
+        assert set(serial['locales']) == {'zh', 'en'}
+    
+    def test_selected_locale(self, tmp_path):
+        """指定语言时只检查该语言"""
+        root = make_project(tmp_path)
+        runner = QualityAssuranceRunner(str(root), locales=['en'])
+        runner.run_all_checks()
+        assert all(name.endswith(' [en]') for name in runner.results)
+        assert len(runner.results) == len(QualityAssuranceRunner.CHECKS)
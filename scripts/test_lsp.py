@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+测试：语言服务器
+验证消息分帧、增量修改、诊断发布，以及链接和术语的跨文档检查
+"""
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+from validators import DocumentCorpus, LinkValidator, MarkdownFormatChecker, TerminologyChecker
+from validators.lsp import LanguageServer, path_to_uri, read_message, to_character, to_index, write_message
+
+
+SCRIPTS_DIR = Path(__file__).parent
+
+GLOSSARY = "# 需求\n\n## 术语表\n\n- **提示词（Prompt）**: 输入\n- **模型（Model）**: 模型\n"
+
+
+def make_project(tmp_path: Path) -> Path:
+    """创建包含两个文档和术语表的项目"""
+    docs_dir = tmp_path / "docs" / "zh"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "a.md").write_text("# A\n\n提示词见 [B](b.md#用法)\n", encoding='utf-8')
+    (docs_dir / "b.md").write_text("# B\n\n## 用法\n\n模型\n", encoding='utf-8')
+    glossary = tmp_path / TerminologyChecker.GLOSSARY_PATH
+    glossary.parent.mkdir(parents=True)
+    glossary.write_text(GLOSSARY, encoding='utf-8')
+    return tmp_path
+
+
+def request(message_id: int, method: str, params=None) -> dict:
+    return {'jsonrpc': '2.0', 'id': message_id, 'method': method, 'params': params or {}}
+
+
+def notification(method: str, params) -> dict:
+    return {'jsonrpc': '2.0', 'method': method, 'params': params}
+
+
+def open_message(path: Path, text: str) -> dict:
+    return notification('textDocument/didOpen', {'textDocument': {
+        'uri': path_to_uri(path), 'languageId': 'markdown', 'version': 1, 'text': text,
+    }})
+
+
+def change_message(path: Path, version: int, start, end, text: str) -> dict:
+    """把 start 到 end（(行, 字符)，从 0 开始）之间的文本替换为 text"""
+    return notification('textDocument/didChange', {
+        'textDocument': {'uri': path_to_uri(path), 'version': version},
+        'contentChanges': [{
+            'range': {
+                'start': {'line': start[0], 'character': start[1]},
+                'end': {'line': end[0], 'character': end[1]},
+            },
+            'text': text,
+        }],
+    })
+
+
+def run_session(root: Path, messages, checker_classes=(MarkdownFormatChecker, LinkValidator, TerminologyChecker)):
+    """依次发送消息（自动加上 initialize 和 shutdown/exit），返回 (退出码, 服务器发出的消息)"""
+    corpus = DocumentCorpus(str(root))
+    server = LanguageServer(corpus, [
+        (lambda checker_class=checker_class: checker_class(str(root), corpus))
+        for checker_class in checker_classes
+    ])
+    stream = io.BytesIO()
+    for message in [request(1, 'initialize', {'capabilities': {}}), notification('initialized', {}),
+                    *messages, request(2, 'shutdown'), notification('exit', None)]:
+        write_message(stream, message)
+    stream.seek(0)
+    output = io.BytesIO()
+    code = server.serve(stream, output)
+    output.seek(0)
+    sent = []
+    while True:
+        message = read_message(output)
+        if message is None:
+            return code, sent
+        sent.append(message)
+
+
+def published(sent, path: Path):
+    """发布到某个文档的所有诊断列表（按发布顺序）"""
+    uri = path_to_uri(path)
+    return [
+        message['params']['diagnostics'] for message in sent
+        if message.get('method') == 'textDocument/publishDiagnostics' and message['params']['uri'] == uri
+    ]
+
+
+class TestProtocol:
+    """
+    测试：协议
+    
+    属性：消息按 Content-Length 分帧，请求都有响应，shutdown 之后 exit 的退出码为 0。
+    """
+    
+    def test_framing_roundtrip(self):
+        """写入的消息（含非 ASCII 字符）可以原样读回"""
+        stream = io.BytesIO()
+        messages = [request(1, 'initialize'), notification('x', {'text': "中文 🎯"})]
+        for message in messages:
+            write_message(stream, message)
+        stream.seek(0)
+        assert [read_message(stream), read_message(stream), read_message(stream)] == messages + [None]
+    
+    def test_lifecycle(self, tmp_path):
+        """initialize 声明增量同步，未知请求返回错误"""
+        code, sent = run_session(make_project(tmp_path), [request(3, 'textDocument/hover')])
+        responses = {message['id']: message for message in sent if 'id' in message}
+        assert code == 0
+        assert responses[1]['result']['capabilities']['textDocumentSync']['change'] == 2
+        assert responses[3]['error']['code'] == -32601
+        assert responses[2]['result'] is None
+    
+    def test_utf16_positions(self):
+        """UTF-16 位置中基本多文种平面之外的字符占两个码元"""
+        line = "🎯 [链接](x.md)"
+        assert to_character(line, 2, 'utf-16') == 3
+        assert to_index(line, 3, 'utf-16') == 2
+        assert to_character(line, 2, 'utf-32') == 2
+
+
+class TestDiagnostics:
+    """
+    测试：诊断发布
+    
+    属性：每次修改后发布的诊断与编辑器中的当前内容一致，不依赖磁盘上的内容。
+    """
+    
+    def test_incremental_edits(self, tmp_path):
+        """增量修改引入和修复格式问题，诊断随之更新"""
+        root = make_project(tmp_path)
+        doc = root / "docs" / "zh" / "b.md"
+        code, sent = run_session(root, [
+            open_message(doc, "# B\n\n## 用法\n\n模型\n"),
+            change_message(doc, 2, (2, 2), (2, 3), ""),
+            change_message(doc, 3, (2, 2), (2, 2), " "),
+        ])
+        results = published(sent, doc)
+        assert results[0] == []
+        assert [(d['code'], d['range']['start']['line'], d['severity']) for d in results[1]] == \
+            [('format/heading-space', 2, 2)]
+        assert results[2] == []
+        # 磁盘上的文件没有被修改
+        assert doc.read_text(encoding='utf-8') == "# B\n\n## 用法\n\n模型\n"
+    
+    def test_anchor_change_revalidates_open_referrers(self, tmp_path):
+        """修改 b.md 的标题后，打开的 a.md 中指向旧锚点的链接被报告"""
+        root = make_project(tmp_path)
+        a_doc = root / "docs" / "zh" / "a.md"
+        b_doc = root / "docs" / "zh" / "b.md"
+        _, sent = run_session(root, [
+            open_message(a_doc, a_doc.read_text(encoding='utf-8')),
+            open_message(b_doc, b_doc.read_text(encoding='utf-8')),
+            change_message(b_doc, 2, (2, 3), (2, 5), "示例"),
+        ])
+        results = published(sent, a_doc)
+        assert results[0] == []
+        assert [(d['code'], d['range']['start']) for d in results[-1]] == \
+            [('links/broken-anchor', {'line': 2, 'character': 5})]
+    
+    def test_unused_terms_follow_edits(self, tmp_path):
+        """删除最后一次使用的术语后，术语表上出现警告；恢复后警告消失"""
+        root = make_project(tmp_path)
+        a_doc = root / "docs" / "zh" / "a.md"
+        glossary = root / TerminologyChecker.GLOSSARY_PATH
+        _, sent = run_session(root, [
+            open_message(a_doc, a_doc.read_text(encoding='utf-8')),
+            change_message(a_doc, 2, (2, 0), (2, 3), "提示"),
+            change_message(a_doc, 3, (2, 0), (2, 2), "提示词"),
+        ])
+        results = published(sent, glossary)
+        assert [[(d['message'], d['range']['start']['line']) for d in result] for result in results] == [
+            [("术语 '提示词' 在文档中未被使用", 4)],
+            [],
+        ]
+
+
+class TestCommandLine:
+    """
+    测试：命令行
+    
+    属性：validate_docs.py --lsp 在标准输入输出上完成一次会话。
+    """
+    
+    def test_stdio_session(self, tmp_path):
+        """打开含失效链接的文档后发布错误，exit 后正常退出"""
+        root = make_project(tmp_path)
+        doc = root / "docs" / "zh" / "a.md"
+        stream = io.BytesIO()
+        for message in [request(1, 'initialize', {'capabilities': {}}),
+                        open_message(doc, "# A\n\n[C](c.md)\n"),
+                        request(2, 'shutdown'), notification('exit', None)]:
+            write_message(stream, message)
+        
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / 'validate_docs.py'), '--lsp', '--links', '--root', str(root)],
+            input=stream.getvalue(), capture_output=True, timeout=60,
+        )
+        assert completed.returncode == 0
+        output = io.BytesIO(completed.stdout)
+        messages = iter(lambda: read_message(output), None)
+        diagnostics = [m['params']['diagnostics'] for m in messages
+                       if m.get('method') == 'textDocument/publishDiagnostics']
+        assert [d['code'] for d in diagnostics[0]] == ['links/broken-internal']
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+属性测试：单遍 Markdown 词法分析器
+验证记号的行号、列号以及代码块边界
+"""
+
+from hypothesis import given, strategies as st, settings
+from validators.markdown import (
+    FENCE_CLOSE,
+    FENCE_OPEN,
+    HEADING,
+    LINK,
+    LIST_ITEM,
+    TABLE_ROW,
+    LineTokenCache,
+    code_blocks,
+    headings,
+    tokenize,
+)
+
+
+SAMPLE = [
+    "# 标题",                      # 1
+    "",                            # 2
+    "- 列表项 [链接](a.md)",        # 3
+    "",                            # 4
+    "```python",                   # 5
+    "# 注释不是标题",               # 6
+    "x = [1](2)",                  # 7
+    "```",                         # 8
+    "",                            # 9
+    "| 列 | 值 |",                  # 10
+    "行内 `[代码](x.md)` 和 [真链接](b.md#s)",  # 11
+    "#缺少空格",                    # 12
+]
+
+
+class TestMarkdownTokenizer:
+    """
+    属性测试：Markdown 记号流
+    
+    属性：代码块内的内容不会产生标题、列表项或链接记号，
+    每个记号的行号和列号都指向它在原文中的位置。
+    """
+    
+    def test_sample_token_stream(self):
+        """示例文档应产生预期的记号序列"""
+        tokens = tokenize(SAMPLE)
+        summary = [(t.kind, t.line, t.col) for t in tokens]
+        
+        assert summary == [
+            (HEADING, 1, 1),
+            (LIST_ITEM, 3, 1),
+            (LINK, 3, 7),
+            (FENCE_OPEN, 5, 1),
+            (FENCE_CLOSE, 8, 1),
+            (TABLE_ROW, 10, 1),
+            (LINK, 11, 19),
+            (HEADING, 12, 1),
+        ]
+        assert [t.text for t in headings(tokens)] == ["标题"]
+        assert tokens[-2].target == "b.md#s"
+    
+    def test_code_block_content(self):
+        """代码块应包含围栏之间的原始内容"""
+        blocks = code_blocks(tokenize(SAMPLE), SAMPLE)
+        
+        assert len(blocks) == 1
+        assert blocks[0].language == "python"
+        assert blocks[0].code == "# 注释不是标题\nx = [1](2)\n"
+        assert blocks[0].closed
+    
+    def test_longer_fence_contains_shorter_fences(self):
+        """四个反引号的围栏内可以包含三个反引号的代码块"""
+        lines = ["````markdown", "```python", "x = 1", "```", "````"]
+        blocks = code_blocks(tokenize(lines), lines)
+        
+        assert len(blocks) == 1
+        assert blocks[0].closed
+        assert blocks[0].code == "```python\nx = 1\n```\n"
+    
+    @given(st.lists(
+        st.sampled_from(["# 标题", "正文", "- 项", "```", "```python", "[a](b.md)", ""]),
+        max_size=40,
+    ))
+    @settings(max_examples=100)
+    def test_tokens_are_ordered_and_fences_balanced(self, lines):
+        """记号按行号递增，且关闭围栏之前总有对应的打开围栏"""
+        tokens = tokenize(lines)
+        
+        assert [t.line for t in tokens] == sorted(t.line for t in tokens)
+        depth = 0
+        for token in tokens:
+            if token.kind == FENCE_OPEN:
+                depth += 1
+            elif token.kind == FENCE_CLOSE:
+                depth -= 1
+            assert depth in (0, 1)
+            if depth == 1 and token.kind != FENCE_OPEN:
+                raise AssertionError(f"代码块内不应产生记号: {token}")
+
+
+# 编辑时使用的行：围栏的开闭会改变其后所有行的扫描结果，段落后的 === 和 --- 会生成 Setext 标题
+EDIT_LINES = ["# 标题", "正文 [a](b.md)", "- 项", "```", "```python", "~~~", "    ```", "#缺少空格", "",
+              "===", "---", "> 引用"]
+
+
+def token_summary(tokens):
+    return [(t.kind, t.line, t.col, t.level, t.text, t.target) for t in tokens]
+
+
+class TestLineTokenCache:
+    """
+    属性测试：按行缓存的增量扫描
+    
+    属性：任意一串行替换之后，缓存的记号与对当前内容重新完整扫描的结果相同。
+    """
+    
+    @given(
+        lines=st.lists(st.sampled_from(EDIT_LINES), max_size=20),
+        edits=st.lists(
+            st.tuples(st.integers(0, 25), st.integers(0, 5), st.lists(st.sampled_from(EDIT_LINES), max_size=4)),
+            max_size=6,
+        ),
+    )
+    @settings(max_examples=200)
+    def test_incremental_equals_full_scan(self, lines, edits):
+        """增量扫描的结果与完整扫描一致"""
+        cache = LineTokenCache(lines)
+        for start, length, new_lines in edits:
+            start = min(start, len(cache.lines))
+            cache.replace(start, min(start + length, len(cache.lines)), new_lines)
+            assert token_summary(cache.tokens) == token_summary(tokenize(cache.lines))
+    
+    def test_rescan_stops_when_fence_state_converges(self):
+        """修改代码块外的一行只重新扫描这一行，打开围栏会重新扫描到文档末尾"""
+        cache = LineTokenCache(["# 标题"] * 1000)
+        assert cache.replace(500, 501, ["## 新标题"]) == 1
+        assert cache.replace(10, 10, ["```"]) == 991
+        assert token_summary(cache.tokens) == token_summary(tokenize(cache.lines))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+测试：notebook 单元格的读取和检查
+验证从 JSON 文本中流式取出的单元格与 json.loads() 的结果一致，Markdown 单元格和代码单元格
+由链接、格式和代码检查器检查，报告的行号相对于单元格，并行检查的结果与串行一致
+"""
+
+import json
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from validators import CodeExampleValidator, DocumentCorpus, LinkValidator, MarkdownFormatChecker
+from validators.corpus import Document
+from validators.diagnostics import Diagnostic
+from validators.notebooks import iter_cells, python_source
+from validators.parallel import ParallelCheckExecutor
+
+
+TEXT = st.text(alphabet=st.sampled_from('ab \n"\\[]{}:,#中文\t'), max_size=30)
+JSON_VALUE = st.recursive(
+    st.none() | st.booleans() | st.integers() | TEXT,
+    lambda children: st.lists(children, max_size=3) | st.dictionaries(TEXT, children, max_size=3),
+    max_leaves=10,
+)
+CELL = st.fixed_dictionaries(
+    {
+        'cell_type': st.sampled_from(['markdown', 'code', 'raw']),
+        'source': TEXT | st.lists(TEXT, max_size=4),
+    },
+    optional={'metadata': JSON_VALUE, 'outputs': st.lists(JSON_VALUE, max_size=3), 'attachments': JSON_VALUE},
+)
+
+
+def notebook_document(text: str) -> Document:
+    return Document(Path('lesson.ipynb'), 'lesson.ipynb', text)
+
+
+def write_notebook(path: Path, cells: list):
+    """按 nbformat 的字段顺序写出 notebook（cells 在前）"""
+    data = {
+        'cells': [
+            {'cell_type': kind, 'metadata': {}, 'outputs': [], 'source': source.splitlines(True)}
+            for kind, source in cells
+        ],
+        'metadata': {'kernelspec': {'name': 'python3'}},
+        'nbformat': 4,
+        'nbformat_minor': 2,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding='utf-8')
+
+
+class TestNotebookReader:
+    """
+    测试：notebook 单元格的流式读取
+    
+    属性：对任意结构的 notebook，取出的单元格类型和内容与 json.loads() 解码的结果相同；
+    无效的 JSON 抛出 ValueError；魔法命令替换后行号不变。
+    """
+    
+    @settings(max_examples=200, deadline=None)
+    @given(cells=st.lists(CELL, max_size=5), before=st.dictionaries(TEXT, JSON_VALUE, max_size=2),
+           indent=st.sampled_from([None, 1]))
+    def test_matches_json_loads(self, cells, before, indent):
+        """cells 之前可以有任意字段，单元格中可以有任意字段和输出"""
+        data = dict(before)
+        data.pop('cells', None)
+        data['cells'] = cells
+        text = json.dumps(data, indent=indent, ensure_ascii=False)
+        
+        found = [(cell.index, cell.cell_type, cell.source) for cell in iter_cells(notebook_document(text))]
+        expected = [
+            (index, cell['cell_type'], ''.join(cell['source']) if isinstance(cell['source'], list) else cell['source'])
+            for index, cell in enumerate(json.loads(text)['cells'], 1)
+        ]
+        assert found == expected
+    
+    def test_invalid(self):
+        """截断的文件、缺少 cells 或不是对象时抛出 ValueError"""
+        text = json.dumps({'cells': [{'cell_type': 'code', 'source': ['x = 1'], 'outputs': [{'a': '[{'}]}]})
+        for broken in (text[:len(text) // 2], text[:-1], '{"metadata": {}}', '[]', ''):
+            try:
+                list(iter_cells(notebook_document(broken)))
+            except ValueError:
+                continue
+            raise AssertionError(f"未报告无效的 notebook: {broken!r}")
+    
+    def test_python_source(self):
+        """行魔法命令和 shell 命令替换为 pass，单元格魔法命令的单元格不检查"""
+        cells = list(iter_cells(notebook_document(json.dumps({'cells': [
+            {'cell_type': 'code', 'source': ["!pip install anthropic\n", "if True:\n", "    %store -r KEY\n"]},
+            {'cell_type': 'code', 'source': ["%%bash\n", "echo hi"]},
+        ]}))))
+        assert python_source(cells[0]) == "pass\nif True:\n    pass\n"
+        assert python_source(cells[1]) is None
+    
+    def test_python_source_logical_lines(self):
+        """只替换逻辑行开头的魔法命令，多行字符串、括号内和续行中以 % 或 ! 开头的行保持不变"""
+        code = (
+            'usage = """\n'
+            '%(prog)s [选项]\n'
+            '!注意\n'
+            '"""\n'
+            "value = (1\n"
+            "    % 2)\n"
+            "flag = 1 \\\n"
+            "    !=0\n"
+            "text = 'a\\\n"
+            "%b' # (\n"
+            "!ls\n"
+        )
+        cell = list(iter_cells(notebook_document(json.dumps({'cells': [{'cell_type': 'code', 'source': code}]}))))[0]
+        assert python_source(cell) == code.replace("!ls", "pass")
+
+
+class TestNotebookChecks:
+    """
+    测试：检查器检查 notebook 的单元格
+    
+    属性：问题记录单元格序号，行号和列号相对于单元格；页内锚点在整个 notebook 中查找；
+    其他文档可以链接到 notebook 的锚点；并行检查的结果与串行一致。
+    """
+    
+    def make_project(self, root: Path) -> Path:
+        (root / "docs" / "zh").mkdir(parents=True)
+        (root / "docs" / "zh" / "guide.md").write_text(
+            "# 指南\n\n见 [练习](../../course/01_lesson.ipynb#exercises) 和 [缺失](../../course/01_lesson.ipynb#nope)\n",
+            encoding='utf-8',
+        )
+        write_notebook(root / "course" / "01_lesson.ipynb", [
+            ('markdown', "# Lesson\n\n- [Exercises](#exercises)\n- [Missing](#missing)\n"),
+            ('code', "!pip install anthropic\nprint('ok')\n"),
+            ('markdown', "##Exercises\n\n## Exercises\n\n```python\nx = (\n```\n"),
+            ('code', "def f():\n    return (\n"),
+            ('code', "%%bash\nthis is not python\n"),
+        ])
+        (root / "course" / "broken.ipynb").write_text('{"cells": [', encoding='utf-8')
+        return root
+    
+    def run(self, checker_class, root: Path):
+        checker = checker_class(str(root), DocumentCorpus(str(root)))
+        checker.collect()
+        return checker
+    
+    def test_cell_locations(self, tmp_path):
+        """链接、格式和代码检查的问题位于各自的单元格中"""
+        root = self.make_project(tmp_path)
+        notebook = 'course/01_lesson.ipynb'
+        
+        links = self.run(LinkValidator, root)
+        found = {(error.rule, error.path, error.cell, error.line) for error in links.errors}
+        assert found == {
+            ('links/broken-anchor', notebook, 1, 4),
+            ('links/broken-anchor', 'docs/zh/guide.md', None, 3),
+            ('invalid-notebook', 'course/broken.ipynb', None, None),
+        }
+        assert sorted(error.args[-1] for error in links.errors if error.rule == 'links/broken-anchor') == \
+            ['missing', 'nope']
+        
+        format_checker = self.run(MarkdownFormatChecker, root)
+        assert [(w.rule, w.cell, w.line) for w in format_checker.warnings] == [('format/heading-space', 3, 1)]
+        
+        code = self.run(CodeExampleValidator, root)
+        syntax = sorted((e.cell, e.line, e.args[0]) for e in code.errors if e.rule == 'code/syntax-error')
+        assert syntax == [(3, 6, 1), (4, 2, 4)]
+        assert str([e for e in code.errors if e.cell == 4][0]).startswith(f"文档 {notebook} 单元格 4 行 2")
+    
+    def test_diagnostic_cell_round_trip(self):
+        """单元格序号随缓存和跨进程传递保留，没有单元格的结果格式不变"""
+        diagnostic = Diagnostic('code/syntax-error', 'error', 'a.ipynb', 3, 5, (4, 'x'), cell=4)
+        assert Diagnostic.from_list(json.loads(json.dumps(diagnostic.to_list()))) == diagnostic
+        assert diagnostic.format('en').startswith("a.ipynb[4]:3:5: ")
+        assert diagnostic.to_dict()['cell'] == 4
+        plain = Diagnostic('format/heading-space', 'warning', 'a.md', 2)
+        assert plain.to_list() == ['format/heading-space', 'warning', 'a.md', 2, None, []]
+    
+    def test_parallel_matches_serial(self, tmp_path):
+        """notebook 分配到多个进程中检查，合并后的结果与串行一致"""
+        root = self.make_project(tmp_path)
+        for number in range(2, 20):
+            write_notebook(root / "course" / f"{number:02d}_lesson.ipynb", [
+                ('markdown', f"# Lesson {number}\n\n[Back](01_lesson.ipynb#lesson)\n"),
+                ('code', "x = [\n" if number % 3 == 0 else "x = 1\n"),
+            ])
+        serial = {
+            checker_class: self.run(checker_class, root)
+            for checker_class in (LinkValidator, CodeExampleValidator)
+        }
+        executor = ParallelCheckExecutor(str(root), jobs=3)
+        try:
+            for checker_class in serial:
+                executor.submit(checker_class)
+            for checker_class, checker in serial.items():
+                result = executor.collect(checker_class)
+                assert result['errors'] == checker.errors
+                assert result['warnings'] == checker.warnings
+        finally:
+            executor.shutdown()
+        assert sum(error.cell == 2 for error in serial[CodeExampleValidator].errors) == 6
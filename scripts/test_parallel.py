@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+属性测试：并行检查执行
+验证按文件分区并行执行的结果与串行执行完全一致
+"""
+
+from hypothesis import given, strategies as st, settings
+from pathlib import Path
+from validators import (
+    DocumentCorpus,
+    CodeExampleValidator,
+    MarkdownFormatChecker,
+    LinkValidator,
+    TerminologyChecker,
+)
+from validators.pathindex import PathIndex
+from validators.parallel import (
+    ParallelCheckExecutor,
+    partition_paths,
+    run_checker,
+    merge_results,
+)
+
+
+# 获取项目根目录（从 scripts/ 目录向上一级）
+ROOT_DIR = Path(__file__).parent.parent
+
+
+class TestParallelExecution:
+    """
+    属性测试：并行执行的确定性
+    
+    属性：对于任何分区数，按顺序合并各分区结果应与串行运行的结果逐条一致。
+    """
+    
+    @given(count=st.integers(min_value=1, max_value=12))
+    @settings(max_examples=20, deadline=None)
+    def test_partitions_preserve_order(self, count):
+        """分区按顺序拼接后应等于原列表，且分区数不超过请求数"""
+        corpus = DocumentCorpus(str(ROOT_DIR))
+        paths = corpus.doc_paths()
+        partitions = partition_paths(paths, count, corpus.path_index)
+        
+        assert len(partitions) <= count
+        assert [p for part in partitions for p in part] == paths
+    
+    def test_partitions_use_path_index_sizes(self, tmp_path):
+        """分区按路径索引中记录的文件大小均衡（与 --shard 相同），不再读取文件"""
+        for name, size in (("a.md", 300), ("b.md", 100), ("c.md", 100), ("d.md", 100)):
+            (tmp_path / name).write_text("x" * size, encoding='utf-8')
+        PathIndex(str(tmp_path)).save(str(tmp_path / "index.json"))
+        index = PathIndex.load(str(tmp_path / "index.json"), str(tmp_path))
+        # 索引保存之后文件的改动不影响划分
+        (tmp_path / "b.md").write_text("x" * 1000, encoding='utf-8')
+        
+        paths = [tmp_path / name for name in ("a.md", "b.md", "c.md", "d.md")]
+        assert partition_paths(paths, 2, index) == [paths[:1], paths[1:]]
+    
+    @given(
+        checker_class=st.sampled_from([CodeExampleValidator, MarkdownFormatChecker, LinkValidator]),
+        count=st.integers(min_value=1, max_value=6),
+    )
+    @settings(max_examples=20, deadline=None)
+    def test_partitioned_results_match_serial(self, checker_class, count):
+        """逐文档检查器分区运行后合并的结果应与串行结果一致"""
+        serial = run_checker(checker_class, str(ROOT_DIR))
+        checker = checker_class(str(ROOT_DIR))
+        paths = checker.document_paths()
+        merged = merge_results([
+            run_checker(checker_class, str(ROOT_DIR), part)
+            for part in partition_paths(paths, count, checker.corpus.path_index)
+        ])
+        
+        assert merged['errors'] == serial['errors']
+        assert merged['warnings'] == serial['warnings']
+    
+    def test_process_pool_matches_serial(self):
+        """进程池执行的结果应与串行结果一致"""
+        checker_classes = [CodeExampleValidator, TerminologyChecker, LinkValidator]
+        executor = ParallelCheckExecutor(str(ROOT_DIR), jobs=3)
+        try:
+            for checker_class in checker_classes:
+                executor.submit(checker_class)
+            for checker_class in checker_classes:
+                parallel = executor.collect(checker_class)
+                serial = run_checker(checker_class, str(ROOT_DIR))
+                assert parallel['errors'] == serial['errors'], checker_class.__name__
+                assert parallel['warnings'] == serial['warnings'], checker_class.__name__
+        finally:
+            executor.shutdown()
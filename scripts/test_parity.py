@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+测试：教程版本一致性检查
+验证各版本的章节按文件名对齐，样板代码不影响单元格指纹，
+与多数版本不同的小节报告为不一致，缺少的章节和小节报告为缺失
+"""
+
+import json
+from pathlib import Path
+from validators import DocumentCorpus, NotebookParityChecker, ValidationCache
+from validators.parity import chapter_key, normalize_code
+
+
+SETUP_1P = """!pip install anthropic
+
+# Import python's built-in regular expression library
+import re
+import anthropic
+
+%store -r API_KEY
+client = anthropic.Anthropic(api_key=API_KEY)
+
+def get_completion(prompt: str, system_prompt=""):
+    message = client.messages.create(
+        model=MODEL_NAME,
+        messages=[
+          {"role": "user", "content": prompt}
+        ]
+    )
+    return message.content[0].text
+"""
+
+SETUP_BOTO3 = """import boto3
+import json
+import os
+import sys
+module_path = ".."
+sys.path.append(os.path.abspath(module_path))
+from utils import hints
+
+%store -r AWS_REGION
+client = boto3.client('bedrock-runtime',region_name=AWS_REGION)
+
+def get_completion(prompt,system=''):
+    body = json.dumps(
+        {
+            "max_tokens": 2000,
+        }
+    )
+    response = client.invoke_model(body=body, modelId=MODEL_NAME)
+    return json.loads(response.get('body').read())['content'][0]['text']
+"""
+
+
+def chapter(setup: str, hint: str, exercise: str = "PROMPT = \"Count to three\"") -> list:
+    return [
+        ('markdown', "# Chapter 1: Basics\n\n## Setup\n\nRun the [setup](https://example.com/a) cell."),
+        ('code', setup),
+        ('markdown', "## Lesson\n\nPrompts have roles."),
+        ('code', "print(get_completion(\"Hi\"))"),
+        ('markdown', "## Exercises\n\n### Exercise 1.1 - Counting\n\nMake Claude count."),
+        ('code', exercise),
+        ('code', hint),
+    ]
+
+
+def write_notebook(path: Path, cells: list):
+    data = {'cells': [
+        {'cell_type': kind, 'metadata': {}, 'outputs': [], 'source': source.splitlines(True)}
+        for kind, source in cells
+    ], 'nbformat': 4}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=1), encoding='utf-8')
+
+
+def run(root: Path, cache: ValidationCache = None) -> NotebookParityChecker:
+    checker = NotebookParityChecker(str(root), DocumentCorpus(str(root)), cache)
+    checker.collect()
+    return checker
+
+
+class TestNormalization:
+    """
+    测试：章节对齐和单元格归一化
+    
+    属性：各版本中写法不同的文件名得到相同的章节键；只有样板代码的单元格归一化后为空，
+    两种引用提示的写法归一化后相同。
+    """
+    
+    def test_chapter_key(self):
+        """章号的分隔符、标题词的缩写、多余的空格和虚词不影响对齐"""
+        assert chapter_key("10_3_Appendix_Empirical_Performance_Eval.ipynb") == \
+            chapter_key("10_3_Appendix_Empirical_Performance_Evaluations.ipynb")
+        assert chapter_key("10.2_Appendix_Tool Use.ipynb") == chapter_key("10_2_Appendix_Tool_Use.ipynb")
+        assert chapter_key("07_Using_Examples _Few-Shot_Prompting.ipynb") == \
+            chapter_key("07_Using_Examples_Few-Shot_Prompting.ipynb")
+        assert chapter_key("10.3_Appendix_Search & Retrieval.ipynb") == \
+            chapter_key("10_4_Appendix_Search_and_Retrieval.ipynb")
+        assert chapter_key("README.ipynb") is None
+    
+    def test_boilerplate(self):
+        """客户端创建和 get_completion 的定义被忽略，其余代码保留"""
+        assert normalize_code(SETUP_1P) == normalize_code(SETUP_BOTO3) == ''
+        assert normalize_code("from hints import exercise_1_1_hint; print(exercise_1_1_hint)") == \
+            normalize_code("print(hints.exercise_1_1_hint)")
+        assert normalize_code(SETUP_1P + "\nPROMPT = 'x'\n") == "PROMPT = 'x'"
+
+
+class TestNotebookParityChecker:
+    """
+    测试：教程版本一致性检查器
+    
+    属性：只有样板代码和链接地址不同的版本没有问题；与另外两个版本不同的练习在该版本中报告，
+    位置为练习标题所在的单元格；缺少的章节和小节报告为缺失。
+    """
+    
+    def make_project(self, root: Path, boto3_exercise: str = "PROMPT = \"Count to three\"") -> Path:
+        write_notebook(root / "Anthropic 1P" / "01_Basics.ipynb",
+                       chapter(SETUP_1P, "from hints import exercise_1_1_hint; print(exercise_1_1_hint)"))
+        for variant, setup in (('anthropic', SETUP_1P), ('boto3', SETUP_BOTO3)):
+            write_notebook(root / "AmazonBedrock" / variant / "01_Basics.ipynb",
+                           chapter(setup, "print(hints.exercise_1_1_hint)",
+                                   boto3_exercise if variant == 'boto3' else "PROMPT = \"Count to three\""))
+        return root
+    
+    def test_consistent(self, tmp_path):
+        """各版本的设置单元格、提示的引用方式和链接地址不同，不报告问题"""
+        checker = run(self.make_project(tmp_path))
+        assert checker.warnings == [] and checker.errors == []
+        assert checker.stats['chapters'] == 1 and checker.stats['notebooks'] == 3
+    
+    def test_drifted_exercise(self, tmp_path):
+        """boto3 版本中修改过的练习报告为与多数版本不一致"""
+        checker = run(self.make_project(tmp_path, "PROMPT = \"Count to four\""))
+        assert [(w.rule, w.path, w.cell, w.line, w.args) for w in checker.warnings] == [(
+            'parity/drifted-section', 'AmazonBedrock/boto3/01_Basics.ipynb', 5, 3,
+            ('Exercise 1.1 - Counting', 'Anthropic 1P/01_Basics.ipynb', 1),
+        )]
+    
+    def test_missing(self, tmp_path):
+        """只在部分版本中存在的章节和小节报告为缺失"""
+        root = self.make_project(tmp_path)
+        cells = chapter(SETUP_1P, "print(hints.exercise_1_1_hint)")
+        write_notebook(root / "AmazonBedrock" / "anthropic" / "02_Extra_Eval.ipynb", cells)
+        write_notebook(root / "AmazonBedrock" / "boto3" / "02_Extra_Evaluations.ipynb",
+                       cells + [('markdown', "## Example Playground\n\nTry it.")])
+        
+        found = {(w.rule, w.path, w.args) for w in run(root).warnings}
+        assert found == {
+            ('parity/missing-chapter', 'AmazonBedrock/anthropic/02_Extra_Eval.ipynb', ('Anthropic 1P',)),
+            ('parity/missing-section', 'AmazonBedrock/anthropic/02_Extra_Eval.ipynb',
+             ('Example Playground', 'AmazonBedrock/boto3/02_Extra_Evaluations.ipynb')),
+        }
+    
+    def test_cached_until_notebook_changes(self, tmp_path):
+        """再次运行时整体命中缓存（包括统计信息）；新增或修改 notebook 后重新检查"""
+        root = self.make_project(tmp_path)
+        cache = ValidationCache(str(tmp_path / "cache"))
+        first = run(root, cache)
+        second = run(root, cache)
+        assert cache.hits == 1
+        assert second.warnings == first.warnings == [] and second.stats == first.stats
+        
+        write_notebook(root / "AmazonBedrock" / "boto3" / "01_Basics.ipynb",
+                       chapter(SETUP_BOTO3, "print(hints.exercise_1_1_hint)", "PROMPT = \"Count to four\""))
+        assert [w.rule for w in run(root, cache).warnings] == ['parity/drifted-section']
+        write_notebook(root / "AmazonBedrock" / "boto3" / "02_Extra.ipynb", chapter(SETUP_BOTO3, ""))
+        assert sorted(w.rule for w in run(root, cache).warnings) == \
+            ['parity/drifted-section', 'parity/missing-chapter', 'parity/missing-chapter']
+        assert cache.hits == 1
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+属性测试：仓库路径索引
+验证基于路径索引的链接检查与直接访问文件系统的结果一致
+"""
+
+import os
+from hypothesis import given, strategies as st, settings
+from pathlib import Path
+from validators import DocumentCorpus, LinkValidator
+from validators.pathindex import PathIndex
+
+
+# 获取项目根目录（从 scripts/ 目录向上一级）
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def make_tree(tmp_path: Path) -> Path:
+    """创建包含嵌套目录和文档的测试仓库"""
+    docs_dir = tmp_path / "docs" / "zh" / "guide"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "a.md").write_text("# A\n", encoding='utf-8')
+    (tmp_path / "docs" / "zh" / "index.md").write_text("# 索引\n", encoding='utf-8')
+    (tmp_path / "README.md").write_text("# 项目\n", encoding='utf-8')
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref\n", encoding='utf-8')
+    return tmp_path
+
+
+class TestPathIndex:
+    """
+    属性测试：路径索引与文件系统一致
+    
+    属性：对于任何链接路径，索引判断的存在性应与 Path.exists() 相同。
+    """
+    
+    def test_scan_records_files_and_dirs(self, tmp_path):
+        """一次遍历应记录所有文件和目录，并跳过 .git"""
+        index = PathIndex(str(make_tree(tmp_path)))
+        
+        assert index.files == {"docs/zh/guide/a.md", "docs/zh/index.md", "README.md"}
+        assert index.dirs == {".", "docs", "docs/zh", "docs/zh/guide"}
+        assert index.files_under("docs/zh", ".md") == ["docs/zh/guide/a.md", "docs/zh/index.md"]
+    
+    @given(link=st.sampled_from([
+        "a.md", "./a.md", "../index.md", "../../../README.md", "../guide/", "..",
+        "missing.md", "../missing/a.md", "/README.md", "/docs/zh/index.md", "/",
+        "/docs/zh/guide/../index.md", "a.md/", "../../../../outside.md",
+        "../../../.git/HEAD",
+    ]))
+    @settings(max_examples=30, deadline=None)
+    def test_link_lookup_matches_filesystem(self, tmp_path_factory, link):
+        """相对链接和根目录绝对链接的查找结果应与文件系统一致"""
+        root = make_tree(tmp_path_factory.mktemp("repo"))
+        index = PathIndex(str(root))
+        doc_path = root / "docs" / "zh" / "guide" / "a.md"
+        
+        if link.startswith('/'):
+            target = root / link.lstrip('/')
+        else:
+            target = doc_path.parent / link
+        assert index.exists(index.link_key(doc_path, link)) == os.path.exists(target)
+    
+    def test_links_do_not_touch_filesystem(self, tmp_path, monkeypatch):
+        """链接验证只查询索引，不对链接目标调用 exists()"""
+        root = make_tree(tmp_path)
+        (root / "docs" / "zh" / "index.md").write_text(
+            "# 索引\n\n[A](guide/a.md) [缺失](guide/b.md) [根](/README.md)\n",
+            encoding='utf-8',
+        )
+        corpus = DocumentCorpus(str(root))
+        corpus.path_index
+        
+        calls = []
+        original = Path.exists
+        monkeypatch.setattr(Path, 'exists', lambda self: calls.append(self) or original(self))
+        checker = LinkValidator(str(root), corpus)
+        checker.run_documents([root / "docs" / "zh" / "index.md"])
+        
+        assert calls == []
+        assert len(checker.errors) == 1
+        assert "guide/b.md" in str(checker.errors[0])
+    
+    def test_repository_doc_paths_match_rglob(self):
+        """语料库从索引得到的文档列表应与 rglob 结果一致"""
+        docs_dir = ROOT_DIR / "docs" / "zh"
+        assert DocumentCorpus(str(ROOT_DIR)).doc_paths() == sorted(docs_dir.rglob("*.md"))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+测试：Python 代码块语法检查
+验证按内容哈希记忆、持久化缓存和进程池并行解析的结果一致
+"""
+
+from pathlib import Path
+from validators import CodeExampleValidator, DocumentCorpus, ValidationCache
+from validators import pysyntax
+from validators.pysyntax import PythonSyntaxChecker, parse_python
+
+
+SNIPPET = "```python\nresponse = get_completion(prompt)\nprint(response)\n```\n"
+
+
+def make_docs(tmp_path: Path, count: int) -> Path:
+    """创建 count 个文档，每个包含同一个代码块和一个独有的语法错误代码块"""
+    docs_dir = tmp_path / "docs" / "zh"
+    docs_dir.mkdir(parents=True)
+    for i in range(count):
+        (docs_dir / f"doc{i:02d}.md").write_text(
+            f"# 文档 {i}\n\n{SNIPPET}\n```python\nx = ({i}\n```\n", encoding='utf-8'
+        )
+    return tmp_path
+
+
+def run_code(root: Path, cache=None) -> CodeExampleValidator:
+    """使用全新语料库运行一次代码示例验证"""
+    checker = CodeExampleValidator(str(root), DocumentCorpus(str(root)), cache)
+    checker.collect()
+    return checker
+
+
+class TestPythonSyntax:
+    """
+    测试：代码块语法检查
+    
+    属性：重复的代码块只解析一次，缓存和并行解析不改变检查结果。
+    """
+    
+    def setup_method(self):
+        pysyntax._MEMO.clear()
+    
+    def test_parse_results(self):
+        """语法错误返回代码块内的位置，只做语法分析因此不报告编译阶段的错误"""
+        assert parse_python("print('ok')\n") is None
+        result = parse_python("x = (\n")
+        assert result['kind'] == 'error' and result['lineno'] == 1
+        assert parse_python("return 1\n") is None
+    
+    def test_duplicate_blocks_are_parsed_once(self, tmp_path):
+        """内容相同的代码块在一次运行中只解析一次"""
+        checker = run_code(make_docs(tmp_path, 10))
+        
+        assert checker.syntax.parsed == 11
+        assert len(checker.errors) == 10
+        assert "doc03.md 行 9, 列 5" in str(checker.errors[3])
+    
+    def test_persistent_cache_skips_parsing(self, tmp_path):
+        """持久化缓存中已有的代码块在新进程中也不再解析，即使所在文档改变了"""
+        root = make_docs(tmp_path, 4)
+        cache = ValidationCache(str(tmp_path / "cache"))
+        first = run_code(root, cache)
+        
+        pysyntax._MEMO.clear()
+        (root / "docs" / "zh" / "doc00.md").write_text(f"# 新文档\n\n{SNIPPET}", encoding='utf-8')
+        second = run_code(root, cache)
+        
+        assert second.syntax.parsed == 0
+        assert second.errors == first.errors[1:]
+    
+    def test_parallel_parse_matches_serial(self, tmp_path, monkeypatch):
+        """进程池并行解析的结果与串行解析一致"""
+        root = make_docs(tmp_path, 12)
+        serial = run_code(root)
+        
+        pysyntax._MEMO.clear()
+        monkeypatch.setattr(pysyntax, 'PARALLEL_THRESHOLD', 1)
+        checker = CodeExampleValidator(str(root), DocumentCorpus(str(root)))
+        checker.syntax = PythonSyntaxChecker(jobs=2)
+        checker.collect()
+        
+        assert checker.syntax.parsed == 13
+        assert checker.errors == serial.errors
+        assert checker.warnings == serial.warnings
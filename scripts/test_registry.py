@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+测试：检查器注册表
+验证检查器模块按需导入、依赖排序，以及第三方检查器通过入口点注册
+"""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from validators import registry
+from validators.registry import CheckerSpec
+
+
+SCRIPTS_DIR = Path(__file__).parent
+
+PLUGIN_SOURCE = '''
+from validators.base import DocumentValidator
+
+
+class TodoChecker(DocumentValidator):
+    """检查文档中遗留的 TODO"""
+    
+    REPORT_TITLE = "TODO 检查报告"
+    PER_DOCUMENT = True
+    COST = 'cheap'
+    DEPENDS = ('existence',)
+    
+    def check_document(self, doc):
+        for number, line in enumerate(doc.lines, 1):
+            if 'TODO' in line:
+                self.add_error(f"文档 {doc.path.relative_to(self.root_dir)} 行 {number}: 遗留 TODO")
+'''
+
+
+def run_python(code: str, extra_path: str = '') -> dict:
+    """在新的解释器中运行代码并返回它打印的 JSON"""
+    python_path = os.pathsep.join(filter(None, [str(SCRIPTS_DIR), extra_path]))
+    output = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+        env={'PYTHONPATH': python_path},
+    ).stdout
+    return json.loads(output)
+
+
+def make_plugin(tmp_path: Path) -> Path:
+    """创建一个通过入口点声明检查器的已安装发行包"""
+    site = tmp_path / "site"
+    (site / "todo_plugin").mkdir(parents=True)
+    (site / "todo_plugin" / "__init__.py").write_text(PLUGIN_SOURCE, encoding='utf-8')
+    dist_info = site / "todo_plugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: todo-plugin\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        f"[{registry.ENTRY_POINT_GROUP}]\ntodo = todo_plugin:TodoChecker\n"
+    )
+    return site
+
+
+class TestLazyImport:
+    """
+    测试：按需导入
+    
+    属性：导入 validators 和选择检查器不导入未选中的检查器模块。
+    """
+    
+    def test_only_selected_modules_are_imported(self):
+        """只选择链接检查时不导入其他检查器及 asyncio、multiprocessing"""
+        modules = run_python(
+            "import json, sys\n"
+            "from validators import registry\n"
+            "registry.resolve(['links'])[0].load()\n"
+            "print(json.dumps(sorted(sys.modules)))\n"
+        )
+        assert 'validators.links' in modules
+        for name in ['validators.code', 'validators.external', 'validators.terminology',
+                     'validators.sandbox', 'asyncio', 'multiprocessing', 'importlib.metadata']:
+            assert name not in modules, name
+    
+    def test_package_attributes_are_lazy(self):
+        """从包中访问检查器类时才导入对应模块"""
+        result = run_python(
+            "import json, sys\n"
+            "import validators\n"
+            "before = 'validators.external' in sys.modules\n"
+            "checker_class = validators.ExternalLinkChecker\n"
+            "print(json.dumps([before, 'validators.external' in sys.modules, checker_class.__name__]))\n"
+        )
+        assert result == [False, True, 'ExternalLinkChecker']
+    
+    def test_builtin_specs_load_their_classes(self):
+        """内置检查器的路径都指向存在的检查器类"""
+        for spec in registry.BUILTIN_CHECKERS:
+            assert spec.load().__name__ == spec.target.split(':')[1]
+
+
+class TestRegistry:
+    """
+    测试：注册和依赖解析
+    
+    属性：依赖排在依赖它的检查器之前，每个检查器只出现一次。
+    """
+    
+    def teardown_method(self):
+        for name in ['a', 'b', 'c']:
+            registry.unregister(name)
+    
+    def test_resolve_orders_dependencies(self):
+        """依赖被自动选中并排在前面，保持其余的给定顺序"""
+        registry.register(CheckerSpec('a', '.links:LinkValidator', depends=['links']))
+        registry.register(CheckerSpec('b', '.links:LinkValidator', depends=['a', 'existence']))
+        
+        names = [spec.name for spec in registry.resolve(['format', 'b', 'links'])]
+        assert names == ['format', 'links', 'a', 'existence', 'b']
+    
+    def test_errors(self):
+        """重复注册、循环依赖、未知名称和无效的成本等级都会报错"""
+        registry.register(CheckerSpec('a', 'x:Y', depends=['b']))
+        registry.register(CheckerSpec('b', 'x:Y', depends=['a']))
+        with pytest.raises(ValueError):
+            registry.register(CheckerSpec('a', 'x:Y'))
+        with pytest.raises(ValueError):
+            registry.resolve(['a'])
+        with pytest.raises(KeyError):
+            registry.resolve(['does-not-exist'])
+        with pytest.raises(ValueError):
+            CheckerSpec('c', 'x:Y', cost='free')
+
+
+class TestEntryPoints:
+    """
+    测试：第三方检查器
+    
+    属性：入口点声明的检查器可以按名称运行，不需要修改 validators 包。
+    """
+    
+    def test_entry_point_checker(self, tmp_path):
+        """入口点中的检查器读取类属性声明的成本和依赖"""
+        site = make_plugin(tmp_path)
+        result = run_python(
+            "import json\n"
+            "from validators import registry\n"
+            "spec = registry.get('todo')\n"
+            "print(json.dumps([spec.cost, list(spec.depends), spec.help,\n"
+            "                  [s.name for s in registry.resolve(['todo'])]]))\n",
+            str(site),
+        )
+        assert result == ['cheap', ['existence'], '检查文档中遗留的 TODO', ['existence', 'todo']]
+    
+    def test_cli_runs_plugin(self, tmp_path):
+        """validate_docs.py --check 运行第三方检查器"""
+        site = make_plugin(tmp_path)
+        root = tmp_path / "project"
+        (root / "docs" / "zh").mkdir(parents=True)
+        (root / "docs" / "zh" / "guide.md").write_text("# 指南\n\nTODO: 补充示例\n", encoding='utf-8')
+        
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / 'validate_docs.py'), '--check', 'todo',
+             '--root', str(root), '--no-cache'],
+            capture_output=True, text=True, env={'PYTHONPATH': str(site)},
+        )
+        assert completed.returncode == 1
+        assert "TODO 检查报告" in completed.stdout
+        assert "文档 docs/zh/guide.md 行 3: 遗留 TODO" in completed.stdout
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+测试：流式报告
+验证 NDJSON、SARIF 和 JUnit 报告在检查完成时写出，且结果可以被标准解析器读取
+"""
+
+import json
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from validators.diagnostics import ERROR, WARNING, Diagnostic
+from validators.reports import (
+    JUnitReportWriter, NdjsonReportWriter, SarifReportWriter, REPORT_WRITERS,
+)
+from run_quality_assurance import QualityAssuranceRunner
+
+
+METADATA = {'started_at': '2026-01-01T00:00:00', 'root_dir': '.'}
+SUMMARY = {'finished_at': '2026-01-01T00:00:01', 'total_errors': 1}
+
+
+def sample_diagnostics():
+    """一个错误和一个警告"""
+    return (
+        [Diagnostic('links/broken-internal', ERROR, 'docs/zh/a b.md', 3, 5, ('x.md', 'docs/zh/x.md'))],
+        [Diagnostic('content/missing-title', WARNING, 'docs/zh/a b.md')],
+    )
+
+
+def write_report(writer_class, path: Path):
+    """写出包含两项检查的报告"""
+    errors, warnings = sample_diagnostics()
+    writer = writer_class(path)
+    writer.start(METADATA)
+    writer.write_check("链接有效性", False, errors, warnings, {'links': 1})
+    writer.write_check("文档存在性", True, [], [], {})
+    writer.finish(SUMMARY)
+
+
+class TestReportFormats:
+    """
+    测试：报告格式
+    
+    属性：每种格式都能被对应的标准解析器完整读取，并包含全部诊断。
+    """
+    
+    def test_ndjson_is_readable_while_running(self, tmp_path):
+        """每项检查完成后，已写出的行都是完整的 JSON 事件"""
+        errors, warnings = sample_diagnostics()
+        path = tmp_path / "report.ndjson"
+        writer = NdjsonReportWriter(path)
+        writer.start(METADATA)
+        writer.write_check("链接有效性", False, errors, warnings, {'links': 1})
+        
+        events = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert [event['type'] for event in events] == ['start', 'diagnostic', 'diagnostic', 'check']
+        assert events[1]['rule'] == 'links/broken-internal' and events[1]['check'] == "链接有效性"
+        assert events[3]['errors'] == 1 and events[3]['warnings'] == 1
+        
+        writer.finish(SUMMARY)
+        assert json.loads(path.read_text(encoding='utf-8').splitlines()[-1])['type'] == 'summary'
+    
+    def test_sarif(self, tmp_path):
+        """SARIF 报告是合法的 JSON，结果引用规则表中的规则"""
+        path = tmp_path / "report.sarif"
+        write_report(SarifReportWriter, path)
+        
+        report = json.loads(path.read_text(encoding='utf-8'))
+        run = report['runs'][0]
+        rules = [rule['id'] for rule in run['tool']['driver']['rules']]
+        assert report['version'] == '2.1.0'
+        assert [rules[result['ruleIndex']] for result in run['results']] == \
+            ['links/broken-internal', 'content/missing-title']
+        
+        location = run['results'][0]['locations'][0]['physicalLocation']
+        assert location['artifactLocation'] == {'uri': 'docs/zh/a%20b.md', 'uriBaseId': 'SRCROOT'}
+        assert location['region'] == {'startLine': 3, 'startColumn': 5}
+        assert run['results'][1]['level'] == 'warning'
+        assert run['properties'] == SUMMARY
+    
+    def test_junit(self, tmp_path):
+        """JUnit 报告中每项检查一个 testsuite，错误是失败的 testcase"""
+        path = tmp_path / "junit.xml"
+        write_report(JUnitReportWriter, path)
+        
+        suites = ET.parse(path).getroot().findall('testsuite')
+        assert [(s.get('name'), s.get('tests'), s.get('failures')) for s in suites] == [
+            ("链接有效性", '1', '1'), ("文档存在性", '1', '0'),
+        ]
+        failure = suites[0].find('testcase/failure')
+        assert failure.get('type') == 'links/broken-internal'
+        assert "缺少主标题" in suites[0].find('system-out').text
+    
+    @settings(max_examples=30, deadline=None)
+    @given(args=st.lists(st.text(max_size=20), min_size=2, max_size=2))
+    def test_arbitrary_message_text(self, tmp_path_factory, args):
+        """消息中的任意字符（引号、尖括号、控制字符）都不会破坏报告"""
+        tmp_path = tmp_path_factory.mktemp("reports")
+        errors = [Diagnostic('links/broken-internal', ERROR, 'docs/zh/a.md', 1, args=args)]
+        for writer_class in REPORT_WRITERS.values():
+            path = tmp_path / writer_class.FILENAME
+            writer = writer_class(path)
+            writer.start(METADATA)
+            writer.write_check("链接有效性", False, errors, [], {})
+            writer.finish(SUMMARY)
+        
+        ET.parse(tmp_path / JUnitReportWriter.FILENAME)
+        json.loads((tmp_path / SarifReportWriter.FILENAME).read_text(encoding='utf-8'))
+        for line in (tmp_path / NdjsonReportWriter.FILENAME).read_text(encoding='utf-8').splitlines():
+            json.loads(line)
+
+
+class TestStreaming:
+    """
+    测试：流式写出
+    
+    属性：写入器不保留已写出的诊断，内存占用与诊断数量无关。
+    """
+    
+    def test_memory_does_not_grow_with_diagnostics(self, tmp_path):
+        """逐个生成的大量诊断写出时只占用很少的内存"""
+        def generate(count):
+            for number in range(count):
+                yield Diagnostic('code/empty-block', WARNING, 'docs/zh/a.md', number + 1, args=(number,))
+        
+        for writer_class in REPORT_WRITERS.values():
+            writer = writer_class(tmp_path / writer_class.FILENAME)
+            writer.start(METADATA)
+            tracemalloc.start()
+            writer.write_check("代码示例", True, [], generate(50000), {})
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            writer.finish(SUMMARY)
+            # 5 万个诊断的消息文本约 3 MB，写入器不应把它们全部保存在内存中
+            assert peak < 1024 * 1024, (writer_class.__name__, peak)
+
+
+class TestQualityAssuranceReports:
+    """
+    测试：质量保证运行器
+    
+    属性：--report-format 选择的报告与 JSON 报告包含相同的检查结果。
+    """
+    
+    def test_runner_writes_selected_formats(self, tmp_path):
+        """运行器为每项检查写出一个 check 事件，并在结束时写出 summary"""
+        docs_dir = tmp_path / "docs" / "zh"
+        docs_dir.mkdir(parents=True)
+        (docs_dir / "guide.md").write_text("# 指南\n\n[链接](missing.md)\n", encoding='utf-8')
+        
+        runner = QualityAssuranceRunner(str(tmp_path), report_formats=['ndjson', 'sarif'])
+        runner.run_all_checks()
+        
+        report_dir = tmp_path / "scripts" / "tests"
+        events = [
+            json.loads(line)
+            for line in (report_dir / NdjsonReportWriter.FILENAME).read_text(encoding='utf-8').splitlines()
+        ]
+        checks = [event['check'] for event in events if event['type'] == 'check']
+        # 流式报告按执行顺序写出，JSON 报告按检查项的固定顺序排列
+        assert checks == [check.data[0] for check in runner.plan]
+        assert sorted(checks) == sorted(name for name, _, _ in QualityAssuranceRunner.CHECKS)
+        assert events[-1]['type'] == 'summary'
+        
+        legacy = json.loads((report_dir / "quality_assurance_report.json").read_text(encoding='utf-8'))
+        sarif = json.loads((report_dir / SarifReportWriter.FILENAME).read_text(encoding='utf-8'))
+        assert sum(1 for r in sarif['runs'][0]['results'] if r['level'] == 'error') == \
+            sum(len(result['errors']) for result in legacy['results'].values())
+        assert not (report_dir / JUnitReportWriter.FILENAME).exists()
+    
+    def test_streaming_run_keeps_only_counts(self, tmp_path):
+        """选择流式报告时运行器只保留计数和前 REPORT_LIMIT 条诊断，JSON 和 Markdown 报告仍然完整"""
+        docs_dir = tmp_path / "docs" / "zh"
+        docs_dir.mkdir(parents=True)
+        links = ''.join(f"[链接{index}](missing{index}.md)\n" for index in range(30))
+        (docs_dir / "guide.md").write_text(f"# 指南\n\n{links}", encoding='utf-8')
+        
+        runner = QualityAssuranceRunner(str(tmp_path), report_formats=['ndjson'])
+        runner.run_all_checks()
+        result = runner.results["链接有效性"]
+        assert result['error_count'] == 30
+        assert len(result['errors']) == QualityAssuranceRunner.REPORT_LIMIT
+        
+        report_dir = tmp_path / "scripts" / "tests"
+        report = json.loads((report_dir / "quality_assurance_report.json").read_text(encoding='utf-8'))
+        assert len(report['results']["链接有效性"]['errors']) == 30
+        assert report['summary']['total_errors'] == sum(r['error_count'] for r in runner.results.values())
+        assert list(report['results']) == list(runner.results)
+        markdown = (report_dir / "QUALITY_ASSURANCE_REPORT.md").read_text(encoding='utf-8')
+        assert "**错误** (30)" in markdown and "还有 10 个错误" in markdown
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+测试：在沙箱中执行代码块
+验证执行结果、资源上限、网络隔离、替身模块和执行结果缓存
+"""
+
+import os
+import pytest
+from pathlib import Path
+from validators import CodeExampleValidator, DocumentCorpus, ValidationCache
+from validators import sandbox
+from validators.sandbox import CodeExecutor, SandboxPool, is_self_contained, should_execute
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason="沙箱隔离依赖 fork")
+
+
+def make_doc(tmp_path: Path, body: str) -> Path:
+    """创建只包含一个文档的项目"""
+    docs_dir = tmp_path / "docs" / "zh"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "guide.md").write_text(f"# 指南\n\n{body}", encoding='utf-8')
+    return tmp_path
+
+
+def run_code(root: Path, cache=None, **kwargs) -> CodeExampleValidator:
+    """使用全新语料库以执行模式运行一次代码示例验证"""
+    checker = CodeExampleValidator(str(root), DocumentCorpus(str(root)), cache, execute=True, **kwargs)
+    checker.collect()
+    return checker
+
+
+class TestSelfContained:
+    """
+    测试：判断代码块能否独立运行
+    
+    属性：依赖上下文中未定义的名字、不可用的模块或交互输入的代码块不执行。
+    """
+    
+    def test_detection(self):
+        """自包含的代码块执行，依赖外部名字的代码块不执行"""
+        assert is_self_contained("import json\nprint(json.dumps({'a': 1}))\n")
+        assert is_self_contained("def f(x):\n    return [y for y in x]\nf([1])\n")
+        assert not is_self_contained("response = get_completion(prompt)\n")
+        assert not is_self_contained("import module_that_does_not_exist\n")
+        assert not is_self_contained("name = input('名字: ')\n")
+        assert not is_self_contained("import pdb; pdb.set_trace()\n")
+    
+    def test_tags(self):
+        """信息字符串中的标记优先于自动判断"""
+        assert should_execute("python exec", "print(undefined_name)\n")
+        assert not should_execute("python no-exec", "print(1)\n")
+        assert should_execute("python", "print(1)\n")
+
+
+class TestSandbox:
+    """
+    测试：沙箱执行
+    
+    属性：代码块在受限的子进程中执行，失败时报告文档中的行号，
+    相同的代码块在一次运行和持久化缓存中都只执行一次。
+    """
+    
+    def setup_method(self):
+        sandbox._MEMO.clear()
+    
+    def test_results(self):
+        """正常结束、抛出异常和超出时间上限分别返回对应的状态"""
+        pool = SandboxPool(1)
+        try:
+            assert pool.run("x = 1\n", 5, 10)['status'] == 'ok'
+            
+            result = pool.run("x = 1\n\nraise ValueError('坏了')\n", 5, 10)
+            assert result['status'] == 'error' and result['lineno'] == 3
+            assert result['message'] == "ValueError: 坏了"
+            
+            assert pool.run("while True:\n    pass\n", 1, 10)['status'] == 'timeout'
+            assert pool.run("import time\ntime.sleep(5)\n", 5, 0.5)['status'] == 'timeout'
+            
+            # 超时后工作进程仍然可用
+            assert pool.run("print('ok')\n", 5, 10)['status'] == 'ok'
+            assert len(pool._workers) == 1
+        finally:
+            pool.close()
+    
+    def test_isolation(self, tmp_path, monkeypatch):
+        """代码块不能访问网络，文件写入临时目录并在执行后删除，子进程中的修改不影响后续代码块"""
+        monkeypatch.setenv('TMPDIR', str(tmp_path))
+        pool = SandboxPool(1)
+        try:
+            result = pool.run("import socket\nsocket.create_connection(('example.com', 80))\n", 5, 10)
+            assert result['status'] == 'error' and result['lineno'] == 2
+            
+            assert pool.run("open('out.txt', 'w').write('x')\n", 5, 10)['status'] == 'ok'
+            assert pool.run("import sys\nsys.modules['json'] = None\n", 5, 10)['status'] == 'ok'
+            assert pool.run("import json\njson.dumps(1)\n", 5, 10)['status'] == 'ok'
+            assert pool.run("open('big.txt', 'w').write('x')\nwhile True:\n    pass\n", 1, 10)['status'] == 'timeout'
+            assert list(tmp_path.iterdir()) == []
+        finally:
+            pool.close()
+    
+    def test_stub_clients(self):
+        """anthropic 和 boto3 替身模块在本地返回回复，不需要凭证和网络"""
+        code = (
+            "import json, anthropic, boto3\n"
+            "client = anthropic.Anthropic()\n"
+            "message = client.messages.create(model='m', max_tokens=10,\n"
+            "                                 messages=[{'role': 'user', 'content': '你好'}])\n"
+            "assert message.content[0].text\n"
+            "runtime = boto3.client('bedrock-runtime')\n"
+            "body = json.loads(runtime.invoke_model(modelId='m', body='{}')['body'].read())\n"
+            "assert body['content'][0]['text']\n"
+            "for page in boto3.client('s3').get_paginator('list_objects_v2').paginate(Bucket='b'):\n"
+            "    page['Contents']\n"
+        )
+        assert CodeExecutor(jobs=1).result(code)['status'] == 'ok'
+    
+    def test_document_errors(self, tmp_path):
+        """执行失败的代码块报告为错误，行号换算为文档中的行号，不执行的代码块不报告"""
+        root = make_doc(tmp_path, (
+            "```python\nitems = [1, 2]\nprint(items[5])\n```\n\n"
+            "```python\nprint(get_completion('hi'))\n```\n\n"
+            "```python no-exec\nraise RuntimeError\n```\n"
+        ))
+        checker = run_code(root)
+        
+        assert [str(error) for error in checker.errors] == [
+            "文档 docs/zh/guide.md 行 5: 代码块 #1 执行失败: IndexError: list index out of range"
+        ]
+        assert checker.executor.executed == 1
+    
+    def test_timeout_is_warning(self, tmp_path):
+        """超出时间上限报告为警告"""
+        root = make_doc(tmp_path, "```python\nimport time\ntime.sleep(5)\n```\n")
+        checker = run_code(root, wall_limit=0.5)
+        
+        assert [str(error) for error in checker.errors] == []
+        assert any("执行超时" in str(warning) for warning in checker.warnings)
+    
+    def test_duplicate_and_cached_blocks_run_once(self, tmp_path):
+        """相同的代码块只执行一次，持久化缓存中已有的结果在新进程中直接复用"""
+        snippet = "```python\nprint(sum(range(10)))\n```\n\n"
+        root = make_doc(tmp_path, snippet * 5)
+        cache = ValidationCache(str(tmp_path / "cache"))
+        first = run_code(root, cache)
+        assert first.executor.executed == 1
+        
+        sandbox._MEMO.clear()
+        (root / "docs" / "zh" / "guide.md").write_text(f"# 新指南\n\n{snippet}", encoding='utf-8')
+        second = run_code(root, cache)
+        assert second.executor.executed == 0
+        assert second.errors == []
+    
+    def test_limits_change_cache_key(self):
+        """资源上限不同时不复用执行结果"""
+        assert CodeExecutor(wall_limit=1).key("x = 1\n") != CodeExecutor(wall_limit=2).key("x = 1\n")
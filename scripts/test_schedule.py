@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+测试：检查的调度和错误预算
+验证检查按预计耗时从低到高运行、依赖先于依赖它的检查，历史耗时保存在缓存目录中，
+错误数达到上限后其余检查被取消，并且仍然生成只包含已完成检查的报告
+"""
+
+import json
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from validators.cache import ValidationCache
+from validators.registry import COST_CLASSES, CheckerSpec
+from validators.schedule import CheckHistory, ErrorBudget, ScheduledCheck, schedule
+from run_quality_assurance import QualityAssuranceRunner
+
+
+def make_spec(name: str, cost: str = 'normal', depends=()) -> CheckerSpec:
+    return CheckerSpec(name, f'.{name}:Checker', cost=cost, depends=depends)
+
+
+def make_project(root: Path) -> Path:
+    """缺少必需文档（存在性检查报告错误）且有失效链接的文档树"""
+    docs = root / "docs" / "zh"
+    docs.mkdir(parents=True)
+    (docs / "guide.md").write_text("# 指南\n\n[链接](missing.md)\n", encoding='utf-8')
+    return root
+
+
+class TestSchedule:
+    """
+    测试：按预计耗时调度检查
+    
+    属性：没有历史耗时时按成本等级排列，成本相同的保持原有顺序；有历史耗时时按历史耗时排列；
+    任何情况下同一语言中被依赖的检查都排在依赖它的检查之前；历史耗时随缓存目录保存。
+    """
+    
+    def test_cost_classes_and_history(self, tmp_path):
+        specs = [make_spec('code', 'expensive'), make_spec('format'), make_spec('existence', 'cheap'),
+                 make_spec('links')]
+        history = CheckHistory()
+        order = [check.spec.name for check in schedule([ScheduledCheck(spec, 'zh') for spec in specs], history)]
+        assert order == ['existence', 'format', 'links', 'code']
+        
+        cache = ValidationCache(str(tmp_path / "cache"))
+        history = CheckHistory(cache)
+        history.record('links', 'zh', 0.001)
+        history.record('format', 'zh', 2.0)
+        history.record('format', 'zh', 4.0)
+        assert history.seconds['zh/format'] == 3.0
+        history.save()
+        reloaded = CheckHistory(ValidationCache(str(tmp_path / "cache")))
+        order = [check.spec.name for check in schedule([ScheduledCheck(spec, 'zh') for spec in specs], reloaded)]
+        assert order == ['links', 'existence', 'code', 'format']
+    
+    @settings(max_examples=100, deadline=None)
+    @given(costs=st.lists(st.sampled_from(COST_CLASSES), min_size=1, max_size=6), data=st.data())
+    def test_dependencies_first(self, costs, data):
+        """随机的成本和依赖（只依赖排在前面的检查器，不成环）下，依赖总是先运行"""
+        specs = []
+        for index, cost in enumerate(costs):
+            depends = data.draw(st.lists(st.sampled_from([spec.name for spec in specs]), unique=True)) \
+                if specs else []
+            specs.append(make_spec(f"check{index}", cost, depends))
+        checks = [ScheduledCheck(spec, locale) for locale in ('zh', 'en') for spec in specs]
+        order = [(check.spec.name, check.locale) for check in schedule(checks, CheckHistory())]
+        assert sorted(order) == sorted((check.spec.name, check.locale) for check in checks)
+        for spec in specs:
+            for locale in ('zh', 'en'):
+                for dependency in spec.depends:
+                    assert order.index((dependency, locale)) < order.index((spec.name, locale))
+
+
+class TestErrorBudget:
+    """
+    测试：错误预算
+    
+    属性：没有上限时从不用尽；上限为 1 时第一个报告错误的检查之后取消其余检查，
+    报告只包含已完成的检查并列出被取消的检查；串行和并行运行的结果相同。
+    """
+    
+    def test_budget(self):
+        budget = ErrorBudget()
+        budget.spend(1000)
+        assert not budget.exhausted
+        budget = ErrorBudget(3)
+        budget.spend(2)
+        assert not budget.exhausted
+        budget.spend(1)
+        assert budget.exhausted
+    
+    def test_fail_fast_partial_report(self, tmp_path):
+        """存在性检查报告错误后，其余检查都不运行"""
+        root = make_project(tmp_path)
+        reports = []
+        for jobs in (1, 2):
+            runner = QualityAssuranceRunner(str(root), jobs=jobs, max_errors=1)
+            assert runner.run_all_checks() is False
+            assert list(runner.results) == ["文档存在性"]
+            assert len(runner.cancelled) == len(QualityAssuranceRunner.CHECKS) - 1
+            assert runner.cancelled[-1] == "代码示例"
+            report_dir = root / "scripts" / "tests"
+            reports.append(json.loads((report_dir / "quality_assurance_report.json").read_text(encoding='utf-8')))
+            assert "**已取消**" in (report_dir / "QUALITY_ASSURANCE_REPORT.md").read_text(encoding='utf-8')
+        
+        serial, parallel = reports
+        assert serial['summary']['cancelled_checks'] == runner.cancelled
+        assert serial['summary']['total_checks'] == 1
+        assert serial['results']["文档存在性"]['errors'] == parallel['results']["文档存在性"]['errors']
+        assert parallel['summary']['cancelled_checks'] == serial['summary']['cancelled_checks']
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+测试：分片运行和部分报告的合并
+验证文档按稳定哈希和文件大小确定地划分，路径索引可以保存后共用，
+各分片的部分报告（JSON 或 NDJSON）合并后与不分片运行的结果相同，分片不齐全时拒绝合并
+"""
+
+import json
+import random
+import shutil
+from pathlib import Path
+import pytest
+from hypothesis import given, settings, strategies as st
+from validators.pathindex import PathIndex, shared_index
+from validators.shard import Shard, partition
+from validators.synthetic import CorpusSpec, generate_corpus
+from run_quality_assurance import QualityAssuranceRunner, merge_main
+
+
+def make_project(root: Path) -> Path:
+    """有错误和警告的合成中文文档树，外加由它复制而来的英文文档树"""
+    generate_corpus(root, CorpusSpec(documents=30, error_rate=0.1))
+    shutil.copytree(root / "docs" / "zh", root / "docs" / "en")
+    return root
+
+
+def findings(results: dict) -> dict:
+    """每项检查的状态、统计和诊断（按报告中的顺序，报告只显示前 20 个）"""
+    return {
+        name: (result['success'], result['stats'], result['errors'], result['warnings'])
+        for name, result in results.items()
+    }
+
+
+class TestPartition:
+    """
+    测试：文档的划分
+    
+    属性：每个文档恰好属于一个分片；划分与输入顺序无关；
+    每个分片的总大小与平均值之差不超过最大的一个文件。
+    """
+    
+    @settings(max_examples=200, deadline=None)
+    @given(sizes=st.dictionaries(st.text(alphabet='abc/._', min_size=1, max_size=8),
+                                 st.integers(min_value=0, max_value=10000), min_size=1, max_size=40),
+           count=st.integers(min_value=1, max_value=6), seed=st.integers(min_value=0))
+    def test_partition(self, sizes, count, seed):
+        keys = list(sizes)
+        shards = dict(zip(keys, partition(keys, [sizes[key] for key in keys], count)))
+        assert all(0 <= shard < count for shard in shards.values())
+        
+        random.Random(seed).shuffle(keys)
+        assert dict(zip(keys, partition(keys, [sizes[key] for key in keys], count))) == shards
+        
+        weights = {key: max(size, 1) for key, size in sizes.items()}
+        average = sum(weights.values()) / count
+        for index in range(count):
+            total = sum(weights[key] for key, shard in shards.items() if shard == index)
+            assert abs(total - average) <= max(weights.values())
+    
+    def test_parse(self):
+        assert Shard.parse("2/4") == Shard(2, 4)
+        assert Shard(2, 4).suffix == "shard-2-of-4" and str(Shard(2, 4)) == "2/4"
+        for text in ("0/4", "5/4", "2", "a/4", "1/0"):
+            with pytest.raises(ValueError):
+                Shard.parse(text)
+    
+    def test_owns(self):
+        """每项汇总类检查恰好由一个分片运行"""
+        for locale in ('zh', 'en'):
+            for name in ('existence', 'structure', 'duplicates'):
+                assert sum(Shard(index, 3).owns(name, locale) for index in (1, 2, 3)) == 1
+
+
+class TestSharedPathIndex:
+    """
+    测试：保存和读取路径索引
+    
+    属性：读取的索引与遍历得到的索引包含相同的文件、目录和文件大小；文件不存在时遍历并写入。
+    """
+    
+    def test_round_trip(self, tmp_path):
+        (tmp_path / "docs" / "zh").mkdir(parents=True)
+        (tmp_path / "docs" / "zh" / "a.md").write_text("# A\n", encoding='utf-8')
+        (tmp_path / "README.md").write_text("x" * 100, encoding='utf-8')
+        index_file = str(tmp_path / "index.json")
+        
+        scanned = shared_index(index_file, str(tmp_path))
+        loaded = PathIndex.load(index_file, str(tmp_path))
+        assert loaded.files == scanned.files and loaded.dirs == scanned.dirs
+        assert loaded.size("README.md") == 100 and loaded.size("docs/zh/a.md") == 4
+        
+        # 文件改动后，读取的索引仍然保留预先计算的大小，各分片看到的划分一致
+        (tmp_path / "README.md").write_text("x", encoding='utf-8')
+        assert shared_index(index_file, str(tmp_path)).size("README.md") == 100
+
+
+class TestShardedRun:
+    """
+    测试：分片运行和合并
+    
+    属性：三个分片的部分报告合并后，每项检查的状态、统计和诊断（包括顺序）与不分片运行相同，
+    从 JSON 和 NDJSON 部分报告合并的结果相同；缺少分片时合并失败。
+    """
+    
+    def test_merge_matches_unsharded(self, tmp_path):
+        root = make_project(tmp_path)
+        report_dir = root / "scripts" / "tests"
+        QualityAssuranceRunner(str(root)).run_all_checks()
+        unsharded = json.loads((report_dir / "quality_assurance_report.json").read_text(encoding='utf-8'))
+        
+        path_index = shared_index(str(tmp_path / "index.json"), str(root))
+        for index in (1, 2, 3):
+            runner = QualityAssuranceRunner(str(root), jobs=2 if index == 2 else 1, report_formats=['ndjson'],
+                                            shard=Shard(index, 3), path_index=path_index)
+            runner.run_all_checks()
+            assert len(runner.plan) < len(QualityAssuranceRunner.CHECKS) * 2
+        
+        merged = []
+        for suffix in ('json', 'ndjson'):
+            reports = sorted(str(path) for path in report_dir.glob(f"*.shard-*-of-3.{suffix}"))
+            assert len(reports) == 3
+            assert merge_main(['--root', str(root)] + reports) == 1
+            merged.append(json.loads((report_dir / "quality_assurance_report.json").read_text(encoding='utf-8')))
+            
+            with pytest.raises(ValueError):
+                QualityAssuranceRunner.merge(reports[:2], str(root))
+            assert merge_main(['--root', str(root)] + reports[1:]) == 2
+        
+        for report in merged:
+            assert list(report['results']) == list(unsharded['results'])
+            assert findings(report['results']) == findings(unsharded['results'])
+            assert report['summary'] == unsharded['summary']
+            assert report['locales'] == unsharded['locales']
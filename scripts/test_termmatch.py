@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+属性测试：多模式术语匹配
+验证 Aho-Corasick 自动机的匹配结果与逐个术语查找的结果一致
+"""
+
+from hypothesis import given, strategies as st, settings
+from pathlib import Path
+from validators import DocumentCorpus, TerminologyChecker
+from validators.termmatch import TermMatcher
+
+
+# 获取项目根目录（从 scripts/ 目录向上一级）
+ROOT_DIR = Path(__file__).parent.parent
+
+# 使用小字母表以便产生大量重叠和前缀关系
+ALPHABET = "ab提示工程\n"
+
+
+def naive_find_all(text, term):
+    """与 str.count() 一致的逐个查找：同一术语的出现互不重叠"""
+    starts = []
+    start = text.find(term)
+    while start != -1:
+        starts.append(start)
+        start = text.find(term, start + len(term))
+    return starts
+
+
+class TestTermMatcher:
+    """
+    属性测试：多模式匹配
+    
+    属性：对于任何术语集合和文本，每个术语的匹配位置应与逐个 str.find() 查找完全相同。
+    """
+    
+    @given(
+        terms=st.lists(st.text(alphabet=ALPHABET, min_size=1, max_size=4), max_size=12),
+        text=st.text(alphabet=ALPHABET, max_size=200),
+    )
+    @settings(max_examples=200, deadline=None)
+    def test_matches_equal_naive_search(self, terms, text):
+        """每个术语的起始位置与 str.find() 循环一致，计数与 str.count() 一致"""
+        matcher = TermMatcher(terms)
+        found = {}
+        for start, term in matcher.find_all(text):
+            found.setdefault(term, []).append(start)
+        
+        for term in set(terms):
+            assert found.get(term, []) == naive_find_all(text, term), term
+            assert matcher.count(text).get(term, 0) == text.count(term)
+    
+    def test_overlapping_terms(self):
+        """互为前缀或后缀的不同术语各自计数"""
+        matcher = TermMatcher(["提示", "提示工程", "工程", "示工"])
+        assert sorted(matcher.find_all("提示工程")) == [
+            (0, "提示"), (0, "提示工程"), (1, "示工"), (2, "工程"),
+        ]
+    
+    def test_terminology_positions(self):
+        """术语检查器记录的每个位置都指向该术语在文档中的实际出现处"""
+        corpus = DocumentCorpus(str(ROOT_DIR))
+        checker = TerminologyChecker(str(ROOT_DIR), corpus)
+        checker.run()
+        
+        for term, positions in checker.term_positions.items():
+            for rel_path, line, col in positions:
+                doc = corpus.get(rel_path)
+                assert doc.lines[line - 1][col - 1:].startswith(term)
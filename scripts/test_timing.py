@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+测试：耗时统计
+验证检查器的耗时、每个文件和每条规则的耗时被记录，并出现在质量保证报告中
+"""
+
+import json
+import pstats
+import subprocess
+import sys
+from pathlib import Path
+from validators import CodeExampleValidator, DocumentCorpus, LinkValidator, TerminologyChecker
+from validators.parallel import ParallelCheckExecutor
+from validators.synthetic import CorpusSpec, generate_corpus
+from validators.timing import CheckTimings, slowest_files, slowest_rules
+from run_quality_assurance import QualityAssuranceRunner
+
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def make_project(root: Path) -> Path:
+    """生成包含失效链接和代码块的小型合成文档树"""
+    generate_corpus(root, CorpusSpec(documents=30, error_rate=0.05))
+    return root
+
+
+def timed_checker(checker_class, root: Path):
+    """启用耗时统计运行检查器"""
+    checker = checker_class(str(root), DocumentCorpus(str(root)))
+    checker.timings = CheckTimings()
+    checker.collect()
+    return checker
+
+
+class TestCheckTimings:
+    """
+    测试：耗时统计的记录与合并
+    
+    属性：启用统计不改变检查结果；每个检查的文档都有耗时记录，规则耗时不超过检查器的总耗时。
+    """
+    
+    def test_per_document_checker(self, tmp_path):
+        """逐文档检查器记录每个文件的耗时、扫描的字节数和规则耗时"""
+        root = make_project(tmp_path)
+        checker = timed_checker(LinkValidator, root)
+        plain = LinkValidator(str(root), DocumentCorpus(str(root)))
+        plain.collect()
+        
+        timings = checker.timings
+        assert checker.errors == plain.errors and checker.warnings == plain.warnings
+        assert set(timings.files) == {doc.rel_path for doc in map(checker.corpus.load, checker.document_paths())}
+        assert timings.bytes == sum(path.stat().st_size for path in checker.document_paths())
+        assert set(timings.rules) == {'links/broken-internal', 'links/broken-anchor'}
+        assert 0 < sum(timings.rules.values()) <= sum(timings.files.values()) <= timings.wall
+    
+    def test_corpus_checker_and_code_rules(self, tmp_path):
+        """汇总类检查器自行记录每个文档的耗时，代码检查把语法分析计入 code/syntax-error"""
+        root = make_project(tmp_path)
+        terminology = timed_checker(TerminologyChecker, root)
+        assert len(terminology.timings.files) == 30 and terminology.timings.cpu > 0
+        code = timed_checker(CodeExampleValidator, root)
+        assert list(code.timings.rules) == ['code/syntax-error']
+    
+    def test_merge_and_top(self):
+        """合并分区时墙钟时间取最大值；最慢的文件按所有检查合计排序"""
+        first, second = CheckTimings(), CheckTimings()
+        first.wall, second.wall = 2.0, 3.0
+        first.add_file('a.md', 1.0, 10)
+        second.add_file('b.md', 2.5, 20)
+        second.rules['links/broken-anchor'] = 0.5
+        first.merge(second)
+        assert (first.wall, first.bytes, first.files) == (3.0, 30, {'a.md': 1.0, 'b.md': 2.5})
+        assert first.to_dict(top=1)['slowest_files'] == [{'path': 'b.md', 'seconds': 2.5}]
+        
+        other = CheckTimings()
+        other.add_file('a.md', 2.0, 10)
+        assert [entry['path'] for entry in slowest_files({'x': first, 'y': other})] == ['a.md', 'b.md']
+        assert slowest_files({'x': first, 'y': other})[0]['checks'] == {'x': 1.0, 'y': 2.0}
+        assert slowest_rules({'x': first}) == [{'rule': 'links/broken-anchor', 'check': 'x', 'seconds': 0.5}]
+    
+    def test_parallel_partitions(self, tmp_path):
+        """并行执行时各分区的耗时统计被合并"""
+        root = make_project(tmp_path)
+        executor = ParallelCheckExecutor(str(root), jobs=2, timings=True)
+        try:
+            executor.submit(LinkValidator)
+            result = executor.collect(LinkValidator)
+        finally:
+            executor.shutdown()
+        assert len(result['timings'].files) == 31  # docs/zh 下的文档和 README
+        assert result['timings'].wall > 0
+
+
+class TestReports:
+    """
+    测试：报告中的性能分析
+    
+    属性：Markdown 和 JSON 报告列出每项检查的耗时以及最慢的文件和规则。
+    """
+    
+    def test_reports_include_timings(self, tmp_path):
+        """每项检查都有耗时，最慢的文件按 top 截断"""
+        root = make_project(tmp_path)
+        runner = QualityAssuranceRunner(str(root), top=3)
+        runner.run_all_checks()
+        
+        report_dir = root / "scripts" / "tests"
+        report = json.loads((report_dir / "quality_assurance_report.json").read_text(encoding='utf-8'))
+        for name, _, _ in QualityAssuranceRunner.CHECKS:
+            assert report['results'][name]['timings']['wall_seconds'] >= 0
+        assert len(report['performance']['slowest_files']) == 3
+        assert report['performance']['slowest_rules'][0]['rule'].startswith(('links/', 'code/'))
+        
+        markdown = (report_dir / "QUALITY_ASSURANCE_REPORT.md").read_text(encoding='utf-8')
+        assert "## 性能分析" in markdown
+        assert "### 最慢的文件（前 3 个）" in markdown
+        assert report['performance']['slowest_files'][0]['path'] in markdown
+    
+    def test_profile_dump(self, tmp_path):
+        """--profile 写出可以被 pstats 读取的数据"""
+        root = make_project(tmp_path / "project")
+        profile = tmp_path / "qa.prof"
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / 'run_quality_assurance.py'), '--root', str(root),
+             '--no-cache', '--profile', str(profile)],
+            capture_output=True, text=True, timeout=120,
+        )
+        assert completed.returncode in (0, 1), completed.stderr
+        stats = pstats.Stats(str(profile))
+        assert any(function[2] == 'run_all_checks' for function in stats.stats)
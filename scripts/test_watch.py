@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+测试：监视模式
+验证文件改动的检测，以及增量验证的结果与重新完整验证的结果一致
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from hypothesis import given, settings, strategies as st
+from validators import DocumentCorpus, DocumentExistenceChecker, LinkValidator, MarkdownFormatChecker
+from validators.watch import FileWatcher, WatchSession
+
+
+CHECKER_CLASSES = [DocumentExistenceChecker, MarkdownFormatChecker, LinkValidator]
+
+# 随机改动时使用的文档内容
+CONTENTS = [
+    "# A\n\n[B](b.md)\n",
+    "# B\n\n[C](c.md#c)\n",
+    "#没有空格\n",
+    "# C\n\n[A](a.md) [D](sub/d.md)\n",
+    "# D\n",
+]
+
+
+def make_docs(root: Path) -> Path:
+    """创建三个互相链接的文档和一个 README"""
+    docs_dir = root / "docs" / "zh"
+    docs_dir.mkdir(parents=True)
+    (docs_dir / "a.md").write_text(CONTENTS[0], encoding='utf-8')
+    (docs_dir / "b.md").write_text(CONTENTS[1], encoding='utf-8')
+    (docs_dir / "c.md").write_text("# C\n", encoding='utf-8')
+    (root / "README.md").write_text("# 项目\n\n[B](docs/zh/b.md)\n", encoding='utf-8')
+    return root
+
+
+def make_session(root: Path) -> WatchSession:
+    """创建监视会话并完成首次验证"""
+    corpus = DocumentCorpus(str(root))
+    session = WatchSession(corpus, [
+        (lambda checker_class=checker_class: checker_class(str(root), corpus))
+        for checker_class in CHECKER_CLASSES
+    ])
+    session.run_all()
+    return session
+
+
+def cold_run(root: Path):
+    """在新的语料库上完整验证，返回 (错误, 警告)"""
+    corpus = DocumentCorpus(str(root))
+    errors, warnings = [], []
+    for checker_class in CHECKER_CLASSES:
+        checker = checker_class(str(root), corpus)
+        checker.collect()
+        errors += checker.errors
+        warnings += checker.warnings
+    return errors, warnings
+
+
+class TestFileWatcher:
+    """
+    测试：文件改动检测
+    
+    属性：每次轮询报告自上次轮询以来新增、修改和删除的文件，目录不作为文件报告。
+    """
+    
+    def test_poll_reports_changes(self, tmp_path):
+        """新增、修改和删除分别出现在对应的集合中"""
+        root = make_docs(tmp_path)
+        docs_dir = root / "docs" / "zh"
+        watcher = FileWatcher([docs_dir], [root / "README.md", docs_dir])
+        assert watcher.poll() == (set(), set())
+        
+        (docs_dir / "a.md").write_text("# A\n\n修改后的内容\n", encoding='utf-8')
+        (docs_dir / "sub").mkdir()
+        (docs_dir / "sub" / "d.md").write_text("# D\n", encoding='utf-8')
+        (docs_dir / "c.md").unlink()
+        
+        assert watcher.poll() == ({docs_dir / "a.md", docs_dir / "sub" / "d.md"}, {docs_dir / "c.md"})
+        assert watcher.poll() == (set(), set())
+
+
+class TestWatchSession:
+    """
+    测试：增量验证
+    
+    属性：改动文档及链接指向它们的文档被重新检查，结果与重新完整验证一致。
+    """
+    
+    def test_deleted_target_reports_referrers(self, tmp_path):
+        """删除被链接的文档后，引用它的文档报告失效链接；恢复后问题解决"""
+        root = make_docs(tmp_path)
+        session = make_session(root)
+        target = root / "docs" / "zh" / "b.md"
+        
+        target.unlink()
+        reported, resolved = session.update(set(), {target})
+        assert sorted(d.path for d in reported if d.rule == 'links/broken-internal') == \
+            ['README.md', 'docs/zh/a.md']
+        assert resolved == 0
+        
+        target.write_text(CONTENTS[1], encoding='utf-8')
+        reported, resolved = session.update({target}, set())
+        assert reported == [] and resolved == 2
+        assert session.diagnostics() == cold_run(root)
+    
+    def test_anchor_change_revalidates_referrers(self, tmp_path):
+        """目标文档的标题改变后，指向其锚点的链接被重新检查"""
+        root = make_docs(tmp_path)
+        session = make_session(root)
+        target = root / "docs" / "zh" / "c.md"
+        
+        target.write_text("# 其他标题\n", encoding='utf-8')
+        reported, _ = session.update({target}, set())
+        assert [(d.rule, d.path) for d in reported] == [('links/broken-anchor', 'docs/zh/b.md')]
+    
+    @settings(max_examples=25, deadline=None)
+    @given(edits=st.lists(
+        st.tuples(
+            st.sampled_from(["a.md", "b.md", "c.md", "sub/d.md"]),
+            st.one_of(st.none(), st.sampled_from(CONTENTS)),
+        ),
+        min_size=1, max_size=6,
+    ))
+    def test_incremental_equals_cold_run(self, edits):
+        """任意顺序的新增、修改和删除之后，增量结果与完整验证结果相同"""
+        root = Path(tempfile.mkdtemp())
+        try:
+            make_docs(root)
+            session = make_session(root)
+            for name, content in edits:
+                path = root / "docs" / "zh" / name
+                if content is None:
+                    if not path.exists():
+                        continue
+                    path.unlink()
+                    session.update(set(), {path})
+                else:
+                    path.parent.mkdir(exist_ok=True)
+                    path.write_text(content, encoding='utf-8')
+                    session.update({path}, set())
+                assert session.diagnostics() == cold_run(root)
+        finally:
+            shutil.rmtree(root)
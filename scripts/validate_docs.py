@@ -5,16 +5,59 @@
 """
 
 import sys
+import time
 import argparse
-from validators import (
-    DocumentExistenceChecker,
-    DocumentContentChecker,
-    CodeExampleValidator,
-    MarkdownFormatChecker,
-    DocumentStructureChecker,
-    TerminologyChecker,
-    LinkValidator,
-)
+import functools
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+from validators import DocumentCorpus, ValidationCache, diagnostics, registry
+from validators.cache import DEFAULT_CACHE_DIR
+from validators.corpus import SOURCE_LOCALE
+
+if TYPE_CHECKING:
+    from validators.changes import ChangeSet
+    from validators.shard import Shard
+
+
+def run_check(checker, change_set: Optional['ChangeSet'], shard: Optional['Shard'] = None) -> bool:
+    """运行单个检查；增量模式下只检查受影响的文档，不受影响的检查直接跳过；
+    分片运行时逐文档检查器只检查属于本分片的文档"""
+    if change_set is None and (shard is None or not checker.PER_DOCUMENT):
+        return checker.check()
+    
+    if checker.PER_DOCUMENT:
+        paths = checker.document_paths()
+        # 先在全部文档上划分分片，划分才与改动无关
+        if shard is not None:
+            paths = shard.select(paths, checker.corpus.path_index)
+        if change_set is not None:
+            paths = change_set.select(paths)
+        if not paths:
+            reason = "没有受影响的文档" if change_set is not None else "本分片没有要检查的文档"
+            print(f"\n跳过 {checker.REPORT_TITLE}：{reason}")
+            return True
+        checker.run_documents(paths)
+        return checker.print_report(checker.REPORT_TITLE)
+    
+    if not change_set.affects(checker):
+        print(f"\n跳过 {checker.REPORT_TITLE}：改动不影响该检查")
+        return True
+    return checker.check()
+
+
+def watch(corpus: DocumentCorpus, factories, interval: Optional[float]):
+    """监视模式：完整验证一次，之后在每次文档改动后增量验证，直到 Ctrl+C"""
+    from validators.watch import DEFAULT_INTERVAL, WatchSession
+    interval = interval if interval is not None else DEFAULT_INTERVAL
+    session = WatchSession(corpus, factories)
+    watcher = session.file_watcher()
+    session.run_all()
+    print(f"\n监视 {corpus.docs_dir} 中的改动（每 {interval} 秒检查一次，Ctrl+C 退出）...")
+    try:
+        session.watch(watcher, interval)
+    except KeyboardInterrupt:
+        print()
+        sys.exit(0)
 
 
 def main():
@@ -32,64 +75,206 @@ def main():
   
   # 指定项目根目录
   python scripts/validate_docs.py --all --root /path/to/project
+  
+  # 只验证英文文档（docs/en）；默认验证 docs/ 下的所有语言
+  python scripts/validate_docs.py --all --locale en
+  
+  # 只验证相对 main 分支改动的文档
+  python scripts/validate_docs.py --all --changed-since main
+  
+  # 发现第一个错误后立即停止（先运行最便宜的检查）
+  python scripts/validate_docs.py --all --fail-fast
+  
+  # 在 4 台 CI 机器上分片验证（各分片共用预先计算的路径索引）
+  python scripts/validate_docs.py --all --shard 2/4 --path-index path-index.json
+  
+  # 在沙箱中执行可以独立运行的 Python 代码块
+  python scripts/validate_docs.py --code --execute
+  
+  # 额外检查外部链接是否可以访问（需要网络）
+  python scripts/validate_docs.py --links --links-external
+  
+  # 监视模式：保存文档后只重新验证受影响的文档
+  python scripts/validate_docs.py --all --watch
+  
+  # 作为语言服务器运行（由编辑器启动，通过标准输入输出通信）
+  python scripts/validate_docs.py --lsp --root /path/to/project
         """
     )
     
     parser.add_argument('--root', default='.', help='项目根目录路径')
     parser.add_argument('--all', action='store_true', help='运行所有检查')
-    parser.add_argument('--existence', action='store_true', help='检查文档存在性')
-    parser.add_argument('--content', action='store_true', help='检查文档内容完整性')
-    parser.add_argument('--code', action='store_true', help='验证代码示例')
-    parser.add_argument('--format', action='store_true', help='检查 Markdown 格式')
-    parser.add_argument('--structure', action='store_true', help='检查文档结构一致性')
-    parser.add_argument('--terminology', action='store_true', help='检查术语一致性')
-    parser.add_argument('--links', action='store_true', help='验证链接')
+    # 每个内置检查器一个开关，检查器模块只在被选中时导入
+    for spec in registry.BUILTIN_CHECKERS:
+        parser.add_argument(f'--{spec.name}', action='store_true', help=spec.help)
+    parser.add_argument('--check', action='append', default=[], metavar='NAME',
+                        help='按名称运行检查器（可重复，包括通过入口点注册的第三方检查器）')
+    parser.add_argument('--list-checks', action='store_true', help='列出所有可用的检查器')
+    parser.add_argument('--execute', action='store_true',
+                        help='代码示例验证时在沙箱中执行可以独立运行的 Python 代码块')
+    parser.add_argument('--execute-cpu', type=float, default=None, metavar='SECONDS',
+                        help='每个代码块的 CPU 时间上限（默认: 5 秒）')
+    parser.add_argument('--execute-timeout', type=float, default=None, metavar='SECONDS',
+                        help='每个代码块的墙钟时间上限（默认: 10 秒）')
+    parser.add_argument('--links-external-ttl', type=float, default=None, metavar='SECONDS',
+                        help='外部链接探测结果的缓存有效期（默认: 86400 秒）')
+    parser.add_argument('--links-external-per-host', type=int, default=None, metavar='N',
+                        help='每个主机的最大并发请求数（默认: 4）')
+    parser.add_argument('--duplicates-threshold', type=float, default=None, metavar='RATIO',
+                        help='近似重复检查的相似度阈值（默认: 0.8）')
+    parser.add_argument('--locale', action='append', default=[], metavar='LOCALE',
+                        help='要验证的文档语言（docs/<LOCALE>），可重复（默认: docs/ 下的所有语言目录；'
+                             '--watch 和 --lsp 默认只使用源语言）')
+    parser.add_argument('--changed-since', metavar='REV', default=None,
+                        help='只验证自 REV 以来改动的文档及链接指向它们的文档')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='任何检查报告错误后不再运行其余检查（等同于 --max-errors 1）')
+    parser.add_argument('--max-errors', type=int, default=None, metavar='N',
+                        help='累计错误数达到 N 后不再运行其余检查')
+    parser.add_argument('--shard', metavar='I/N', default=None,
+                        help='只验证 N 个分片中的第 I 个（从 1 开始）：逐文档检查按文件划分，'
+                             '其他检查整项分给一个分片')
+    parser.add_argument('--path-index', metavar='FILE', default=None,
+                        help='所有分片共用的预先计算的路径索引（文件不存在时遍历仓库并写入）')
+    parser.add_argument('--watch', action='store_true',
+                        help='完整验证后继续监视文档改动，只重新验证受影响的文档（Ctrl+C 退出）')
+    parser.add_argument('--watch-interval', type=float, default=None, metavar='SECONDS',
+                        help='监视模式下检查文件改动的间隔（默认: 0.05 秒）')
+    parser.add_argument('--lsp', action='store_true',
+                        help='作为语言服务器（LSP）在标准输入输出上运行，为编辑器中打开的文档实时发布诊断')
+    parser.add_argument('--message-lang', choices=sorted(diagnostics.MESSAGES),
+                        default=diagnostics.DEFAULT_LOCALE, help='报告消息的语言（默认: zh）')
+    parser.add_argument('--no-cache', action='store_true', help='禁用增量验证缓存')
+    parser.add_argument('--cache-dir', default=None,
+                        help=f'缓存目录（默认: <root>/{DEFAULT_CACHE_DIR}）')
     
     args = parser.parse_args()
+    diagnostics.set_locale(args.message_lang)
     
-    # 如果没有指定任何检查，默认运行所有检查
-    if not any([args.all, args.existence, args.content, args.code, 
-                args.format, args.structure, args.terminology, args.links]):
-        args.all = True
+    if args.list_checks:
+        for spec in registry.available():
+            print(f"{spec.name:<16} {spec.cost:<10} {spec.help}")
+        sys.exit(0)
+    
+    # 选中的检查器名称；如果没有指定任何检查，默认运行所有检查
+    names = [spec.name for spec in registry.BUILTIN_CHECKERS if getattr(args, spec.dest)]
+    names += args.check
+    if args.all or not names:
+        names = [spec.name for spec in registry.defaults()] + names
+    try:
+        selected_checks = registry.resolve(names)
+    except KeyError as e:
+        parser.error(f"未知的检查器: {e.args[0]}（使用 --list-checks 查看可用的检查器）")
+    if args.watch and args.changed_since:
+        parser.error("--watch 不能与 --changed-since 同时使用")
+    if args.lsp and (args.watch or args.changed_since):
+        parser.error("--lsp 不能与 --watch 或 --changed-since 同时使用")
+    if (args.watch or args.lsp) and len(set(args.locale)) > 1:
+        parser.error("--watch 和 --lsp 只能用于一种语言")
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors 必须大于 0")
+    shard = None
+    if args.shard:
+        if args.watch or args.lsp:
+            parser.error("--shard 不能与 --watch 或 --lsp 同时使用")
+        from validators.shard import Shard
+        try:
+            shard = Shard.parse(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
     
     root_dir = args.root
     all_success = True
     
-    # 运行选定的检查
-    if args.all or args.existence:
-        checker = DocumentExistenceChecker(root_dir)
-        success = checker.check()
-        all_success = all_success and success
-    
-    if args.all or args.content:
-        checker = DocumentContentChecker(root_dir)
-        success = checker.check()
-        all_success = all_success and success
-    
-    if args.all or args.code:
-        checker = CodeExampleValidator(root_dir)
-        success = checker.check()
-        all_success = all_success and success
-    
-    if args.all or args.format:
-        checker = MarkdownFormatChecker(root_dir)
-        success = checker.check()
-        all_success = all_success and success
-    
-    if args.all or args.structure:
-        checker = DocumentStructureChecker(root_dir)
-        success = checker.check()
-        all_success = all_success and success
-    
-    if args.all or args.terminology:
-        checker = TerminologyChecker(root_dir)
-        success = checker.check()
-        all_success = all_success and success
-    
-    if args.all or args.links:
-        checker = LinkValidator(root_dir)
-        success = checker.check()
-        all_success = all_success and success
+    # 所有检查和所有语言共享同一个路径索引和已加载的文档，每个文档只读取一次；
+    # 分片运行时所有分片共用同一个预先计算的路径索引，链接目标按完整的仓库判断
+    path_index = None
+    if args.path_index:
+        from validators.pathindex import shared_index
+        path_index = shared_index(args.path_index, root_dir)
+    corpus = DocumentCorpus(root_dir, path_index)
+    if args.locale:
+        locales = list(dict.fromkeys(args.locale))
+    elif args.watch or args.lsp:
+        locales = [SOURCE_LOCALE]
+    else:
+        discovered = corpus.locales()
+        locales = discovered if SOURCE_LOCALE in discovered else [SOURCE_LOCALE] + discovered
+    corpus = corpus.for_locale(locales[0])
+    
+    # 未修改的文档直接复用上次的检查结果（语言服务器每次按键都会检查，不写入缓存）
+    cache = None
+    if not args.no_cache and not args.lsp:
+        cache = ValidationCache(args.cache_dir or Path(root_dir) / DEFAULT_CACHE_DIR)
+    
+    # 增量模式：只验证自指定修订版本以来改动的文档及链接指向它们的文档
+    change_set = None
+    if args.changed_since:
+        from validators.changes import ChangeSet
+        change_set = ChangeSet.since(root_dir, args.changed_since)
+        if change_set is None:
+            print(f"⚠️  无法解析修订版本 {args.changed_since}，执行完整验证")
+        else:
+            for locale in locales:
+                change_set.expand_with_referrers(corpus.for_locale(locale))
+            print(f"增量验证: {len(change_set.changed) + len(change_set.deleted)} 个文件有改动，"
+                  f"{len(change_set.affected)} 个文档需要重新验证")
+    
+    # 检查器的额外参数（未指定的使用检查器的默认值）
+    checker_options = {
+        'code': {
+            'execute': args.execute,
+            'cpu_limit': args.execute_cpu,
+            'wall_limit': args.execute_timeout,
+        },
+        'links-external': {
+            'ttl': args.links_external_ttl,
+            'per_host': args.links_external_per_host,
+        },
+        'duplicates': {
+            'threshold': args.duplicates_threshold,
+        },
+    }
+    
+    def make_checker(spec, locale_corpus: DocumentCorpus = corpus):
+        options = checker_options.get(spec.name, {})
+        return spec.load()(root_dir, locale_corpus, cache,
+                           **{key: value for key, value in options.items() if value is not None})
+    
+    if args.lsp:
+        from validators.lsp import serve_stdio
+        sys.exit(serve_stdio(corpus, [functools.partial(make_checker, spec) for spec in selected_checks]))
+    
+    if args.watch:
+        watch(corpus, [functools.partial(make_checker, spec) for spec in selected_checks],
+              args.watch_interval)
+    
+    # 依次在每种语言的文档上运行选定的检查，每种语言中先运行预计耗时最少的检查
+    from validators.schedule import CheckHistory, ErrorBudget, ScheduledCheck, schedule
+    history = CheckHistory(cache)
+    budget = ErrorBudget(1 if args.fail_fast else args.max_errors)
+    for locale in locales:
+        if budget.exhausted:
+            break
+        if len(locales) > 1:
+            print(f"\n{'#' * 60}\n语言: {locale}（docs/{locale}）\n{'#' * 60}")
+        for check in schedule([ScheduledCheck(spec, locale) for spec in selected_checks], history):
+            checker_class = check.spec.load()
+            if shard is not None and not checker_class.PER_DOCUMENT and not shard.owns(check.spec.name, locale):
+                print(f"\n跳过 {checker_class.REPORT_TITLE}：由其他分片运行")
+                continue
+            checker = make_checker(check.spec, corpus.for_locale(locale))
+            started = time.perf_counter()
+            success = run_check(checker, change_set, shard)
+            all_success = all_success and success
+            # 增量验证和分片运行的耗时不代表完整检查的耗时，不计入历史
+            if change_set is None and shard is None:
+                history.record(check.spec.name, locale, time.perf_counter() - started)
+            budget.spend(len(checker.errors))
+            if budget.exhausted:
+                print(f"\n⚠️  错误数已达到上限 {budget.max_errors}，不再运行其余检查")
+                break
+    history.save()
     
     # 打印总结
     print(f"\n{'='*60}")
@@ -1,15 +1,46 @@
-"""文档验证工具模块"""
+"""文档验证工具模块
 
+检查器类在第一次访问时才导入（如 `from validators import LinkValidator` 只导入 links 模块），
+命令行工具通过 registry 按名称选择检查器。
+"""
+
+import importlib
+from .corpus import Document, DocumentCorpus
+from .cache import ValidationCache
 from .base import DocumentValidator
-from .existence import DocumentExistenceChecker
-from .content import DocumentContentChecker
-from .code import CodeExampleValidator
-from .format import MarkdownFormatChecker
-from .structure import DocumentStructureChecker
-from .terminology import TerminologyChecker
-from .links import LinkValidator
+
+# 检查器类 -> 所在模块，访问时才导入
+_LAZY_CHECKERS = {
+    'DocumentExistenceChecker': '.existence',
+    'DocumentContentChecker': '.content',
+    'CodeExampleValidator': '.code',
+    'MarkdownFormatChecker': '.format',
+    'DocumentStructureChecker': '.structure',
+    'TerminologyChecker': '.terminology',
+    'LinkValidator': '.links',
+    'ExternalLinkChecker': '.external',
+    'NearDuplicateChecker': '.duplicates',
+    'NotebookParityChecker': '.parity',
+    'GraderHintChecker': '.graders',
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_CHECKERS:
+        value = getattr(importlib.import_module(_LAZY_CHECKERS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_CHECKERS))
+
 
 __all__ = [
+    'Document',
+    'DocumentCorpus',
+    'ValidationCache',
     'DocumentValidator',
     'DocumentExistenceChecker',
     'DocumentContentChecker',
@@ -18,4 +49,8 @@ __all__ = [
     'DocumentStructureChecker',
     'TerminologyChecker',
     'LinkValidator',
+    'ExternalLinkChecker',
+    'NearDuplicateChecker',
+    'NotebookParityChecker',
+    'GraderHintChecker',
 ]
@@ -1,24 +1,225 @@
 """文档验证基类"""
 
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .cache import ValidationCache
+from .corpus import Document, DocumentCorpus
+from .diagnostics import ERROR, MESSAGES, PLAIN_MESSAGE, WARNING, Diagnostic
+from .notebooks import NotebookCell, is_notebook, notebook_keys
+from .timing import NULL_TIMER, CheckTimings
 
 
 class DocumentValidator:
     """文档验证基类"""
     
-    def __init__(self, root_dir: str = "."):
+    # 报告标题
+    REPORT_TITLE = "文档验证报告"
+    
+    # 是否逐文档独立检查；为 True 时结果只依赖单个文档，可以按文件分区并行执行
+    PER_DOCUMENT = False
+    
+    # 检查规则版本；修改检查逻辑或报告文本后需要递增，使旧的缓存结果失效
+    VERSION = 1
+    
+    # 非逐文档检查器的结果是否只取决于 input_paths() 中文件的内容和配置，为 True 时整体缓存
+    CORPUS_CACHEABLE = False
+    
+    # 逐文档检查器还要检查的 notebook 单元格类型（如 ('markdown', 'code')），为空时不检查 notebook
+    NOTEBOOK_CELLS: Tuple[str, ...] = ()
+    
+    def __init__(self, root_dir: str = ".", corpus: Optional[DocumentCorpus] = None,
+                 cache: Optional[ValidationCache] = None):
         self.root_dir = Path(root_dir)
-        self.errors: List[str] = []
-        self.warnings: List[str] = []
+        # 未传入语料库时单独创建一个；QA 运行中应由调用方共享同一个实例
+        self.corpus = corpus if corpus is not None else DocumentCorpus(root_dir)
+        self.cache = cache
+        self.errors: List[Diagnostic] = []
+        self.warnings: List[Diagnostic] = []
+        # 当前文档检查过程中依赖的路径索引键及其存在状态，用于缓存失效判断
+        self._dependencies: Dict[str, bool] = {}
+        # 耗时统计，由调用方启用（见 timing.py），为 None 时不统计
+        self.timings: Optional[CheckTimings] = None
+        # 正在检查的 notebook 单元格序号，报告的问题记录在该单元格中
+        self._cell: Optional[int] = None
+        
+    def check(self) -> bool:
+        """执行检查并打印报告"""
+        self.collect()
+        return self.print_report(self.REPORT_TITLE)
+    
+    def collect(self):
+        """收集检查结果（不打印报告），启用缓存时复用未变化部分的结果"""
+        if self.timings is not None:
+            with self.timings.measure():
+                self._collect()
+        else:
+            self._collect()
+    
+    def _collect(self):
+        if self.cache is None or self.PER_DOCUMENT or not self.CORPUS_CACHEABLE:
+            self.run()
+            return
+        
+        key = self.cache.corpus_key(self)
+        entry = self.cache.load(self, key)
+        if entry is not None:
+            self.errors.extend(entry['errors'])
+            self.warnings.extend(entry['warnings'])
+            if entry.get('stats'):
+                self.stats = entry['stats']
+            return
+        
+        error_count, warning_count = len(self.errors), len(self.warnings)
+        self.run()
+        self.cache.store(self, key, self.errors[error_count:], self.warnings[warning_count:],
+                         stats=getattr(self, 'stats', None))
+    
+    def run(self):
+        """收集检查结果（不打印报告），默认逐个检查 document_paths() 中的文档"""
+        self.run_documents(self.document_paths())
+    
+    def document_paths(self) -> List[Path]:
+        """逐文档检查时需要检查的文档路径（源语言还包括 NOTEBOOK_CELLS 要求检查的 notebook）"""
+        notebooks = self.notebook_paths()
+        if not notebooks:
+            return self.corpus.doc_paths()
+        return self.corpus.doc_paths() + notebooks
+    
+    def notebook_paths(self) -> List[Path]:
+        """仓库中需要检查的 notebook（只随源语言检查），NOTEBOOK_CELLS 为空时为空列表"""
+        if not self.NOTEBOOK_CELLS or not self.corpus.is_source_locale:
+            return []
+        return [self.root_dir / key for key in notebook_keys(self.corpus.path_index)]
+    
+    def input_paths(self) -> List[Path]:
+        """检查结果所依赖的全部输入文件，用于判断改动是否影响本检查"""
+        return self.document_paths()
+    
+    def run_documents(self, paths: List[Path]):
+        """逐个检查给定的文档"""
+        # 先查缓存，确定哪些文档需要重新检查，再按原顺序输出结果
+        plan = []
+        for path in paths:
+            doc = self.corpus.load(path)
+            key = entry = None
+            if doc.error is None and self.cache is not None:
+                key = self.cache.document_key(self, doc)
+                entry = self.cache.load(self, key)
+            plan.append((doc, key, entry))
+        
+        self.prepare_documents([
+            doc for doc, _, entry in plan if doc.error is None and entry is None
+        ])
+        
+        for doc, key, entry in plan:
+            if doc.error is not None:
+                self.add_error('read-failed', doc.path, doc.error)
+                continue
+            
+            if self.cache is None:
+                with self.timed_document(doc):
+                    self._check_any(doc)
+                continue
+            
+            if entry is not None:
+                self.errors.extend(entry['errors'])
+                self.warnings.extend(entry['warnings'])
+                continue
+            
+            error_count, warning_count = len(self.errors), len(self.warnings)
+            self._dependencies = {}
+            with self.timed_document(doc):
+                self._check_any(doc)
+            self.cache.store(
+                self, key,
+                self.errors[error_count:],
+                self.warnings[warning_count:],
+                self._dependencies,
+            )
+    
+    def timed_document(self, doc: Document):
+        """统计检查单个文档的耗时和字节数（用于 with 语句），未启用耗时统计时不做任何事
+        
+        逐文档检查器由 run_documents() 统计；汇总类检查器在遍历文档时自行使用。
+        """
+        if self.timings is None:
+            return NULL_TIMER
+        return self.timings.document(doc.rel_path, len(doc.text.encode('utf-8')))
+    
+    def timed(self, rule: str):
+        """统计一段检查逻辑的耗时并计入 rule 名下（用于 with 语句），未启用耗时统计时不做任何事"""
+        if self.timings is None:
+            return NULL_TIMER
+        return self.timings.rule(rule)
+    
+    def prepare_documents(self, docs: List[Document]):
+        """在逐个检查之前批量预处理所有需要检查的文档（如并行预解析），默认不做任何事"""
+    
+    def check_document(self, doc: Document):
+        """检查单个文档，逐文档检查器需要实现此方法"""
+        raise NotImplementedError
+    
+    def _check_any(self, doc: Document):
+        if is_notebook(doc.path):
+            self.check_notebook(doc)
+        else:
+            self.check_document(doc)
+    
+    def check_notebook(self, doc: Document):
+        """逐个检查 notebook 中 NOTEBOOK_CELLS 类型的单元格，报告的问题记录单元格序号"""
+        try:
+            cells = doc.cells
+        except ValueError as e:
+            self.add_error('invalid-notebook', e, path=doc.path)
+            return
+        for cell in cells:
+            if cell.cell_type not in self.NOTEBOOK_CELLS:
+                continue
+            self._cell = cell.index
+            try:
+                self.check_cell(doc, cell)
+            finally:
+                self._cell = None
+    
+    def check_cell(self, notebook: Document, cell: NotebookCell):
+        """检查 notebook 中的单个单元格，默认把单元格内容当作 Markdown 文档检查"""
+        self.check_document(cell.document)
+    
+    def config_fingerprint(self) -> str:
+        """影响检查结果的配置的文本表示，用于计算缓存键"""
+        return ""
+    
+    def record_dependency(self, key: str, exists: bool):
+        """记录当前文档的检查结果依赖于某个路径（路径索引键）的存在状态"""
+        self._dependencies[key] = exists
+    
+    def dependency_exists(self, key: str) -> bool:
+        """重新核对 record_dependency() 记录的依赖当前是否存在，用于缓存失效判断"""
+        return self.corpus.path_index.exists(key)
+        
+    def add_error(self, rule: str, *args: Any, path: Union[Path, str, None] = None,
+                  line: Optional[int] = None, col: Optional[int] = None, cell: Optional[int] = None):
+        """添加错误：规则 ID、消息参数和位置（见 diagnostics.MESSAGES）
+        
+        只传入一个不是规则 ID 的字符串时，作为预先格式化的消息（兼容第三方检查器）。
+        cell 为 notebook 单元格序号，默认为 check_cell() 正在检查的单元格。
+        """
+        self.errors.append(self._diagnostic(ERROR, rule, args, path, line, col, cell))
         
-    def add_error(self, message: str):
-        """添加错误信息"""
-        self.errors.append(message)
+    def add_warning(self, rule: str, *args: Any, path: Union[Path, str, None] = None,
+                    line: Optional[int] = None, col: Optional[int] = None, cell: Optional[int] = None):
+        """添加警告，参数同 add_error()"""
+        self.warnings.append(self._diagnostic(WARNING, rule, args, path, line, col, cell))
         
-    def add_warning(self, message: str):
-        """添加警告信息"""
-        self.warnings.append(message)
+    def _diagnostic(self, severity: str, rule: str, args, path, line, col, cell=None) -> Diagnostic:
+        if not args and path is None and rule not in MESSAGES['zh']:
+            return Diagnostic(PLAIN_MESSAGE, severity, args=(rule,))
+        if isinstance(path, Path):
+            # 文档路径以相对于项目根目录的形式保存
+            path = str(path.relative_to(self.root_dir))
+        # 消息参数只保留可以序列化为 JSON 的类型
+        args = tuple(arg if isinstance(arg, (str, int, float)) else str(arg) for arg in args)
+        return Diagnostic(rule, severity, path, line, col, args, cell if cell is not None else self._cell)
         
     def print_report(self, title: str) -> bool:
         """打印验证报告"""
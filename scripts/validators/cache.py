@@ -0,0 +1,124 @@
+"""增量验证缓存
+
+把每个检查器对每个文档的检查结果持久化到磁盘，
+缓存键由 (检查器名称, 检查器版本, 相关配置哈希, 文档路径, 文档内容哈希) 计算得到。
+文档未修改时直接复用上次的结果，跳过重新验证。
+
+跨文件检查（如链接验证）在检查时通过 record_dependency() 记录所依赖路径的存在状态，
+命中缓存时通过检查器的 dependency_exists() 重新核对这些路径（默认查询语料库的路径索引）；
+链接目标或目标文档中的锚点出现或消失都会使对应条目失效。
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from .diagnostics import Diagnostic
+
+
+# 缓存条目格式版本，格式变化时递增以使旧条目全部失效
+CACHE_FORMAT_VERSION = 3
+
+# 默认缓存目录（相对于项目根目录）
+DEFAULT_CACHE_DIR = "scripts/tests/.validation_cache"
+
+
+class ValidationCache:
+    """按内容哈希寻址的持久化验证缓存
+    
+    每个条目单独存为一个 JSON 文件，写入时先写临时文件再原子替换，
+    因此并行进程可以安全地同时读写同一个缓存目录。
+    """
+    
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+    
+    def document_key(self, checker, doc) -> str:
+        """计算单个文档检查结果的缓存键"""
+        return self._key(checker, doc.rel_path, doc.content_hash)
+    
+    def corpus_key(self, checker) -> str:
+        """计算依赖多个文件的检查结果的缓存键（由检查器 input_paths() 中各文件的路径和内容哈希得到）"""
+        digest = hashlib.sha256()
+        for path in checker.input_paths():
+            doc = checker.corpus.load(path)
+            digest.update(doc.rel_path.encode('utf-8'))
+            digest.update(b'\0')
+            digest.update((doc.content_hash or repr(doc.error)).encode('utf-8'))
+            digest.update(b'\0')
+        return self._key(checker, '*', digest.hexdigest())
+    
+    def _key(self, checker, scope: str, data_hash: str) -> str:
+        parts = [
+            str(CACHE_FORMAT_VERSION),
+            type(checker).__name__,
+            str(checker.VERSION),
+            hashlib.sha256(checker.config_fingerprint().encode('utf-8')).hexdigest(),
+            # 报告中可能包含绝对路径，根目录变化时不能复用
+            str(checker.root_dir.resolve()),
+            scope,
+            data_hash,
+        ]
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+    
+    def _entry_path(self, checker, key: str) -> Path:
+        return self.cache_dir / type(checker).__name__ / key[:2] / f"{key}.json"
+    
+    def load(self, checker, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存条目；条目不存在、损坏或依赖已变化时返回 None"""
+        try:
+            with open(self._entry_path(checker, key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        
+        for dep_key, existed in entry.get('dependencies', {}).items():
+            if checker.dependency_exists(dep_key) != existed:
+                self.misses += 1
+                return None
+        
+        self.hits += 1
+        entry['errors'] = [Diagnostic.from_list(data) for data in entry['errors']]
+        entry['warnings'] = [Diagnostic.from_list(data) for data in entry['warnings']]
+        return entry
+    
+    def store(self, checker, key: str, errors: List[Diagnostic], warnings: List[Diagnostic],
+              dependencies: Optional[Dict[str, bool]] = None, stats: Optional[Dict[str, Any]] = None):
+        """写入缓存条目（stats 为检查器报告的统计信息，命中缓存时原样恢复）"""
+        entry = {
+            'errors': [diagnostic.to_list() for diagnostic in errors],
+            'warnings': [diagnostic.to_list() for diagnostic in warnings],
+            'dependencies': dependencies or {},
+            'stats': stats or {},
+        }
+        self._write(self._entry_path(checker, key), entry)
+    
+    def load_value(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """读取与检查器无关的缓存值（如按代码块哈希缓存的解析结果），不存在时返回 None"""
+        try:
+            with open(self.cache_dir / namespace / key[:2] / f"{key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def store_value(self, namespace: str, key: str, value: Dict[str, Any]):
+        """写入与检查器无关的缓存值"""
+        self._write(self.cache_dir / namespace / key[:2] / f"{key}.json", value)
+    
+    def _write(self, path: Path, entry: Dict[str, Any]):
+        """先写临时文件再原子替换，写入失败时静默忽略（缓存只是加速手段）"""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,119 @@
+"""基于 git 改动的增量验证范围
+
+根据 `git diff` 计算自某个修订版本以来改动的文件，再通过反向链接索引
+找出所有链接指向这些文件的文档，得到需要重新验证的文档闭包。
+只使用离线可用的 git 基础命令；修订版本不存在或无法调用 git 时返回 None，
+由调用方退回到完整验证。
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from .base import DocumentValidator
+from .corpus import DocumentCorpus
+from .links import LinkValidator
+from .notebooks import NOTEBOOK_SUFFIX
+
+
+def _git(root_dir: Path, *args: str) -> Optional[str]:
+    """在 root_dir 中执行 git 命令，失败时返回 None"""
+    try:
+        result = subprocess.run(
+            ['git', '-C', str(root_dir), *args],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _split_z(output: str) -> List[str]:
+    """拆分 -z 格式的 NUL 分隔输出"""
+    return [item for item in output.split('\0') if item]
+
+
+class ChangeSet:
+    """自某个修订版本以来的文件改动及其影响范围"""
+    
+    def __init__(self, root_dir: Path, changed: Set[Path], deleted: Set[Path]):
+        self.root_dir = root_dir
+        # 新增或修改且仍然存在的文件（已解析为绝对路径）
+        self.changed = changed
+        # 已删除的文件（已解析为绝对路径）
+        self.deleted = deleted
+        # 需要重新验证的文档：改动的文档加上链接指向改动文件的文档
+        self.affected: Set[Path] = {path for path in changed if path.suffix in ('.md', NOTEBOOK_SUFFIX)}
+    
+    @classmethod
+    def since(cls, root_dir: str, rev: str) -> Optional['ChangeSet']:
+        """计算自 rev 以来（含工作区和未跟踪文件）的改动，rev 无效时返回 None"""
+        root = Path(root_dir)
+        if _git(root, 'rev-parse', '--verify', '--quiet', f'{rev}^{{commit}}') is None:
+            return None
+        
+        # 与工作区比较，包含已提交、已暂存和未暂存的改动；路径相对于 root_dir
+        diff = _git(root, 'diff', '--name-status', '--no-renames', '--relative', '-z', rev, '--')
+        untracked = _git(root, 'ls-files', '--others', '--exclude-standard', '-z')
+        if diff is None or untracked is None:
+            return None
+        
+        changed: Set[Path] = set()
+        deleted: Set[Path] = set()
+        fields = _split_z(diff)
+        for status, name in zip(fields[0::2], fields[1::2]):
+            path = (root / name).resolve()
+            if status == 'D':
+                deleted.add(path)
+            else:
+                changed.add(path)
+        for name in _split_z(untracked):
+            changed.add((root / name).resolve())
+        
+        return cls(root, changed, deleted)
+    
+    def expand_with_referrers(self, corpus: DocumentCorpus):
+        """把链接指向改动文件（包括已删除文件）的文档加入受影响集合"""
+        touched = self.changed | self.deleted
+        if not touched:
+            return
+        
+        link_validator = LinkValidator(str(corpus.root_dir), corpus)
+        referrers = build_reverse_link_index(link_validator)
+        for target in touched:
+            key = corpus.path_index.key(target)
+            # 只有引用了改动文件的文档才需要解析为绝对路径
+            for source in referrers.get(key, ()) if key is not None else ():
+                self.affected.add((corpus.root_dir / source).resolve())
+    
+    def affects(self, checker: DocumentValidator) -> bool:
+        """改动是否可能影响该检查器的结果"""
+        touched = self.changed | self.deleted
+        if any(path.resolve() in touched for path in checker.input_paths()):
+            return True
+        # 删除的文档已不在输入中，但会改变汇总类检查的结果
+        docs_dir = checker.corpus.docs_dir.resolve()
+        return not checker.PER_DOCUMENT and any(
+            docs_dir in path.parents for path in self.deleted
+        )
+    
+    def select(self, paths: Iterable[Path]) -> List[Path]:
+        """从逐文档检查的路径中挑出受影响的文档，保持原有顺序"""
+        return [path for path in paths if path.resolve() in self.affected]
+
+
+def build_reverse_link_index(link_validator: LinkValidator) -> Dict[str, Set[str]]:
+    """构建 链接目标 -> 引用它的文档 的反向索引（均为路径索引键，只做字符串运算，不访问文件系统）"""
+    index = link_validator.corpus.path_index
+    referrers: Dict[str, Set[str]] = {}
+    for path in link_validator.document_paths():
+        doc = link_validator.corpus.load(path)
+        source = index.key(path)
+        if doc.error is not None or source is None:
+            continue
+        for key in link_validator.link_targets(doc):
+            referrers.setdefault(key, set()).add(source)
+    return referrers
@@ -1,71 +1,149 @@
 """代码示例验证器"""
 
-import re
 from pathlib import Path
+from typing import List, Optional
 from .base import DocumentValidator
+from .cache import ValidationCache
+from .corpus import Document, DocumentCorpus
+from .markdown import CodeBlock, code_blocks
+from .notebooks import CODE, MARKDOWN, NotebookCell, is_notebook, python_source
+from .pysyntax import PythonSyntaxChecker
 
 
 class CodeExampleValidator(DocumentValidator):
     """代码示例验证器"""
     
-    def check(self) -> bool:
-        """执行代码示例验证"""
-        self._check_code_examples()
-        return self.print_report("代码示例验证报告")
+    REPORT_TITLE = "代码示例验证报告"
+    PER_DOCUMENT = True
+    VERSION = 5
+    # notebook 中 Markdown 单元格的代码块和代码单元格都做语法检查（代码单元格不在沙箱中执行）
+    NOTEBOOK_CELLS = (MARKDOWN, CODE)
     
-    def _check_code_examples(self):
-        """检查所有文档中的代码示例"""
-        docs_dir = self.root_dir / "docs" / "zh"
-        if not docs_dir.exists():
+    def __init__(self, root_dir: str = ".", corpus: Optional[DocumentCorpus] = None,
+                 cache: Optional[ValidationCache] = None, execute: bool = False,
+                 cpu_limit: Optional[float] = None, wall_limit: Optional[float] = None):
+        super().__init__(root_dir, corpus, cache)
+        # 按代码块内容哈希记忆解析结果，重复的代码块只解析一次
+        self.syntax = PythonSyntaxChecker(cache)
+        # 执行模式：在沙箱中运行可以独立运行的代码块（沙箱模块只在执行模式下导入）
+        self.execute = execute
+        self.executor = None
+        if execute:
+            from .sandbox import CodeExecutor
+            self.executor = CodeExecutor(cache, cpu_limit=cpu_limit, wall_limit=wall_limit)
+    
+    def config_fingerprint(self) -> str:
+        """执行模式和资源上限会改变检查结果"""
+        if not self.execute:
+            return ""
+        return f"execute:{self.executor.cpu_limit}:{self.executor.wall_limit}"
+    
+    def prepare_documents(self, docs: List[Document]):
+        """预先解析所有需要检查的 Python 代码块（数量较多时并行解析），执行模式下并发执行它们"""
+        blocks = []
+        cell_sources = []
+        for doc in docs:
+            if not is_notebook(doc.path):
+                blocks.extend(self._python_blocks(doc))
+                continue
+            try:
+                cells = doc.cells
+            except ValueError:
+                # 由 check_notebook() 报告
+                continue
+            for cell in cells:
+                if cell.cell_type == MARKDOWN:
+                    blocks.extend(self._python_blocks(cell.document))
+                elif cell.cell_type == CODE:
+                    cell_sources.append(python_source(cell))
+        with self.timed('code/syntax-error'):
+            self.syntax.prefetch(
+                [block.code for block in blocks] + [code for code in cell_sources if code]
+            )
+        if self.execute:
+            from .sandbox import should_execute
+            with self.timed('code/exec-failed'):
+                self.executor.prefetch(
+                    block.code for block in blocks
+                    if self.syntax.check(block.code) is None and should_execute(block.info, block.code)
+                )
+    
+    def _python_blocks(self, doc: Document) -> List[CodeBlock]:
+        return [
+            block for block in code_blocks(doc.tokens, doc.lines)
+            if block.closed and block.language.lower() in ['python', 'py']
+        ]
+    
+    def check_document(self, doc: Document):
+        """检查单个文档中的代码示例"""
+        self._validate_code_blocks(doc)
+    
+    def check_cell(self, notebook: Document, cell: NotebookCell):
+        """检查 Markdown 单元格中的代码块，或者代码单元格本身的语法（行号相对于单元格）"""
+        if cell.cell_type == MARKDOWN:
+            self._validate_code_blocks(cell.document)
             return
         
-        for doc_path in docs_dir.rglob("*.md"):
-            try:
-                content = doc_path.read_text(encoding='utf-8')
-                self._validate_code_blocks(doc_path, content)
-            except Exception as e:
-                self.add_error(f"读取文档失败 {doc_path}: {e}")
+        code = python_source(cell)
+        if not code or not code.strip():
+            return
+        # 代码单元格相当于从第 0 行开始的代码块，报告中的编号为单元格序号
+        block = CodeBlock(0, 1, 'python', code, True)
+        self._validate_python_syntax(notebook.path, cell.index, block)
     
-    def _validate_code_blocks(self, doc_path: Path, content: str):
+    def _validate_code_blocks(self, doc: Document):
         """验证文档中的代码块"""
-        # 提取代码块
-        code_blocks = re.findall(
-            r'```(\w+)?\n(.*?)```',
-            content,
-            re.DOTALL
-        )
+        # 未闭合的代码块由 Markdown 格式检查报告
+        blocks = [block for block in code_blocks(doc.tokens, doc.lines) if block.closed]
         
-        for i, (language, code) in enumerate(code_blocks, 1):
-            if not language:
-                self.add_warning(
-                    f"文档 {doc_path.relative_to(self.root_dir)} "
-                    f"代码块 #{i} 未指定语言"
-                )
+        for i, block in enumerate(blocks, 1):
+            if not block.language:
+                self.add_warning('code/missing-language', i, path=doc.path, line=block.line)
                 continue
             
             # 验证 Python 代码语法
-            if language.lower() in ['python', 'py']:
-                self._validate_python_syntax(doc_path, i, code)
+            if block.language.lower() in ['python', 'py']:
+                if self._validate_python_syntax(doc.path, i, block) and self.execute:
+                    self._execute_python(doc.path, i, block)
             
             # 检查代码块是否为空
-            if not code.strip():
-                self.add_warning(
-                    f"文档 {doc_path.relative_to(self.root_dir)} "
-                    f"代码块 #{i} 为空"
-                )
+            if not block.code.strip():
+                self.add_warning('code/empty-block', i, path=doc.path, line=block.line)
     
-    def _validate_python_syntax(self, doc_path: Path, block_num: int, code: str):
-        """验证 Python 代码语法"""
-        try:
-            compile(code, f"<{doc_path}>", 'exec')
-        except SyntaxError as e:
+    def _validate_python_syntax(self, doc_path: Path, block_num: int, block: CodeBlock):
+        """验证 Python 代码语法（只做语法分析，不生成字节码），语法正确时返回 True"""
+        with self.timed('code/syntax-error'):
+            result = self.syntax.check(block.code)
+        if result is None:
+            return True
+        
+        if result['kind'] == 'error':
+            # 把代码块内的行号换算为文档中的行号
+            line = block.line + (result['lineno'] or 1)
             self.add_error(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"代码块 #{block_num} 存在语法错误: {e.msg} (行 {e.lineno})"
+                'code/syntax-error', block_num, result['msg'],
+                path=doc_path, line=line, col=(result['offset'] or 0) + block.col - 1,
             )
-        except Exception as e:
-            # 其他编译错误（如缩进问题）
+        else:
+            # 其他解析问题（如包含空字符）
             self.add_warning(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"代码块 #{block_num} 可能存在问题: {e}"
+                'code/parse-problem', block_num, result['message'], path=doc_path, line=block.line
             )
+        return False
+    
+    def _execute_python(self, doc_path: Path, block_num: int, block: CodeBlock):
+        """在沙箱中执行可以独立运行的代码块"""
+        from .sandbox import should_execute
+        if not should_execute(block.info, block.code):
+            return
+        
+        with self.timed('code/exec-failed'):
+            result = self.executor.result(block.code)
+        if result['status'] == 'ok':
+            return
+        
+        line = block.line + result['lineno'] if result['lineno'] else block.line
+        if result['status'] == 'timeout':
+            self.add_warning('code/exec-timeout', block_num, result['message'], path=doc_path, line=line)
+        else:
+            self.add_error('code/exec-failed', block_num, result['message'], path=doc_path, line=line)
@@ -1,9 +1,11 @@
 """文档内容完整性检查器"""
 
-import re
+import json
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from .base import DocumentValidator
+from .corpus import Document
+from .markdown import headings
 
 
 class DocumentContentChecker(DocumentValidator):
@@ -41,41 +43,78 @@ class DocumentContentChecker(DocumentValidator):
         }
     }
     
-    def check(self) -> bool:
-        """执行文档内容完整性检查"""
-        self._check_document_content()
-        return self.print_report("文档内容完整性检查报告")
+    # 其他语言中章节关键词的译法：关键词 -> 可接受的译文（标题包含任意一个即可），
+    # 没有列出的语言只检查标题和长度
+    SECTION_TRANSLATIONS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+        "en": {
+            "概述": ("Overview", "Introduction"),
+            "前置条件": ("Prerequisites", "Requirements"),
+            "安装步骤": ("Installation", "Install"),
+            "快速开始": ("Quick Start", "Quickstart", "Getting Started"),
+            "章节": ("Chapters", "Sections", "Contents"),
+            "配置": ("Configuration", "Configure"),
+            "示例": ("Examples", "Example"),
+            "架构": ("Architecture",),
+            "开发环境": ("Development Environment", "Setup"),
+            "贡献": ("Contributing", "Contribution"),
+            "代码规范": ("Code Style", "Coding Standards"),
+            "设计原理": ("Design Principles", "Design"),
+            "性能": ("Performance",),
+            "问题": ("Problem", "Issue", "Question"),
+            "版本对比": ("Comparison", "Version"),
+            "特点": ("Features", "Characteristics"),
+        },
+    }
+    
+    REPORT_TITLE = "文档内容完整性检查报告"
+    PER_DOCUMENT = True
+    VERSION = 4
     
-    def _check_document_content(self):
-        """检查文档内容"""
+    def document_paths(self) -> List[Path]:
+        """REQUIRED_SECTIONS 中列出且实际存在的文档"""
+        paths = []
         for category, docs in self.REQUIRED_SECTIONS.items():
-            for doc_name, required_sections in docs.items():
-                doc_path = self.root_dir / "docs" / "zh" / category / doc_name
-                
-                if not doc_path.exists():
-                    continue  # 存在性检查会处理
-                
-                try:
-                    content = doc_path.read_text(encoding='utf-8')
-                    self._check_sections(doc_path, content, required_sections)
-                    self._check_metadata(doc_path, content)
-                except Exception as e:
-                    self.add_error(f"读取文档失败 {doc_path}: {e}")
+            for doc_name in docs:
+                doc_path = self.corpus.docs_dir / category / doc_name
+                if doc_path.is_file():  # 缺失的文档由存在性检查处理
+                    paths.append(doc_path)
+        return paths
+    
+    def config_fingerprint(self) -> str:
+        """必需章节配置及所属语言的译法"""
+        return json.dumps(
+            [self.REQUIRED_SECTIONS, self.corpus.locale, self._translations()],
+            ensure_ascii=False, sort_keys=True,
+        )
+    
+    def _translations(self) -> Optional[Dict[str, Tuple[str, ...]]]:
+        """语料库所属语言的章节关键词译法，源语言为 {}，没有译法的语言为 None"""
+        if self.corpus.is_source_locale:
+            return {}
+        return self.SECTION_TRANSLATIONS.get(self.corpus.locale)
     
-    def _check_sections(self, doc_path: Path, content: str, required_sections: List[str]):
+    def check_document(self, doc: Document):
+        """检查单个文档的内容"""
+        required_sections = self.REQUIRED_SECTIONS[doc.path.parent.name][doc.path.name]
+        translations = self._translations()
+        if translations is not None:
+            self._check_sections(doc, required_sections, translations)
+        self._check_metadata(doc.path, doc.text)
+    
+    def _check_sections(self, doc: Document, required_sections: List[str],
+                        translations: Dict[str, Tuple[str, ...]]):
         """检查必需章节"""
-        # 提取所有标题
-        headings = re.findall(r'^#+\s+(.+)$', content, re.MULTILINE)
-        headings_lower = [h.lower() for h in headings]
+        # 提取所有标题（不含代码块中的注释行）
+        headings_lower = [token.text.lower() for token in headings(doc.tokens)]
         
         for section in required_sections:
-            # 检查是否存在包含该关键词的标题
-            found = any(section.lower() in heading for heading in headings_lower)
+            keywords = translations.get(section, (section,))
+            # 检查是否存在包含该关键词（或其任一译法）的标题
+            found = any(
+                keyword.lower() in heading for keyword in keywords for heading in headings_lower
+            )
             if not found:
-                self.add_warning(
-                    f"文档 {doc_path.relative_to(self.root_dir)} "
-                    f"可能缺少章节: {section}"
-                )
+                self.add_warning('content/missing-section', keywords[0], path=doc.path)
     
     def _check_metadata(self, doc_path: Path, content: str):
         """检查文档元数据"""
@@ -85,14 +124,8 @@ class DocumentContentChecker(DocumentValidator):
             
         lines = content.strip().split('\n')
         if not lines[0].startswith('#'):
-            self.add_warning(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"缺少主标题"
-            )
+            self.add_warning('content/missing-title', path=doc_path)
         
         # 检查文档长度
         if len(content) < 100:
-            self.add_warning(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"内容过短 ({len(content)} 字符)"
-            )
+            self.add_warning('content/too-short', len(content), path=doc_path)
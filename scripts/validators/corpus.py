@@ -0,0 +1,222 @@
+"""文档语料库
+
+在一次验证运行中只发现、读取、解码并按行拆分每个文档一次，
+由所有检查器共享，避免每个检查器各自遍历文档目录并重复读取文件。
+文档发现和链接目标检查共用同一个仓库路径索引（见 pathindex.py）。
+
+每种语言的文档位于 docs/<语言> 下（如 docs/zh、docs/en、docs/ja），一个语料库对应一种语言；
+for_locale() 创建的其他语言的语料库共用同一个路径索引和已加载的文档，
+跨语言的链接目标只读取和扫描一次。
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from . import markdown
+from .pathindex import PathIndex
+
+
+# 源语言：其他语言的文档由它翻译而来，根目录的 README 等只随源语言检查
+SOURCE_LOCALE = 'zh'
+
+# docs/ 下被视为语言目录的目录名（如 zh、en、ja、zh-TW、pt_BR），其他目录（如 images）不是语言目录
+LOCALE_PATTERN = re.compile(r'^[a-z]{2,3}(?:[-_][A-Za-z0-9]{2,8})*$')
+
+
+class Document:
+    """已加载的单个文档"""
+    
+    __slots__ = ('path', 'rel_path', 'text', 'error', '_lines', '_content_hash', '_tokens',
+                 '_anchors', '_cells')
+    
+    def __init__(self, path: Path, rel_path: str, text: Optional[str] = None,
+                 error: Optional[Exception] = None):
+        self.path = path
+        self.rel_path = rel_path
+        self.text = text
+        self.error = error
+        self._lines: Optional[List[str]] = None
+        self._content_hash: Optional[str] = None
+        self._tokens: Optional[List[markdown.Token]] = None
+        self._anchors: Optional[Set[str]] = None
+        self._cells = None
+    
+    @property
+    def lines(self) -> List[str]:
+        """按行拆分后的内容（首次访问时拆分并缓存）"""
+        if self._lines is None:
+            self._lines = self.text.split('\n') if self.text is not None else []
+        return self._lines
+    
+    @property
+    def tokens(self) -> List[markdown.Token]:
+        """Markdown 记号流（首次访问时扫描一次并缓存）"""
+        if self._tokens is None:
+            self._tokens = markdown.tokenize(self.lines)
+        return self._tokens
+    
+    @property
+    def anchors(self) -> Set[str]:
+        """标题生成的 GitHub 风格锚点集合（首次访问时计算并缓存）"""
+        if self._anchors is None:
+            self._anchors = markdown.anchors(self.tokens)
+        return self._anchors
+    
+    @property
+    def cells(self) -> List['NotebookCell']:
+        """notebook 的单元格（首次访问时从 JSON 文本中取出并缓存，见 notebooks.py）
+        
+        JSON 格式无效时抛出 ValueError。
+        """
+        if self._cells is None:
+            from .notebooks import iter_cells
+            self._cells = list(iter_cells(self))
+        return self._cells
+    
+    @property
+    def content_hash(self) -> Optional[str]:
+        """内容的 SHA-256 哈希（首次访问时计算并缓存），读取失败时为 None"""
+        if self._content_hash is None and self.text is not None:
+            self._content_hash = hashlib.sha256(self.text.encode('utf-8')).hexdigest()
+        return self._content_hash
+
+
+class DocumentCorpus:
+    """文档语料库 - 按需加载并缓存文档内容"""
+    
+    def __init__(self, root_dir: str = ".", path_index: Optional[PathIndex] = None,
+                 locale: str = SOURCE_LOCALE):
+        self.root_dir = Path(root_dir)
+        self.locale = locale
+        self.docs_dir = self.root_dir / "docs" / locale
+        self._documents: Dict[Path, Document] = {}
+        self._doc_paths: Optional[List[Path]] = None
+        self._path_index = path_index
+    
+    @property
+    def path_index(self) -> PathIndex:
+        """仓库路径索引（首次访问时遍历一次仓库并缓存）"""
+        if self._path_index is None:
+            self._path_index = PathIndex(str(self.root_dir))
+        return self._path_index
+    
+    @property
+    def is_source_locale(self) -> bool:
+        """是否为源语言的语料库"""
+        return self.locale == SOURCE_LOCALE
+    
+    def for_locale(self, locale: str) -> 'DocumentCorpus':
+        """另一种语言的语料库，与本语料库共用路径索引和已加载的文档"""
+        if locale == self.locale:
+            return self
+        corpus = DocumentCorpus(str(self.root_dir), self.path_index, locale)
+        corpus._documents = self._documents
+        return corpus
+    
+    def locales(self) -> List[str]:
+        """docs/ 下的语言目录名（来自路径索引），源语言在前，其余按名称排序"""
+        names = set()
+        for key in self.path_index.dirs:
+            if key.startswith('docs/'):
+                name = key[len('docs/'):]
+                if '/' not in name and LOCALE_PATTERN.match(name):
+                    names.add(name)
+        return sorted(names, key=lambda name: (name != SOURCE_LOCALE, name))
+    
+    def doc_paths(self) -> List[Path]:
+        """docs/<语言> 下所有 Markdown 文档的路径（按路径排序，来自路径索引）"""
+        if self._doc_paths is None:
+            index = self.path_index
+            self._doc_paths = sorted(
+                self.root_dir / key for key in index.files_under(f'docs/{self.locale}', '.md')
+            )
+        return self._doc_paths
+    
+    def documents(self) -> Iterator[Document]:
+        """遍历 docs/<语言> 下的所有文档"""
+        for path in self.doc_paths():
+            yield self.load(path)
+    
+    def documents_in(self, category: str) -> List[Document]:
+        """返回 docs/<语言>/<category> 目录下（不递归）的文档"""
+        category_dir = self.docs_dir / category
+        return [
+            self.load(path) for path in self.doc_paths()
+            if path.parent == category_dir
+        ]
+    
+    def get(self, rel_path: str) -> Optional[Document]:
+        """按相对于根目录的路径获取文档，文件不存在时返回 None"""
+        path = self.root_dir / rel_path
+        if path in self._documents:
+            return self._documents[path]
+        if not path.is_file():
+            return None
+        return self.load(path)
+    
+    def load(self, path: Path) -> Document:
+        """读取并缓存单个文档，读取失败时记录在 Document.error 中"""
+        document = self._documents.get(path)
+        if document is not None:
+            return document
+        
+        rel_path = self._rel_path(path)
+        try:
+            text = path.read_text(encoding='utf-8')
+            document = Document(path, rel_path, text)
+        except Exception as e:
+            document = Document(path, rel_path, error=e)
+        
+        self._documents[path] = document
+        return document
+    
+    def put(self, path: Path, text: str, lines: Optional[List[str]] = None,
+            tokens: Optional[List[markdown.Token]] = None) -> Document:
+        """用给定内容替换文档（如编辑器中尚未保存的内容），不读取磁盘
+        
+        lines、tokens 为已经拆分和扫描好的结果时直接使用（见 markdown.LineTokenCache）。
+        """
+        document = Document(path, self._rel_path(path), text)
+        document._lines = lines
+        document._tokens = tokens
+        self._documents[path] = document
+        return document
+    
+    def _rel_path(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.root_dir))
+        except ValueError:
+            return str(path)
+    
+    def refresh(self, changed: Iterable[Path], deleted: Iterable[Path]):
+        """文件改动后丢弃缓存的文档并更新路径索引（用于常驻进程中的增量验证）
+        
+        changed 为新增或修改的文件，deleted 为已删除的文件，路径形式与 doc_paths() 相同。
+        """
+        index = self.path_index
+        for path in changed:
+            self._documents.pop(path, None)
+            key = index.key(path)
+            if key is None:
+                continue
+            index.add(key)
+            # 新文件可能位于新建的目录中
+            parent = posixpath.dirname(key)
+            while parent and parent not in index.dirs:
+                index.add(parent, is_dir=True)
+                parent = posixpath.dirname(parent)
+        for path in deleted:
+            self._documents.pop(path, None)
+            key = index.key(path)
+            if key is None:
+                continue
+            index.discard(key)
+            # 随文件一起删除的目录
+            parent = posixpath.dirname(key)
+            while parent and parent in index.dirs and not os.path.isdir(self.root_dir / parent):
+                index.discard(parent)
+                parent = posixpath.dirname(parent)
+        self._doc_paths = None
@@ -0,0 +1,264 @@
+"""结构化的检查结果
+
+检查器报告的每个问题是一个 Diagnostic：规则 ID、严重程度、文档路径（路径表中的序号）、
+行号、列号和消息参数。消息文本由规则 ID 对应的模板和参数生成，只在打印或写入报告时才格式化，
+同一组结果可以按任意语言输出，也可以直接排序、去重、分组和序列化。
+
+路径表在进程内共享，同一个路径只保存一份；跨进程传递（pickle）和写入缓存时使用路径文本。
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# 默认输出语言
+DEFAULT_LOCALE = 'zh'
+_locale = DEFAULT_LOCALE
+
+# 没有对应规则的预先格式化消息（如第三方检查器直接传入的字符串）使用的规则 ID
+PLAIN_MESSAGE = 'message'
+
+# 消息模板：语言 -> 规则 ID -> 模板，模板中用 {0}、{1} 引用消息参数
+MESSAGES: Dict[str, Dict[str, str]] = {
+    'zh': {
+        PLAIN_MESSAGE: "{0}",
+        'read-failed': "读取文档失败 {0}: {1}",
+        'checker-failed': "检查器执行失败: {0}",
+        'invalid-notebook': "无法解析 notebook: {0}",
+        'existence/missing-dir': "缺失目录: {0}",
+        'existence/not-a-dir': "路径不是目录: {0}",
+        'existence/missing-doc': "缺失文档 [{0}]: {1}",
+        'existence/not-a-file': "路径不是文件 [{0}]: {1}",
+        'existence/empty-doc': "文档为空 [{0}]: {1}",
+        'content/missing-section': "可能缺少章节: {0}",
+        'content/missing-title': "缺少主标题",
+        'content/too-short': "内容过短 ({0} 字符)",
+        'code/missing-language': "代码块 #{0} 未指定语言",
+        'code/empty-block': "代码块 #{0} 为空",
+        'code/syntax-error': "代码块 #{0} 存在语法错误: {1}",
+        'code/parse-problem': "代码块 #{0} 可能存在问题: {1}",
+        'code/exec-timeout': "代码块 #{0} 执行超时: {1}",
+        'code/exec-failed': "代码块 #{0} 执行失败: {1}",
+        'format/unclosed-fence': "代码块未正确闭合（``` 数量不匹配）",
+        'format/heading-space': "标题格式不规范（# 后应有空格）",
+        'format/heading-depth': "标题层级过深（最多 6 级）",
+        'format/list-marker-space': "列表格式不规范（标记后应有空格）",
+        'structure/missing-title': "类别 [{0}] 中以下文档缺少主标题: {1}",
+        'structure/heading-depth': "类别 [{0}] 中文档的标题层级深度不一致: {1}",
+        'terminology/glossary-failed': "加载术语表失败: {0}",
+        'terminology/no-glossary': "未找到术语表，跳过术语一致性检查",
+        'terminology/unused-term': "术语 '{0}' 在文档中未被使用",
+        'links/malformed-external': "包含格式错误的外部链接: {0}",
+        'links/broken-internal': "包含失效的内部链接: {0} (目标不存在: {1})",
+        'links/broken-anchor': "包含失效的锚点链接: {0} (目标文档中没有标题锚点: #{1})",
+        'links/unreachable': "外部链接不可达: {0} ({1})",
+        'duplicates/near-duplicate-document': "与 {0} 近似重复（相似度 {1}%），两份副本已出现差异",
+        'duplicates/near-duplicate-section': "章节“{0}”与 {1} 近似重复（相似度 {2}%），两份副本已出现差异",
+        'parity/missing-chapter': "{0} 中没有对应的 notebook",
+        'parity/missing-section': "缺少小节“{0}”（见 {1}）",
+        'parity/drifted-section': "小节“{0}”与 {1} 不一致（{2} 个单元格不同）",
+        'graders/invalid-module': "无法解析提示模块: {0}",
+        'graders/undefined-hint': "引用的提示 {0} 在 {1} 中不存在",
+        'graders/missing-grader': "练习 {0} 在 {1} 中没有评分函数（见 {2}）",
+        'graders/ungraded-string': "练习 {0} 的提示说评分函数查找 \"{1}\"，但评分函数中没有这个字符串（提示见 {2}）",
+        'graders/drifted-grader': "练习 {0} 的评分函数与 {1} 不一致（不同的字符串: {2}）",
+        'graders/drifted-hint': "提示 {0} 描述的评分条件与 {1} 不一致",
+    },
+    'en': {
+        PLAIN_MESSAGE: "{0}",
+        'read-failed': "failed to read document {0}: {1}",
+        'checker-failed': "checker failed: {0}",
+        'invalid-notebook': "cannot parse notebook: {0}",
+        'existence/missing-dir': "missing directory: {0}",
+        'existence/not-a-dir': "not a directory: {0}",
+        'existence/missing-doc': "missing document [{0}]: {1}",
+        'existence/not-a-file': "not a file [{0}]: {1}",
+        'existence/empty-doc': "empty document [{0}]: {1}",
+        'content/missing-section': "section may be missing: {0}",
+        'content/missing-title': "missing top-level heading",
+        'content/too-short': "content too short ({0} characters)",
+        'code/missing-language': "code block #{0} has no language",
+        'code/empty-block': "code block #{0} is empty",
+        'code/syntax-error': "code block #{0} has a syntax error: {1}",
+        'code/parse-problem': "code block #{0} may have a problem: {1}",
+        'code/exec-timeout': "code block #{0} timed out: {1}",
+        'code/exec-failed': "code block #{0} failed: {1}",
+        'format/unclosed-fence': "unclosed code fence (unbalanced ```)",
+        'format/heading-space': "malformed heading (space required after #)",
+        'format/heading-depth': "heading nested too deep (at most 6 levels)",
+        'format/list-marker-space': "malformed list item (space required after marker)",
+        'structure/missing-title': "documents in category [{0}] missing a top-level heading: {1}",
+        'structure/heading-depth': "inconsistent heading depth in category [{0}]: {1}",
+        'terminology/glossary-failed': "failed to load glossary: {0}",
+        'terminology/no-glossary': "glossary not found, skipping terminology check",
+        'terminology/unused-term': "term '{0}' is not used in any document",
+        'links/malformed-external': "malformed external link: {0}",
+        'links/broken-internal': "broken internal link: {0} (target does not exist: {1})",
+        'links/broken-anchor': "broken anchor link: {0} (no heading anchor in target: #{1})",
+        'links/unreachable': "external link unreachable: {0} ({1})",
+        'duplicates/near-duplicate-document': "near-duplicate of {0} ({1}% similar); the copies have drifted apart",
+        'duplicates/near-duplicate-section': "section '{0}' is a near-duplicate of {1} ({2}% similar); the copies have drifted apart",
+        'parity/missing-chapter': "no matching notebook in {0}",
+        'parity/missing-section': "missing section '{0}' (see {1})",
+        'parity/drifted-section': "section '{0}' differs from {1} ({2} cells differ)",
+        'graders/invalid-module': "cannot parse hints module: {0}",
+        'graders/undefined-hint': "hint {0} is not defined in {1}",
+        'graders/missing-grader': "exercise {0} has no grading function in {1} (see {2})",
+        'graders/ungraded-string': "the hint for exercise {0} says the grader looks for \"{1}\", but the grading function does not contain it (hint at {2})",
+        'graders/drifted-grader': "grading function of exercise {0} differs from {1} (differing strings: {2})",
+        'graders/drifted-hint': "hint {0} describes different grading criteria than {1}",
+    },
+}
+
+# 路径表：序号 -> 路径文本，以及反向索引
+_PATHS: List[str] = []
+_PATH_INDEX: Dict[str, int] = {}
+_PATHS_LOCK = threading.Lock()
+
+
+def intern_path(path: str) -> int:
+    """返回路径在路径表中的序号，新路径加入路径表"""
+    index = _PATH_INDEX.get(path)
+    if index is None:
+        with _PATHS_LOCK:
+            index = _PATH_INDEX.get(path)
+            if index is None:
+                index = len(_PATHS)
+                _PATHS.append(path)
+                _PATH_INDEX[path] = index
+    return index
+
+
+def set_locale(locale: str):
+    """设置打印和写入报告时使用的语言"""
+    global _locale
+    if locale not in MESSAGES:
+        raise ValueError(f"不支持的语言: {locale}")
+    _locale = locale
+
+
+def register_messages(locale: str, templates: Dict[str, str]):
+    """注册（第三方检查器的）消息模板"""
+    MESSAGES.setdefault(locale, {}).update(templates)
+
+
+def _format_location(locale: str, path: str, line: Optional[int], col: Optional[int],
+                     cell: Optional[int] = None) -> str:
+    if locale == 'zh':
+        location = f"文档 {path}"
+        if cell is not None:
+            location += f" 单元格 {cell}"
+        if line is None:
+            return location + " "
+        location += f" 行 {line}"
+        if col is not None:
+            location += f", 列 {col}"
+        return location + ": "
+    return location_text(path, line, col, cell) + ": "
+
+
+def location_text(path: str, line: Optional[int], col: Optional[int],
+                  cell: Optional[int] = None) -> str:
+    """紧凑的位置文本：路径[:行[:列]]，notebook 单元格中为 路径[单元格序号]:行:列"""
+    if cell is not None:
+        path = f"{path}[{cell}]"
+    return ':'.join([path] + [str(n) for n in (line, col) if n is not None])
+
+
+class Diagnostic:
+    """检查器报告的一个问题"""
+    
+    __slots__ = ('rule', 'severity', 'path_index', 'line', 'col', 'args', 'cell')
+    
+    def __init__(self, rule: str, severity: str, path: Optional[str] = None,
+                 line: Optional[int] = None, col: Optional[int] = None, args: Sequence[Any] = (),
+                 cell: Optional[int] = None):
+        self.rule = rule
+        self.severity = severity
+        self.path_index = intern_path(path) if path is not None else None
+        self.line = line
+        self.col = col
+        self.args = tuple(args)
+        # notebook 单元格序号（从 1 开始），此时 line、col 相对于单元格；其他文档为 None
+        self.cell = cell
+    
+    @property
+    def path(self) -> Optional[str]:
+        """相对于项目根目录的文档路径，没有对应文档时为 None"""
+        return _PATHS[self.path_index] if self.path_index is not None else None
+    
+    def message(self, locale: Optional[str] = None) -> str:
+        """不含位置的消息文本，默认使用 set_locale() 设置的语言"""
+        locale = locale or _locale
+        template = MESSAGES.get(locale, {}).get(self.rule) or MESSAGES[DEFAULT_LOCALE].get(self.rule)
+        if template is None:
+            return ' '.join([self.rule] + [str(arg) for arg in self.args])
+        return template.format(*self.args)
+    
+    def format(self, locale: Optional[str] = None) -> str:
+        """完整的消息文本（位置和消息）"""
+        locale = locale or _locale
+        if self.path_index is None:
+            return self.message(locale)
+        return _format_location(locale, self.path, self.line, self.col, self.cell) + self.message(locale)
+    
+    def __str__(self) -> str:
+        return self.format()
+    
+    def __repr__(self) -> str:
+        return (f"Diagnostic({self.rule!r}, {self.severity!r}, {self.path!r}, "
+                f"{self.line!r}, {self.col!r}, {self.args!r}, cell={self.cell!r})")
+    
+    def _identity(self):
+        return (self.rule, self.severity, self.path_index, self.cell, self.line, self.col, self.args)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Diagnostic):
+            return NotImplemented
+        return self._identity() == other._identity()
+    
+    def __hash__(self) -> int:
+        return hash(self._identity())
+    
+    def sort_key(self):
+        """按文档路径、位置排序的键（没有文档的排在最前）"""
+        return (self.path or '', self.cell or 0, self.line or 0, self.col or 0, self.severity, self.rule,
+                tuple(str(arg) for arg in self.args))
+    
+    def to_list(self) -> List[Any]:
+        """紧凑的 JSON 表示（用于缓存）"""
+        data = [self.rule, self.severity, self.path, self.line, self.col, list(self.args)]
+        if self.cell is not None:
+            data.append(self.cell)
+        return data
+    
+    @classmethod
+    def from_list(cls, data: List[Any]) -> 'Diagnostic':
+        rule, severity, path, line, col, args = data[:6]
+        return cls(rule, severity, path, line, col, args, data[6] if len(data) > 6 else None)
+    
+    def to_dict(self, locale: Optional[str] = None) -> Dict[str, Any]:
+        """带格式化消息的 JSON 表示（用于报告）"""
+        return {
+            'rule': self.rule,
+            'severity': self.severity,
+            'path': self.path,
+            'line': self.line,
+            'col': self.col,
+            'cell': self.cell,
+            'args': list(self.args),
+            'message': self.format(locale),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Diagnostic':
+        """从 to_dict() 的结果（如报告文件中的记录）恢复，格式化后的消息被忽略"""
+        return cls(data['rule'], data['severity'], data.get('path'), data.get('line'), data.get('col'),
+                   data.get('args', ()), data.get('cell'))
+    
+    def __reduce__(self):
+        # 路径表只在进程内有效，跨进程传递路径文本
+        return (Diagnostic, (self.rule, self.severity, self.path, self.line, self.col, self.args, self.cell))
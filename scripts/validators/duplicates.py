@@ -0,0 +1,236 @@
+"""近似重复检查器
+
+把 docs/<语言> 下的文档、仓库中的 README 以及 notebook 的 Markdown 单元格按整篇和按章节
+切分为段落，为每个段落计算 MinHash 签名并放入 LSH 哈希桶（见 minhash.py），只核实落入同一个桶的
+候选对，整体耗时与文本总量大致成正比，不需要两两比较所有段落。
+
+近似重复但不完全相同的段落说明复制出的副本已经各自修改（如三个教程版本中的同一章节），
+报告为警告；完全相同的副本只计入统计。两篇文档整体近似重复时只报告文档，不再逐章节报告。
+"""
+
+import hashlib
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from .base import DocumentValidator
+from .cache import ValidationCache
+from .corpus import Document, DocumentCorpus
+from .diagnostics import location_text
+from .markdown import FENCE_CLOSE, FENCE_OPEN, Token, headings
+from .minhash import LSHIndex, bin_minima, densify, similarity, token_hashes, window_hashes, words
+from .notebooks import MARKDOWN, NOTEBOOK_SUFFIX, notebook_keys, read_cells
+
+
+# 段落的种类
+DOCUMENT = 'document'
+SECTION = 'section'
+
+
+class Passage:
+    """参与比较的一段文本：整篇文档（或 notebook）或其中的一个章节"""
+    
+    __slots__ = ('kind', 'source', 'rel_path', 'line', 'cell', 'title', 'digest', 'signature')
+    
+    def __init__(self, kind: str, source: int, rel_path: str, line: Optional[int],
+                 cell: Optional[int], title: Optional[str]):
+        self.kind = kind
+        # 所属文档的序号，用于跳过整篇已经报告过的文档中的章节
+        self.source = source
+        self.rel_path = rel_path
+        # 章节标题所在的行（notebook 中为单元格内的行），整篇文档为 None
+        self.line = line
+        # notebook 单元格序号（从 1 开始），Markdown 文档为 None
+        self.cell = cell
+        self.title = title
+        # 归一化后的词序列的哈希，相同时两段文本完全相同
+        self.digest = b''
+        self.signature = array('Q')
+    
+    @property
+    def label(self) -> str:
+        """报告中引用该段落的位置：路径[:行]，notebook 中为 路径[单元格序号]:行"""
+        return location_text(self.rel_path, self.line, None, self.cell)
+
+
+class NearDuplicateChecker(DocumentValidator):
+    """近似重复检查器"""
+    
+    REPORT_TITLE = "近似重复检查报告"
+    CORPUS_CACHEABLE = True
+    VERSION = 2
+    
+    # 相似度（估计的 Jaccard 相似度）达到该值即视为近似重复
+    DEFAULT_THRESHOLD = 0.8
+    
+    # 签名长度、shingle 的词数，以及参与比较的段落至少包含的词数（过短的段落相似没有意义）
+    NUM_PERM = 128
+    SHINGLE_SIZE = 5
+    MIN_WORDS = 40
+    
+    # 不查找 README 和 notebook 的目录（docs 下的文档由语料库提供，scripts 下是工具本身的说明）
+    EXCLUDED_DIRS = ('docs', 'scripts')
+    
+    def __init__(self, root_dir: str = ".", corpus: Optional[DocumentCorpus] = None,
+                 cache: Optional[ValidationCache] = None, threshold: float = DEFAULT_THRESHOLD):
+        super().__init__(root_dir, corpus, cache)
+        self.threshold = threshold
+        self.stats: Dict[str, int] = {}
+    
+    def document_paths(self) -> List[Path]:
+        """语言目录下的文档（不含模板），源语言还包括仓库中的 README 和 notebook"""
+        paths = [path for path in self.corpus.doc_paths() if not self._is_template(path)]
+        if not self.corpus.is_source_locale:
+            return paths
+        extra = []
+        for key in self.corpus.path_index.files:
+            if key.split('/', 1)[0] in self.EXCLUDED_DIRS:
+                continue
+            name = key.rsplit('/', 1)[-1]
+            if name.startswith('README') and name.endswith('.md'):
+                extra.append(key)
+        extra.extend(key for key in notebook_keys(self.corpus.path_index)
+                     if key.split('/', 1)[0] not in self.EXCLUDED_DIRS)
+        return paths + [self.root_dir / key for key in sorted(extra)]
+    
+    def config_fingerprint(self) -> str:
+        """相似度阈值"""
+        return repr(self.threshold)
+    
+    @staticmethod
+    def _is_template(path: Path) -> bool:
+        """模板本来就是供复制的内容"""
+        return 'template' in path.name.lower() or 'templates' in path.parts
+    
+    def run(self):
+        """计算所有段落的签名，核实 LSH 候选对并报告近似重复"""
+        passages: List[Passage] = []
+        for source, path in enumerate(self.document_paths()):
+            doc = self.corpus.load(path)
+            if doc.error is not None:
+                self.add_error('read-failed', doc.path, doc.error)
+                continue
+            with self.timed_document(doc):
+                try:
+                    passages.extend(self._passages(source, doc))
+                except ValueError as e:
+                    self.add_error('invalid-notebook', e, path=doc.path)
+        
+        pairs: Dict[str, List[Tuple[Passage, Passage, float]]] = {}
+        candidate_count = identical = near = 0
+        for kind in (DOCUMENT, SECTION):
+            members = [passage for passage in passages if passage.kind == kind]
+            index = LSHIndex(self.NUM_PERM, self.threshold)
+            for number, passage in enumerate(members):
+                index.add(number, passage.signature)
+            candidates = index.candidates()
+            candidate_count += len(candidates)
+            
+            found = []
+            with self.timed(f'duplicates/near-duplicate-{kind}'):
+                for first, second in sorted(candidates):
+                    a, b = members[first], members[second]
+                    if a.digest == b.digest:
+                        found.append((a, b, 1.0))
+                        continue
+                    score = similarity(a.signature, b.signature)
+                    if score >= self.threshold:
+                        found.append((a, b, score))
+            pairs[kind] = found
+        
+        # 整篇近似重复的文档不再逐章节报告
+        duplicate_sources: Set[Tuple[int, int]] = {(a.source, b.source) for a, b, _ in pairs[DOCUMENT]}
+        for kind in (DOCUMENT, SECTION):
+            for a, b, score in pairs[kind]:
+                if kind == SECTION and (a.source, b.source) in duplicate_sources:
+                    continue
+                if score >= 1.0 and a.digest == b.digest:
+                    identical += 1
+                    continue
+                near += 1
+                percent = min(99, int(score * 100))
+                if kind == DOCUMENT:
+                    self.add_warning('duplicates/near-duplicate-document', b.label, percent,
+                                     path=a.rel_path, line=a.line)
+                else:
+                    self.add_warning('duplicates/near-duplicate-section', a.title, b.label, percent,
+                                     path=a.rel_path, line=a.line if a.cell is None else None)
+        
+        self.stats = {
+            'passages': len(passages),
+            'candidate_pairs': candidate_count,
+            'near_duplicates': near,
+            'identical': identical,
+        }
+    
+    def _passages(self, source: int, doc: Document) -> List[Passage]:
+        """文档（或 notebook 的 Markdown 单元格）中足够长的整篇段落和章节段落
+        
+        每个章节是整篇文档词序列中连续的一段：整篇文档的 shingle 哈希只计算一次，章节取其中的切片；
+        计算整篇文档的签名时，每个章节只需代入其各区间的最小值，不必再次处理章节中的全部 shingle。
+        词序列和 shingle 哈希在计算完签名后即丢弃。
+        """
+        sections: List[Tuple[Passage, int]] = []
+        doc_words: List[str] = []
+        if doc.path.suffix == NOTEBOOK_SUFFIX:
+            for cell in read_cells(doc, MARKDOWN):
+                self._split_sections(source, doc.rel_path, cell.document.lines, cell.document.tokens,
+                                     cell.index, sections, doc_words)
+        else:
+            self._split_sections(source, doc.rel_path, doc.lines, doc.tokens, None, sections, doc_words)
+        if len(doc_words) < self.MIN_WORDS:
+            return []
+        
+        size = self.SHINGLE_SIZE
+        windows = window_hashes(token_hashes(doc_words), size)
+        whole = Passage(DOCUMENT, source, doc.rel_path, None, None, None)
+        result = [whole]
+        # 整篇文档参与计算的值：不属于任何章节的 shingle 哈希，以及各章节的区间最小值
+        rest: List[int] = []
+        covered = 0
+        ends = [start for _, start in sections[1:]] + [len(doc_words)]
+        for (passage, start), end in zip(sections, ends):
+            if end - start < self.MIN_WORDS:
+                continue
+            # MIN_WORDS 不小于 SHINGLE_SIZE，足够长的章节中的 shingle 都不跨出章节
+            minima = bin_minima(windows[start:end - size + 1], self.NUM_PERM)
+            passage.digest = self._digest(doc_words[start:end])
+            passage.signature = densify(minima, self.NUM_PERM)
+            result.append(passage)
+            rest.extend(windows[covered:start])
+            rest.extend(minima.values())
+            covered = end - size + 1
+        rest.extend(windows[covered:])
+        whole.digest = self._digest(doc_words)
+        whole.signature = densify(bin_minima(rest, self.NUM_PERM), self.NUM_PERM)
+        return result
+    
+    @staticmethod
+    def _digest(passage_words: List[str]) -> bytes:
+        return hashlib.blake2b(' '.join(passage_words).encode('utf-8'), digest_size=16).digest()
+    
+    def _split_sections(self, source: int, rel_path: str, lines: List[str], tokens: List[Token],
+                        cell: Optional[int], sections: List[Tuple[Passage, int]], doc_words: List[str]):
+        """把一段 Markdown 中的词（不含代码块）追加到 doc_words，每个章节记录为 (段落, 开始位置)
+        
+        章节可以跨越 notebook 的多个单元格：没有标题的单元格并入前一个章节。
+        第一个标题之前的文字只计入整篇文档。
+        """
+        code_lines: Set[int] = set()
+        open_line = None
+        for token in tokens:
+            if token.kind == FENCE_OPEN:
+                open_line = token.line
+            elif token.kind == FENCE_CLOSE and open_line is not None:
+                code_lines.update(range(open_line, token.line + 1))
+                open_line = None
+        if open_line is not None:
+            code_lines.update(range(open_line, len(lines) + 1))
+        heading_lines = {token.line: token.text for token in headings(tokens)}
+        
+        for number, line in enumerate(lines, 1):
+            if number in code_lines:
+                continue
+            title = heading_lines.get(number)
+            if title is not None:
+                sections.append((Passage(SECTION, source, rel_path, number, cell, title), len(doc_words)))
+            doc_words.extend(words(line))
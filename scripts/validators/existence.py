@@ -1,12 +1,17 @@
 """文档存在性检查器"""
 
+from pathlib import Path
+from typing import Dict, List
 from .base import DocumentValidator
+from .corpus import SOURCE_LOCALE
 
 
 class DocumentExistenceChecker(DocumentValidator):
     """文档存在性检查器"""
     
-    # 必需的文档文件
+    REPORT_TITLE = "文档存在性检查报告"
+    
+    # 必需的文档文件（以源语言列出，其他语言的文档位于 docs/<语言> 下的相同位置）
     REQUIRED_DOCS = {
         "getting-started": [
             "docs/zh/getting-started/installation.md",
@@ -52,29 +57,62 @@ class DocumentExistenceChecker(DocumentValidator):
         "docs/zh/versions",
     ]
     
-    def check(self) -> bool:
+    def required_docs(self) -> Dict[str, List[str]]:
+        """语料库所属语言必需的文档：docs/zh 下的路径换成该语言的目录，根目录的文档只随源语言检查"""
+        if self.corpus.is_source_locale:
+            return self.REQUIRED_DOCS
+        required = {}
+        for category, docs in self.REQUIRED_DOCS.items():
+            localized = [self._localize(doc_path) for doc_path in docs if self._is_localized(doc_path)]
+            if localized:
+                required[category] = localized
+        return required
+    
+    def required_dirs(self) -> List[str]:
+        """语料库所属语言必需的目录"""
+        return [self._localize(dir_path) for dir_path in self.REQUIRED_DIRS]
+    
+    @staticmethod
+    def _is_localized(path: str) -> bool:
+        """路径是否位于源语言的文档目录下"""
+        prefix = f"docs/{SOURCE_LOCALE}"
+        return path == prefix or path.startswith(prefix + '/')
+    
+    def _localize(self, path: str) -> str:
+        """把源语言文档目录下的路径换成语料库所属语言的目录"""
+        if not self._is_localized(path):
+            return path
+        return f"docs/{self.corpus.locale}" + path[len(f"docs/{SOURCE_LOCALE}"):]
+    
+    def input_paths(self) -> List[Path]:
+        """所有必需的文档和目录"""
+        paths = [self.root_dir / dir_path for dir_path in self.required_dirs()]
+        for docs in self.required_docs().values():
+            paths.extend(self.root_dir / doc_path for doc_path in docs)
+        return paths
+    
+    def run(self):
         """执行文档存在性检查"""
         self._check_directories()
         self._check_documents()
-        return self.print_report("文档存在性检查报告")
     
     def _check_directories(self):
         """检查目录结构"""
-        for dir_path in self.REQUIRED_DIRS:
+        for dir_path in self.required_dirs():
             full_path = self.root_dir / dir_path
             if not full_path.exists():
-                self.add_error(f"缺失目录: {dir_path}")
+                self.add_error('existence/missing-dir', dir_path)
             elif not full_path.is_dir():
-                self.add_error(f"路径不是目录: {dir_path}")
+                self.add_error('existence/not-a-dir', dir_path)
     
     def _check_documents(self):
         """检查文档文件"""
-        for category, docs in self.REQUIRED_DOCS.items():
+        for category, docs in self.required_docs().items():
             for doc_path in docs:
                 full_path = self.root_dir / doc_path
                 if not full_path.exists():
-                    self.add_error(f"缺失文档 [{category}]: {doc_path}")
+                    self.add_error('existence/missing-doc', category, doc_path)
                 elif not full_path.is_file():
-                    self.add_error(f"路径不是文件 [{category}]: {doc_path}")
+                    self.add_error('existence/not-a-file', category, doc_path)
                 elif full_path.stat().st_size == 0:
-                    self.add_warning(f"文档为空 [{category}]: {doc_path}")
+                    self.add_warning('existence/empty-doc', category, doc_path)
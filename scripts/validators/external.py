@@ -0,0 +1,371 @@
+"""外部链接可达性检查
+
+可选的检查（validate_docs.py --links-external），用标准库 asyncio 实现的 HTTP/1.1 客户端
+并发探测文档中的 http(s) 链接：
+
+- 每个主机维护一个保持连接（keep-alive）的连接池，复用已建立的连接
+- 每个主机的并发请求数有上限，避免对同一站点造成压力
+- 先发送 HEAD 请求，失败（如 405）时再用 GET 重试；自动跟随重定向
+- 探测结果保存在磁盘上的 JSON 文件中，在有效期（TTL）内重复运行不再重新探测；
+  网络错误和超时不写入缓存，下次运行时重试
+
+HTTP 4xx/5xx 响应报告为错误；超时、连接失败和 429 限流视为暂时性问题，报告为警告。
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+from .cache import ValidationCache
+from .corpus import Document, DocumentCorpus
+from .links import LinkValidator
+from .markdown import Token
+from .notebooks import MARKDOWN, is_notebook, read_cells
+
+
+# 默认结果缓存有效期（秒）
+DEFAULT_TTL = 24 * 60 * 60
+
+# 默认每个主机的最大并发请求数
+DEFAULT_PER_HOST = 4
+
+# 默认单个请求的超时时间（秒）
+DEFAULT_TIMEOUT = 10.0
+
+# 最多跟随的重定向次数
+MAX_REDIRECTS = 5
+
+# GET 响应体超过此大小时不读完，直接关闭连接
+MAX_BODY_SIZE = 1024 * 1024
+
+# 结果缓存文件名（位于验证缓存目录下）
+CACHE_FILENAME = "external_links.json"
+
+USER_AGENT = "prompt-eng-docs-linkcheck/1.0"
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class _ProtocolError(Exception):
+    """响应不是合法的 HTTP/1.x 响应"""
+
+
+class HostConnectionPool:
+    """按 (协议, 主机, 端口) 分组的连接池，每组有独立的并发上限"""
+    
+    def __init__(self, per_host: int = DEFAULT_PER_HOST):
+        self.per_host = per_host
+        self.connections_opened = 0
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+    
+    def limit(self, origin: Tuple[str, str, int]) -> asyncio.Semaphore:
+        """某个主机的并发上限"""
+        if origin not in self._limits:
+            self._limits[origin] = asyncio.Semaphore(self.per_host)
+        return self._limits[origin]
+    
+    async def acquire(self, origin: Tuple[str, str, int]):
+        """取出一个空闲连接，没有时新建；返回 (reader, writer, 是否复用)"""
+        idle = self._idle.get(origin)
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        
+        scheme, host, port = origin
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=self._ssl_context, server_hostname=host
+            )
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        self.connections_opened += 1
+        return reader, writer, False
+    
+    def release(self, origin: Tuple[str, str, int], reader, writer, reusable: bool):
+        """归还连接；不能复用的连接直接关闭"""
+        if reusable and not writer.is_closing():
+            self._idle.setdefault(origin, []).append((reader, writer))
+        else:
+            writer.close()
+    
+    def close(self):
+        """关闭所有空闲连接"""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+def _origin(url: str) -> Tuple[str, str, int]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    port = parts.port or (443 if scheme == 'https' else 80)
+    return scheme, parts.hostname or '', port
+
+
+def _request_bytes(method: str, url: str) -> bytes:
+    parts = urlsplit(url)
+    target = quote(parts.path or '/', safe="/%:@!$&'()*+,;=-._~")
+    if parts.query:
+        target += '?' + quote(parts.query, safe="/%:@!$&'()*+,;=-._~?")
+    host = (parts.hostname or '').encode('idna').decode('ascii')
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    return (
+        f"{method} {target} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        f"User-Agent: {USER_AGENT}\r\n"
+        f"Accept: */*\r\n"
+        f"Connection: keep-alive\r\n"
+        f"\r\n"
+    ).encode('ascii')
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, str, Dict[str, str]]:
+    """读取状态行和响应头"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("连接已被服务器关闭")
+    try:
+        version, status, *_ = status_line.decode('latin-1').split(None, 2)
+        status_code = int(status)
+    except ValueError:
+        raise _ProtocolError(f"无效的状态行: {status_line!r}")
+    
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return status_code, version, headers
+
+
+async def _drain_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bool:
+    """读完 GET 响应体以便复用连接；响应体过大或长度未知时返回 False"""
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        total = 0
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return True
+            total += size
+            if total > MAX_BODY_SIZE:
+                return False
+            await reader.readexactly(size + 2)
+    
+    length = headers.get('content-length')
+    if length is None or not length.isdigit() or int(length) > MAX_BODY_SIZE:
+        return False
+    await reader.readexactly(int(length))
+    return True
+
+
+async def _request(pool: HostConnectionPool, method: str, url: str,
+                   timeout: float) -> Tuple[int, Dict[str, str]]:
+    """发送一个请求并返回 (状态码, 响应头)；复用的连接已失效时换新连接重试一次"""
+    origin = _origin(url)
+    async with pool.limit(origin):
+        for attempt in range(2):
+            reader, writer, reused = await asyncio.wait_for(pool.acquire(origin), timeout)
+            try:
+                writer.write(_request_bytes(method, url))
+                await writer.drain()
+                status, version, headers = await asyncio.wait_for(_read_head(reader), timeout)
+                reusable = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                if method == 'GET' and status not in (204, 304):
+                    reusable = reusable and await asyncio.wait_for(_drain_body(reader, headers), timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            pool.release(origin, reader, writer, reusable)
+            return status, headers
+    raise ConnectionError("无法建立连接")
+
+
+async def probe(pool: HostConnectionPool, url: str, timeout: float = DEFAULT_TIMEOUT) -> Dict:
+    """探测单个 URL，返回 {'ok', 'status', 'reason', 'transient'}"""
+    current = url
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers = await _request(pool, 'HEAD', current, timeout)
+            if status >= 400 and status != 429:
+                # 部分服务器不支持 HEAD（405/501）或对 HEAD 返回错误，用 GET 再确认
+                status, headers = await _request(pool, 'GET', current, timeout)
+            
+            if status in _REDIRECT_STATUSES:
+                location = headers.get('location')
+                if not location:
+                    return _result(False, status, f"HTTP {status} 重定向缺少 Location")
+                current = urljoin(current, location)
+                if urlsplit(current).scheme not in ('http', 'https'):
+                    return _result(False, status, f"重定向到不支持的地址: {current}")
+                continue
+            
+            if status == 429:
+                return _result(False, status, "HTTP 429 请求过多", transient=True)
+            if status >= 400:
+                return _result(False, status, f"HTTP {status}")
+            return _result(True, status, f"HTTP {status}")
+        return _result(False, None, f"重定向次数超过 {MAX_REDIRECTS} 次")
+    except asyncio.TimeoutError:
+        return _result(False, None, f"超时（{timeout:g} 秒）", transient=True)
+    except (OSError, EOFError, _ProtocolError, ValueError, UnicodeError,
+            asyncio.LimitOverrunError) as e:
+        return _result(False, None, f"连接失败: {e}", transient=True)
+
+
+def _result(ok: bool, status: Optional[int], reason: str, transient: bool = False) -> Dict:
+    return {'ok': ok, 'status': status, 'reason': reason, 'transient': transient}
+
+
+async def probe_all(urls: List[str], per_host: int = DEFAULT_PER_HOST,
+                    timeout: float = DEFAULT_TIMEOUT) -> Tuple[Dict[str, Dict], int]:
+    """并发探测所有 URL，返回 (URL -> 结果, 新建的连接数)"""
+    pool = HostConnectionPool(per_host)
+    try:
+        results = await asyncio.gather(*(probe(pool, url, timeout) for url in urls))
+    finally:
+        pool.close()
+    return dict(zip(urls, results)), pool.connections_opened
+
+
+class ExternalLinkCache:
+    """带有效期的外部链接探测结果缓存（单个 JSON 文件）"""
+    
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+    
+    def get(self, url: str, now: Optional[float] = None) -> Optional[Dict]:
+        """返回有效期内的结果，过期或不存在时返回 None"""
+        entry = self._entries.get(url)
+        now = time.time() if now is None else now
+        if entry is None or now - entry.get('checked_at', 0) >= self.ttl:
+            return None
+        return entry
+    
+    def put(self, url: str, result: Dict, now: Optional[float] = None):
+        """记录探测结果；暂时性失败不缓存"""
+        if result['transient']:
+            self._entries.pop(url, None)
+            return
+        self._entries[url] = dict(result, checked_at=time.time() if now is None else now)
+    
+    def save(self):
+        """原子地写回磁盘，写入失败时静默忽略"""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+
+class ExternalLinkChecker(LinkValidator):
+    """外部链接可达性检查器"""
+    
+    REPORT_TITLE = "外部链接可达性报告"
+    PER_DOCUMENT = False
+    
+    def __init__(self, root_dir: str = ".", corpus: Optional[DocumentCorpus] = None,
+                 cache: Optional[ValidationCache] = None, ttl: float = DEFAULT_TTL,
+                 per_host: int = DEFAULT_PER_HOST, timeout: float = DEFAULT_TIMEOUT):
+        super().__init__(root_dir, corpus, cache)
+        self.ttl = ttl
+        self.per_host = per_host
+        self.timeout = timeout
+        self.stats: Dict[str, int] = {}
+    
+    def run(self):
+        """收集所有外部链接，探测缓存中没有的 URL 并报告结果"""
+        # 按文档顺序记录每个链接出现的位置，同一 URL 只探测一次
+        occurrences: List[Tuple[str, Path, Optional[int], int, int]] = []
+        for path in self.document_paths():
+            doc = self.corpus.load(path)
+            if doc.error is not None or self._is_template(doc.path):
+                continue
+            for cell, token in self._external_links(doc):
+                url = token.target.split()[0] if token.target.strip() else ''
+                if url.startswith(('http://', 'https://')):
+                    occurrences.append((url, doc.path, cell, token.line, token.col))
+        urls = list(dict.fromkeys(occurrence[0] for occurrence in occurrences))
+        
+        link_cache = None
+        if self.cache is not None:
+            link_cache = ExternalLinkCache(self.cache.cache_dir / CACHE_FILENAME, self.ttl)
+        
+        results: Dict[str, Dict] = {}
+        pending = []
+        for url in urls:
+            entry = link_cache.get(url) if link_cache is not None else None
+            if entry is not None:
+                results[url] = entry
+            else:
+                pending.append(url)
+        
+        connections = 0
+        if pending:
+            probed, connections = asyncio.run(probe_all(pending, self.per_host, self.timeout))
+            results.update(probed)
+            if link_cache is not None:
+                for url, result in probed.items():
+                    link_cache.put(url, result)
+                link_cache.save()
+        
+        self.stats = {
+            'urls': len(urls),
+            'probed': len(pending),
+            'cached': len(urls) - len(pending),
+            'connections': connections,
+        }
+        
+        for url, doc_path, cell, line, col in occurrences:
+            result = results[url]
+            if result['ok']:
+                continue
+            report = self.add_warning if result['transient'] else self.add_error
+            report('links/unreachable', url, result['reason'], path=doc_path, line=line, col=col, cell=cell)
+    
+    def _external_links(self, doc: Document) -> List[Tuple[Optional[int], Token]]:
+        """文档中的链接记号及其所在的 notebook 单元格序号（普通文档为 None）
+        
+        notebook 只检查 Markdown 单元格中的链接（与 LinkValidator 相同），不扫描代码和输出；
+        JSON 格式无效的 notebook 由链接检查报告，这里跳过。
+        """
+        if not is_notebook(doc.path):
+            return [(None, token) for token in self._link_tokens(doc)]
+        try:
+            cells = read_cells(doc, MARKDOWN)
+        except ValueError:
+            return []
+        return [(cell.index, token) for cell in cells for token in self._link_tokens(cell.document)]
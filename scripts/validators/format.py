@@ -1,80 +1,50 @@
 """Markdown 格式检查器"""
 
-import re
 from pathlib import Path
 from .base import DocumentValidator
+from .corpus import Document
+from .markdown import FENCE_CLOSE, FENCE_OPEN, HEADING, LIST_ITEM, Token
+from .notebooks import MARKDOWN
 
 
 class MarkdownFormatChecker(DocumentValidator):
     """Markdown 格式检查器"""
     
-    def check(self) -> bool:
-        """执行 Markdown 格式检查"""
-        self._check_markdown_format()
-        return self.print_report("Markdown 格式检查报告")
+    REPORT_TITLE = "Markdown 格式检查报告"
+    PER_DOCUMENT = True
+    VERSION = 4
+    NOTEBOOK_CELLS = (MARKDOWN,)
     
-    def _check_markdown_format(self):
-        """检查所有文档的 Markdown 格式"""
-        docs_dir = self.root_dir / "docs" / "zh"
-        if not docs_dir.exists():
-            return
+    def check_document(self, doc: Document):
+        """检查单个文档的 Markdown 格式"""
+        open_fence = None
         
-        for doc_path in docs_dir.rglob("*.md"):
-            try:
-                content = doc_path.read_text(encoding='utf-8')
-                self._validate_markdown(doc_path, content)
-            except Exception as e:
-                self.add_error(f"读取文档失败 {doc_path}: {e}")
-    
-    def _validate_markdown(self, doc_path: Path, content: str):
-        """验证 Markdown 格式"""
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # 检查标题格式
-            if line.startswith('#'):
-                self._check_heading_format(doc_path, i, line)
-            
-            # 检查列表格式
-            if re.match(r'^\s*[-*+]\s', line):
-                self._check_list_format(doc_path, i, line)
+        for token in doc.tokens:
+            if token.kind == HEADING:
+                self._check_heading_format(doc.path, token)
+            elif token.kind == LIST_ITEM:
+                self._check_list_format(doc.path, token)
+            elif token.kind == FENCE_OPEN:
+                open_fence = token
+            elif token.kind == FENCE_CLOSE:
+                open_fence = None
         
-        # 检查代码块配对
-        self._check_code_block_pairing(doc_path, content)
+        # 检查代码块配对：扫描结束时仍有打开的围栏即未闭合
+        if open_fence is not None:
+            self.add_error('format/unclosed-fence', path=doc.path, line=open_fence.line)
     
-    def _check_heading_format(self, doc_path: Path, line_num: int, line: str):
+    def _check_heading_format(self, doc_path: Path, token: Token):
         """检查标题格式"""
         # 检查标题后是否有空格
-        if not re.match(r'^#+\s+\S', line):
-            self.add_warning(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"行 {line_num}: 标题格式不规范（# 后应有空格）"
-            )
+        if token.text is None:
+            self.add_warning('format/heading-space', path=doc_path, line=token.line)
         
         # 检查标题层级
-        match = re.match(r'^(#+)', line)
-        if match:
-            level = len(match.group(1))
-            if level > 6:
-                self.add_error(
-                    f"文档 {doc_path.relative_to(self.root_dir)} "
-                    f"行 {line_num}: 标题层级过深（最多 6 级）"
-                )
+        if token.level > 6:
+            self.add_error('format/heading-depth', path=doc_path, line=token.line)
     
-    def _check_list_format(self, doc_path: Path, line_num: int, line: str):
+    def _check_list_format(self, doc_path: Path, token: Token):
         """检查列表格式"""
-        # 检查列表项后是否有空格
-        if not re.match(r'^\s*[-*+]\s+\S', line):
-            self.add_warning(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"行 {line_num}: 列表格式不规范（标记后应有空格）"
-            )
-    
-    def _check_code_block_pairing(self, doc_path: Path, content: str):
-        """检查代码块是否配对"""
-        backticks = re.findall(r'^```', content, re.MULTILINE)
-        if len(backticks) % 2 != 0:
-            self.add_error(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"代码块未正确闭合（``` 数量不匹配）"
-            )
+        # 检查列表项后是否有内容
+        if not token.text:
+            self.add_warning('format/list-marker-space', path=doc_path, line=token.line, col=token.col)
@@ -0,0 +1,363 @@
+"""练习提示与评分函数一致性检查器
+
+教程中每个练习的代码单元格定义一个 grade_exercise() 评分函数（通常用正则表达式或字符串比较），
+紧随其后的单元格从 hints 模块中引用该练习的提示（from hints import exercise_1_1_hint 或
+hints.exercise_1_1_hint）。提示的第一句描述评分函数查找的内容，如
+The grading function ... contains the exact Arabic numerals "1", "2", and "3"。
+
+这里不导入 notebook 和 hints 模块，而是用 ast 解析：notebook 中含有 grade_exercise 的代码单元格、
+两个 hints 模块（Anthropic 1P/hints.py 和 AmazonBedrock/utils/hints.py），所有文件只读取和解析一次。
+评分函数中的字符串常量及其中正则表达式的字面量片段构成评分函数的字符串集合，然后检查：
+
+- notebook 引用的提示在对应的 hints 模块中是否存在；
+- 提示中用引号括起的字符串是否都出现在评分函数中；
+- 同一练习的评分函数在三个教程版本中是否一致，是否有版本缺少评分函数；
+- 两个 hints 模块中同名提示描述的字符串是否一致。
+"""
+
+import ast
+import re
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from .base import DocumentValidator
+from .cache import ValidationCache
+from .corpus import DocumentCorpus
+from .notebooks import CODE, NOTEBOOK_SUFFIX, NotebookCell, python_source
+from .parity import chapter_key
+
+# 评分函数的名称
+GRADER_NAME = 'grade_exercise'
+
+# hints 模块中的提示和答案名称，如 exercise_1_1_hint、exercise_10_2_1_solution
+_HINT_NAME_RE = re.compile(r'\bexercise_(\d+(?:_\d+)+)_(hint|solution)\b')
+# 提示中描述评分函数的句子，以及其中用引号括起的字符串
+_GRADING_RE = re.compile(r'grading function', re.I)
+_QUOTED_RE = re.compile(r'"([^"\n]+)"')
+
+# 正则表达式中不属于字面量的部分：(?=、(?:、(?P<name> 等分组前缀，字符类，量词
+_GROUP_PREFIX_RE = re.compile(r'\(\?(?:P<\w+>|P=\w+\)|<[=!]|[=!:>]|[aiLmsux-]+[:)])?')
+_CHAR_CLASS_RE = re.compile(r'\[\^?\]?(?:\\.|[^\]])*\]')
+_COUNT_RE = re.compile(r'\{\d*(?:,\d*)?\}')
+_REGEX_META = '.^$|()'
+_QUANTIFIERS = '*+?{'
+
+
+def regex_literals(pattern: str) -> List[str]:
+    """正则表达式中连续的字面量片段，如 ^(?=.*1)(?=.*2) 为 ['1', '2']，A\\) P 为 ['A) P']
+    
+    量词作用的最后一个字符不属于片段（colou?r 为 ['colo', 'r']），\\d、\\s 等转义和字符类分隔片段。
+    """
+    literals = []
+    current: List[str] = []
+    
+    def flush():
+        if current:
+            literals.append(''.join(current))
+            current.clear()
+    
+    pos = 0
+    while pos < len(pattern):
+        char = pattern[pos]
+        if char == '\\' and pos + 1 < len(pattern):
+            escaped = pattern[pos + 1]
+            if escaped.isalnum():
+                flush()
+            else:
+                current.append(escaped)
+            pos += 2
+            continue
+        match = None
+        if char == '(':
+            match = _GROUP_PREFIX_RE.match(pattern, pos)
+        elif char == '[':
+            match = _CHAR_CLASS_RE.match(pattern, pos)
+        elif char == '{':
+            match = _COUNT_RE.match(pattern, pos)
+            if match is None:
+                current.append(char)
+                pos += 1
+                continue
+        if char in _QUANTIFIERS and current:
+            current.pop()
+        if match is not None or char in _REGEX_META or char in _QUANTIFIERS or char == '[':
+            flush()
+            pos = match.end() if match is not None else pos + 1
+            continue
+        current.append(char)
+        pos += 1
+    flush()
+    return literals
+
+
+def grader_strings(function: ast.FunctionDef) -> Set[str]:
+    """评分函数中的字符串常量（不含文档字符串和空白字符串）及其正则表达式字面量片段"""
+    docstring = ast.get_docstring(function, clean=False)
+    strings: Set[str] = set()
+    for node in ast.walk(function):
+        if not isinstance(node, ast.Constant) or not isinstance(node.value, str):
+            continue
+        if node.value == docstring or not node.value.strip():
+            continue
+        strings.add(node.value)
+        strings.update(literal for literal in regex_literals(node.value) if literal.strip())
+    return strings
+
+
+def hint_strings(text: str) -> Optional[List[str]]:
+    """提示中描述评分函数的第一行里用引号括起的字符串，提示没有描述评分函数时为 None"""
+    for line in text.split('\n'):
+        if _GRADING_RE.search(line):
+            return _QUOTED_RE.findall(line)
+    return None
+
+
+def exercise_label(exercise: str) -> str:
+    """练习编号的显示形式，如 1_1 为 1.1"""
+    return exercise.replace('_', '.')
+
+
+class Hint:
+    """hints 模块中的一个提示或答案"""
+    
+    __slots__ = ('name', 'line', 'strings')
+    
+    def __init__(self, name: str, line: int, strings: Optional[List[str]]):
+        self.name = name
+        self.line = line
+        # 提示描述的评分函数查找的字符串，没有描述时为 None
+        self.strings = strings
+
+
+class Grader:
+    """notebook 中的一个评分函数"""
+    
+    __slots__ = ('path', 'cell', 'line', 'exercise', 'strings')
+    
+    def __init__(self, path: Path, cell: int, line: int, strings: Set[str]):
+        self.path = path
+        # 定义所在的单元格序号和单元格内的行号
+        self.cell = cell
+        self.line = line
+        # 练习编号（如 1_1），由其后的单元格引用的提示确定，没有引用提示时为 None
+        self.exercise: Optional[str] = None
+        self.strings = strings
+
+
+class GraderHintChecker(DocumentValidator):
+    """练习提示与评分函数一致性检查器"""
+    
+    REPORT_TITLE = "练习提示与评分函数一致性检查报告"
+    CORPUS_CACHEABLE = True
+    VERSION = 1
+    
+    # 教程版本目录 -> 该版本的 notebook 引用的 hints 模块（相对于项目根目录），出现差异时前面的版本作为参照
+    HINT_MODULES = {
+        'Anthropic 1P': 'Anthropic 1P/hints.py',
+        'AmazonBedrock/anthropic': 'AmazonBedrock/utils/hints.py',
+        'AmazonBedrock/boto3': 'AmazonBedrock/utils/hints.py',
+    }
+    
+    def __init__(self, root_dir: str = ".", corpus: Optional[DocumentCorpus] = None,
+                 cache: Optional[ValidationCache] = None):
+        super().__init__(root_dir, corpus, cache)
+        self.stats: Dict[str, int] = {}
+    
+    def document_paths(self) -> List[Path]:
+        """各版本目录下（不递归）的 notebook 和 hints 模块，只随源语言检查"""
+        if not self.corpus.is_source_locale:
+            return []
+        index = self.corpus.path_index
+        paths = []
+        for variant in self.HINT_MODULES:
+            paths.extend(
+                self.root_dir / key for key in index.files_under(variant + '/', NOTEBOOK_SUFFIX)
+                if '/' not in key[len(variant) + 1:]
+            )
+        for module in dict.fromkeys(self.HINT_MODULES.values()):
+            if index.exists(module):
+                paths.append(self.root_dir / module)
+        return paths
+    
+    def run(self):
+        """解析 hints 模块和 notebook 中的评分函数，逐个练习交叉检查"""
+        modules: Dict[str, Optional[Dict[str, Hint]]] = {}
+        for module in dict.fromkeys(self.HINT_MODULES.values()):
+            modules[module] = self._load_hints(module)
+        
+        # 练习编号 -> 版本 -> 评分函数；版本 -> 含有 notebook 的章号
+        graders: Dict[str, Dict[str, Grader]] = {}
+        chapters: Dict[str, Set[str]] = {variant: set() for variant in self.HINT_MODULES}
+        notebook_count = grader_count = 0
+        for path in self.document_paths():
+            if not path.name.endswith(NOTEBOOK_SUFFIX):
+                continue
+            notebook_count += 1
+            variant = self._variant(path)
+            key = chapter_key(path.name)
+            if key is not None:
+                chapters[variant].add(key[0])
+            found = self._load_graders(path, modules[self.HINT_MODULES[variant]])
+            grader_count += len(found)
+            for grader in found:
+                if grader.exercise is not None:
+                    graders.setdefault(grader.exercise, {}).setdefault(variant, grader)
+        
+        mismatches = 0
+        with self.timed('graders/drifted-grader'):
+            for exercise in sorted(graders, key=lambda name: [int(part) for part in name.split('_')]):
+                mismatches += self._compare(exercise, graders[exercise], chapters, modules)
+            mismatches += self._compare_modules(modules)
+        
+        self.stats = {
+            'notebooks': notebook_count,
+            'graders': grader_count,
+            'exercises': len(graders),
+            'hints': sum(len(hints) for hints in modules.values() if hints is not None),
+            'mismatches': mismatches,
+        }
+    
+    def _variant(self, path: Path) -> str:
+        rel_path = path.relative_to(self.root_dir).as_posix()
+        return next(variant for variant in self.HINT_MODULES if rel_path.startswith(variant + '/'))
+    
+    def _label(self, path: Path) -> str:
+        return path.relative_to(self.root_dir).as_posix()
+    
+    def _load_hints(self, module: str) -> Optional[Dict[str, Hint]]:
+        """hints 模块中的提示和答案（名称 -> Hint），模块不存在或无法解析时为 None"""
+        if not self.corpus.path_index.exists(module):
+            return None
+        doc = self.corpus.load(self.root_dir / module)
+        if doc.error is not None:
+            self.add_error('read-failed', doc.path, doc.error)
+            return None
+        with self.timed_document(doc):
+            try:
+                tree = ast.parse(doc.text, filename=module)
+            except SyntaxError as e:
+                self.add_error('graders/invalid-module', e.msg, path=doc.path, line=e.lineno)
+                return None
+        hints = {}
+        for node in tree.body:
+            if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+                continue
+            target = node.targets[0]
+            if not isinstance(target, ast.Name) or not _HINT_NAME_RE.fullmatch(target.id):
+                continue
+            if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                strings = hint_strings(node.value.value) if target.id.endswith('_hint') else None
+                hints[target.id] = Hint(target.id, node.lineno, strings)
+        return hints
+    
+    def _load_graders(self, path: Path, hints: Optional[Dict[str, Hint]]) -> List[Grader]:
+        """notebook 中的评分函数，并检查引用的提示是否存在
+        
+        每个评分函数对应其后（下一个评分函数之前）第一个引用的提示所属的练习。
+        只解析含有 grade_exercise 的代码单元格，其余单元格只用正则表达式查找提示的引用。
+        """
+        doc = self.corpus.load(path)
+        if doc.error is not None:
+            self.add_error('read-failed', doc.path, doc.error)
+            return []
+        graders: List[Grader] = []
+        with self.timed_document(doc):
+            try:
+                cells = [cell for cell in doc.cells if cell.cell_type == CODE]
+            except ValueError as e:
+                self.add_error('invalid-notebook', e, path=doc.path)
+                return []
+            pending: Optional[Grader] = None
+            for cell in cells:
+                if GRADER_NAME in cell.source:
+                    grader = self._grader(path, cell)
+                    if grader is not None:
+                        graders.append(grader)
+                        pending = grader
+                for match in _HINT_NAME_RE.finditer(cell.source):
+                    name = match.group()
+                    if hints is not None and name not in hints:
+                        line = cell.source.count('\n', 0, match.start()) + 1
+                        self.add_error('graders/undefined-hint', name, self.HINT_MODULES[self._variant(path)],
+                                       path=doc.path, line=line, cell=cell.index)
+                    if pending is not None and match.group(2) == 'hint':
+                        pending.exercise = match.group(1)
+                        pending = None
+        return graders
+    
+    def _grader(self, path: Path, cell: NotebookCell) -> Optional[Grader]:
+        """单元格中定义的评分函数，没有定义或有语法错误时为 None（语法错误由代码示例验证报告）"""
+        source = python_source(cell)
+        if source is None:
+            return None
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                tree = ast.parse(source)
+        except SyntaxError:
+            return None
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and node.name == GRADER_NAME:
+                return Grader(path, cell.index, node.lineno, grader_strings(node))
+        return None
+    
+    def _compare(self, exercise: str, found: Dict[str, Grader], chapters: Dict[str, Set[str]],
+                 modules: Dict[str, Optional[Dict[str, Hint]]]) -> int:
+        """检查一个练习在各版本中的评分函数，返回报告的问题数"""
+        variants = [variant for variant in self.HINT_MODULES if variant in found]
+        label = exercise_label(exercise)
+        chapter = exercise.split('_')[0]
+        problems = 0
+        reference = found[variants[0]]
+        for variant in self.HINT_MODULES:
+            if variant not in found and chapter in chapters[variant]:
+                problems += 1
+                self.add_warning('graders/missing-grader', label, variant, self._label(reference.path),
+                                 path=reference.path, line=reference.line, cell=reference.cell)
+        
+        # 提示中的字符串都应出现在评分函数中
+        for variant in variants:
+            grader = found[variant]
+            module = self.HINT_MODULES[variant]
+            hint = (modules[module] or {}).get(f"exercise_{exercise}_hint")
+            if hint is None or hint.strings is None:
+                continue
+            for text in hint.strings:
+                if text not in grader.strings:
+                    problems += 1
+                    self.add_warning('graders/ungraded-string', label, text, f"{module}:{hint.line}",
+                                     path=grader.path, line=grader.line, cell=grader.cell)
+        
+        # 字符串集合 -> 具有该集合的版本；与多数（并列时与靠前的版本）不同的版本出现了差异
+        groups: Dict[frozenset, List[str]] = {}
+        for variant in variants:
+            groups.setdefault(frozenset(found[variant].strings), []).append(variant)
+        if len(groups) < 2:
+            return problems
+        majority = max(groups.values(), key=lambda members: (len(members), -variants.index(members[0])))
+        expected = found[majority[0]].strings
+        for variant in variants:
+            if variant in majority:
+                continue
+            grader = found[variant]
+            problems += 1
+            difference = ', '.join(f'"{text}"' for text in sorted(expected ^ grader.strings))
+            self.add_warning('graders/drifted-grader', label, self._label(found[majority[0]].path), difference,
+                             path=grader.path, line=grader.line, cell=grader.cell)
+        return problems
+    
+    def _compare_modules(self, modules: Dict[str, Optional[Dict[str, Hint]]]) -> int:
+        """比较各 hints 模块中同名提示描述的字符串，以第一个模块为参照，返回报告的问题数"""
+        loaded = [(module, hints) for module, hints in modules.items() if hints is not None]
+        if len(loaded) < 2:
+            return 0
+        reference_module, reference = loaded[0]
+        problems = 0
+        for module, hints in loaded[1:]:
+            for name, hint in hints.items():
+                expected = reference.get(name)
+                if expected is not None and expected.strings != hint.strings:
+                    problems += 1
+                    self.add_warning('graders/drifted-hint', name, f"{reference_module}:{expected.line}",
+                                     path=self.root_dir / module, line=hint.line)
+        return problems
@@ -2,48 +2,88 @@
 
 import re
 from pathlib import Path
+from typing import List, Optional, Set
+from urllib.parse import unquote
 from .base import DocumentValidator
+from .corpus import Document
+from .markdown import LINK, Token
+from .notebooks import MARKDOWN, NOTEBOOK_SUFFIX, NotebookCell, is_notebook, notebook_anchors, read_cells
 
 
 class LinkValidator(DocumentValidator):
     """链接验证器"""
     
-    def check(self) -> bool:
-        """执行链接验证"""
-        self._check_links()
-        return self.print_report("链接验证报告")
+    REPORT_TITLE = "链接验证报告"
+    PER_DOCUMENT = True
+    VERSION = 6
+    NOTEBOOK_CELLS = (MARKDOWN,)
     
-    def _check_links(self):
-        """检查所有文档中的链接"""
-        docs_dir = self.root_dir / "docs" / "zh"
-        if not docs_dir.exists():
-            return
+    def document_paths(self) -> List[Path]:
+        """docs/<语言> 下的所有文档，源语言还包括根目录的 README 和仓库中的 notebook"""
+        if not self.corpus.docs_dir.exists():
+            return []
         
-        # 同时检查根目录的 README
-        all_docs = list(docs_dir.rglob("*.md"))
+        all_docs = list(self.corpus.doc_paths())
         readme = self.root_dir / "README.md"
-        if readme.exists():
+        if self.corpus.is_source_locale and readme.is_file():
             all_docs.append(readme)
+        return all_docs + self.notebook_paths()
+    
+    def check_document(self, doc: Document):
+        """检查单个文档中的链接"""
+        self._validate_links(doc)
+    
+    def check_cell(self, notebook: Document, cell: NotebookCell):
+        """检查 Markdown 单元格中的链接，页内锚点在整个 notebook 的标题中查找"""
+        self._validate_links(cell.document, notebook_anchors(notebook))
+    
+    def link_targets(self, doc: Document) -> List[str]:
+        """文档中所有内部链接指向的路径索引键（用于构建反向链接索引）"""
+        if self._is_template(doc.path):
+            return []
         
-        for doc_path in all_docs:
+        if is_notebook(doc.path):
             try:
-                content = doc_path.read_text(encoding='utf-8')
-                self._validate_links(doc_path, content)
-            except Exception as e:
-                self.add_error(f"读取文档失败 {doc_path}: {e}")
+                docs = [cell.document for cell in read_cells(doc, MARKDOWN)]
+            except ValueError:
+                return []
+        else:
+            docs = [doc]
+        
+        targets = []
+        for token in (token for part in docs for token in self._link_tokens(part)):
+            link_url = token.target
+            if link_url.startswith(('#', 'mailto:', 'ftp://', 'http://', 'https://')):
+                continue
+            key = self._target_key(doc.path, link_url)
+            if key is not None:
+                targets.append(key)
+        return targets
+    
+    def _is_template(self, doc_path: Path) -> bool:
+        """模板文件中的链接是占位符，不做检查"""
+        return 'template' in doc_path.name.lower() or 'templates' in str(doc_path)
+    
+    def _link_tokens(self, doc: Document) -> List[Token]:
+        """Markdown 链接 [text](url) 记号（不含代码块和行内代码中的内容）"""
+        return [token for token in doc.tokens if token.kind == LINK]
     
-    def _validate_links(self, doc_path: Path, content: str):
-        """验证文档中的链接"""
+    def _validate_links(self, doc: Document, anchors: Optional[Set[str]] = None):
+        """验证文档中的链接，页内锚点在 anchors（默认为文档自身的标题锚点）中查找"""
         # 跳过模板文件
-        if 'template' in doc_path.name.lower() or 'templates' in str(doc_path):
+        if self._is_template(doc.path):
             return
         
-        # 提取 Markdown 链接 [text](url)
-        md_links = re.findall(r'\[([^\]]+)\]\(([^\)]+)\)', content)
-        
-        for link_text, link_url in md_links:
-            # 跳过锚点链接
+        if anchors is None:
+            anchors = doc.anchors
+        for token in self._link_tokens(doc):
+            link_url = token.target
+            # 页内锚点链接 - 检查当前文档中是否有对应标题
             if link_url.startswith('#'):
+                with self.timed('links/broken-anchor'):
+                    fragment = self._fragment(link_url)
+                    if fragment and fragment not in anchors:
+                        self._add_anchor_error(doc.path, token, fragment)
                 continue
             
             # 跳过 mailto 链接
@@ -59,32 +99,72 @@ class LinkValidator(DocumentValidator):
                 # 外部链接 - 只检查格式
                 if not re.match(r'https?://[^\s]+', link_url):
                     self.add_error(
-                        f"文档 {doc_path.relative_to(self.root_dir)} "
-                        f"包含格式错误的外部链接: {link_url}"
+                        'links/malformed-external', link_url,
+                        path=doc.path, line=token.line, col=token.col,
                     )
             else:
                 # 内部链接 - 检查文件是否存在
-                self._check_internal_link(doc_path, link_url)
+                self._check_internal_link(doc.path, token)
     
-    def _check_internal_link(self, doc_path: Path, link_url: str):
-        """检查内部链接"""
-        # 移除锚点
+    def _target_key(self, doc_path: Path, link_url: str) -> Optional[str]:
+        """内部链接指向的路径索引键（纯字符串运算，不访问文件系统），纯锚点链接返回 None"""
         link_path = link_url.split('#')[0]
         if not link_path:
-            return
-        
-        # 解析相对路径
-        if link_path.startswith('/'):
-            # 绝对路径（相对于仓库根目录）
-            target_path = self.root_dir / link_path.lstrip('/')
-        else:
-            # 相对路径
-            target_path = (doc_path.parent / link_path).resolve()
+            return None
+        return self.corpus.path_index.link_key(doc_path, link_path)
+    
+    def _check_internal_link(self, doc_path: Path, token: Token):
+        """检查内部链接"""
+        link_url = token.target
+        with self.timed('links/broken-internal'):
+            key = self._target_key(doc_path, link_url)
+            if key is None:
+                return
+            
+            # 检查目标文件是否存在（在仓库路径索引中查找，不访问文件系统）
+            index = self.corpus.path_index
+            exists = index.exists(key)
+            self.record_dependency(key, exists)
+            if not exists:
+                # 只有失效的链接才需要显示目标路径
+                self.add_error(
+                    'links/broken-internal', link_url, self.root_dir / key,
+                    path=doc_path, line=token.line, col=token.col,
+                )
+                return
         
-        # 检查目标文件是否存在
-        if not target_path.exists():
-            self.add_error(
-                f"文档 {doc_path.relative_to(self.root_dir)} "
-                f"包含失效的内部链接: {link_url} "
-                f"(目标不存在: {target_path})"
-            )
+        # 指向 Markdown 文档的锚点 - 在目标文档的锚点集合中查找（首次查找时读取并扫描目标文档）
+        fragment = self._fragment(link_url)
+        if fragment and key.endswith(('.md', NOTEBOOK_SUFFIX)) and index.is_file(key):
+            with self.timed('links/broken-anchor'):
+                found = self._has_anchor(key, fragment)
+                self.record_dependency(f"{key}#{fragment}", found)
+                if not found:
+                    self._add_anchor_error(doc_path, token, fragment)
+    
+    def _fragment(self, link_url: str) -> str:
+        """链接中 # 之后的锚点（已解码并转为小写，与标题生成的锚点比较）"""
+        _, _, fragment = link_url.partition('#')
+        return unquote(fragment).lower()
+    
+    def _has_anchor(self, key: str, fragment: str) -> bool:
+        """路径索引键对应的文档中是否有该锚点（每个文档的锚点集合只计算一次）"""
+        doc = self.corpus.load(self.root_dir / key)
+        if doc.error is not None:
+            return False
+        if is_notebook(key):
+            return fragment in notebook_anchors(doc)
+        return fragment in doc.anchors
+    
+    def _add_anchor_error(self, doc_path: Path, token: Token, fragment: str):
+        self.add_error(
+            'links/broken-anchor', token.target, fragment,
+            path=doc_path, line=token.line, col=token.col,
+        )
+    
+    def dependency_exists(self, key: str) -> bool:
+        """依赖键可以是路径索引键，也可以是 文档键#锚点"""
+        path_key, _, fragment = key.partition('#')
+        if not fragment:
+            return super().dependency_exists(key)
+        return self.corpus.path_index.is_file(path_key) and self._has_anchor(path_key, fragment)
@@ -0,0 +1,486 @@
+"""Language Server Protocol 服务器
+
+通过标准输入输出（JSON-RPC，Content-Length 分帧）为编辑器中打开的 Markdown 文档发布诊断。
+编辑器发送的增量修改直接应用到每个文档的按行记号缓存（markdown.LineTokenCache），
+不重新读取磁盘，也不重新扫描未改动的行；每次修改只重新检查被修改的文档。
+
+跨文档的规则由常驻内存的共享索引回答：
+
+- 链接：仓库路径索引和语料库中各文档的锚点（打开的文档使用编辑器中的内容）；
+  目标文档的标题改变后，通过链接图（watch.LinkGraph）重新检查引用它的打开文档
+- 术语：术语 -> 使用它的文档 的索引，每次修改只重新扫描被修改的文档，
+  未被任何文档使用的术语作为警告发布在术语表文档上
+
+只运行逐文档检查器和术语检查；存在性、结构一致性等汇总类检查仍由命令行工具执行。
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set
+from urllib.parse import quote, unquote, urlparse
+from .base import DocumentValidator
+from .corpus import DocumentCorpus
+from .diagnostics import ERROR, WARNING, Diagnostic
+from .links import LinkValidator
+from .markdown import LineTokenCache
+from .terminology import TerminologyChecker
+from .watch import LinkGraph
+
+
+# 诊断的来源名称
+SOURCE = "docs-validator"
+
+# JSON-RPC 错误码
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+# LSP 常量
+SYNC_INCREMENTAL = 2
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+FILE_DELETED = 3
+MESSAGE_ERROR = 1
+
+# 基本多文种平面之外的字符（UTF-16 中占两个码元）
+_ASTRAL_RE = re.compile('[\U00010000-\U0010ffff]')
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """读取一条 JSON-RPC 消息，输入结束时返回 None"""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is not None:
+                break
+            continue
+        name, _, value = line.decode('ascii').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return json.loads(stream.read(length).decode('utf-8'))
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]):
+    """写入一条 JSON-RPC 消息"""
+    body = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    stream.write(b'Content-Length: %d\r\n\r\n' % len(body))
+    stream.write(body)
+    stream.flush()
+
+
+def to_index(line: str, character: int, encoding: str) -> int:
+    """把 LSP 位置中的字符偏移转换为字符串下标"""
+    if encoding == 'utf-32' or not _ASTRAL_RE.search(line):
+        return min(character, len(line))
+    units = 0
+    for index, char in enumerate(line):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def to_character(line: str, index: int, encoding: str) -> int:
+    """把字符串下标转换为 LSP 位置中的字符偏移"""
+    if encoding == 'utf-32':
+        return index
+    return index + len(_ASTRAL_RE.findall(line, 0, index))
+
+
+def uri_to_path(uri: str) -> Optional[Path]:
+    """file:// URI 对应的文件路径，其他协议返回 None"""
+    parsed = urlparse(uri)
+    if parsed.scheme != 'file':
+        return None
+    return Path(unquote(parsed.path))
+
+
+def path_to_uri(path: Path) -> str:
+    return 'file://' + quote(str(path.resolve()))
+
+
+class OpenDocument:
+    """编辑器中打开的文档"""
+    
+    __slots__ = ('uri', 'path', 'version', 'cache')
+    
+    def __init__(self, uri: str, path: Path, version: Optional[int], text: str):
+        self.uri = uri
+        self.path = path
+        self.version = version
+        self.cache = LineTokenCache(text.split('\n'))
+    
+    def apply_change(self, change: Dict[str, Any], encoding: str):
+        """应用一条修改（带 range 的增量修改，或不带 range 的全文替换）"""
+        if 'range' not in change:
+            self.cache = LineTokenCache(change['text'].split('\n'))
+            return
+        lines = self.cache.lines
+        start_line, start = self._position(change['range']['start'], encoding)
+        end_line, end = self._position(change['range']['end'], encoding)
+        text = lines[start_line][:start] + change['text'] + lines[end_line][end:]
+        self.cache.replace(start_line, end_line + 1, text.split('\n'))
+    
+    def _position(self, position: Dict[str, int], encoding: str):
+        lines = self.cache.lines
+        line = position['line']
+        if line >= len(lines):
+            return len(lines) - 1, len(lines[-1])
+        return line, to_index(lines[line], position['character'], encoding)
+
+
+class TermIndex:
+    """术语 -> 使用它的文档 的索引，文档修改后只重新扫描该文档"""
+    
+    def __init__(self, checker: TerminologyChecker):
+        self.checker = checker
+        self._terms: Dict[Path, Set[str]] = {}
+        self._users: Dict[str, Set[Path]] = {term: set() for term in checker.terms}
+        for doc in checker.corpus.documents():
+            self.update(doc.path)
+    
+    def update(self, path: Path):
+        """重新扫描文档目录下的文档"""
+        self.remove(path)
+        if self.checker.corpus.docs_dir not in path.parents:
+            return
+        doc = self.checker.corpus.load(path)
+        if doc.error is not None:
+            return
+        terms = set(self.checker.find_terms(doc))
+        self._terms[path] = terms
+        for term in terms:
+            self._users[term].add(path)
+    
+    def remove(self, path: Path):
+        for term in self._terms.pop(path, ()):
+            self._users[term].discard(path)
+    
+    def unused(self) -> List[str]:
+        """未被任何文档使用的术语（按术语表顺序）"""
+        return [term for term, users in self._users.items() if not users]
+
+
+class LanguageServer:
+    """文档检查的语言服务器"""
+    
+    def __init__(self, corpus: DocumentCorpus, factories: List[Callable[[], DocumentValidator]]):
+        self.corpus = corpus
+        self.root_dir = corpus.root_dir
+        self.factories = factories
+        self.checkers: List[DocumentValidator] = []
+        self.terminology: Optional[TerminologyChecker] = None
+        self.link_validator = LinkValidator(str(self.root_dir), corpus)
+        self.links: Optional[LinkGraph] = None
+        self.terms: Optional[TermIndex] = None
+        self.documents: Dict[Path, OpenDocument] = {}
+        # 位置编码：客户端支持时使用 utf-32（即字符串下标），否则使用 LSP 默认的 utf-16
+        self.encoding = 'utf-16'
+        self._watch_files = False
+        self._unused_terms: List[str] = []
+        self._document_paths: Dict[int, Set[Path]] = {}
+        self._output: Optional[BinaryIO] = None
+        self._shutdown = False
+        self._next_id = 0
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'initialize': self._initialize,
+            'initialized': self._initialized,
+            'shutdown': self._shutdown_request,
+            'textDocument/didOpen': self._did_open,
+            'textDocument/didChange': self._did_change,
+            'textDocument/didSave': self._did_save,
+            'textDocument/didClose': self._did_close,
+            'workspace/didChangeWatchedFiles': self._did_change_watched_files,
+        }
+    
+    def serve(self, input_stream: BinaryIO, output_stream: BinaryIO) -> int:
+        """处理消息直到收到 exit，返回进程退出码"""
+        self._output = output_stream
+        while True:
+            message = read_message(input_stream)
+            if message is None:
+                return 1
+            if message.get('method') == 'exit':
+                return 0 if self._shutdown else 1
+            self._dispatch(message)
+    
+    def _dispatch(self, message: Dict[str, Any]):
+        method = message.get('method')
+        if method is None:
+            return  # 客户端对服务器请求的响应
+        is_request = 'id' in message
+        handler = self._handlers.get(method)
+        if handler is None:
+            if is_request:
+                self._respond_error(message['id'], METHOD_NOT_FOUND, f"未知的方法: {method}")
+            return
+        try:
+            result = handler(message.get('params') or {})
+        except Exception as e:
+            if is_request:
+                self._respond_error(message['id'], INTERNAL_ERROR, str(e))
+            else:
+                self._notify('window/logMessage', {'type': MESSAGE_ERROR, 'message': f"处理 {method} 失败: {e}"})
+            return
+        if is_request:
+            self._send({'jsonrpc': '2.0', 'id': message['id'], 'result': result})
+    
+    def _send(self, message: Dict[str, Any]):
+        write_message(self._output, message)
+    
+    def _notify(self, method: str, params: Dict[str, Any]):
+        self._send({'jsonrpc': '2.0', 'method': method, 'params': params})
+    
+    def _respond_error(self, request_id, code: int, message: str):
+        self._send({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}})
+    
+    # 生命周期
+    
+    def _initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        capabilities = params.get('capabilities') or {}
+        if 'utf-32' in (capabilities.get('general') or {}).get('positionEncodings', []):
+            self.encoding = 'utf-32'
+        watched = (capabilities.get('workspace') or {}).get('didChangeWatchedFiles') or {}
+        self._watch_files = bool(watched.get('dynamicRegistration'))
+        
+        # 创建检查器并建立共享索引（每个文档读取和扫描一次）
+        for factory in self.factories:
+            checker = factory()
+            if isinstance(checker, TerminologyChecker):
+                self.terminology = checker
+            elif checker.PER_DOCUMENT:
+                self.checkers.append(checker)
+        self.links = LinkGraph(self.link_validator)
+        if self.terminology is not None and self.terminology.terms:
+            self.terms = TermIndex(self.terminology)
+        
+        return {
+            'capabilities': {
+                'positionEncoding': self.encoding,
+                'textDocumentSync': {
+                    'openClose': True,
+                    'change': SYNC_INCREMENTAL,
+                    'save': {'includeText': False},
+                },
+            },
+            'serverInfo': {'name': SOURCE},
+        }
+    
+    def _initialized(self, params: Dict[str, Any]):
+        if self._watch_files:
+            # 请求客户端通知磁盘上 Markdown 文件的改动（如 git 切换分支）
+            self._next_id += 1
+            self._send({
+                'jsonrpc': '2.0',
+                'id': self._next_id,
+                'method': 'client/registerCapability',
+                'params': {'registrations': [{
+                    'id': 'docs-validator-watch',
+                    'method': 'workspace/didChangeWatchedFiles',
+                    'registerOptions': {'watchers': [{'globPattern': '**/*.md'}]},
+                }]},
+            })
+        self._publish_terms()
+    
+    def _shutdown_request(self, params: Dict[str, Any]):
+        self._shutdown = True
+        return None
+    
+    # 文档同步
+    
+    def _did_open(self, params: Dict[str, Any]):
+        item = params['textDocument']
+        path = self._corpus_path(item['uri'])
+        if path is None:
+            return
+        document = OpenDocument(item['uri'], path, item.get('version'), item['text'])
+        self.documents[path] = document
+        self._document_changed(document)
+    
+    def _did_change(self, params: Dict[str, Any]):
+        path = self._corpus_path(params['textDocument']['uri'])
+        document = self.documents.get(path)
+        if document is None:
+            return
+        for change in params['contentChanges']:
+            document.apply_change(change, self.encoding)
+        document.version = params['textDocument'].get('version')
+        self._document_changed(document)
+    
+    def _did_save(self, params: Dict[str, Any]):
+        # 保存后文件一定存在于磁盘上（可能是新文件），链接到它的文档需要重新检查
+        path = self._corpus_path(params['textDocument']['uri'])
+        if path is not None:
+            self._files_changed({path}, set())
+    
+    def _did_close(self, params: Dict[str, Any]):
+        uri = params['textDocument']['uri']
+        path = self._corpus_path(uri)
+        document = self.documents.pop(path, None)
+        if document is None:
+            return
+        # 之后使用磁盘上的内容
+        old_anchors = self.corpus.load(path).anchors
+        if path.is_file():
+            self.corpus.refresh([path], [])
+        else:
+            self.corpus.refresh([], [path])
+        self._reindex(path)
+        self._notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+        if self.corpus.load(path).anchors != old_anchors:
+            self._validate_referrers({path})
+        self._publish_terms()
+    
+    def _did_change_watched_files(self, params: Dict[str, Any]):
+        changed: Set[Path] = set()
+        deleted: Set[Path] = set()
+        for event in params['changes']:
+            path = self._corpus_path(event['uri'])
+            if path is not None:
+                (deleted if event['type'] == FILE_DELETED else changed).add(path)
+        self._files_changed(changed, deleted)
+    
+    def _files_changed(self, changed: Set[Path], deleted: Set[Path]):
+        """磁盘上的文件改动：更新路径索引和共享索引，重新检查受影响的打开文档"""
+        self.corpus.refresh(changed, deleted)
+        self._document_paths.clear()
+        for path in changed | deleted:
+            if path in self.documents:
+                # 打开的文档继续使用编辑器中的内容
+                self._store(self.documents[path])
+            else:
+                self._reindex(path)
+        self._validate_referrers(changed | deleted)
+        self._publish_terms()
+    
+    # 检查
+    
+    def _document_changed(self, document: OpenDocument):
+        """编辑器中的内容改变后更新共享索引并重新检查"""
+        old_anchors = self.corpus.load(document.path).anchors
+        self._store(document)
+        self._reindex(document.path)
+        self._validate(document)
+        if self.corpus.load(document.path).anchors != old_anchors:
+            self._validate_referrers({document.path})
+        self._publish_terms()
+    
+    def _store(self, document: OpenDocument):
+        """用编辑器中的内容替换语料库中的文档（直接使用已经扫描好的记号）"""
+        cache = document.cache
+        lines = list(cache.lines)
+        self.corpus.put(document.path, '\n'.join(lines), lines, cache.tokens)
+    
+    def _reindex(self, path: Path):
+        """更新链接图和术语索引中的一个文档"""
+        if path in self.documents or path.is_file():
+            self.links.update(path)
+            if self.terms is not None:
+                self.terms.update(path)
+        else:
+            self.links.remove(path)
+            if self.terms is not None:
+                self.terms.remove(path)
+    
+    def _validate_referrers(self, targets: Set[Path]):
+        """重新检查链接指向 targets 的打开文档"""
+        referrers: Set[Path] = set()
+        for target in targets:
+            referrers |= self.links.referrers(target)
+        for document in self.documents.values():
+            if document.path.resolve() in referrers and document.path not in targets:
+                self._validate(document)
+    
+    def _validate(self, document: OpenDocument):
+        """用逐文档检查器检查一个打开的文档并发布诊断"""
+        diagnostics: List[Diagnostic] = []
+        for index, checker in enumerate(self.checkers):
+            if document.path not in self._checker_paths(index):
+                continue
+            checker.errors, checker.warnings = [], []
+            checker.run_documents([document.path])
+            diagnostics += checker.errors + checker.warnings
+        self._publish(document.uri, diagnostics, document.cache.lines, document.version)
+    
+    def _checker_paths(self, index: int) -> Set[Path]:
+        """检查器负责的文档（磁盘上的文件改动后重新计算）"""
+        paths = self._document_paths.get(index)
+        if paths is None:
+            paths = self._document_paths[index] = set(self.checkers[index].document_paths())
+        return paths
+    
+    def _publish_terms(self):
+        """未使用的术语有变化时，在术语表文档上发布警告"""
+        if self.terms is None:
+            return
+        unused = self.terms.unused()
+        if unused == self._unused_terms:
+            return
+        self._unused_terms = unused
+        
+        glossary_path = self.root_dir / self.terminology.GLOSSARY_PATH
+        glossary = self.corpus.load(glossary_path)
+        lines = glossary.lines if glossary.error is None else []
+        diagnostics = [
+            Diagnostic('terminology/unused-term', WARNING, self.terminology.GLOSSARY_PATH,
+                       self._glossary_line(lines, term), args=(term,))
+            for term in unused
+        ]
+        self._publish(path_to_uri(glossary_path), diagnostics, lines)
+    
+    def _glossary_line(self, lines: List[str], term: str) -> Optional[int]:
+        """术语（中文或英文）在术语表文档中定义的行号"""
+        markers = (f"**{term}（", f"（{term}）**")
+        for number, line in enumerate(lines, 1):
+            if any(marker in line for marker in markers):
+                return number
+        return None
+    
+    def _publish(self, uri: str, diagnostics: List[Diagnostic], lines: List[str],
+                 version: Optional[int] = None):
+        params: Dict[str, Any] = {
+            'uri': uri,
+            'diagnostics': [self._lsp_diagnostic(diagnostic, lines) for diagnostic in diagnostics],
+        }
+        if version is not None:
+            params['version'] = version
+        self._notify('textDocument/publishDiagnostics', params)
+    
+    def _lsp_diagnostic(self, diagnostic: Diagnostic, lines: List[str]) -> Dict[str, Any]:
+        """诊断的范围从所在列（没有列号时从行首）到行尾；没有行号的诊断标在第一行"""
+        line = (diagnostic.line or 1) - 1
+        text = lines[line].rstrip('\r') if line < len(lines) else ''
+        start = to_character(text, min((diagnostic.col or 1) - 1, len(text)), self.encoding)
+        end = to_character(text, len(text), self.encoding)
+        return {
+            'range': {
+                'start': {'line': line, 'character': start},
+                'end': {'line': line, 'character': end},
+            },
+            'severity': SEVERITY_ERROR if diagnostic.severity == ERROR else SEVERITY_WARNING,
+            'code': diagnostic.rule,
+            'source': SOURCE,
+            'message': diagnostic.message(),
+        }
+    
+    def _corpus_path(self, uri: str) -> Optional[Path]:
+        """URI 对应的语料库路径（与 doc_paths() 的形式相同），不在项目中时返回 None"""
+        path = uri_to_path(uri)
+        if path is None or path.suffix != '.md':
+            return None
+        key = self.corpus.path_index.key(path)
+        if key is None:
+            return None
+        return self.root_dir / key
+
+
+def serve_stdio(corpus: DocumentCorpus, factories: List[Callable[[], DocumentValidator]]) -> int:
+    """在标准输入输出上运行语言服务器；标准输出只用于协议消息，其他输出转到标准错误"""
+    output = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    return LanguageServer(corpus, factories).serve(sys.stdin.buffer, output)
@@ -0,0 +1,290 @@
+"""单遍 Markdown 词法分析器
+
+按行线性扫描一次文档，输出紧凑的记号流（标题、列表项、代码围栏开闭、链接、表格行），
+每个记号带有行号和列号（均从 1 开始）。所有检查器共享同一份记号流，
+不再各自对全文做正则匹配。
+
+代码围栏内部的行不会产生标题、列表项和链接记号；行内代码中的链接同样会被忽略。
+"""
+
+import re
+import unicodedata
+from typing import List, Optional, Set, Tuple
+
+
+# 记号类型
+HEADING = 'heading'
+LIST_ITEM = 'list_item'
+FENCE_OPEN = 'fence_open'
+FENCE_CLOSE = 'fence_close'
+LINK = 'link'
+TABLE_ROW = 'table_row'
+
+_FENCE_RE = re.compile(r'^(\s*)(`{3,}|~{3,})(.*)$')
+_HEADING_RE = re.compile(r'^(#+)(.*)$')
+# ATX 标题末尾可选的关闭序列（如 "## 标题 ##"），前面必须有空格
+_CLOSING_SEQUENCE_RE = re.compile(r'(?:^|[ \t])#+$')
+# Setext 标题的下划线（段落下一行的 === 或 ---）
+_SETEXT_RE = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+# 分隔线、引用和缩进代码块：不能作为 Setext 标题的内容，也会结束段落
+_THEMATIC_BREAK_RE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+_LIST_ITEM_RE = re.compile(r'^(\s*)([-*+])\s(.*)$')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
+_CODE_SPAN_RE = re.compile(r'(`+)(.+?)\1')
+_INLINE_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^\)]*\)')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_SLUG_STRIP_RE = re.compile(r'[^\w\- ]')
+
+
+class Token:
+    """Markdown 记号
+    
+    - HEADING: level 为 # 的个数（Setext 标题为 1 或 2），text 为标题文本（不含关闭的 #）；
+      # 后没有空格或文本为空时 text 为 None。Setext 标题的行号为其第一行内容
+    - LIST_ITEM: text 为标记后的内容（可能为空字符串）
+    - FENCE_OPEN: text 为信息字符串（如 "python"），level 为围栏长度
+    - FENCE_CLOSE: level 为围栏长度
+    - LINK: text 为链接文字，target 为链接地址
+    - TABLE_ROW: text 为整行内容
+    """
+    
+    __slots__ = ('kind', 'line', 'col', 'level', 'text', 'target')
+    
+    def __init__(self, kind: str, line: int, col: int, level: int = 0,
+                 text: Optional[str] = None, target: Optional[str] = None):
+        self.kind = kind
+        self.line = line
+        self.col = col
+        self.level = level
+        self.text = text
+        self.target = target
+    
+    def __repr__(self) -> str:
+        return f"Token({self.kind}, {self.line}:{self.col}, {self.text!r})"
+
+
+class CodeBlock:
+    """围栏代码块"""
+    
+    __slots__ = ('line', 'col', 'info', 'code', 'closed')
+    
+    def __init__(self, line: int, col: int, info: str, code: str, closed: bool):
+        self.line = line
+        self.col = col
+        self.info = info
+        self.code = code
+        self.closed = closed
+    
+    @property
+    def language(self) -> str:
+        """信息字符串中的语言标记（第一个单词），未指定时为空字符串"""
+        return self.info.split()[0] if self.info.strip() else ''
+
+
+# 行与行之间传递的扫描状态：(打开的围栏, 段落)
+# 围栏如 "```"，None 表示不在代码块中；段落为当前段落已有的各行内容（可能成为 Setext 标题的文本），
+# 空元组表示不在段落中，None 表示处于列表项、引用或表格之中（其后的行不会开始新段落）
+ScanState = Tuple[Optional[str], Optional[Tuple[str, ...]]]
+INITIAL_STATE: ScanState = (None, ())
+
+
+def tokenize(lines: List[str]) -> List[Token]:
+    """对按行拆分的文档做一次线性扫描，返回记号列表"""
+    tokens: List[Token] = []
+    state = INITIAL_STATE
+    for line_num, line in enumerate(lines, 1):
+        state = _scan_line(tokens, line_num, line, state)
+    return tokens
+
+
+def _scan_line(tokens: List[Token], line_num: int, line: str, state: ScanState) -> ScanState:
+    """扫描一行，把记号追加到 tokens，返回扫描后的状态
+    
+    行与行之间只传递 state 这一个不含行号的状态，LineTokenCache 依赖这一点做增量扫描。
+    """
+    fence, paragraph = state
+    fence_match = _FENCE_RE.match(line)
+    
+    if fence is not None:
+        # 代码块内只识别与打开围栏相同字符、长度不小于它且后面没有其他内容的关闭围栏
+        if (fence_match and fence_match.group(2)[0] == fence[0]
+                and len(fence_match.group(2)) >= len(fence)
+                and not fence_match.group(3).strip()):
+            tokens.append(Token(FENCE_CLOSE, line_num, len(fence_match.group(1)) + 1,
+                                level=len(fence_match.group(2))))
+            return INITIAL_STATE
+        return state
+    
+    if fence_match and not (fence_match.group(2)[0] == '`' and '`' in fence_match.group(3)):
+        fence = fence_match.group(2)
+        tokens.append(Token(FENCE_OPEN, line_num, len(fence_match.group(1)) + 1,
+                            level=len(fence), text=fence_match.group(3).strip()))
+        return fence, ()
+    
+    setext_match = _SETEXT_RE.match(line) if paragraph else None
+    if setext_match:
+        # 段落下一行的 === 或 --- 把整个段落变为一级或二级标题
+        level = 1 if setext_match.group(1)[0] == '=' else 2
+        tokens.append(Token(HEADING, line_num - len(paragraph), 1, level=level, text=' '.join(paragraph)))
+        return INITIAL_STATE
+    
+    next_state = INITIAL_STATE
+    if line.startswith('#'):
+        heading_match = _HEADING_RE.match(line)
+        level = len(heading_match.group(1))
+        rest = heading_match.group(2)
+        text = None
+        if rest[:1].isspace():
+            text = _CLOSING_SEQUENCE_RE.sub('', rest.strip()).strip() or None
+        tokens.append(Token(HEADING, line_num, 1, level=level, text=text))
+    else:
+        list_match = _LIST_ITEM_RE.match(line)
+        stripped = line.strip()
+        if list_match:
+            tokens.append(Token(LIST_ITEM, line_num, len(list_match.group(1)) + 1,
+                                text=list_match.group(3).strip()))
+            next_state = (None, None)
+        elif stripped.startswith('|'):
+            tokens.append(Token(TABLE_ROW, line_num, len(line) - len(line.lstrip()) + 1,
+                                text=line))
+            next_state = (None, None)
+        elif stripped.startswith('>'):
+            next_state = (None, None)
+        elif not stripped or _THEMATIC_BREAK_RE.match(line):
+            pass
+        elif paragraph:
+            next_state = (None, paragraph + (stripped,))
+        elif paragraph is None:
+            next_state = state
+        elif not line.startswith(('    ', '\t')):
+            next_state = (None, (stripped,))
+    
+    if '](' in line:
+        _tokenize_links(tokens, line_num, line)
+    return next_state
+
+
+class LineTokenCache:
+    """按行缓存的记号流，编辑后只重新扫描受影响的行（用于编辑器中的实时检查）
+    
+    每行保存扫描前的状态（打开的围栏和当前段落）和该行产生的记号。替换若干行之后，
+    从第一个被替换的行开始重新扫描，直到某一行扫描前的状态与编辑前相同；其后各行的记号不变，只需调整行号。
+    """
+    
+    def __init__(self, lines: List[str]):
+        self.lines: List[str] = []
+        # 扫描第 i 行（从 0 开始）之前的状态；最后一项是扫描完所有行之后的状态
+        self._states: List[ScanState] = [INITIAL_STATE]
+        self._line_tokens: List[List[Token]] = []
+        self._tokens: Optional[List[Token]] = None
+        self.replace(0, 0, list(lines))
+    
+    @property
+    def tokens(self) -> List[Token]:
+        """整个文档的记号列表（与 tokenize(self.lines) 相同）"""
+        if self._tokens is None:
+            self._tokens = [token for line_tokens in self._line_tokens for token in line_tokens]
+        return self._tokens
+    
+    def replace(self, start: int, end: int, new_lines: List[str]) -> int:
+        """把第 start 到 end 行（从 0 开始，不含 end）替换为 new_lines，返回重新扫描的行数"""
+        delta = len(new_lines) - (end - start)
+        state = self._states[start]
+        self.lines[start:end] = new_lines
+        self._line_tokens[start:end] = [[] for _ in new_lines]
+        # 替换后 _states[start + len(new_lines):] 仍是其后各行编辑前的状态
+        self._states[start:end] = [INITIAL_STATE] * len(new_lines)
+        self._tokens = None
+        
+        line_index = start
+        edited_end = start + len(new_lines)
+        count = len(self.lines)
+        while line_index < count:
+            if line_index >= edited_end and self._states[line_index] == state:
+                break
+            self._states[line_index] = state
+            line_tokens: List[Token] = []
+            state = _scan_line(line_tokens, line_index + 1, self.lines[line_index], state)
+            self._line_tokens[line_index] = line_tokens
+            line_index += 1
+        else:
+            self._states[count] = state
+        
+        if delta:
+            for line_tokens in self._line_tokens[line_index:]:
+                for token in line_tokens:
+                    token.line += delta
+        return line_index - start
+
+
+def _tokenize_links(tokens: List[Token], line_num: int, line: str):
+    """提取一行中的链接，跳过行内代码中的内容"""
+    code_spans = [match.span() for match in _CODE_SPAN_RE.finditer(line)] if '`' in line else []
+    for match in _LINK_RE.finditer(line):
+        start = match.start()
+        if any(span_start <= start < span_end for span_start, span_end in code_spans):
+            continue
+        tokens.append(Token(LINK, line_num, start + 1,
+                            text=match.group(1), target=match.group(2)))
+
+
+def code_blocks(tokens: List[Token], lines: List[str]) -> List[CodeBlock]:
+    """根据记号流提取所有围栏代码块（未闭合的代码块延伸到文档末尾）"""
+    blocks: List[CodeBlock] = []
+    open_token: Optional[Token] = None
+    
+    for token in tokens:
+        if token.kind == FENCE_OPEN:
+            open_token = token
+        elif token.kind == FENCE_CLOSE and open_token is not None:
+            blocks.append(_make_block(open_token, lines, token.line, closed=True))
+            open_token = None
+    
+    if open_token is not None:
+        blocks.append(_make_block(open_token, lines, len(lines) + 1, closed=False))
+    return blocks
+
+
+def _make_block(open_token: Token, lines: List[str], end_line: int, closed: bool) -> CodeBlock:
+    """构造代码块，去掉与围栏相同的缩进（列表中的代码块常带有缩进）"""
+    indent = open_token.col - 1
+    body = []
+    for line in lines[open_token.line:end_line - 1]:
+        prefix = len(line) - len(line.lstrip(' '))
+        body.append(line[min(indent, prefix):])
+    code = '\n'.join(body) + '\n' if body else ''
+    return CodeBlock(open_token.line, open_token.col, open_token.text, code, closed)
+
+
+def headings(tokens: List[Token]) -> List[Token]:
+    """格式正确的标题记号（# 后有空格且有文本）"""
+    return [token for token in tokens if token.kind == HEADING and token.text is not None]
+
+
+def slugify(text: str) -> str:
+    """按 GitHub 的规则把标题文本转换为锚点
+    
+    渲染后的文本转为小写，去掉字母、数字（含中日韩文字）、组合附加符号、下划线、连字符和空格以外的字符，
+    再把每个空格替换为连字符；全角标点会被去掉，连续的连字符不合并。
+    """
+    text = _INLINE_LINK_RE.sub(r'\1', text)
+    text = _HTML_TAG_RE.sub('', text)
+    return _SLUG_STRIP_RE.sub(_strip_slug_char, text.lower()).replace(' ', '-')
+
+
+def _strip_slug_char(match: re.Match) -> str:
+    # 组合附加符号（如分解形式的重音、天城文元音符号）是字符的一部分，不能去掉
+    char = match.group()
+    return char if unicodedata.category(char).startswith('M') else ''
+
+
+def anchors(tokens: List[Token]) -> Set[str]:
+    """文档中所有标题生成的锚点集合，重复的锚点依次追加 -1、-2 等后缀"""
+    result: Set[str] = set()
+    counts = {}
+    for token in headings(tokens):
+        slug = slugify(token.text)
+        count = counts.get(slug, 0)
+        counts[slug] = count + 1
+        result.add(slug if count == 0 else f"{slug}-{count}")
+    return result
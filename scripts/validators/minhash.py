@@ -0,0 +1,176 @@
+"""MinHash 签名与 LSH 分桶
+
+用于在线性时间内找出近似重复的文本：把文本切分为词的 k-shingle，为每段文本计算固定长度的
+MinHash 签名，再把签名切分为若干段（band）分别放入哈希桶，只有至少一段完全相同的文本
+才成为候选对，不需要两两比较所有文本。
+
+签名使用单次排列哈希（one permutation hashing）：每个 shingle 只哈希一次，按哈希值分配到
+num_perm 个区间之一并保留每个区间的最小值；空区间从右侧最近的非空区间借用数值
+（rotation densification）。计算签名的代价与文本长度成正比，与签名长度无关。
+两个签名中相同位置的比例是 Jaccard 相似度的无偏估计。签名保存为 array('Q')，每个值占 8 字节。
+
+每个词的哈希使用 zlib.crc32 而不是内置的 hash()（字符串的 hash() 在每个进程中随机化），
+shingle 的哈希是其中各个词的哈希组成的元组的 hash()（整数元组的哈希不随机化），
+结果在不同进程（并行执行、缓存）中保持一致。文本的所有 shingle 哈希一次算出（window_hashes()），
+其中任意一段连续的词（如一个章节）的 shingle 就是其中的一段切片，不需要重新哈希。
+"""
+
+import operator
+import re
+import zlib
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+
+# 分词：中日韩文字按单个字符，其他文字按连续的字母和数字
+_CJK = '぀-ヿ㐀-䶿一-鿿豈-﫿'
+_WORD_RE = re.compile(f'[{_CJK}]|[^\\W_{_CJK}]+')
+
+_MASK64 = (1 << 64) - 1
+
+
+def words(text: str) -> List[str]:
+    """把文本拆分为小写的词（中日韩文字每个字符是一个词）"""
+    return _WORD_RE.findall(text.lower())
+
+
+def token_hashes(tokens: Sequence[str]) -> List[int]:
+    """每个词的 32 位哈希（同一个词只计算一次）"""
+    table = {token: zlib.crc32(token.encode('utf-8')) for token in set(tokens)}
+    return list(map(table.__getitem__, tokens))
+
+
+def window_hashes(hashes: Sequence[int], size: int = 5) -> List[int]:
+    """从每个位置开始的连续 size 个词组成的 shingle 的 64 位哈希（共 len(hashes) - size + 1 个）
+    
+    hashes 为 token_hashes() 的结果；词数不足 size 时整段作为一个 shingle。
+    """
+    if not hashes:
+        return []
+    if len(hashes) < size:
+        windows: Iterable[Tuple[int, ...]] = [tuple(hashes)]
+    else:
+        windows = zip(*(hashes[offset:] for offset in range(size)))
+    return list(map(_MASK64.__and__, map(hash, windows)))
+
+
+def shingles(tokens: Sequence[str], size: int = 5) -> Set[int]:
+    """连续 size 个词组成的 shingle 的 64 位哈希集合；词数不足 size 时整段作为一个 shingle"""
+    return set(window_hashes(token_hashes(tokens), size))
+
+
+def bin_minima(hashes: Iterable[int], num_perm: int = 128) -> Dict[int, int]:
+    """单次排列哈希：把 shingle 哈希分配到 num_perm 个区间，返回 区间序号 -> 区间内的最小哈希值
+    
+    计算一段较长文本时，其中某一段的结果（values()）可以代替这一段的全部 shingle 哈希，结果不变。
+    """
+    values = sorted(hashes, reverse=True)
+    # 按从大到小的顺序写入字典，较小的值覆盖较大的值（num_perm 为 2 的幂时用位运算代替取余）
+    bin_of = (num_perm - 1).__and__ if num_perm & (num_perm - 1) == 0 else num_perm.__rmod__
+    return dict(zip(map(bin_of, values), values))
+
+
+def densify(minima: Dict[int, int], num_perm: int = 128) -> array:
+    """由各区间的最小值得到 MinHash 签名（长度为 num_perm 的 array('Q')）；没有 shingle 时返回空数组
+    
+    签名中的值为最小值除以 num_perm 的商（同一区间中值的大小顺序就是商的大小顺序）。
+    """
+    if not minima:
+        return array('Q')
+    ranks = {index: value // num_perm for index, value in minima.items()}
+    bins = list(map(ranks.get, range(num_perm)))
+    if len(ranks) < num_perm:
+        # 空区间取右侧（循环）最近的非空区间的数值，并按距离偏移，避免不同区间取到相同的值；
+        # 从右向左扫描一遍，最右侧的空区间取第一个非空区间的数值
+        offset = (_MASK64 // num_perm) + 1
+        following = min(ranks)
+        rank = ranks[following]
+        following += num_perm
+        for index in range(num_perm - 1, -1, -1):
+            value = bins[index]
+            if value is None:
+                bins[index] = rank + (following - index) * offset
+            else:
+                rank, following = value, index
+    return array('Q', bins)
+
+
+def signature(hashes: Iterable[int], num_perm: int = 128) -> array:
+    """单次排列哈希的 MinHash 签名（长度为 num_perm 的 array('Q')）；没有 shingle 时返回空数组"""
+    return densify(bin_minima(hashes, num_perm), num_perm)
+
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """两个签名估计的 Jaccard 相似度"""
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(map(operator.eq, first, second)) / len(first)
+
+
+def jaccard(first: Set[int], second: Set[int]) -> float:
+    """两个 shingle 集合的精确 Jaccard 相似度"""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def lsh_parameters(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """选择段数 bands 和每段行数 rows（bands * rows == num_perm）
+    
+    成为候选对的概率在 Jaccard 相似度约为 (1 / bands) ** (1 / rows) 处陡增；
+    选择这一拐点不超过 threshold 且最接近它的划分，宁可多出候选对（随后按签名核实）也不漏掉。
+    """
+    best = (num_perm, 1)
+    best_point = 0.0
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        point = (1 / bands) ** (1 / rows)
+        if best_point < point <= threshold:
+            best, best_point = (bands, rows), point
+    return best
+
+
+class LSHIndex:
+    """按签名分段的 LSH 哈希桶
+    
+    只保存加入的签名，查找候选对时逐段分桶，同一时刻只有一段的哈希桶在内存中。
+    """
+    
+    def __init__(self, num_perm: int = 128, threshold: float = 0.8):
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_parameters(num_perm, threshold)
+        # 条目序号和签名（不复制）
+        self._keys: List[int] = []
+        self._signatures: List[array] = []
+    
+    def add(self, key: int, sig: array):
+        """加入一个签名（signature() 的结果），key 为调用方的条目序号"""
+        self._keys.append(key)
+        self._signatures.append(sig)
+    
+    def candidates(self) -> Set[Tuple[int, int]]:
+        """至少有一段签名相同的条目对 (较小序号, 较大序号)
+        
+        每一段先统计各个桶的大小（在 C 中完成），只有落入同一个桶的少数条目才逐个分组。
+        """
+        pairs = set()
+        rows = self.rows
+        for band in range(self.bands):
+            band_slice = operator.itemgetter(slice(band * rows, (band + 1) * rows))
+            values = list(map(array.tobytes, map(band_slice, self._signatures)))
+            sizes = Counter(values)
+            shared = map((1).__lt__, map(sizes.__getitem__, values))
+            # 段内签名值的字节表示 -> 签名落入该桶的条目序号
+            buckets: Dict[bytes, List[int]] = {}
+            for value, key in compress(zip(values, self._keys), shared):
+                buckets.setdefault(value, []).append(key)
+            for members in buckets.values():
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        if first != second:
+                            pairs.add((min(first, second), max(first, second)))
+        return pairs
@@ -0,0 +1,272 @@
+"""Jupyter notebook 的读取
+
+从语料库加载的 .ipynb 文档（JSON 文本）中逐个取出单元格，供需要检查 notebook 内容的检查器使用。
+
+带有输出的 notebook 每个可能有数 MB，其中绝大部分是单元格的 outputs 和 attachments
+（base64 编码的图片等）。这里不用 json.loads() 解码整个文件，而是在 JSON 文本上顺序扫描：
+只解码单元格的 cell_type 和 source，其余的值按字符串和括号的边界整段跳过，不创建任何对象。
+每个 notebook 只扫描一次，结果缓存在 Document.cells 中，由所有检查器共享。
+
+每个单元格的内容作为一个独立的 Document（路径与 notebook 相同），检查器报告的行号相对于单元格，
+由 Diagnostic.cell 记录单元格序号。
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from .corpus import Document
+from .pathindex import PathIndex
+
+
+# notebook 文件的扩展名
+NOTEBOOK_SUFFIX = '.ipynb'
+
+# 单元格类型
+MARKDOWN = 'markdown'
+CODE = 'code'
+
+# 需要解码的单元格字段，其余字段（outputs、attachments、metadata 等）直接跳过
+_CELL_FIELDS = ('cell_type', 'source')
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+# 跳过一个数组或对象时只需要识别字符串的开头（字符串中可能包含括号）和括号
+_STRUCTURE_RE = re.compile(r'["\[\]{}]')
+
+# IPython 的行魔法命令和 shell 命令（如 %pip install、!pip install），检查语法时替换为 pass
+_MAGIC_RE = re.compile(r'([ \t]*)[%!]')
+
+
+class NotebookCell:
+    """notebook 中的单个单元格"""
+    
+    __slots__ = ('index', 'cell_type', 'source', 'document')
+    
+    def __init__(self, index: int, cell_type: str, source: str, document: Document):
+        # 单元格在 notebook 中的序号（从 1 开始）
+        self.index = index
+        self.cell_type = cell_type
+        self.source = source
+        # 单元格内容组成的文档（路径与 notebook 相同，行号相对于单元格）
+        self.document = document
+    
+    def __repr__(self) -> str:
+        return f"NotebookCell({self.index}, {self.cell_type!r})"
+
+
+def is_notebook(path) -> bool:
+    """路径是否为 notebook 文件"""
+    return str(path).endswith(NOTEBOOK_SUFFIX)
+
+
+def notebook_keys(path_index: PathIndex) -> List[str]:
+    """仓库中所有 notebook 的路径索引键（按键排序）"""
+    return sorted(key for key in path_index.files if key.endswith(NOTEBOOK_SUFFIX))
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    return _WHITESPACE_RE.match(text, pos).end()
+
+
+def _expect(text: str, pos: int, char: str) -> int:
+    """pos 处（跳过空白后）应为 char，返回其后的位置"""
+    pos = _skip_whitespace(text, pos)
+    if not text.startswith(char, pos):
+        raise ValueError(f"notebook JSON 格式无效：位置 {pos} 处应为 {char!r}")
+    return pos + 1
+
+
+def _string_end(text: str, pos: int) -> int:
+    """pos 位于字符串的开头引号之后，返回结束引号之后的位置
+    
+    用 str.find() 直接查找引号，base64 编码的图片等长字符串不需要逐个字符匹配。
+    """
+    while True:
+        end = text.find('"', pos)
+        if end < 0:
+            raise ValueError("notebook JSON 格式无效：字符串未结束")
+        backslashes = 0
+        while text[end - 1 - backslashes] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return end + 1
+        pos = end + 1
+
+
+def _skip_value(text: str, pos: int) -> int:
+    """跳过 pos 处的一个 JSON 值（不解码数组和对象），返回值之后的位置"""
+    pos = _skip_whitespace(text, pos)
+    if not text.startswith(('[', '{'), pos):
+        return _DECODER.raw_decode(text, pos)[1]
+    depth = 0
+    while True:
+        match = _STRUCTURE_RE.search(text, pos)
+        if match is None:
+            raise ValueError("notebook JSON 格式无效：数组或对象未结束")
+        char = match.group()
+        pos = match.end()
+        if char == '"':
+            pos = _string_end(text, pos)
+        elif char in '[{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _next_key(text: str, pos: int) -> Tuple[Optional[str], int]:
+    """读取 JSON 对象中的下一个键，pos 位于 { 或上一个值之后
+    
+    返回 (键, 值的开始位置)；对象已结束时返回 (None, } 之后的位置)。
+    """
+    pos = _skip_whitespace(text, pos)
+    if text.startswith('}', pos):
+        return None, pos + 1
+    if text.startswith(',', pos):
+        pos = _skip_whitespace(text, pos + 1)
+    key, pos = _DECODER.raw_decode(text, pos)
+    if not isinstance(key, str):
+        raise ValueError(f"notebook JSON 格式无效：位置 {pos} 之前应为对象的键")
+    return key, _expect(text, pos, ':')
+
+
+def _next_item(text: str, pos: int) -> Tuple[bool, int]:
+    """JSON 数组中是否还有下一个元素，pos 位于 [ 或上一个元素之后，返回 (是否还有元素, 新位置)"""
+    pos = _skip_whitespace(text, pos)
+    if text.startswith(']', pos):
+        return False, pos + 1
+    if text.startswith(',', pos):
+        pos += 1
+    return True, pos
+
+
+def _scan_cells(text: str) -> Iterator[Tuple[str, Any]]:
+    """在 notebook 的 JSON 文本中依次找出每个单元格的 (cell_type, source)"""
+    key, pos = _next_key(text, _expect(text, 0, '{'))
+    while key != 'cells':
+        if key is None:
+            raise ValueError("notebook 中没有 cells 列表")
+        key, pos = _next_key(text, _skip_value(text, pos))
+    
+    more, pos = _next_item(text, _expect(text, pos, '['))
+    while more:
+        fields: Dict[str, Any] = {}
+        key, pos = _next_key(text, _expect(text, pos, '{'))
+        while key is not None:
+            if key in _CELL_FIELDS:
+                fields[key], pos = _DECODER.raw_decode(text, _skip_whitespace(text, pos))
+            else:
+                pos = _skip_value(text, pos)
+            key, pos = _next_key(text, pos)
+        yield fields.get('cell_type', ''), fields.get('source', '')
+        more, pos = _next_item(text, pos)
+    
+    # cells 之后的字段（metadata 等）只跳过，确认文件完整
+    key, pos = _next_key(text, pos)
+    while key is not None:
+        key, pos = _next_key(text, _skip_value(text, pos))
+
+
+def iter_cells(doc: Document) -> Iterator[NotebookCell]:
+    """从 notebook 文档的 JSON 文本中逐个取出单元格（不解码 outputs 和 attachments）
+    
+    JSON 格式无效时抛出 ValueError。
+    """
+    try:
+        for index, (cell_type, source) in enumerate(_scan_cells(doc.text), 1):
+            if isinstance(source, list):
+                source = ''.join(source)
+            if not isinstance(source, str):
+                raise ValueError(f"单元格 {index} 的 source 不是文本")
+            yield NotebookCell(index, cell_type, source, Document(doc.path, doc.rel_path, source))
+    except (IndexError, TypeError):
+        raise ValueError("notebook JSON 格式无效：文件不完整或单元格内容不是文本")
+
+
+def read_cells(doc: Document, cell_type: Optional[str] = None) -> List[NotebookCell]:
+    """notebook 文档中的单元格（由 Document.cells 缓存），cell_type 不为 None 时只返回该类型的单元格
+    
+    JSON 格式无效时抛出 ValueError。
+    """
+    if cell_type is None:
+        return doc.cells
+    return [cell for cell in doc.cells if cell.cell_type == cell_type]
+
+
+def notebook_anchors(doc: Document) -> Set[str]:
+    """notebook 中所有 Markdown 单元格的标题锚点，JSON 格式无效时为空集合
+    
+    Jupyter 中的锚点在整个 notebook 内有效，不限于标题所在的单元格。
+    结果缓存在 notebook 文档自身的锚点集合中（notebook 的 JSON 文本本身没有标题）。
+    """
+    if doc._anchors is not None:
+        return doc._anchors
+    anchors: Set[str] = set()
+    try:
+        for cell in read_cells(doc, MARKDOWN):
+            anchors |= cell.document.anchors
+    except ValueError:
+        pass
+    doc._anchors = anchors
+    return anchors
+
+
+def _scan_line(line: str, depth: int, quote: Optional[str]) -> Tuple[int, Optional[str], bool]:
+    """扫描一行 Python 代码（不含换行符），更新括号深度和未结束的字符串
+    
+    quote 为上一行结束时仍未结束的字符串的引号（三引号，或以反斜杠续行的单引号），
+    返回 (括号深度, 未结束的字符串的引号, 是否以反斜杠续行)。
+    """
+    end = len(line.rstrip('\r'))
+    pos = 0
+    while pos < end:
+        if quote is not None:
+            if line[pos] == '\\':
+                pos += 2
+            elif line.startswith(quote, pos):
+                pos += len(quote)
+                quote = None
+            else:
+                pos += 1
+            continue
+        char = line[pos]
+        if char == '#':
+            return depth, None, False
+        if char in '\'"':
+            quote = char * 3 if line.startswith(char * 3, pos) else char
+            pos += len(quote)
+            continue
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth = max(depth - 1, 0)
+        pos += 1
+    if quote is None:
+        return depth, None, line[:end].endswith('\\')
+    if len(quote) == 1 and pos <= end:
+        # 没有以反斜杠续行的单引号字符串是语法错误（由编译报告），不影响后续行的判断
+        quote = None
+    return depth, quote, False
+
+
+def python_source(cell: NotebookCell) -> Optional[str]:
+    """代码单元格中可以按 Python 语法检查的内容，单元格魔法命令（%%bash 等）开头的单元格返回 None
+    
+    逻辑行开头的行魔法命令和 shell 命令替换为同样缩进的 pass，保持行号不变；
+    括号内、多行字符串中和续行中以 % 或 ! 开头的行是代码的一部分，保持不变。
+    """
+    stripped = cell.source.lstrip()
+    if stripped.startswith('%%'):
+        return None
+    
+    lines = []
+    depth, quote, continued = 0, None, False
+    for line in cell.source.split('\n'):
+        match = _MAGIC_RE.match(line)
+        if match and depth == 0 and quote is None and not continued:
+            lines.append(match.group(1) + 'pass')
+            continue
+        lines.append(line)
+        depth, quote, continued = _scan_line(line, depth, quote)
+    return '\n'.join(lines)
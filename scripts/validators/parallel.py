@@ -0,0 +1,169 @@
+"""并行执行检查器
+
+把相互独立的检查器，以及逐文档检查器内部的文件分区，分发到进程池中执行。
+每个分区在子进程中只收集结果、不打印；结果按提交顺序合并，
+因此打印的报告和生成的报告文件与串行运行完全一致。
+
+多种语言的文档目录（docs/zh、docs/en 等）各自作为独立的任务提交到同一个进程池，
+不同语言的检查同时进行，共用主进程中只构建一次的路径索引。
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+from .base import DocumentValidator
+from .cache import ValidationCache
+from .corpus import SOURCE_LOCALE, DocumentCorpus
+from .pathindex import PathIndex
+from .timing import CheckTimings
+
+
+# 每个分区至少包含的文档数，文档太少时分区的进程间开销得不偿失
+MIN_PARTITION_SIZE = 8
+
+
+def run_checker(checker_class: Type[DocumentValidator], root_dir: str,
+                paths: Optional[List[Path]] = None,
+                cache_dir: Optional[str] = None,
+                path_index: Optional[PathIndex] = None,
+                timings: bool = False, locale: str = SOURCE_LOCALE) -> Dict[str, Any]:
+    """在某种语言的文档上运行检查器（或其一个文件分区）并返回收集到的结果，
+    timings 为 True 时同时返回耗时统计"""
+    cache = ValidationCache(cache_dir) if cache_dir is not None else None
+    checker = checker_class(root_dir, DocumentCorpus(root_dir, path_index, locale), cache)
+    if timings:
+        checker.timings = CheckTimings()
+    if paths is None:
+        checker.collect()
+    elif checker.timings is not None:
+        with checker.timings.measure():
+            checker.run_documents(paths)
+    else:
+        checker.run_documents(paths)
+    
+    return {
+        'errors': checker.errors,
+        'warnings': checker.warnings,
+        'info': getattr(checker, 'info', []),
+        'stats': getattr(checker, 'stats', {}),
+        'timings': checker.timings,
+    }
+
+
+def partition_paths(paths: List[Path], count: int, path_index: PathIndex) -> List[List[Path]]:
+    """把文档列表切分为 count 个按文件大小大致均衡的连续分区
+    
+    分区保持原有顺序且互不交叉，按顺序拼接各分区的结果即等于串行结果。
+    文件大小取自路径索引（与 --shard 的划分使用相同的大小，每个文件最多读取一次）。
+    """
+    if count <= 1 or len(paths) <= 1:
+        return [list(paths)]
+    
+    sizes = []
+    for path in paths:
+        key = path_index.key(path)
+        sizes.append(max(path_index.size(key), 1) if key is not None else 1)
+    
+    target = sum(sizes) / count
+    partitions: List[List[Path]] = [[]]
+    accumulated = 0
+    for path, size in zip(paths, sizes):
+        if accumulated >= target * len(partitions) and len(partitions) < count:
+            partitions.append([])
+        partitions[-1].append(path)
+        accumulated += size
+    return partitions
+
+
+def merge_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """按顺序合并各分区的结果，数值型统计项求和，耗时统计按 CheckTimings.merge() 合并"""
+    merged = {'errors': [], 'warnings': [], 'info': [], 'stats': {}, 'timings': None}
+    for result in results:
+        if result.get('timings') is not None:
+            if merged['timings'] is None:
+                merged['timings'] = CheckTimings()
+            merged['timings'].merge(result['timings'])
+        merged['errors'].extend(result['errors'])
+        merged['warnings'].extend(result['warnings'])
+        merged['info'].extend(result['info'])
+        for key, value in result['stats'].items():
+            previous = merged['stats'].get(key)
+            if isinstance(value, (int, float)) and isinstance(previous, (int, float)):
+                merged['stats'][key] = previous + value
+            else:
+                merged['stats'][key] = value
+    return merged
+
+
+class ParallelCheckExecutor:
+    """在进程池中执行检查器
+    
+    先用 submit() 提交所有检查器（可以针对多种语言），再按原顺序对每个检查器调用 collect()
+    获取合并后的结果；检查器抛出的异常会在 collect() 时重新抛出。
+    """
+    
+    def __init__(self, root_dir: str, jobs: int, corpus: Optional[DocumentCorpus] = None,
+                 cache_dir: Optional[str] = None, timings: bool = False):
+        self.root_dir = str(root_dir)
+        self.jobs = jobs
+        # 是否在子进程中统计耗时（见 timing.py）
+        self.timings = timings
+        # 子进程各自打开同一个缓存目录（缓存条目的写入是原子的）
+        self.cache_dir = str(cache_dir) if cache_dir is not None else None
+        self.corpus = corpus if corpus is not None else DocumentCorpus(root_dir)
+        self._executor = ProcessPoolExecutor(max_workers=jobs)
+        self._pending: Dict[Tuple[Type[DocumentValidator], str], List[Future]] = {}
+    
+    def submit(self, checker_class: Type[DocumentValidator], locale: Optional[str] = None,
+               paths: Optional[List[Path]] = None):
+        """提交一个检查器（默认针对 corpus 所属的语言），逐文档检查器会按文件分区拆分为多个任务
+        
+        paths 为逐文档检查器要检查的文档（如分片运行时属于本分片的部分），默认为 document_paths()。
+        """
+        corpus = self.corpus if locale is None else self.corpus.for_locale(locale)
+        # 路径索引只在主进程中构建一次，随任务传给子进程
+        path_index = corpus.path_index
+        if checker_class.PER_DOCUMENT:
+            if paths is None:
+                paths = checker_class(self.root_dir, corpus).document_paths()
+            count = min(self.jobs, max(1, len(paths) // MIN_PARTITION_SIZE))
+            futures = [
+                self._executor.submit(
+                    run_checker, checker_class, self.root_dir, part, self.cache_dir, path_index,
+                    self.timings, corpus.locale,
+                )
+                for part in partition_paths(paths, count, path_index)
+            ]
+        else:
+            futures = [self._executor.submit(
+                run_checker, checker_class, self.root_dir, None, self.cache_dir, path_index,
+                self.timings, corpus.locale,
+            )]
+        self._pending[(checker_class, corpus.locale)] = futures
+    
+    def collect(self, checker_class: Type[DocumentValidator],
+                locale: Optional[str] = None) -> Dict[str, Any]:
+        """等待并返回某个检查器（在某种语言上）所有分区合并后的结果"""
+        futures = self._pending.pop((checker_class, locale or self.corpus.locale))
+        return merge_results([future.result() for future in futures])
+    
+    def cancel(self):
+        """放弃所有尚未收集的任务：未开始的任务直接取消，正在执行任务的子进程被终止
+        
+        用于错误预算用尽时立即结束运行；之后只能调用 shutdown()。
+        """
+        for futures in self._pending.values():
+            for future in futures:
+                future.cancel()
+        self._pending.clear()
+        # ProcessPoolExecutor 没有中止正在执行的任务的公开接口，只能终止其子进程
+        processes = list((getattr(self._executor, '_processes', None) or {}).values())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    
+    def shutdown(self):
+        """关闭进程池，取消尚未开始的任务"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,266 @@
+"""教程版本一致性检查器
+
+同一套教程有多个版本（Anthropic API、Bedrock 上的 anthropic SDK、Bedrock 上的 boto3），
+每个版本是一个目录，其中每章是一个 notebook，文件名在各版本间并不完全相同
+（如 10_3_Appendix_Empirical_Performance_Eval 与 10_3_Appendix_Empirical_Performance_Evaluations）。
+
+章节按文件名中的章号和标题词对齐；每个 notebook 按标题切分为小节（课程、练习等），
+小节中的每个单元格在归一化后计算指纹：去掉导入、魔法命令、客户端创建和 get_completion 的定义等
+各版本本来就不同的样板代码，去掉 Markdown 中的链接地址（各版本链接到各自平台的文档）。
+指纹序列相同的小节视为一致；各版本间不一致时，与多数版本不同的版本报告为已出现差异，
+某个版本缺少的章节和小节报告为缺失。所有 notebook 只扫描一次，比较都在指纹上进行。
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from .base import DocumentValidator
+from .cache import ValidationCache
+from .corpus import Document, DocumentCorpus
+from .markdown import headings
+from .notebooks import CODE, MARKDOWN, NOTEBOOK_SUFFIX
+
+# 文件名：章号（如 07、10.3、10_3）和标题
+_CHAPTER_RE = re.compile(r'^(\d+)(?:[._](\d+))?[ _-]*(.*)$')
+_TITLE_WORD_RE = re.compile(r'[a-z0-9]+')
+# 对齐标题时忽略的虚词；其余的词只比较前 4 个字母（Eval 与 Evaluations 视为相同）
+_TITLE_STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'to', 'for', 'with'}
+_TITLE_PREFIX = 4
+
+# 代码单元格中各版本本来就不同的样板代码
+_BOILERPLATE_LINE_RE = re.compile(
+    r'^\s*(?:'
+    r'[%!].*'                                   # 魔法命令和 shell 命令
+    r'|#.*'                                     # 注释
+    r'|import\s.*|from\s+\S+\s+import\s.*'      # 导入
+    r'|(?:client|module_path)\s*=.*'            # 客户端创建
+    r'|sys\.path\.append\(.*'
+    r')$'
+)
+_HELPER_DEF_RE = re.compile(r'^def\s+get_completion\b')
+# hints 模块的两种引用方式：from hints import x 与 hints.x
+_HINTS_PREFIX_RE = re.compile(r'\bhints\.')
+# Markdown 中的链接地址和裸 URL
+_LINK_TARGET_RE = re.compile(r'\]\([^)]*\)')
+_URL_RE = re.compile(r'https?://\S+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def chapter_key(name: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """notebook 文件名对应的章节键 (章号, 标题词)，文件名不以章号开头时为 None"""
+    match = _CHAPTER_RE.match(name[:-len(NOTEBOOK_SUFFIX)] if name.endswith(NOTEBOOK_SUFFIX) else name)
+    if match is None:
+        return None
+    words = tuple(
+        word[:_TITLE_PREFIX] for word in _TITLE_WORD_RE.findall(match.group(3).lower())
+        if word not in _TITLE_STOPWORDS
+    )
+    return str(int(match.group(1))), words
+
+
+def normalize_code(source: str) -> str:
+    """去掉样板代码、注释和空行后的代码单元格内容，只剩样板代码的单元格为空字符串"""
+    lines = []
+    in_helper = False
+    for line in source.split('\n'):
+        if in_helper:
+            if not line.strip() or line[:1] in ' \t' or line.lstrip().startswith(')'):
+                continue
+            in_helper = False
+        if _HELPER_DEF_RE.match(line):
+            in_helper = True
+            continue
+        # 一行中用分号分隔的多条语句分别判断（如 from hints import x; print(x)）
+        statements = [
+            statement for statement in line.split(';')
+            if statement.strip() and not _BOILERPLATE_LINE_RE.match(statement)
+        ]
+        if statements:
+            text = ';'.join(statement.strip() for statement in statements)
+            lines.append(_SPACE_RE.sub(' ', _HINTS_PREFIX_RE.sub('', text)))
+    return '\n'.join(lines)
+
+
+def normalize_markdown(source: str) -> str:
+    """去掉链接地址并合并空白后的 Markdown 单元格内容"""
+    text = _URL_RE.sub('', _LINK_TARGET_RE.sub(']', source))
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def fingerprint(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+class Section:
+    """notebook 中从一个标题到下一个标题的单元格"""
+    
+    __slots__ = ('key', 'title', 'cell', 'line', 'fingerprints')
+    
+    def __init__(self, key: str, title: str, cell: Optional[int], line: Optional[int]):
+        # 归一化的标题，同名小节（如每章中的多个 Examples）附加出现次数
+        self.key = key
+        self.title = title
+        # 标题所在的单元格序号和单元格内的行号
+        self.cell = cell
+        self.line = line
+        self.fingerprints: List[bytes] = []
+
+
+class NotebookParityChecker(DocumentValidator):
+    """教程版本一致性检查器"""
+    
+    REPORT_TITLE = "教程版本一致性检查报告"
+    CORPUS_CACHEABLE = True
+    VERSION = 1
+    
+    # 教程版本所在的目录（相对于项目根目录），出现差异时前面的版本作为参照
+    VARIANTS = ('Anthropic 1P', 'AmazonBedrock/anthropic', 'AmazonBedrock/boto3')
+    
+    def __init__(self, root_dir: str = ".", corpus: Optional[DocumentCorpus] = None,
+                 cache: Optional[ValidationCache] = None):
+        super().__init__(root_dir, corpus, cache)
+        self.stats: Dict[str, int] = {}
+    
+    def document_paths(self) -> List[Path]:
+        """各版本目录下（不递归）的 notebook，只随源语言检查"""
+        if not self.corpus.is_source_locale:
+            return []
+        index = self.corpus.path_index
+        paths = []
+        for variant in self.VARIANTS:
+            paths.extend(
+                self.root_dir / key for key in index.files_under(variant + '/', NOTEBOOK_SUFFIX)
+                if '/' not in key[len(variant) + 1:]
+            )
+        return paths
+    
+    def run(self):
+        """对齐各版本的章节，逐小节比较单元格指纹"""
+        # 章节键 -> 版本 -> notebook 路径
+        chapters: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Path]] = {}
+        for path in self.document_paths():
+            key = chapter_key(path.name)
+            if key is None:
+                continue
+            variant = self._variant(path)
+            chapters.setdefault(key, {})[variant] = path
+        
+        drifted = missing = section_count = 0
+        for key in sorted(chapters, key=lambda key: (int(key[0]), key[1])):
+            found = chapters[key]
+            reference = next(variant for variant in self.VARIANTS if variant in found)
+            for variant in self.VARIANTS:
+                if variant not in found:
+                    missing += 1
+                    self.add_warning('parity/missing-chapter', variant, path=found[reference])
+            
+            sections: Dict[str, Dict[str, Section]] = {}
+            for variant, path in found.items():
+                doc = self.corpus.load(path)
+                if doc.error is not None:
+                    self.add_error('read-failed', doc.path, doc.error)
+                    continue
+                with self.timed_document(doc):
+                    try:
+                        sections[variant] = {section.key: section for section in self._sections(doc)}
+                    except ValueError as e:
+                        self.add_error('invalid-notebook', e, path=doc.path)
+            
+            with self.timed('parity/drifted-section'):
+                section_count += len({name for parsed in sections.values() for name in parsed})
+                counts = self._compare(found, sections)
+            drifted += counts[0]
+            missing += counts[1]
+        
+        self.stats = {
+            'chapters': len(chapters),
+            'notebooks': sum(len(found) for found in chapters.values()),
+            'sections': section_count,
+            'drifted': drifted,
+            'missing': missing,
+        }
+    
+    def _variant(self, path: Path) -> str:
+        rel_path = path.relative_to(self.root_dir).as_posix()
+        return next(variant for variant in self.VARIANTS if rel_path.startswith(variant + '/'))
+    
+    def _compare(self, found: Dict[str, Path],
+                 sections: Dict[str, Dict[str, Section]]) -> Tuple[int, int]:
+        """比较一章在各版本中的小节，返回 (出现差异的小节数, 缺失的小节数)"""
+        variants = [variant for variant in self.VARIANTS if variant in sections]
+        drifted = missing = 0
+        names: List[str] = []
+        for variant in variants:
+            names.extend(name for name in sections[variant] if name not in names)
+        
+        for name in names:
+            present = [variant for variant in variants if name in sections[variant]]
+            reference = sections[present[0]][name]
+            for variant in variants:
+                if variant not in present:
+                    missing += 1
+                    self.add_warning('parity/missing-section', reference.title,
+                                     self._label(found[present[0]]), path=found[variant])
+            
+            # 指纹序列 -> 具有该序列的版本；与多数（并列时与靠前的版本）不同的版本出现了差异
+            groups: Dict[Tuple[bytes, ...], List[str]] = {}
+            for variant in present:
+                groups.setdefault(tuple(sections[variant][name].fingerprints), []).append(variant)
+            if len(groups) < 2:
+                continue
+            majority = max(groups.values(), key=lambda members: (len(members), -variants.index(members[0])))
+            expected = sections[majority[0]][name].fingerprints
+            for variant in present:
+                if variant in majority:
+                    continue
+                section = sections[variant][name]
+                drifted += 1
+                self.add_warning('parity/drifted-section', section.title, self._label(found[majority[0]]),
+                                 self._difference(expected, section.fingerprints),
+                                 path=found[variant], line=section.line, cell=section.cell)
+        return drifted, missing
+    
+    def _label(self, path: Path) -> str:
+        return path.relative_to(self.root_dir).as_posix()
+    
+    @staticmethod
+    def _difference(expected: Sequence[bytes], actual: Sequence[bytes]) -> int:
+        """两个指纹序列中互相找不到对应的单元格数"""
+        remaining = list(expected)
+        extra = 0
+        for value in actual:
+            if value in remaining:
+                remaining.remove(value)
+            else:
+                extra += 1
+        return max(extra, len(remaining))
+    
+    def _sections(self, doc: Document) -> List[Section]:
+        """把 notebook 按标题切分为小节并计算每个单元格的指纹
+        
+        含有标题的 Markdown 单元格开始一个新的小节（以单元格中最后一个标题命名），
+        第一个标题之前的单元格属于没有标题的小节。同名的小节按出现的次序区分。
+        """
+        sections = [Section('', '', None, None)]
+        seen: Dict[str, int] = {}
+        for cell in doc.cells:
+            if cell.cell_type == MARKDOWN:
+                titles = headings(cell.document.tokens)
+                if titles:
+                    heading = titles[-1]
+                    title = heading.text or ''
+                    # 一级标题是 notebook 的标题，其中的章号在各版本间可能不同，按位置对应
+                    name = '#' if heading.level == 1 else normalize_markdown(title).lower()
+                    seen[name] = seen.get(name, 0) + 1
+                    if seen[name] > 1:
+                        name = f"{name}#{seen[name]}"
+                    sections.append(Section(name, title, cell.index, heading.line))
+                text = normalize_markdown(cell.source)
+            elif cell.cell_type == CODE:
+                text = normalize_code(cell.source)
+            else:
+                continue
+            if text:
+                sections[-1].fingerprints.append(fingerprint(f"{cell.cell_type}\0{text}"))
+        return [section for section in sections if section.key or section.fingerprints]
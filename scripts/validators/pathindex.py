@@ -0,0 +1,184 @@
+"""仓库路径索引
+
+用一次 os.scandir 遍历记录仓库中的所有文件和目录，
+之后判断链接目标是否存在只需一次集合查找，不再为每个链接调用 resolve()/exists()。
+
+索引中的键是相对于项目根目录、用 / 分隔、经过规范化的路径（根目录本身为 "."）。
+
+索引可以保存到文件（save()）并在其他进程或机器上读取（load()）：分片运行（--shard）时
+所有分片共用 CI 中预先计算的同一个索引，看到完全相同的文件集合和文件大小，
+分片的划分一致，跨分片的链接目标检查也与不分片时一致。
+"""
+
+import json
+import os
+import posixpath
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+
+# 遍历时跳过的目录（版本库元数据、缓存等不会成为文档链接目标）
+SKIP_DIRS = frozenset({
+    '.git',
+    '__pycache__',
+    '.hypothesis',
+    '.pytest_cache',
+    '.mypy_cache',
+    '.ruff_cache',
+    '.validation_cache',
+    'node_modules',
+})
+
+# 保存的索引文件的格式版本
+INDEX_FORMAT_VERSION = 1
+
+
+class PathIndex:
+    """仓库中所有文件和目录的路径集合"""
+    
+    def __init__(self, root_dir: str = ".", files: Optional[Iterable[str]] = None,
+                 dirs: Optional[Iterable[str]] = None):
+        self.root_dir = Path(root_dir)
+        self._root = os.path.abspath(root_dir)
+        # 指向目录的符号链接不展开遍历，其下的路径退回到文件系统检查
+        self.symlink_dirs: Set[str] = set()
+        # 文件键 -> 字节数，按需读取（从文件读取的索引中已包含全部文件的大小）
+        self._sizes: Dict[str, int] = {}
+        if files is None or dirs is None:
+            self.files, self.dirs = self._scan()
+        else:
+            self.files = set(files)
+            self.dirs = set(dirs)
+    
+    def _scan(self):
+        """用 os.scandir 遍历一次根目录，收集所有文件和目录"""
+        files: Set[str] = set()
+        dirs: Set[str] = {'.'}
+        stack = [('', self._root)]
+        while stack:
+            prefix, directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                key = prefix + entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in SKIP_DIRS:
+                            continue
+                        dirs.add(key)
+                        stack.append((key + '/', entry.path))
+                    elif entry.is_symlink() and entry.is_dir():
+                        dirs.add(key)
+                        self.symlink_dirs.add(key)
+                    else:
+                        files.add(key)
+                except OSError:
+                    continue
+        return files, dirs
+    
+    def key(self, path: Path) -> Optional[str]:
+        """把文件系统路径转换为索引键，路径不在根目录下时返回 None"""
+        relative = os.path.relpath(os.path.abspath(path), self._root)
+        if relative == '..' or relative.startswith('..' + os.sep):
+            # 已经 resolve() 过的路径（根目录位于符号链接之下时）按真实路径比较
+            relative = os.path.relpath(os.path.realpath(path), os.path.realpath(self._root))
+            if relative == '..' or relative.startswith('..' + os.sep):
+                return None
+        return posixpath.normpath(relative.replace(os.sep, '/'))
+    
+    def link_key(self, doc_path: Path, link_path: str) -> str:
+        """计算文档中链接路径（已去掉 #锚点）指向的索引键
+        
+        以 / 开头的链接相对于项目根目录，其余链接相对于文档所在目录。
+        结果可能以 .. 开头，表示目标在根目录之外。
+        """
+        if link_path.startswith('/'):
+            return posixpath.normpath(link_path.lstrip('/') or '.')
+        doc_dir = self.key(doc_path.parent)
+        if doc_dir is None:
+            doc_dir = os.path.relpath(os.path.abspath(doc_path.parent), self._root).replace(os.sep, '/')
+        return posixpath.normpath(posixpath.join(doc_dir, link_path))
+    
+    def exists(self, key: str) -> bool:
+        """索引键对应的文件或目录是否存在"""
+        if key in self.files or key in self.dirs:
+            return True
+        # 根目录之外或被跳过目录中的路径不在索引里，退回到文件系统检查
+        parts = key.split('/')
+        if parts[0] == '..' or any(part in SKIP_DIRS for part in parts) or self._under_symlink(parts):
+            return os.path.exists(os.path.join(self._root, key))
+        return False
+    
+    def _under_symlink(self, parts: List[str]) -> bool:
+        if not self.symlink_dirs:
+            return False
+        return any('/'.join(parts[:i]) in self.symlink_dirs for i in range(1, len(parts)))
+    
+    def is_file(self, key: str) -> bool:
+        """索引键是否对应一个文件"""
+        return key in self.files
+    
+    def files_under(self, prefix: str, suffix: str = '') -> List[str]:
+        """返回某个目录下（递归）以 suffix 结尾的所有文件键，按键排序"""
+        prefix = prefix.rstrip('/') + '/'
+        return sorted(
+            key for key in self.files
+            if key.startswith(prefix) and key.endswith(suffix)
+        )
+    
+    def size(self, key: str) -> int:
+        """文件的字节数，文件无法访问时为 0"""
+        size = self._sizes.get(key)
+        if size is None:
+            try:
+                size = os.stat(os.path.join(self._root, key)).st_size
+            except OSError:
+                size = 0
+            self._sizes[key] = size
+        return size
+    
+    def save(self, path: str):
+        """把索引（包括所有文件的大小）写入 JSON 文件（原子替换，读取方不会看到写了一半的文件）"""
+        data = {
+            'version': INDEX_FORMAT_VERSION,
+            'files': {key: self.size(key) for key in sorted(self.files)},
+            'dirs': sorted(self.dirs),
+            'symlink_dirs': sorted(self.symlink_dirs),
+        }
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def load(cls, path: str, root_dir: str = ".") -> 'PathIndex':
+        """读取 save() 写入的索引文件，格式无效时抛出 ValueError"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('version') != INDEX_FORMAT_VERSION:
+            raise ValueError(f"路径索引文件格式无效: {path}")
+        index = cls(root_dir, files=data['files'], dirs=data['dirs'])
+        index.symlink_dirs = set(data['symlink_dirs'])
+        index._sizes = dict(data['files'])
+        return index
+    
+    def add(self, key: str, is_dir: bool = False):
+        """登记新出现的文件或目录（用于常驻进程中的增量更新）"""
+        (self.dirs if is_dir else self.files).add(key)
+    
+    def discard(self, key: str):
+        """移除已删除的文件或目录"""
+        self.files.discard(key)
+        self.dirs.discard(key)
+        self._sizes.pop(key, None)
+
+
+def shared_index(path: str, root_dir: str = ".") -> PathIndex:
+    """读取所有分片共用的索引文件，文件不存在时遍历仓库并写入该文件"""
+    if os.path.exists(path):
+        return PathIndex.load(path, root_dir)
+    index = PathIndex(root_dir)
+    index.save(path)
+    return index
@@ -0,0 +1,117 @@
+"""Python 代码块语法检查
+
+只用 ast.parse() 做语法分析，不生成字节码。检查结果按代码块内容哈希记忆：
+同一进程内重复的代码块只解析一次，启用验证缓存时结果还会持久化到磁盘，
+以后的运行中（即使所在文档改变了）内容相同的代码块不再解析。
+
+需要解析的代码块很多时，在主进程中把它们分发到进程池并行解析。
+"""
+
+import ast
+import hashlib
+import os
+import sys
+import warnings
+from typing import Dict, Iterable, List, Optional
+from .cache import ValidationCache
+
+
+# 需要解析的不同代码块达到此数量时才使用进程池（进程启动开销约为解析数百个代码块的时间）
+PARALLEL_THRESHOLD = 512
+
+# 持久化缓存中的命名空间
+CACHE_NAMESPACE = "python-syntax"
+
+# 进程内的解析结果记忆：代码块哈希 -> 结果
+_MEMO: Dict[str, Optional[Dict]] = {}
+
+
+def block_hash(code: str) -> str:
+    """代码块的缓存键（不同 Python 版本的语法不同，版本号也计入哈希）"""
+    digest = hashlib.sha256(f"{sys.version_info[0]}.{sys.version_info[1]}\0".encode('utf-8'))
+    digest.update(code.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def parse_python(code: str) -> Optional[Dict]:
+    """解析代码块，语法正确时返回 None
+    
+    语法错误返回 {'kind': 'error', 'lineno', 'offset', 'msg'}（行号相对于代码块），
+    其他解析问题（如包含空字符）返回 {'kind': 'warning', 'message'}。
+    """
+    try:
+        # 无效转义序列等编译警告与语法检查无关（notebook 的代码单元格中很常见），不输出
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            ast.parse(code, '<code block>', 'exec')
+    except SyntaxError as e:
+        return {'kind': 'error', 'lineno': e.lineno, 'offset': e.offset, 'msg': e.msg}
+    except Exception as e:
+        return {'kind': 'warning', 'message': str(e)}
+    return None
+
+
+class PythonSyntaxChecker:
+    """带记忆和持久化缓存的代码块语法检查"""
+    
+    def __init__(self, cache: Optional[ValidationCache] = None, jobs: Optional[int] = None):
+        self.cache = cache
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        self.parsed = 0
+    
+    def prefetch(self, codes: Iterable[str]):
+        """预先解析一批代码块：跳过已记忆和已缓存的，其余数量较多时并行解析"""
+        pending: Dict[str, str] = {}
+        for code in codes:
+            key = block_hash(code)
+            if key in _MEMO or key in pending:
+                continue
+            if self._load(key):
+                continue
+            pending[key] = code
+        if not pending:
+            return
+        
+        codes_to_parse = list(pending.values())
+        if len(codes_to_parse) >= PARALLEL_THRESHOLD and self.jobs > 1:
+            results = self._parse_parallel(codes_to_parse)
+        else:
+            results = [parse_python(code) for code in codes_to_parse]
+        
+        for key, result in zip(pending, results):
+            self._remember(key, result)
+    
+    def _parse_parallel(self, codes_to_parse: List[str]) -> List[Optional[Dict]]:
+        # multiprocessing 导入较慢，只在需要时导入
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # 已在子进程中（如 QA 并行模式的分区）时不再嵌套创建进程池
+        if multiprocessing.parent_process() is None:
+            chunksize = max(1, len(codes_to_parse) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                return list(executor.map(parse_python, codes_to_parse, chunksize=chunksize))
+        return [parse_python(code) for code in codes_to_parse]
+    
+    def check(self, code: str) -> Optional[Dict]:
+        """返回代码块的解析结果（见 parse_python()）"""
+        key = block_hash(code)
+        if key in _MEMO or self._load(key):
+            return _MEMO[key]
+        result = parse_python(code)
+        self._remember(key, result)
+        return result
+    
+    def _load(self, key: str) -> bool:
+        if self.cache is None:
+            return False
+        entry = self.cache.load_value(CACHE_NAMESPACE, key)
+        if entry is None:
+            return False
+        _MEMO[key] = entry['result']
+        return True
+    
+    def _remember(self, key: str, result: Optional[Dict]):
+        self.parsed += 1
+        _MEMO[key] = result
+        if self.cache is not None:
+            self.cache.store_value(CACHE_NAMESPACE, key, {'result': result})
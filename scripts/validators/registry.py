@@ -0,0 +1,166 @@
+"""检查器注册表
+
+validate_docs.py 和 run_quality_assurance.py 通过注册表按名称选择检查器。注册表只记录
+检查器的元数据（名称、"模块:类名" 路径、成本等级和依赖），检查器所在的模块在被选中时
+才导入：只运行一项检查时不会导入其他检查器及其用到的标准库模块（如 asyncio、multiprocessing）。
+
+第三方检查器不需要修改本包：可以调用 register() 注册，或者在发行包中声明入口点
+    
+    [project.entry-points."prompt_docs.validators"]
+    spelling = "my_package.spelling:SpellingChecker"
+
+入口点的检查器类可以用类属性 COST 和 DEPENDS 声明成本等级和依赖。扫描已安装的发行包
+需要几十毫秒，所以只在按名称找不到检查器或需要列出所有检查器时才扫描入口点。
+"""
+
+import importlib
+from typing import Dict, Iterable, List, Sequence
+
+
+# 第三方检查器的入口点分组
+ENTRY_POINT_GROUP = "prompt_docs.validators"
+
+# 成本等级，从低到高：只访问路径索引、逐文档分析、解析或执行代码、访问网络
+COST_CLASSES = ('cheap', 'normal', 'expensive', 'network')
+
+
+class CheckerSpec:
+    """检查器的元数据，load() 时才导入检查器类"""
+    
+    __slots__ = ('name', 'target', 'help', 'cost', 'depends', 'default', '_class')
+    
+    def __init__(self, name: str, target: str, help: str = '', cost: str = 'normal',
+                 depends: Sequence[str] = (), default: bool = True):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"检查器 {name} 的成本等级无效: {cost}")
+        self.name = name
+        # "模块:类名"，模块名以 . 开头时相对于本包
+        self.target = target
+        self.help = help
+        self.cost = cost
+        # 必须先于本检查器运行的检查器名称；选中本检查器时它们也会被选中
+        self.depends = tuple(depends)
+        # 是否包含在 --all 中
+        self.default = default
+        self._class = None
+    
+    @property
+    def dest(self) -> str:
+        """命令行选项对应的属性名（如 links-external -> links_external）"""
+        return self.name.replace('-', '_')
+    
+    def load(self):
+        """导入并返回检查器类"""
+        if self._class is None:
+            module_name, _, class_name = self.target.partition(':')
+            module = importlib.import_module(module_name, __package__)
+            self._class = getattr(module, class_name)
+        return self._class
+    
+    def __repr__(self) -> str:
+        return f"CheckerSpec({self.name!r}, {self.target!r}, cost={self.cost!r})"
+
+
+# 内置检查器，按默认执行顺序排列
+BUILTIN_CHECKERS = [
+    CheckerSpec('existence', '.existence:DocumentExistenceChecker', '检查文档存在性', cost='cheap'),
+    CheckerSpec('content', '.content:DocumentContentChecker', '检查文档内容完整性', cost='cheap'),
+    CheckerSpec('code', '.code:CodeExampleValidator', '验证代码示例', cost='expensive'),
+    CheckerSpec('format', '.format:MarkdownFormatChecker', '检查 Markdown 格式'),
+    CheckerSpec('structure', '.structure:DocumentStructureChecker', '检查文档结构一致性'),
+    CheckerSpec('terminology', '.terminology:TerminologyChecker', '检查术语一致性'),
+    CheckerSpec('links', '.links:LinkValidator', '验证链接'),
+    CheckerSpec('duplicates', '.duplicates:NearDuplicateChecker',
+                '检测文档、README 和 notebook 中近似重复的段落'),
+    CheckerSpec('parity', '.parity:NotebookParityChecker', '检查各教程版本的 notebook 是否一致'),
+    CheckerSpec('graders', '.graders:GraderHintChecker', '检查练习提示与评分函数是否一致'),
+    CheckerSpec('links-external', '.external:ExternalLinkChecker',
+                '检查外部链接是否可以访问（需要网络，不包含在 --all 中）',
+                cost='network', default=False),
+]
+
+_REGISTRY: Dict[str, CheckerSpec] = {spec.name: spec for spec in BUILTIN_CHECKERS}
+_entry_points_loaded = False
+
+
+def register(spec: CheckerSpec):
+    """注册检查器；名称已被占用时抛出 ValueError"""
+    if spec.name in _REGISTRY:
+        raise ValueError(f"检查器名称已被注册: {spec.name}")
+    _REGISTRY[spec.name] = spec
+
+
+def unregister(name: str):
+    """取消注册检查器（主要用于测试）"""
+    _REGISTRY.pop(name, None)
+
+
+def _load_entry_points():
+    """把已安装发行包声明的入口点加入注册表（只扫描一次）"""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    
+    from importlib.metadata import entry_points
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:
+        # Python 3.9 及以前的 entry_points() 不支持 group 参数
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+    for entry in found:
+        if entry.name in _REGISTRY:
+            continue
+        checker_class = entry.load()
+        spec = CheckerSpec(
+            entry.name, entry.value,
+            help=(checker_class.__doc__ or '').strip().split('\n')[0],
+            cost=getattr(checker_class, 'COST', 'normal'),
+            depends=getattr(checker_class, 'DEPENDS', ()),
+        )
+        spec._class = checker_class
+        _REGISTRY[entry.name] = spec
+
+
+def get(name: str) -> CheckerSpec:
+    """按名称查找检查器，找不到时抛出 KeyError"""
+    if name not in _REGISTRY:
+        _load_entry_points()
+    return _REGISTRY[name]
+
+
+def available() -> List[CheckerSpec]:
+    """所有已注册的检查器（包括入口点声明的第三方检查器）"""
+    _load_entry_points()
+    return list(_REGISTRY.values())
+
+
+def defaults() -> List[CheckerSpec]:
+    """--all 包含的检查器（不扫描入口点）"""
+    return [spec for spec in _REGISTRY.values() if spec.default]
+
+
+def resolve(names: Iterable[str]) -> List[CheckerSpec]:
+    """按给定顺序返回选中的检查器，并把依赖加入到依赖它们的检查器之前
+    
+    找不到的名称抛出 KeyError，循环依赖抛出 ValueError。
+    """
+    ordered: List[CheckerSpec] = []
+    visiting: List[str] = []
+    
+    def visit(name: str):
+        if any(spec.name == name for spec in ordered):
+            return
+        if name in visiting:
+            raise ValueError(f"检查器存在循环依赖: {' -> '.join(visiting + [name])}")
+        spec = get(name)
+        visiting.append(name)
+        for dependency in spec.depends:
+            visit(dependency)
+        visiting.pop()
+        ordered.append(spec)
+    
+    for name in names:
+        visit(name)
+    return ordered
+
@@ -0,0 +1,247 @@
+"""流式报告写入器
+
+质量保证运行过程中，每项检查完成后立即把它的诊断写入报告文件并刷新，
+CI 在运行结束之前就能读到已完成检查的结果。写入器只保留计数和规则表（JUnit 只缓冲当前检查的失败用例），
+不在内存中构造整个报告，输出也不做缩进。选择了流式报告时，运行器在写出一项检查的诊断后
+只保留计数和 Markdown 报告列出的前几条，JSON 报告中该检查的部分暂存在临时文件中。
+
+- NDJSON：每行一个事件（start、diagnostic、check、summary）
+- SARIF 2.1.0：代码扫描平台使用的格式，规则表在 results 之后写出
+- JUnit XML：每项检查一个 testsuite，每个错误一个失败的 testcase，警告写入 system-out
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote
+from xml.sax.saxutils import escape, quoteattr
+from .diagnostics import ERROR, MESSAGES, Diagnostic, location_text
+
+
+TOOL_NAME = "prompt-eng-docs-validator"
+
+# XML 1.0 不允许的控制字符
+_XML_INVALID_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class StreamingReportWriter:
+    """流式报告写入器基类
+    
+    依次调用 start()、每项检查完成后调用 write_check()、最后调用 finish()。
+    """
+    
+    # 默认文件名（位于报告目录下）
+    FILENAME = ""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+    
+    def start(self, metadata: Dict[str, Any]):
+        """打开报告文件并写入开头部分"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._start(metadata)
+        self._file.flush()
+    
+    def write_check(self, name: str, success: bool, errors: Iterable[Diagnostic],
+                    warnings: Iterable[Diagnostic], stats: Optional[Dict[str, Any]] = None,
+                    extra: Optional[Dict[str, Any]] = None):
+        """写入一项检查的全部诊断并刷新文件
+        
+        extra 是检查的其他信息（如语言和耗时统计），只有能容纳它们的格式（NDJSON）才写出，
+        合并分片报告时需要用到。
+        """
+        self._write_check(name, success, errors, warnings, stats or {}, extra or {})
+        self._file.flush()
+    
+    def finish(self, summary: Dict[str, Any]):
+        """写入结尾部分并关闭文件"""
+        try:
+            self._finish(summary)
+        finally:
+            self.close()
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _start(self, metadata: Dict[str, Any]):
+        raise NotImplementedError
+    
+    def _write_check(self, name, success, errors, warnings, stats, extra):
+        raise NotImplementedError
+    
+    def _finish(self, summary: Dict[str, Any]):
+        raise NotImplementedError
+
+
+# 除 \n 外也会被当作换行的字符（如 str.splitlines()），写成转义序列以保证一行一个事件
+_LINE_BREAKS = str.maketrans({'\x85': '\\u0085', '\u2028': '\\u2028', '\u2029': '\\u2029'})
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str).translate(_LINE_BREAKS)
+
+
+class NdjsonReportWriter(StreamingReportWriter):
+    """NDJSON 报告：每行一个 JSON 事件"""
+    
+    FILENAME = "quality_assurance_report.ndjson"
+    
+    def _event(self, event_type: str, data: Dict[str, Any]):
+        self._file.write(_dumps({'type': event_type, **data}))
+        self._file.write('\n')
+    
+    def _start(self, metadata):
+        self._event('start', metadata)
+    
+    def _write_check(self, name, success, errors, warnings, stats, extra):
+        error_count = warning_count = 0
+        for diagnostic in errors:
+            self._event('diagnostic', {'check': name, **diagnostic.to_dict()})
+            error_count += 1
+        for diagnostic in warnings:
+            self._event('diagnostic', {'check': name, **diagnostic.to_dict()})
+            warning_count += 1
+        self._event('check', {
+            'check': name,
+            'success': success,
+            'errors': error_count,
+            'warnings': warning_count,
+            'stats': stats,
+            **extra,
+        })
+    
+    def _finish(self, summary):
+        self._event('summary', summary)
+
+
+class SarifReportWriter(StreamingReportWriter):
+    """SARIF 2.1.0 报告
+    
+    所有检查写入同一个 run；规则在第一次出现时编号，规则表在 results 之后写出
+    （JSON 对象中键的顺序不影响语义）。文档路径相对于 SRCROOT（项目根目录）。
+    """
+    
+    FILENAME = "quality_assurance_report.sarif"
+    
+    def __init__(self, path):
+        super().__init__(path)
+        self._rules: Dict[str, int] = {}
+        self._first = True
+    
+    def _start(self, metadata):
+        self._metadata = metadata
+        self._file.write(
+            '{"$schema":"https://json.schemastore.org/sarif-2.1.0.json","version":"2.1.0",'
+            '"runs":[{"results":['
+        )
+    
+    def _write_check(self, name, success, errors, warnings, stats, extra):
+        for diagnostics in (errors, warnings):
+            for diagnostic in diagnostics:
+                self._file.write(('' if self._first else ',') + _dumps(self._result(name, diagnostic)))
+                self._first = False
+    
+    def _result(self, check: str, diagnostic: Diagnostic) -> Dict[str, Any]:
+        rule_index = self._rules.setdefault(diagnostic.rule, len(self._rules))
+        result = {
+            'ruleId': diagnostic.rule,
+            'ruleIndex': rule_index,
+            'level': 'error' if diagnostic.severity == ERROR else 'warning',
+            'message': {'text': diagnostic.message()},
+            'properties': {'check': check},
+        }
+        if diagnostic.cell is not None:
+            # SARIF 的区域以整个文件的行号表示，notebook 单元格内的位置只作为属性记录
+            result['properties'].update(cell=diagnostic.cell, cellLine=diagnostic.line)
+        if diagnostic.path is not None:
+            region = {}
+            if diagnostic.line is not None and diagnostic.cell is None:
+                region['startLine'] = diagnostic.line
+                if diagnostic.col is not None:
+                    region['startColumn'] = diagnostic.col
+            location = {'artifactLocation': {'uri': quote(diagnostic.path), 'uriBaseId': 'SRCROOT'}}
+            if region:
+                location['region'] = region
+            result['locations'] = [{'physicalLocation': location}]
+        return result
+    
+    def _finish(self, summary):
+        templates = MESSAGES['zh']
+        rules = [
+            {'id': rule, 'shortDescription': {'text': templates.get(rule, rule)}}
+            for rule in self._rules
+        ]
+        root_uri = Path(self._metadata['root_dir']).resolve().as_uri() + '/'
+        self._file.write('],' + _dumps({
+            'tool': {'driver': {'name': TOOL_NAME, 'rules': rules}},
+            'originalUriBaseIds': {'SRCROOT': {'uri': root_uri}},
+            'invocations': [{
+                'executionSuccessful': True,
+                'startTimeUtc': self._metadata.get('started_at'),
+                'endTimeUtc': summary.get('finished_at'),
+            }],
+            'properties': summary,
+        })[1:-1] + '}]}\n')
+
+
+def _xml_text(text: str) -> str:
+    return escape(_XML_INVALID_RE.sub('', text))
+
+
+def _xml_attr(text: str) -> str:
+    return quoteattr(_XML_INVALID_RE.sub('', text))
+
+
+class JUnitReportWriter(StreamingReportWriter):
+    """JUnit XML 报告：每项检查一个 testsuite"""
+    
+    FILENAME = "quality_assurance_junit.xml"
+    
+    def _start(self, metadata):
+        self._file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self._file.write(f'<testsuites name={_xml_attr(TOOL_NAME)}>\n')
+    
+    def _write_check(self, name, success, errors, warnings, stats, extra):
+        # testsuite 的计数要写在开头，先把本检查的失败用例写成文本；警告直接逐行写出
+        cases: List[str] = []
+        for diagnostic in errors:
+            location = ''
+            if diagnostic.path is not None:
+                location = location_text(diagnostic.path, diagnostic.line, diagnostic.col, diagnostic.cell)
+            case_name = f"{location} {diagnostic.rule}" if location else diagnostic.rule
+            cases.append(
+                f'    <testcase classname={_xml_attr(name)} name={_xml_attr(case_name)}>'
+                f'<failure type={_xml_attr(diagnostic.rule)} message={_xml_attr(diagnostic.message())}>'
+                f'{_xml_text(diagnostic.format())}</failure></testcase>\n'
+            )
+        failures = len(cases)
+        if not cases:
+            cases.append(f'    <testcase classname={_xml_attr(name)} name={_xml_attr(name)}/>\n')
+        
+        self._file.write(
+            f'  <testsuite name={_xml_attr(name)} tests="{len(cases)}" failures="{failures}" errors="0">\n'
+        )
+        self._file.writelines(cases)
+        has_output = False
+        for warning in warnings:
+            self._file.write('\n' if has_output else '    <system-out>')
+            self._file.write(_xml_text(warning.format()))
+            has_output = True
+        if has_output:
+            self._file.write('</system-out>\n')
+        self._file.write('  </testsuite>\n')
+    
+    def _finish(self, summary):
+        self._file.write('</testsuites>\n')
+
+
+REPORT_WRITERS = {
+    'ndjson': NdjsonReportWriter,
+    'sarif': SarifReportWriter,
+    'junit': JUnitReportWriter,
+}
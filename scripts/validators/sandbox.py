@@ -0,0 +1,256 @@
+"""在沙箱中执行文档里的 Python 代码块
+
+validate_docs.py --code --execute 时使用。可以独立运行的代码块（信息字符串带 exec 标记，
+或自动判断为自包含）会在常驻工作进程池中执行：
+
+- 工作进程启动一次后常驻，预先导入 anthropic/boto3 替身模块（见 sandbox_stubs/），
+  不需要网络和真实凭证
+- 每个代码块在工作进程 fork 出的子进程中执行，相互隔离，并受 CPU 时间和墙钟时间限制
+- 执行结果按代码块内容哈希记忆，启用验证缓存时持久化到磁盘
+
+信息字符串中的 no-exec 标记可以排除不应执行的代码块（如需要真实服务的示例）。
+"""
+
+import ast
+import builtins
+import hashlib
+import importlib.util
+import json
+import os
+import queue
+import select
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from .cache import ValidationCache
+
+
+# 默认每个代码块的 CPU 时间上限（秒）
+DEFAULT_CPU_LIMIT = 5.0
+
+# 默认每个代码块的墙钟时间上限（秒）
+DEFAULT_WALL_LIMIT = 10.0
+
+# 替身模块版本；修改替身模块后递增，使缓存的执行结果失效
+STUB_VERSION = 1
+
+# 持久化缓存中的命名空间
+CACHE_NAMESPACE = "python-exec"
+
+# 信息字符串中的执行标记
+EXEC_TAG = 'exec'
+NO_EXEC_TAGS = ('no-exec', 'noexec')
+
+# 交互式调试器会等待终端输入，使用它们的代码块不执行
+INTERACTIVE_MODULES = frozenset({'pdb', 'ipdb', 'IPython', 'code'})
+INTERACTIVE_CALLS = frozenset({'input', 'breakpoint'})
+
+STUBS_DIR = Path(__file__).parent / 'sandbox_stubs'
+WORKER_SCRIPT = Path(__file__).parent / 'sandbox_worker.py'
+STUB_MODULES = frozenset(path.name for path in STUBS_DIR.iterdir() if path.is_dir()) \
+    if STUBS_DIR.is_dir() else frozenset()
+
+# 进程内的执行结果记忆：缓存键 -> 结果
+_MEMO: Dict[str, Dict] = {}
+
+
+def _module_available(name: str) -> bool:
+    if name in STUB_MODULES:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_self_contained(code: str) -> bool:
+    """判断代码块能否独立运行
+    
+    要求：能够编译；用到的名字都在代码块中定义或是内置名字；导入的模块都可用
+    （替身模块或已安装的模块）；不使用相对导入、通配符导入、input() 和交互式调试器。
+    """
+    try:
+        tree = ast.parse(code, '<code block>', 'exec')
+        compile(tree, '<code block>', 'exec')
+    except (SyntaxError, ValueError):
+        return False
+    
+    bound = set(dir(builtins)) | {'__name__', '__file__'}
+    loaded = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            (loaded if isinstance(node.ctx, ast.Load) else bound).add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            bound.update(node.names)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                top = alias.name.split('.')[0]
+                if top in INTERACTIVE_MODULES or not _module_available(top):
+                    return False
+                bound.add(alias.asname or alias.name.split('.')[0])
+        elif isinstance(node, ast.ImportFrom):
+            if node.level or not node.module:
+                return False
+            top = node.module.split('.')[0]
+            if top in INTERACTIVE_MODULES or not _module_available(top):
+                return False
+            for alias in node.names:
+                if alias.name == '*':
+                    return False
+                bound.add(alias.asname or alias.name)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in INTERACTIVE_CALLS:
+            return False
+        elif getattr(node, 'name', None) and type(node).__name__ in ('MatchAs', 'MatchStar'):
+            bound.add(node.name)
+    return loaded <= bound
+
+
+def should_execute(info: str, code: str) -> bool:
+    """根据信息字符串中的标记和代码内容决定是否执行代码块"""
+    tags = info.split()[1:]
+    if any(tag in NO_EXEC_TAGS for tag in tags):
+        return False
+    if EXEC_TAG in tags:
+        return True
+    return is_self_contained(code)
+
+
+class SandboxPool:
+    """常驻的沙箱工作进程池"""
+    
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._idle: "queue.Queue[subprocess.Popen]" = queue.Queue()
+        self._workers: List[subprocess.Popen] = []
+    
+    def _spawn(self) -> subprocess.Popen:
+        worker = subprocess.Popen(
+            [sys.executable, '-I', str(WORKER_SCRIPT), str(STUBS_DIR)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+        )
+        self._workers.append(worker)
+        return worker
+    
+    def _acquire(self) -> subprocess.Popen:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            if len(self._workers) < self.size:
+                return self._spawn()
+            return self._idle.get()
+    
+    def run(self, code: str, cpu: float, wall: float) -> Dict:
+        """在一个空闲工作进程中执行代码块"""
+        worker = self._acquire()
+        try:
+            worker.stdin.write(json.dumps({'code': code, 'cpu': cpu, 'wall': wall}) + '\n')
+            worker.stdin.flush()
+            # 工作进程自己会在墙钟超时后杀死子进程，这里再留出余量防止工作进程本身卡住
+            ready = True
+            if os.name == 'posix':
+                ready, _, _ = select.select([worker.stdout], [], [], wall + 5)
+            line = worker.stdout.readline() if ready else ''
+        except OSError:
+            line = ''
+        if not line:
+            self._discard(worker)
+            return {'status': 'timeout', 'lineno': None, 'message': f"墙钟时间超过 {wall:g} 秒"}
+        self._idle.put(worker)
+        return json.loads(line)
+    
+    def _discard(self, worker: subprocess.Popen):
+        worker.kill()
+        worker.wait()
+        self._workers.remove(worker)
+    
+    def close(self):
+        """关闭所有工作进程"""
+        for worker in list(self._workers):
+            try:
+                worker.stdin.close()
+            except OSError:
+                pass
+            try:
+                worker.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+                worker.wait()
+        self._workers.clear()
+
+
+class CodeExecutor:
+    """带记忆和持久化缓存的代码块执行"""
+    
+    def __init__(self, cache: Optional[ValidationCache] = None, jobs: Optional[int] = None,
+                 cpu_limit: Optional[float] = None, wall_limit: Optional[float] = None):
+        self.cache = cache
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        self.cpu_limit = cpu_limit if cpu_limit is not None else DEFAULT_CPU_LIMIT
+        self.wall_limit = wall_limit if wall_limit is not None else DEFAULT_WALL_LIMIT
+        self.executed = 0
+    
+    def key(self, code: str) -> str:
+        """执行结果的缓存键（Python 版本、替身模块版本和资源上限都会影响结果）"""
+        digest = hashlib.sha256(
+            f"{sys.version_info[0]}.{sys.version_info[1]}\0{STUB_VERSION}\0"
+            f"{self.cpu_limit}\0{self.wall_limit}\0".encode('utf-8')
+        )
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def prefetch(self, codes: Iterable[str]):
+        """并发执行一批代码块：跳过已记忆和已缓存的，其余分发到工作进程池"""
+        pending: Dict[str, str] = {}
+        for code in codes:
+            key = self.key(code)
+            if key in _MEMO or key in pending or self._load(key):
+                continue
+            pending[key] = code
+        if not pending:
+            return
+        
+        pool = SandboxPool(min(self.jobs, len(pending)))
+        try:
+            with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                results = list(executor.map(
+                    lambda code: pool.run(code, self.cpu_limit, self.wall_limit),
+                    pending.values(),
+                ))
+        finally:
+            pool.close()
+        for key, result in zip(pending, results):
+            self._remember(key, result)
+    
+    def result(self, code: str) -> Dict:
+        """返回代码块的执行结果，没有预先执行时现在执行"""
+        key = self.key(code)
+        if key not in _MEMO and not self._load(key):
+            self.prefetch([code])
+        return _MEMO[key]
+    
+    def _load(self, key: str) -> bool:
+        if self.cache is None:
+            return False
+        entry = self.cache.load_value(CACHE_NAMESPACE, key)
+        if entry is None:
+            return False
+        _MEMO[key] = entry['result']
+        return True
+    
+    def _remember(self, key: str, result: Dict):
+        self.executed += 1
+        _MEMO[key] = result
+        if self.cache is not None:
+            self.cache.store_value(CACHE_NAMESPACE, key, {'result': result})
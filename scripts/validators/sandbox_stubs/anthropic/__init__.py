@@ -0,0 +1,227 @@
+"""沙箱中使用的 anthropic 替身模块
+
+提供文档示例中用到的客户端、响应对象和异常类型，所有请求都在本地返回固定的回复，不访问网络。
+"""
+
+__version__ = "0.0.0-sandbox"
+
+STUB_TEXT = "这是沙箱中的示例回复。"
+
+
+class _Object:
+    """可以通过属性访问字段，也可以当作字典读取的简单对象"""
+    
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+    
+    def __getitem__(self, key):
+        return self.__dict__[key]
+    
+    def get(self, key, default=None):
+        return self.__dict__.get(key, default)
+    
+    def model_dump(self):
+        return {
+            key: value.model_dump() if isinstance(value, _Object) else
+            [item.model_dump() if isinstance(item, _Object) else item for item in value]
+            if isinstance(value, list) else value
+            for key, value in self.__dict__.items()
+        }
+    
+    to_dict = model_dump
+    
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.__dict__.items())
+        return f"{type(self).__name__}({fields})"
+
+
+class TextBlock(_Object):
+    pass
+
+
+class Usage(_Object):
+    pass
+
+
+class Message(_Object):
+    pass
+
+
+def _message(model=None, **_):
+    return Message(
+        id="msg_sandbox",
+        type="message",
+        role="assistant",
+        model=model or "claude-sandbox",
+        content=[TextBlock(type="text", text=STUB_TEXT)],
+        stop_reason="end_turn",
+        stop_sequence=None,
+        usage=Usage(input_tokens=10, output_tokens=10),
+    )
+
+
+class MessageStream:
+    """messages.stream() 返回的上下文管理器"""
+    
+    def __init__(self, **kwargs):
+        self._message = _message(**kwargs)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    @property
+    def text_stream(self):
+        return _Chunks([STUB_TEXT])
+    
+    def __iter__(self):
+        yield _Object(type="message_start", message=self._message)
+        yield _Object(type="content_block_delta", index=0,
+                      delta=_Object(type="text_delta", text=STUB_TEXT))
+        yield _Object(type="message_stop")
+    
+    def get_final_message(self):
+        return self._message
+    
+    def get_final_text(self):
+        return STUB_TEXT
+    
+    def until_done(self):
+        pass
+
+
+class _Chunks:
+    """同时支持同步和异步迭代的文本块序列"""
+    
+    def __init__(self, chunks):
+        self._chunks = chunks
+    
+    def __iter__(self):
+        return iter(self._chunks)
+    
+    def __aiter__(self):
+        async def generate():
+            for chunk in self._chunks:
+                yield chunk
+        return generate()
+
+
+class _Messages:
+    def create(self, **kwargs):
+        if kwargs.get("stream"):
+            return iter(MessageStream(**kwargs))
+        return _message(**kwargs)
+    
+    def stream(self, **kwargs):
+        return MessageStream(**kwargs)
+    
+    def count_tokens(self, **kwargs):
+        return _Object(input_tokens=10)
+
+
+class _AsyncMessages(_Messages):
+    async def create(self, **kwargs):
+        return _message(**kwargs)
+
+
+class Anthropic:
+    def __init__(self, *args, **kwargs):
+        self.api_key = kwargs.get("api_key")
+        self.messages = _Messages()
+    
+    def with_options(self, **kwargs):
+        return self
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def close(self):
+        pass
+
+
+class AnthropicBedrock(Anthropic):
+    pass
+
+
+class AsyncAnthropic(Anthropic):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.messages = _AsyncMessages()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class AsyncAnthropicBedrock(AsyncAnthropic):
+    pass
+
+
+Client = Anthropic
+AsyncClient = AsyncAnthropic
+
+
+class AnthropicError(Exception):
+    pass
+
+
+class APIError(AnthropicError):
+    def __init__(self, message="", *args, **kwargs):
+        super().__init__(message)
+        self.message = message
+        self.status_code = kwargs.get("status_code")
+        self.response = kwargs.get("response")
+        self.body = kwargs.get("body")
+
+
+class APIConnectionError(APIError):
+    pass
+
+
+class APITimeoutError(APIConnectionError):
+    pass
+
+
+class APIStatusError(APIError):
+    pass
+
+
+class BadRequestError(APIStatusError):
+    pass
+
+
+class AuthenticationError(APIStatusError):
+    pass
+
+
+class PermissionDeniedError(APIStatusError):
+    pass
+
+
+class NotFoundError(APIStatusError):
+    pass
+
+
+class RateLimitError(APIStatusError):
+    pass
+
+
+class InternalServerError(APIStatusError):
+    pass
+
+
+HUMAN_PROMPT = "\n\nHuman:"
+AI_PROMPT = "\n\nAssistant:"
@@ -0,0 +1,131 @@
+"""沙箱中使用的 boto3 替身模块
+
+client("bedrock-runtime") 返回的客户端在本地返回固定的 Claude 回复，不访问网络；
+其他服务和未知方法返回 Response：缺少的键和未知的属性仍然返回 Response，
+示例代码可以照常取值、遍历和链式调用（如分页器、资源对象的方法）。
+"""
+
+import io
+import json
+
+from . import session
+from .session import Session
+
+__version__ = "0.0.0-sandbox"
+
+STUB_TEXT = "这是沙箱中的示例回复。"
+
+
+def _anthropic_body(model_id):
+    return {
+        "id": "msg_sandbox",
+        "type": "message",
+        "role": "assistant",
+        "model": model_id,
+        "content": [{"type": "text", "text": STUB_TEXT}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 10},
+        # 旧版 Text Completions 格式
+        "completion": STUB_TEXT,
+    }
+
+
+class Response(dict):
+    """宽松的空响应：缺少的键返回空 Response，未知的方法返回 Response"""
+    
+    def __missing__(self, key):
+        return Response()
+    
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: Response()
+
+
+class StreamingBody:
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+    
+    def read(self, amt=None):
+        return self._stream.read(amt)
+    
+    def close(self):
+        pass
+
+
+class _Exceptions:
+    def __getattr__(self, name):
+        from botocore.exceptions import ClientError
+        return ClientError
+
+
+class Client:
+    def __init__(self, service_name, **kwargs):
+        self.service_name = service_name
+        self.region_name = kwargs.get("region_name", "us-west-2")
+        self.exceptions = _Exceptions()
+        self.meta = Client._Meta(self.region_name)
+    
+    class _Meta:
+        def __init__(self, region_name):
+            self.region_name = region_name
+    
+    def invoke_model(self, body=None, modelId="", **kwargs):
+        data = json.dumps(_anthropic_body(modelId)).encode("utf-8")
+        return {
+            "body": StreamingBody(data),
+            "contentType": "application/json",
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        }
+    
+    def invoke_model_with_response_stream(self, body=None, modelId="", **kwargs):
+        events = [
+            {"type": "message_start", "message": _anthropic_body(modelId)},
+            {"type": "content_block_delta", "index": 0,
+             "delta": {"type": "text_delta", "text": STUB_TEXT}},
+            {"type": "message_stop"},
+        ]
+        return {
+            "body": [{"chunk": {"bytes": json.dumps(event).encode("utf-8")}} for event in events],
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        }
+    
+    def converse(self, **kwargs):
+        return {
+            "output": {"message": {"role": "assistant", "content": [{"text": STUB_TEXT}]}},
+            "stopReason": "end_turn",
+            "usage": {"inputTokens": 10, "outputTokens": 10, "totalTokens": 20},
+            "metrics": {"latencyMs": 1},
+        }
+    
+    def converse_stream(self, **kwargs):
+        return {"stream": [
+            {"messageStart": {"role": "assistant"}},
+            {"contentBlockDelta": {"delta": {"text": STUB_TEXT}, "contentBlockIndex": 0}},
+            {"messageStop": {"stopReason": "end_turn"}},
+        ]}
+    
+    def list_foundation_models(self, **kwargs):
+        return {"modelSummaries": []}
+    
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: Response()
+
+
+def client(service_name, *args, **kwargs):
+    return Client(service_name, **kwargs)
+
+
+def resource(service_name, *args, **kwargs):
+    return Client(service_name, **kwargs)
+
+
+def set_stream_logger(*args, **kwargs):
+    pass
+
+
+def setup_default_session(**kwargs):
+    pass
@@ -0,0 +1,40 @@
+"""boto3.session 替身"""
+
+from botocore.config import Config
+
+
+class Credentials:
+    def __init__(self):
+        self.access_key = "sandbox"
+        self.secret_key = "sandbox"
+        self.token = None
+        self.method = "env"
+    
+    def get_frozen_credentials(self):
+        return self
+
+
+class Session:
+    def __init__(self, *args, **kwargs):
+        self.region_name = kwargs.get("region_name", "us-west-2")
+        self.profile_name = kwargs.get("profile_name", "default")
+    
+    def client(self, service_name, **kwargs):
+        import boto3
+        kwargs.setdefault("region_name", self.region_name)
+        return boto3.client(service_name, **kwargs)
+    
+    def resource(self, service_name, **kwargs):
+        return self.client(service_name, **kwargs)
+    
+    def get_credentials(self):
+        return Credentials()
+    
+    def get_available_regions(self, service_name):
+        return ["us-east-1", "us-west-2"]
+    
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        from boto3 import Response
+        return lambda *args, **kwargs: Response()
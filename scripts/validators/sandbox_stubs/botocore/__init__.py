@@ -0,0 +1,3 @@
+"""沙箱中使用的 botocore 替身模块"""
+
+__version__ = "0.0.0-sandbox"
@@ -0,0 +1,11 @@
+"""botocore.config 替身"""
+
+
+class Config:
+    def __init__(self, *args, **kwargs):
+        self.__dict__.update(kwargs)
+    
+    def merge(self, other):
+        merged = Config(**self.__dict__)
+        merged.__dict__.update(other.__dict__)
+        return merged
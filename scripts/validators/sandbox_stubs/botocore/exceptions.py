@@ -0,0 +1,29 @@
+"""botocore.exceptions 替身"""
+
+
+class BotoCoreError(Exception):
+    pass
+
+
+class NoCredentialsError(BotoCoreError):
+    pass
+
+
+class NoRegionError(BotoCoreError):
+    pass
+
+
+class EndpointConnectionError(BotoCoreError):
+    pass
+
+
+class ReadTimeoutError(BotoCoreError):
+    pass
+
+
+class ClientError(Exception):
+    def __init__(self, error_response=None, operation_name=""):
+        self.response = error_response or {"Error": {"Code": "Unknown", "Message": ""}}
+        self.operation_name = operation_name
+        super().__init__(f"An error occurred ({self.response['Error'].get('Code')}) "
+                         f"when calling the {operation_name} operation")
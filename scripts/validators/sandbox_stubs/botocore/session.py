@@ -0,0 +1,27 @@
+"""botocore.session 替身"""
+
+
+class Session:
+    def __init__(self, *args, **kwargs):
+        self.profile = kwargs.get("profile")
+        self._credentials = None
+    
+    def set_credentials(self, access_key, secret_key, token=None):
+        from boto3.session import Credentials
+        self._credentials = Credentials()
+        self._credentials.access_key = access_key
+        self._credentials.secret_key = secret_key
+        self._credentials.token = token
+    
+    def get_credentials(self):
+        if self._credentials is None:
+            from boto3.session import Credentials
+            return Credentials()
+        return self._credentials
+    
+    def get_config_variable(self, name):
+        return None
+
+
+def get_session(*args, **kwargs):
+    return Session(*args, **kwargs)
@@ -0,0 +1,168 @@
+"""代码块执行沙箱的工作进程
+
+由 sandbox.SandboxPool 以 `python -I sandbox_worker.py <替身模块目录>` 启动并常驻。
+启动时预先导入替身模块和常用标准库，之后从标准输入逐行读取 JSON 请求：
+    
+    {"code": "...", "cpu": 秒, "wall": 秒}
+
+对每个请求 fork 一个子进程执行代码（子进程继承已导入的模块，无需重新启动解释器），
+子进程中设置 CPU 时间上限、禁止网络连接、丢弃标准输出，父进程超过墙钟时间上限时杀死子进程。
+结果以一行 JSON 写回标准输出：
+    
+    {"status": "ok" | "error" | "timeout", "lineno": 行号或 null, "message": "..."}
+
+不支持 fork 的平台上直接在工作进程中执行（没有 CPU 时间上限，墙钟超时由调用方处理）。
+"""
+
+import contextlib
+import io
+import json
+import os
+import select
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+
+FILENAME = '<code block>'
+
+# 示例代码常从环境变量读取的凭证，在沙箱中使用占位值
+SANDBOX_ENV = {
+    'ANTHROPIC_API_KEY': 'sk-ant-sandbox',
+    'AWS_ACCESS_KEY_ID': 'sandbox',
+    'AWS_SECRET_ACCESS_KEY': 'sandbox',
+    'AWS_DEFAULT_REGION': 'us-west-2',
+    'AWS_REGION': 'us-west-2',
+}
+
+
+def _deny_network(*args, **kwargs):
+    raise OSError("沙箱中禁止网络连接")
+
+
+def _isolate(cpu: float, workdir: str):
+    """在执行代码的进程中设置资源上限、禁止网络，并切换到临时工作目录"""
+    try:
+        import resource
+        limit = max(1, int(cpu + 0.999))
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, limit + 1))
+    except (ImportError, ValueError, OSError):
+        pass
+    
+    import socket
+    socket.socket.connect = _deny_network
+    socket.socket.connect_ex = _deny_network
+    socket.create_connection = _deny_network
+    socket.getaddrinfo = _deny_network
+    
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.chdir(workdir)
+
+
+def execute(code: str) -> dict:
+    """在当前进程中执行代码并返回结果"""
+    namespace = {'__name__': '__main__', '__builtins__': __builtins__}
+    try:
+        exec(compile(code, FILENAME, 'exec'), namespace)
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return {'status': 'ok', 'lineno': None, 'message': ''}
+        return {'status': 'error', 'lineno': None, 'message': f"SystemExit: {e.code}"}
+    except BaseException as e:
+        lineno = None
+        if isinstance(e, SyntaxError) and e.filename == FILENAME:
+            lineno = e.lineno
+        for frame, frame_lineno in traceback.walk_tb(e.__traceback__):
+            if frame.f_code.co_filename == FILENAME:
+                lineno = frame_lineno
+        message = f"{type(e).__name__}: {e}".strip().rstrip(':')
+        return {'status': 'error', 'lineno': lineno, 'message': message[:500]}
+    return {'status': 'ok', 'lineno': None, 'message': ''}
+
+
+def run_forked(request: dict) -> dict:
+    """在 fork 出的子进程中执行一个请求
+    
+    代码块的工作目录由父进程创建，子进程结束（包括被杀死）后删除，代码块写入的文件不会残留。
+    """
+    workdir = tempfile.mkdtemp(prefix='doc-sandbox-')
+    try:
+        return _run_forked(request, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_forked(request: dict, workdir: str) -> dict:
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            _isolate(request['cpu'], workdir)
+            result = execute(request['code'])
+            os.write(write_fd, json.dumps(result, ensure_ascii=False).encode('utf-8'))
+        finally:
+            os._exit(0)
+    
+    os.close(write_fd)
+    deadline = time.monotonic() + request['wall']
+    chunks = []
+    timed_out = False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        return {'status': 'timeout', 'lineno': None, 'message': f"墙钟时间超过 {request['wall']:g} 秒"}
+    
+    _, status = os.waitpid(pid, 0)
+    if chunks:
+        return json.loads(b''.join(chunks).decode('utf-8'))
+    if os.WIFSIGNALED(status) and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL):
+        return {'status': 'timeout', 'lineno': None, 'message': f"CPU 时间超过 {request['cpu']:g} 秒"}
+    return {'status': 'error', 'lineno': None, 'message': f"进程异常退出（状态 {status}）"}
+
+
+def main():
+    # 脚本所在目录中的 code.py 等文件会遮蔽同名标准库模块，从搜索路径中去掉
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:] = [path for path in sys.path if os.path.abspath(path or '.') != script_dir]
+    sys.path.insert(0, sys.argv[1])
+    os.environ.update(SANDBOX_ENV)
+    # 预先导入替身模块和示例中常用的标准库，fork 出的子进程直接继承
+    import anthropic  # noqa: F401
+    import boto3  # noqa: F401
+    import asyncio  # noqa: F401
+    import logging  # noqa: F401
+    
+    stdout = sys.stdout
+    for line in sys.stdin:
+        request = json.loads(line)
+        if hasattr(os, 'fork'):
+            result = run_forked(request)
+        else:
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                result = execute(request['code'])
+        stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+        stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
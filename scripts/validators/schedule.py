@@ -0,0 +1,120 @@
+"""检查的调度和错误预算
+
+质量保证运行器和 validate_docs.py 不再按固定顺序运行检查，而是先运行最便宜的检查：
+每项检查的预计耗时取上次运行测得的墙钟时间（按检查器和语言记录在验证缓存目录中，
+用指数移动平均平滑），没有历史记录时按注册表中的成本等级估计。依赖（CheckerSpec.depends）
+始终先于依赖它的检查运行。
+
+配合错误预算（--fail-fast、--max-errors N），文档存在性等便宜的检查发现错误后，
+昂贵的检查（代码示例验证、外部链接检查）不再启动，明显有问题时可以在一秒内得到结论。
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from .cache import ValidationCache
+from .registry import CheckerSpec
+
+
+# 没有历史耗时的检查按成本等级估计的耗时（秒）
+COST_ESTIMATES = {'cheap': 0.01, 'normal': 0.1, 'expensive': 1.0, 'network': 10.0}
+
+# 历史耗时在验证缓存中的位置（见 ValidationCache.load_value()）
+HISTORY_NAMESPACE = 'schedule'
+HISTORY_KEY = 'history'
+
+# 新测得的耗时在历史耗时中所占的权重（指数移动平均）
+HISTORY_WEIGHT = 0.5
+
+
+def history_key(checker_name: str, locale: str) -> str:
+    """历史耗时的键：同一检查器在不同语言上的耗时分别记录"""
+    return f"{locale}/{checker_name}"
+
+
+class CheckHistory:
+    """各项检查的历史耗时，没有缓存目录时只在本次运行中有效"""
+    
+    def __init__(self, cache: Optional[ValidationCache] = None):
+        self.cache = cache
+        self.seconds: Dict[str, float] = {}
+        if cache is not None:
+            entry = cache.load_value(HISTORY_NAMESPACE, HISTORY_KEY) or {}
+            self.seconds = {
+                key: float(value) for key, value in entry.get('seconds', {}).items()
+                if isinstance(value, (int, float))
+            }
+    
+    def estimate(self, spec: CheckerSpec, locale: str) -> float:
+        """检查的预计耗时：有历史记录时为历史耗时，否则按成本等级估计"""
+        key = history_key(spec.name, locale)
+        if key in self.seconds:
+            return self.seconds[key]
+        return COST_ESTIMATES[spec.cost]
+    
+    def record(self, checker_name: str, locale: str, seconds: float):
+        """记录一次测得的耗时"""
+        key = history_key(checker_name, locale)
+        previous = self.seconds.get(key)
+        self.seconds[key] = seconds if previous is None else \
+            previous + (seconds - previous) * HISTORY_WEIGHT
+    
+    def save(self):
+        """把历史耗时写入缓存目录"""
+        if self.cache is not None:
+            self.cache.store_value(HISTORY_NAMESPACE, HISTORY_KEY, {'seconds': self.seconds})
+
+
+class ScheduledCheck:
+    """调度中的一项检查：检查器、语言和调用方附带的数据（如 QA 运行器的检查项名称）"""
+    
+    __slots__ = ('spec', 'locale', 'data', 'estimate')
+    
+    def __init__(self, spec: CheckerSpec, locale: str, data: Any = None):
+        self.spec = spec
+        self.locale = locale
+        self.data = data
+        self.estimate = 0.0
+    
+    def __repr__(self) -> str:
+        return f"ScheduledCheck({self.spec.name!r}, {self.locale!r}, estimate={self.estimate:.3f})"
+
+
+def schedule(checks: Sequence[ScheduledCheck], history: CheckHistory) -> List[ScheduledCheck]:
+    """按预计耗时从低到高排列检查，预计耗时相同的保持原有顺序
+    
+    同一语言中被依赖的检查器总是排在依赖它的检查器之前（即使它更昂贵）。
+    """
+    for check in checks:
+        check.estimate = history.estimate(check.spec, check.locale)
+    pending = list(checks)
+    ordered: List[ScheduledCheck] = []
+    while pending:
+        # 依赖都已排定的检查（循环依赖由 registry.resolve() 报告，这里不会卡住）
+        ready = [
+            check for check in pending
+            if not any(_scheduled(pending, dependency, check.locale) for dependency in check.spec.depends)
+        ] or pending
+        chosen = min(ready, key=lambda check: check.estimate)
+        pending.remove(chosen)
+        ordered.append(chosen)
+    return ordered
+
+
+def _scheduled(pending: Sequence[ScheduledCheck], name: str, locale: str) -> bool:
+    return any(check.spec.name == name and check.locale == locale for check in pending)
+
+
+class ErrorBudget:
+    """错误预算：已完成的检查累计报告的错误数达到上限后，不再启动后续检查"""
+    
+    def __init__(self, max_errors: Optional[int] = None):
+        # 错误数上限，为 None 时不限制
+        self.max_errors = max_errors
+        self.errors = 0
+    
+    def spend(self, errors: int):
+        """计入一项检查报告的错误数"""
+        self.errors += errors
+    
+    @property
+    def exhausted(self) -> bool:
+        return self.max_errors is not None and self.errors >= self.max_errors
@@ -0,0 +1,214 @@
+"""分片运行和分片报告的合并
+
+大型仓库的验证可以拆分到 N 台 CI 机器上同时运行（--shard i/N）：
+
+- 逐文档检查器（PER_DOCUMENT）要检查的文档按路径的稳定哈希排列，再按文件大小切分为
+  大致相等的 N 段，第 i 个分片只检查第 i 段。划分只取决于路径和文件大小，
+  与机器、进程和 Python 的哈希随机化无关，同一棵树在每个分片上得到相同的划分。
+- 汇总类检查器需要看到全部文档（如结构一致性、近似重复），不拆分文档，
+  每项检查（检查器和语言）按稳定哈希整体分给一个分片。
+- 所有分片共用 CI 中预先计算的路径索引（--path-index，见 pathindex.py），
+  链接目标是否存在按完整的仓库判断，不受分片影响。
+
+每个分片写出带分片后缀的部分报告（JSON 和可选的 NDJSON），
+run_quality_assurance.py merge 把全部分片的部分报告合并为与不分片运行相同的摘要和报告。
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+from .diagnostics import Diagnostic
+from .parallel import merge_results
+from .pathindex import PathIndex
+from .schedule import history_key
+from .timing import CheckTimings
+
+
+def stable_hash(key: str) -> int:
+    """与进程无关的 64 位哈希（内置 hash() 对字符串随机化，不能跨机器使用）"""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def partition(keys: Sequence[str], sizes: Sequence[int], count: int) -> List[int]:
+    """把键划分为 count 个按大小大致均衡的分片，返回每个键所属分片的序号（从 0 开始）
+    
+    键按 (稳定哈希, 键) 排列后依次累加大小，每个键归入其大小区间的中点所在的那一段。
+    """
+    weights = [max(size, 1) for size in sizes]
+    total = sum(weights)
+    shards = [0] * len(keys)
+    accumulated = 0
+    for position in sorted(range(len(keys)), key=lambda i: (stable_hash(keys[i]), keys[i])):
+        midpoint = accumulated + weights[position] / 2
+        shards[position] = min(int(midpoint * count / total), count - 1)
+        accumulated += weights[position]
+    return shards
+
+
+class Shard:
+    """N 个分片中的第 index 个（从 1 开始）"""
+    
+    def __init__(self, index: int, count: int):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"无效的分片: {index}/{count}")
+        self.index = index
+        self.count = count
+    
+    @classmethod
+    def parse(cls, text: str) -> 'Shard':
+        """解析 "i/N" 形式的分片说明，格式无效时抛出 ValueError"""
+        index, sep, count = text.partition('/')
+        if not sep or not index.strip().isdigit() or not count.strip().isdigit():
+            raise ValueError(f"无效的分片: {text}（应为 i/N，如 1/4）")
+        return cls(int(index), int(count))
+    
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+    
+    def __repr__(self) -> str:
+        return f"Shard({self.index}, {self.count})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Shard):
+            return NotImplemented
+        return (self.index, self.count) == (other.index, other.count)
+    
+    def __hash__(self) -> int:
+        return hash((self.index, self.count))
+    
+    @property
+    def suffix(self) -> str:
+        """部分报告文件名中的分片标记"""
+        return f"shard-{self.index}-of-{self.count}"
+    
+    def select(self, paths: List[Path], path_index: PathIndex) -> List[Path]:
+        """逐文档检查器的文档中属于本分片的部分，保持原有顺序"""
+        keys = [path_index.key(path) or str(path) for path in paths]
+        shards = partition(keys, [path_index.size(key) for key in keys], self.count)
+        return [path for path, shard in zip(paths, shards) if shard == self.index - 1]
+    
+    def owns(self, checker_name: str, locale: str) -> bool:
+        """汇总类检查器在某种语言上的检查是否由本分片运行"""
+        return stable_hash(history_key(checker_name, locale)) % self.count == self.index - 1
+
+
+def load_partial_report(path: str) -> Dict[str, Any]:
+    """读取一个分片写出的部分报告（.json 或 .ndjson）
+    
+    返回 {'metadata', 'results', 'cancelled', 'finished_at'}，results 中的诊断恢复为 Diagnostic，
+    耗时统计恢复为 CheckTimings。文件不是分片报告时抛出 ValueError。
+    """
+    if str(path).endswith('.ndjson'):
+        report = _load_ndjson(path)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        report = {
+            'metadata': data['metadata'],
+            'results': {
+                name: {
+                    **result,
+                    'errors': [Diagnostic.from_dict(item) for item in result['errors']],
+                    'warnings': [Diagnostic.from_dict(item) for item in result['warnings']],
+                }
+                for name, result in data['results'].items()
+            },
+            'cancelled': data['summary'].get('cancelled_checks', []),
+            'finished_at': data['metadata']['generated_at'],
+        }
+    if not report['metadata'].get('shard'):
+        raise ValueError(f"不是分片报告: {path}")
+    for result in report['results'].values():
+        result['timings'] = CheckTimings.from_dict(result['timings'])
+    return report
+
+
+def _load_ndjson(path: str) -> Dict[str, Any]:
+    report = {'metadata': {}, 'results': {}, 'cancelled': [], 'finished_at': None}
+    diagnostics: Dict[str, Dict[str, List[Diagnostic]]] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            event = json.loads(line)
+            event_type = event.pop('type')
+            if event_type == 'start':
+                report['metadata'] = event
+            elif event_type == 'diagnostic':
+                found = diagnostics.setdefault(event['check'], {'error': [], 'warning': []})
+                found[event['severity']].append(Diagnostic.from_dict(event))
+            elif event_type == 'check':
+                found = diagnostics.pop(event['check'], {'error': [], 'warning': []})
+                report['results'][event['check']] = {
+                    'success': event['success'],
+                    'locale': event['locale'],
+                    'errors': found['error'],
+                    'warnings': found['warning'],
+                    'info': [],
+                    'stats': event['stats'],
+                    'timings': event['timings'],
+                }
+            elif event_type == 'summary':
+                report['cancelled'] = event.get('cancelled_checks', [])
+                report['finished_at'] = event['finished_at']
+    if report['finished_at'] is None:
+        raise ValueError(f"分片报告不完整（缺少 summary）: {path}")
+    return report
+
+
+def merge_partial_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """合并全部分片的部分报告
+    
+    各分片必须属于同一次划分（相同的 N）且一个不缺、不重复，否则抛出 ValueError。
+    同一项检查在各分片上的结果按 parallel.merge_results() 合并（各分片同时运行，
+    墙钟时间取最大值），诊断按文档路径和位置排序，与不分片运行的报告顺序相同。
+    返回 {'metadata', 'results', 'timings', 'cancelled'}。
+    """
+    if not reports:
+        raise ValueError("没有要合并的分片报告")
+    shards = [Shard.parse(report['metadata']['shard']) for report in reports]
+    count = shards[0].count
+    if any(shard.count != count for shard in shards):
+        raise ValueError(f"分片报告来自不同的划分: {', '.join(sorted(map(str, shards)))}")
+    indexes = [shard.index for shard in shards]
+    duplicated = sorted({index for index in indexes if indexes.count(index) > 1})
+    if duplicated:
+        raise ValueError(f"重复的分片: {', '.join(f'{index}/{count}' for index in duplicated)}")
+    missing = sorted(set(range(1, count + 1)) - set(indexes))
+    if missing:
+        raise ValueError(f"缺少分片: {', '.join(f'{index}/{count}' for index in missing)}")
+    
+    partials: Dict[str, List[Dict[str, Any]]] = {}
+    for report in reports:
+        for name, result in report['results'].items():
+            partials.setdefault(name, []).append(result)
+    results = {}
+    timings = {}
+    for name, parts in partials.items():
+        merged = merge_results(parts)
+        timings[name] = merged['timings']
+        results[name] = {
+            'success': all(part['success'] for part in parts),
+            'locale': parts[0]['locale'],
+            'errors': sorted(merged['errors'], key=Diagnostic.sort_key),
+            'warnings': sorted(merged['warnings'], key=Diagnostic.sort_key),
+            'info': merged['info'],
+            'stats': merged['stats'],
+        }
+    
+    cancelled = []
+    for report in reports:
+        cancelled.extend(name for name in report['cancelled'] if name not in cancelled)
+    first = reports[0]['metadata']
+    return {
+        'metadata': {
+            'root_dir': first.get('root_dir'),
+            'locales': first.get('locales'),
+            'started_at': min(datetime.fromisoformat(report['metadata']['started_at']) for report in reports),
+            'finished_at': max(datetime.fromisoformat(report['finished_at']) for report in reports),
+            'shards': count,
+        },
+        'results': results,
+        'timings': timings,
+        'cancelled': cancelled,
+    }
@@ -1,51 +1,57 @@
 """文档结构一致性检查器"""
 
-import re
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 from .base import DocumentValidator
+from .corpus import Document
+from .markdown import headings
 
 
 class DocumentStructureChecker(DocumentValidator):
     """文档结构一致性检查器"""
     
-    def check(self) -> bool:
+    REPORT_TITLE = "文档结构一致性检查报告"
+    CORPUS_CACHEABLE = True
+    VERSION = 3
+    
+    # 需要比较结构的文档类别
+    CATEGORIES = ["getting-started", "user-guide", "development", "advanced", "versions"]
+    
+    def input_paths(self) -> List[Path]:
+        """各类别目录下的文档"""
+        category_dirs = {self.corpus.docs_dir / category for category in self.CATEGORIES}
+        return [path for path in self.corpus.doc_paths() if path.parent in category_dirs]
+    
+    def run(self):
         """执行文档结构一致性检查"""
         self._check_structure_consistency()
-        return self.print_report("文档结构一致性检查报告")
     
     def _check_structure_consistency(self):
         """检查同类文档的结构一致性"""
-        categories = ["getting-started", "user-guide", "development", "advanced", "versions"]
-        
-        for category in categories:
-            category_dir = self.root_dir / "docs" / "zh" / category
-            if not category_dir.exists():
-                continue
-            
-            docs = list(category_dir.glob("*.md"))
+        for category in self.CATEGORIES:
+            docs = self.corpus.documents_in(category)
             if len(docs) < 2:
                 continue  # 少于2个文档无需比较
             
             structures = {}
-            for doc_path in docs:
-                try:
-                    content = doc_path.read_text(encoding='utf-8')
-                    structure = self._extract_structure(content)
-                    structures[doc_path.name] = structure
-                except Exception as e:
-                    self.add_error(f"读取文档失败 {doc_path}: {e}")
+            for doc in docs:
+                if doc.error is not None:
+                    self.add_error('read-failed', doc.path, doc.error)
+                    continue
+                with self.timed_document(doc):
+                    structures[doc.path.name] = self._extract_structure(doc)
             
             self._compare_structures(category, structures)
     
-    def _extract_structure(self, content: str) -> Dict[str, any]:
+    def _extract_structure(self, doc: Document) -> Dict[str, any]:
         """提取文档结构"""
-        headings = re.findall(r'^(#+)\s+(.+)$', content, re.MULTILINE)
+        levels = [token.level for token in headings(doc.tokens)]
+        content = doc.text
         
         structure = {
-            'heading_levels': [len(h[0]) for h in headings],
-            'heading_count': len(headings),
-            'max_level': max([len(h[0]) for h in headings]) if headings else 0,
+            'heading_levels': levels,
+            'heading_count': len(levels),
+            'max_level': max(levels) if levels else 0,
             'has_title': content.strip().startswith('#') if content.strip() else False,
         }
         
@@ -62,15 +68,11 @@ class DocumentStructureChecker(DocumentValidator):
             if not struct['has_title']
         ]
         if docs_without_title:
-            self.add_warning(
-                f"类别 [{category}] 中以下文档缺少主标题: "
-                f"{', '.join(docs_without_title)}"
-            )
+            self.add_warning('structure/missing-title', category, ', '.join(docs_without_title))
         
         # 检查标题层级是否一致
         max_levels = [struct['max_level'] for struct in structures.values()]
         if len(set(max_levels)) > 1:
             self.add_warning(
-                f"类别 [{category}] 中文档的标题层级深度不一致: "
-                f"{dict(zip(structures.keys(), max_levels))}"
+                'structure/heading-depth', category, str(dict(zip(structures.keys(), max_levels)))
             )
@@ -0,0 +1,238 @@
+"""合成文档树生成器（用于基准测试）
+
+按给定参数生成确定性的 docs/zh 文档树：文档数、标题层级、链接密度、代码块比例和语言分布、
+中英文比例以及术语表大小。相同的参数和随机种子总是生成逐字节相同的文档树。
+
+生成的文档树包含存在性和内容完整性检查要求的全部文档、README 和术语表，error_rate 为 0 时
+各检查器不报告错误；error_rate 大于 0 时按比例注入失效链接、失效锚点、标题格式问题和
+Python 语法错误，使基准测试同时覆盖报告问题的开销。
+"""
+
+import posixpath
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .content import DocumentContentChecker
+from .markdown import slugify
+from .terminology import TerminologyChecker
+
+
+# 正文使用的词汇
+CJK_WORDS = [
+    "文档", "示例", "配置", "参数", "输出", "输入", "结构", "方法", "调用", "结果",
+    "内容", "格式", "步骤", "说明", "问题", "版本", "接口", "用户", "数据", "服务",
+]
+ENGLISH_WORDS = [
+    "the", "model", "prompt", "returns", "request", "value", "example", "with",
+    "context", "response", "token", "system", "message", "user", "output",
+]
+
+# 组成术语的汉字
+TERM_CHARS = "提示词模型上下文温度采样角色思维链格式评估工具向量检索嵌入微调推理对齐幻觉"
+
+# 默认的代码块语言分布（语言 -> 权重），空字符串表示没有标注语言的代码块
+DEFAULT_CODE_MIX = {'python': 4, 'bash': 2, 'json': 1, 'text': 1}
+
+# 每个子目录中的文档数
+DOCS_PER_DIR = 200
+
+
+class CorpusSpec:
+    """合成文档树的参数"""
+    
+    def __init__(self, documents: int = 100, heading_depth: int = 3, sections: int = 6,
+                 link_density: float = 0.2, code_ratio: float = 0.3,
+                 code_mix: Optional[Dict[str, int]] = None, cjk_ratio: float = 0.7,
+                 glossary_size: int = 50, error_rate: float = 0.0, seed: int = 0):
+        # docs/zh 下的 Markdown 文档总数（包括存在性检查要求的文档）
+        self.documents = documents
+        # 最深的标题层级（1 表示只有文档标题）
+        self.heading_depth = heading_depth
+        # 每个文档的章节数
+        self.sections = sections
+        # 每个句子后附带链接的概率
+        self.link_density = link_density
+        # 每个章节包含代码块的概率
+        self.code_ratio = code_ratio
+        self.code_mix = dict(code_mix if code_mix is not None else DEFAULT_CODE_MIX)
+        # 中文句子所占的比例
+        self.cjk_ratio = cjk_ratio
+        self.glossary_size = glossary_size
+        # 链接、标题和 Python 代码块出错的概率
+        self.error_rate = error_rate
+        self.seed = seed
+    
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CorpusSpec':
+        return cls(**data)
+
+
+def document_paths(spec: CorpusSpec) -> List[str]:
+    """所有文档相对于根目录的路径：先是内容完整性检查要求的文档，然后是按类别分目录存放的其他文档"""
+    required = [
+        f"docs/zh/{category}/{name}"
+        for category, docs in DocumentContentChecker.REQUIRED_SECTIONS.items()
+        for name in docs
+    ]
+    categories = list(DocumentContentChecker.REQUIRED_SECTIONS)
+    paths = required[:spec.documents]
+    for index in range(spec.documents - len(paths)):
+        category = categories[index % len(categories)]
+        part = index // len(categories) // DOCS_PER_DIR
+        paths.append(f"docs/zh/{category}/part-{part:03d}/doc-{index:06d}.md")
+    return paths
+
+
+def glossary_terms(spec: CorpusSpec) -> List[str]:
+    """生成 glossary_size 个互不相同的术语"""
+    rng = random.Random(f"{spec.seed}:glossary")
+    terms: List[str] = []
+    seen = set()
+    while len(terms) < spec.glossary_size:
+        term = ''.join(rng.choices(TERM_CHARS, k=rng.randint(3, 5)))
+        if term not in seen:
+            seen.add(term)
+            terms.append(term)
+    return terms
+
+
+def generate_corpus(root: Path, spec: CorpusSpec) -> Dict[str, int]:
+    """在 root（应为空目录）下生成文档树，返回 {'documents': 文档数, 'bytes': docs/zh 下文档的总字节数}"""
+    root = Path(root)
+    paths = document_paths(spec)
+    terms = glossary_terms(spec)
+    # 先规划所有文档的标题，生成链接时才能指向实际存在的锚点
+    plans = [_plan_headings(spec, index, path) for index, path in enumerate(paths)]
+    anchors = [[slugify(text) for level, text, valid in plan if valid] for plan in plans]
+    
+    total_bytes = 0
+    for index, path in enumerate(paths):
+        text = _render_document(spec, index, path, plans[index], paths, anchors, terms)
+        data = text.encode('utf-8')
+        total_bytes += len(data)
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+    
+    _write_glossary(root, terms)
+    _write_readmes(root, paths)
+    return {'documents': len(paths), 'bytes': total_bytes}
+
+
+def _plan_headings(spec: CorpusSpec, index: int, path: str) -> List[Tuple[int, str, bool]]:
+    """文档的标题列表：(层级, 文本, 格式是否正确)，第一项是文档标题"""
+    rng = random.Random(f"{spec.seed}:headings:{index}")
+    category, _, name = path[len("docs/zh/"):].partition('/')
+    required = DocumentContentChecker.REQUIRED_SECTIONS.get(category, {}).get(name, [])
+    
+    headings = [(1, f"{_word(rng, spec)} 文档 {index}", True)]
+    if spec.heading_depth < 2:
+        return headings
+    for section in range(spec.sections):
+        if section < len(required):
+            # 内容完整性检查要求的章节
+            headings.append((2, f"{required[section]} {section}", True))
+            continue
+        level = 2 if section == 0 else rng.randint(2, spec.heading_depth)
+        valid = rng.random() >= spec.error_rate
+        headings.append((level, f"{_word(rng, spec)} {section}", valid))
+    return headings
+
+
+def _render_document(spec: CorpusSpec, index: int, path: str, plan: List[Tuple[int, str, bool]],
+                     paths: List[str], anchors: List[List[str]], terms: List[str]) -> str:
+    rng = random.Random(f"{spec.seed}:body:{index}")
+    source_dir = posixpath.dirname(path)
+    
+    def link() -> str:
+        """指向随机文档（多数带锚点）的相对链接，按 error_rate 指向不存在的文档或锚点"""
+        target = rng.randrange(len(paths))
+        url = posixpath.relpath(paths[target], source_dir)
+        if rng.random() < spec.error_rate:
+            if rng.random() < 0.5:
+                return f"[缺失](missing-{target}.md)"
+            return f"[缺失]({url}#不存在的锚点-{target})"
+        if anchors[target] and rng.random() < 0.7:
+            url += '#' + rng.choice(anchors[target])
+        return f"[{_word(rng, spec)}]({url})"
+    
+    def sentence() -> str:
+        if rng.random() < spec.cjk_ratio:
+            words = rng.choices(CJK_WORDS, k=rng.randint(4, 10))
+            if terms and rng.random() < 0.3:
+                words.insert(rng.randrange(len(words)), rng.choice(terms))
+            text = ''.join(words) + "。"
+        else:
+            text = ' '.join(rng.choices(ENGLISH_WORDS, k=rng.randint(5, 12))).capitalize() + "."
+        if rng.random() < spec.link_density:
+            text += ' ' + link()
+        return text
+    
+    def paragraph() -> str:
+        return ' '.join(sentence() for _ in range(rng.randint(2, 5)))
+    
+    lines = [f"# {plan[0][1]}", "", paragraph(), ""]
+    for section, (level, text, valid) in enumerate(plan[1:]):
+        lines.append('#' * level + (' ' if valid else '') + text)
+        lines.append("")
+        for _ in range(rng.randint(1, 3)):
+            lines.append(paragraph())
+            lines.append("")
+        if rng.random() < 0.3:
+            lines.extend(f"- {sentence()}" for _ in range(rng.randint(2, 4)))
+            lines.append("")
+        if spec.code_mix and rng.random() < spec.code_ratio:
+            lines.extend(_code_block(rng, spec, f"{index}_{section}"))
+            lines.append("")
+    return '\n'.join(lines)
+
+
+def _code_block(rng: random.Random, spec: CorpusSpec, suffix: str) -> List[str]:
+    """按语言分布生成一个围栏代码块"""
+    languages = list(spec.code_mix)
+    language = rng.choices(languages, weights=[spec.code_mix[name] for name in languages])[0]
+    number = rng.randint(1, 1000)
+    if language in ('python', 'py'):
+        if rng.random() < spec.error_rate:
+            body = [f"def broken_{suffix}(:", "    pass"]
+        else:
+            body = [
+                f"def compute_{suffix}(value):",
+                f"    result = value * {number}",
+                f"    return [result, \"{rng.choice(ENGLISH_WORDS)}\"]",
+                "",
+                f"print(compute_{suffix}({number}))",
+            ]
+    elif language == 'bash':
+        body = [f"python3 scripts/run_{suffix}.py --count {number}"]
+    elif language == 'json':
+        body = ['{', f'  "name": "{rng.choice(ENGLISH_WORDS)}",', f'  "count": {number}', '}']
+    else:
+        body = [' '.join(rng.choices(ENGLISH_WORDS, k=8))]
+    return [f"```{language}", *body, "```"]
+
+
+def _word(rng: random.Random, spec: CorpusSpec) -> str:
+    return rng.choice(CJK_WORDS if rng.random() < spec.cjk_ratio else ENGLISH_WORDS)
+
+
+def _write_glossary(root: Path, terms: List[str]):
+    """术语表所在的需求文档"""
+    lines = ["# 需求文档", "", "## 术语表", ""]
+    lines.extend(f"- **{term}（Term {index}）**: 合成术语 {index}" for index, term in enumerate(terms))
+    lines.append("")
+    path = root / TerminologyChecker.GLOSSARY_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('\n'.join(lines), encoding='utf-8')
+
+
+def _write_readmes(root: Path, paths: List[str]):
+    """根目录的 README（链接到前几个文档）和英文 README"""
+    lines = ["# 合成文档", "", "## 文档", ""]
+    lines.extend(f"- [{posixpath.basename(path)}]({path})" for path in paths[:20])
+    lines.append("")
+    (root / "README.md").write_text('\n'.join(lines), encoding='utf-8')
+    (root / "README_EN.md").write_text("# Synthetic documents\n", encoding='utf-8')
@@ -1,71 +1,120 @@
 """术语一致性检查器"""
 
+import bisect
+import json
 import re
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from .base import DocumentValidator
+from .cache import ValidationCache
+from .corpus import Document, DocumentCorpus
+from .termmatch import TermMatcher
 
 
 class TerminologyChecker(DocumentValidator):
     """术语一致性检查器"""
     
-    def __init__(self, root_dir: str = "."):
-        super().__init__(root_dir)
+    REPORT_TITLE = "术语一致性检查报告"
+    CORPUS_CACHEABLE = True
+    
+    # 术语表所在文档（相对于项目根目录）
+    GLOSSARY_PATH = ".kiro/specs/comprehensive-chinese-documentation/requirements.md"
+    
+    # 术语表中英文一列对应的语言：这种语言的文档检查英文术语，其他非源语言没有对应的术语
+    ENGLISH_LOCALE = "en"
+    
+    def __init__(self, root_dir: str = ".", corpus: Optional[DocumentCorpus] = None,
+                 cache: Optional[ValidationCache] = None):
+        super().__init__(root_dir, corpus, cache)
         self.glossary = self._load_glossary()
+        # 语料库所属语言使用的术语（按术语表顺序）
+        self.terms = self._locale_terms()
+        # 术语表只编译一次，每个文档扫描一遍即可找到所有术语
+        self.matcher = TermMatcher(self.terms)
+        # 每个术语在各文档中的出现位置：术语 -> [(文档相对路径, 行, 列)]，由 run() 填充
+        self.term_positions: Dict[str, List[Tuple[str, int, int]]] = {}
     
     def _load_glossary(self) -> Dict[str, str]:
         """加载术语表"""
         glossary = {}
         
         # 从需求文档加载术语表
-        req_path = self.root_dir / ".kiro/specs/comprehensive-chinese-documentation/requirements.md"
-        if req_path.exists():
-            try:
-                content = req_path.read_text(encoding='utf-8')
-                # 提取术语表部分
-                match = re.search(r'## 术语表\n\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-                if match:
-                    glossary_text = match.group(1)
-                    # 解析术语定义
-                    terms = re.findall(r'-\s+\*\*(.+?)（(.+?)）\*\*', glossary_text)
-                    for zh_term, en_term in terms:
-                        glossary[zh_term] = en_term
-            except Exception as e:
-                self.add_warning(f"加载术语表失败: {e}")
+        req_doc = self.corpus.get(self.GLOSSARY_PATH)
+        if req_doc is not None:
+            if req_doc.error is not None:
+                self.add_warning('terminology/glossary-failed', req_doc.error)
+                return glossary
+            
+            # 提取术语表部分
+            match = re.search(r'## 术语表\n\n(.*?)(?=\n##|\Z)', req_doc.text, re.DOTALL)
+            if match:
+                glossary_text = match.group(1)
+                # 解析术语定义
+                terms = re.findall(r'-\s+\*\*(.+?)（(.+?)）\*\*', glossary_text)
+                for zh_term, en_term in terms:
+                    glossary[zh_term] = en_term
         
         return glossary
     
-    def check(self) -> bool:
+    def _locale_terms(self) -> List[str]:
+        """源语言的文档使用中文术语，英文文档使用英文术语，其他语言为空"""
+        if self.corpus.is_source_locale:
+            return list(self.glossary)
+        if self.corpus.locale == self.ENGLISH_LOCALE:
+            return list(dict.fromkeys(self.glossary.values()))
+        return []
+    
+    def input_paths(self) -> List[Path]:
+        """所有文档以及术语表所在的需求文档"""
+        return self.corpus.doc_paths() + [self.root_dir / self.GLOSSARY_PATH]
+    
+    def config_fingerprint(self) -> str:
+        """术语表内容及所属语言使用的术语"""
+        return json.dumps([self.glossary, self.terms], ensure_ascii=False, sort_keys=True)
+    
+    def run(self):
         """执行术语一致性检查"""
         if not self.glossary:
-            self.add_warning("未找到术语表，跳过术语一致性检查")
-            return self.print_report("术语一致性检查报告")
+            self.add_warning('terminology/no-glossary')
+            return
+        if not self.terms:
+            return
         
         self._check_terminology_usage()
-        return self.print_report("术语一致性检查报告")
     
     def _check_terminology_usage(self):
         """检查术语使用一致性"""
-        docs_dir = self.root_dir / "docs" / "zh"
-        if not docs_dir.exists():
+        if not self.corpus.docs_dir.exists():
             return
         
-        term_usage = {term: [] for term in self.glossary.keys()}
+        term_positions = {term: [] for term in self.terms}
         
-        for doc_path in docs_dir.rglob("*.md"):
-            try:
-                content = doc_path.read_text(encoding='utf-8')
-                
-                for term in self.glossary.keys():
-                    # 统计术语出现次数
-                    count = content.count(term)
-                    if count > 0:
-                        term_usage[term].append((doc_path, count))
-                
-            except Exception as e:
-                self.add_error(f"读取文档失败 {doc_path}: {e}")
+        for doc in self.corpus.documents():
+            if doc.error is not None:
+                self.add_error('read-failed', doc.path, doc.error)
+                continue
+            
+            with self.timed_document(doc):
+                found = self.find_terms(doc)
+            for term, positions in found.items():
+                term_positions[term].extend(
+                    (doc.rel_path, line, col) for line, col in positions
+                )
+        self.term_positions = term_positions
         
         # 报告术语使用情况
-        for term, usage in term_usage.items():
-            if not usage:
-                self.add_warning(f"术语 '{term}' 在文档中未被使用")
+        for term, positions in term_positions.items():
+            if not positions:
+                self.add_warning('terminology/unused-term', term)
+    
+    def find_terms(self, doc: Document) -> Dict[str, List[Tuple[int, int]]]:
+        """一次扫描找出文档中所有术语的出现位置：术语 -> [(行, 列)]（均从 1 开始）"""
+        line_starts = [0]
+        for line in doc.lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+        
+        positions: Dict[str, List[Tuple[int, int]]] = {}
+        for offset, term in self.matcher.find_all(doc.text):
+            line = bisect.bisect_right(line_starts, offset)
+            positions.setdefault(term, []).append((line, offset - line_starts[line - 1] + 1))
+        return positions
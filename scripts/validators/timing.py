@@ -0,0 +1,143 @@
+"""检查耗时统计
+
+记录每个检查器的墙钟时间和 CPU 时间、每个文件的检查耗时和扫描的字节数，以及检查器中
+按规则划分的热点代码段的耗时（如链接检查中查找目标文件和查找锚点分别计入
+links/broken-internal 和 links/broken-anchor）。
+
+检查器的 timings 为 None 时不做任何统计；质量保证运行器为每个检查器启用统计，
+并在报告中列出最慢的文件和规则。
+"""
+
+import contextlib
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 未启用统计时 DocumentValidator.timed() 返回的空上下文（可以重复使用）
+NULL_TIMER = contextlib.nullcontext()
+
+
+class _RuleTimer:
+    """把一段代码的耗时累加到某条规则名下"""
+    
+    __slots__ = ('rules', 'rule', 'started')
+    
+    def __init__(self, rules: Dict[str, float], rule: str):
+        self.rules = rules
+        self.rule = rule
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+    
+    def __exit__(self, *exc_info):
+        self.rules[self.rule] = self.rules.get(self.rule, 0.0) + time.perf_counter() - self.started
+
+
+class CheckTimings:
+    """单个检查器的耗时统计"""
+    
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.bytes = 0
+        # 文档相对路径 -> 检查该文档的耗时（秒）
+        self.files: Dict[str, float] = {}
+        # 规则 ID -> 耗时（秒）
+        self.rules: Dict[str, float] = {}
+    
+    @contextlib.contextmanager
+    def measure(self):
+        """统计一次运行的墙钟时间和 CPU 时间"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.wall += time.perf_counter() - wall
+            self.cpu += time.process_time() - cpu
+    
+    @contextlib.contextmanager
+    def document(self, rel_path: str, size: int):
+        """统计检查一个文档的耗时"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_file(rel_path, time.perf_counter() - started, size)
+    
+    def rule(self, rule: str) -> _RuleTimer:
+        """统计一段代码的耗时，计入 rule 名下"""
+        return _RuleTimer(self.rules, rule)
+    
+    def add_file(self, rel_path: str, seconds: float, size: int):
+        """记录检查一个文档的耗时和文档的字节数"""
+        self.files[rel_path] = self.files.get(rel_path, 0.0) + seconds
+        self.bytes += size
+    
+    def merge(self, other: 'CheckTimings'):
+        """合并并行执行的另一个分区：分区同时运行，墙钟时间取最大值，其他各项求和"""
+        self.wall = max(self.wall, other.wall)
+        self.cpu += other.cpu
+        self.bytes += other.bytes
+        for path, seconds in other.files.items():
+            self.files[path] = self.files.get(path, 0.0) + seconds
+        for rule, seconds in other.rules.items():
+            self.rules[rule] = self.rules.get(rule, 0.0) + seconds
+    
+    def to_dict(self, top: Optional[int] = 10) -> Dict:
+        """可以写入 JSON 的摘要，只保留最慢的 top 个文件（top 为 None 时保留全部）"""
+        return {
+            'wall_seconds': round(self.wall, 4),
+            'cpu_seconds': round(self.cpu, 4),
+            'files': len(self.files),
+            'bytes_scanned': self.bytes,
+            'mb_per_second': round(self.bytes / 1e6 / self.wall, 3) if self.bytes and self.wall > 0 else None,
+            'slowest_files': [
+                {'path': path, 'seconds': round(seconds, 4)}
+                for path, seconds in _top(self.files.items(), top)
+            ],
+            'rules': {rule: round(seconds, 4) for rule, seconds in _top(self.rules.items(), None)},
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CheckTimings':
+        """从 to_dict() 的结果恢复；只有 to_dict(None) 保留了全部文件，恢复的统计才是完整的"""
+        timings = cls()
+        timings.wall = data['wall_seconds']
+        timings.cpu = data['cpu_seconds']
+        timings.bytes = data['bytes_scanned']
+        timings.files = {entry['path']: entry['seconds'] for entry in data['slowest_files']}
+        timings.rules = dict(data['rules'])
+        return timings
+
+
+def slowest_files(timings: Dict[str, CheckTimings], top: int = 10) -> List[Dict]:
+    """所有检查器合计最慢的文件：[{'path', 'seconds', 'checks': {检查名称: 秒}}]"""
+    totals: Dict[str, float] = {}
+    breakdown: Dict[str, Dict[str, float]] = {}
+    for name, check_timings in timings.items():
+        for path, seconds in check_timings.files.items():
+            totals[path] = totals.get(path, 0.0) + seconds
+            breakdown.setdefault(path, {})[name] = round(seconds, 4)
+    return [
+        {'path': path, 'seconds': round(seconds, 4), 'checks': breakdown[path]}
+        for path, seconds in _top(totals.items(), top)
+    ]
+
+
+def slowest_rules(timings: Dict[str, CheckTimings], top: int = 10) -> List[Dict]:
+    """耗时最多的规则：[{'rule', 'check', 'seconds'}]"""
+    entries = [
+        ((rule, name), seconds)
+        for name, check_timings in timings.items()
+        for rule, seconds in check_timings.rules.items()
+    ]
+    return [
+        {'rule': rule, 'check': name, 'seconds': round(seconds, 4)}
+        for (rule, name), seconds in _top(entries, top)
+    ]
+
+
+def _top(items: Iterable[Tuple], count: Optional[int]) -> List[Tuple]:
+    """按耗时从大到小排序（耗时相同时按名称），count 为 None 时保留全部"""
+    ordered = sorted(items, key=lambda item: (-item[1], item[0]))
+    return ordered if count is None else ordered[:count]
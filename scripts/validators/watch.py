@@ -0,0 +1,278 @@
+"""监视模式：常驻内存的增量验证
+
+首次完整验证后保留语料库、链接图和每个文档的检查结果，之后轮询受监视文件的修改时间和大小。
+文件保存后只重新检查改动的文档以及链接指向它们的文档，汇总类检查只在输入文件改动时重新运行，
+未改动的文档直接使用内存中的结果，不再读取和解析。
+"""
+
+import os
+import stat
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from .base import DocumentValidator
+from .changes import ChangeSet
+from .corpus import DocumentCorpus
+from .diagnostics import ERROR, Diagnostic
+from .links import LinkValidator
+from .pathindex import SKIP_DIRS
+
+
+# 默认轮询间隔（秒）
+DEFAULT_INTERVAL = 0.05
+
+
+class FileWatcher:
+    """轮询文件的修改时间和大小，报告新增、修改和删除的文件
+    
+    每轮只对受监视的目录树和文件执行 os.scandir/stat，不读取文件内容。
+    """
+    
+    def __init__(self, directories: Iterable[Path], files: Iterable[Path] = ()):
+        self.directories = list(directories)
+        self.files = list(files)
+        self._snapshot = self._scan()
+    
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """文件路径 -> (修改时间, 大小)"""
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+        stack = [str(directory) for directory in self.directories]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        info = entry.stat()
+                        snapshot[Path(entry.path)] = (info.st_mtime_ns, info.st_size)
+                except OSError:
+                    continue
+        for path in self.files:
+            try:
+                info = path.stat()
+            except OSError:
+                continue
+            # 检查器的输入中可能有目录（如存在性检查），目录的增删已经体现在文件的增删中
+            if stat.S_ISREG(info.st_mode):
+                snapshot[path] = (info.st_mtime_ns, info.st_size)
+        return snapshot
+    
+    def poll(self) -> Tuple[Set[Path], Set[Path]]:
+        """返回自上次轮询以来 (新增或修改的文件, 删除的文件)"""
+        snapshot = self._scan()
+        changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+        deleted = set(self._snapshot) - set(snapshot)
+        self._snapshot = snapshot
+        return changed, deleted
+
+
+class LinkGraph:
+    """文档之间的链接图，随文档改动增量更新（路径均为绝对路径）"""
+    
+    def __init__(self, link_validator: LinkValidator):
+        self.link_validator = link_validator
+        # 文档 -> 链接目标（路径索引键）
+        self._targets: Dict[Path, Set[str]] = {}
+        # 链接目标（路径索引键） -> 引用它的文档
+        self._referrers: Dict[str, Set[Path]] = {}
+        for path in link_validator.document_paths():
+            self.update(path)
+    
+    def update(self, path: Path):
+        """重新提取文档的链接"""
+        self.remove(path)
+        doc = self.link_validator.corpus.load(path)
+        if doc.error is not None:
+            return
+        source = path.resolve()
+        targets = set(self.link_validator.link_targets(doc))
+        self._targets[source] = targets
+        for target in targets:
+            self._referrers.setdefault(target, set()).add(source)
+    
+    def remove(self, path: Path):
+        """移除文档的所有链接"""
+        source = path.resolve()
+        for target in self._targets.pop(source, ()):
+            referrers = self._referrers[target]
+            referrers.discard(source)
+            if not referrers:
+                del self._referrers[target]
+    
+    def referrers(self, target: Path) -> Set[Path]:
+        """链接指向 target 的文档"""
+        key = self.link_validator.corpus.path_index.key(target)
+        return self._referrers.get(key, set()) if key is not None else set()
+
+
+class WatchSession:
+    """常驻内存的验证状态
+    
+    逐文档检查器保留同一个实例和每个文档的结果；汇总类检查器在输入改动时用工厂函数重新创建
+    （如术语检查器在创建时加载术语表）。
+    """
+    
+    def __init__(self, corpus: DocumentCorpus, factories: List[Callable[[], DocumentValidator]]):
+        self.corpus = corpus
+        self.root_dir = corpus.root_dir
+        self.factories = factories
+        self.checkers = [factory() for factory in factories]
+        # 逐文档检查器的结果：检查器序号 -> 文档路径 -> (错误, 警告)
+        self._document_results: List[Dict[Path, Tuple[List[Diagnostic], List[Diagnostic]]]] = [
+            {} for _ in factories
+        ]
+        self.link_validator = LinkValidator(str(self.root_dir), corpus)
+        self.links = LinkGraph(self.link_validator)
+    
+    def file_watcher(self) -> FileWatcher:
+        """监视语言文档目录树（如 docs/zh），以及各检查器在该目录之外的输入文件（如 README、术语表）"""
+        docs_dir = self.corpus.docs_dir
+        files = set()
+        for checker in self.checkers + [self.link_validator]:
+            for path in checker.input_paths():
+                if docs_dir not in path.parents:
+                    files.add(path)
+        return FileWatcher([docs_dir], sorted(files))
+    
+    def run_all(self) -> bool:
+        """首次完整验证，按常规格式打印每个检查器的报告"""
+        success = True
+        for index, checker in enumerate(self.checkers):
+            if checker.PER_DOCUMENT:
+                self._check_documents(index, checker.document_paths())
+                checker.errors, checker.warnings = self._gather(index)
+            else:
+                checker.collect()
+            success = checker.print_report(checker.REPORT_TITLE) and success
+        return success
+    
+    def update(self, changed: Set[Path], deleted: Set[Path]) -> Tuple[List[Diagnostic], int]:
+        """处理一批文件改动
+        
+        返回 (改动文档的全部诊断及其他重新检查的结果中新出现的诊断, 已解决的问题数)。
+        """
+        previous = self._all_diagnostics()
+        self.corpus.refresh(changed, deleted)
+        change_set = ChangeSet(
+            self.root_dir,
+            {path.resolve() for path in changed},
+            {path.resolve() for path in deleted},
+        )
+        
+        # 更新链接图，并把链接指向改动文件（包括新增和删除的文件）的文档加入受影响集合
+        for path in deleted:
+            self.links.remove(path)
+        link_sources = set(self.link_validator.document_paths())
+        for path in changed:
+            if path in link_sources:
+                self.links.update(path)
+        for path in change_set.changed | change_set.deleted:
+            change_set.affected.update(self.links.referrers(path))
+        
+        reported: List[Diagnostic] = []
+        for index, checker in enumerate(self.checkers):
+            try:
+                if checker.PER_DOCUMENT:
+                    reported += self._update_documents(index, change_set, previous)
+                elif change_set.affects(checker):
+                    checker = self.checkers[index] = self.factories[index]()
+                    checker.collect()
+                    reported += [
+                        diagnostic for diagnostic in checker.errors + checker.warnings
+                        if diagnostic not in previous
+                    ]
+            except Exception as e:
+                reported.append(Diagnostic('checker-failed', ERROR, args=(str(e),)))
+        return reported, len(previous - self._all_diagnostics())
+    
+    def _update_documents(self, index: int, change_set: ChangeSet,
+                          previous: Set[Diagnostic]) -> List[Diagnostic]:
+        """重新检查受影响的文档，移除已不在检查范围内的文档的结果"""
+        checker = self.checkers[index]
+        results = self._document_results[index]
+        paths = checker.document_paths()
+        for path in set(results) - set(paths):
+            del results[path]
+        
+        affected = change_set.select(paths)
+        self._check_documents(index, affected)
+        reported: List[Diagnostic] = []
+        for path in affected:
+            errors, warnings = results[path]
+            if path.resolve() in change_set.changed:
+                reported += errors + warnings
+            else:
+                # 因链接而重新检查的文档只报告新出现的问题
+                reported += [diagnostic for diagnostic in errors + warnings if diagnostic not in previous]
+        return reported
+    
+    def _check_documents(self, index: int, paths: List[Path]):
+        """逐个检查文档，分别保存每个文档的结果"""
+        checker = self.checkers[index]
+        results = self._document_results[index]
+        for path in paths:
+            checker.errors, checker.warnings = [], []
+            checker.run_documents([path])
+            results[path] = (checker.errors, checker.warnings)
+    
+    def _gather(self, index: int) -> Tuple[List[Diagnostic], List[Diagnostic]]:
+        """按文档顺序合并逐文档检查器的结果"""
+        errors: List[Diagnostic] = []
+        warnings: List[Diagnostic] = []
+        results = self._document_results[index]
+        for path in self.checkers[index].document_paths():
+            if path in results:
+                errors += results[path][0]
+                warnings += results[path][1]
+        return errors, warnings
+    
+    def diagnostics(self) -> Tuple[List[Diagnostic], List[Diagnostic]]:
+        """当前所有检查的 (错误, 警告)"""
+        errors: List[Diagnostic] = []
+        warnings: List[Diagnostic] = []
+        for index, checker in enumerate(self.checkers):
+            if checker.PER_DOCUMENT:
+                checker_errors, checker_warnings = self._gather(index)
+            else:
+                checker_errors, checker_warnings = checker.errors, checker.warnings
+            errors += checker_errors
+            warnings += checker_warnings
+        return errors, warnings
+    
+    def _all_diagnostics(self) -> Set[Diagnostic]:
+        errors, warnings = self.diagnostics()
+        return set(errors) | set(warnings)
+    
+    def watch(self, watcher: FileWatcher, interval: float = DEFAULT_INTERVAL):
+        """轮询文件改动并增量验证，直到被中断（Ctrl+C）"""
+        while True:
+            time.sleep(interval)
+            changed, deleted = watcher.poll()
+            if not changed and not deleted:
+                continue
+            started = time.perf_counter()
+            reported, resolved = self.update(changed, deleted)
+            elapsed = (time.perf_counter() - started) * 1000
+            self.print_update(changed | deleted, reported, resolved, elapsed)
+    
+    def print_update(self, touched: Set[Path], reported: List[Diagnostic], resolved: int,
+                     elapsed_ms: float):
+        """打印一次增量验证的结果"""
+        names = ', '.join(sorted(self.corpus.path_index.key(path) or str(path) for path in touched))
+        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 改动: {names}（{elapsed_ms:.0f} ms）")
+        if resolved:
+            print(f"  ✓ 已解决 {resolved} 个问题")
+        if not reported:
+            print("  ✓ 重新验证的文档没有问题")
+        for diagnostic in reported:
+            marker = "❌" if diagnostic.severity == ERROR else "⚠️ "
+            print(f"  {marker} {diagnostic}")
+        errors, warnings = self.diagnostics()
+        print(f"当前共 {len(errors)} 个错误，{len(warnings)} 个警告")